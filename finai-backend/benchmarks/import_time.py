@@ -0,0 +1,184 @@
+"""
+Cold-start report for the API process.
+
+Imports a module (main by default) in a fresh interpreter with "python -X importtime"
+and breaks the import time down per module and per top-level package, then times
+the first-request work done at startup (loading or building the cohort index and
+a warm-up pipeline run) in another fresh interpreter.
+
+The suite exits with status 1 when --budget is given and the import takes longer.
+
+Usage (from finai-backend/):
+    python -m benchmarks.import_time                     # report for "import main"
+    python -m benchmarks.import_time --top 30 --output import_time.json
+    python -m benchmarks.import_time --module simple_server --budget 0.5
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from typing import Any, Dict, List, NamedTuple
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from utils.cohort import get_cohort_index
+get_cohort_index()
+cohort = time.perf_counter()
+from prefork import warm_up
+warm_up()
+warmed = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - started,
+    "cohort_index_seconds": cohort - imported,
+    "warm_up_seconds": warmed - cohort,
+}))
+"""
+
+
+class ImportEntry(NamedTuple):
+    """One line of -X importtime output."""
+
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> List[ImportEntry]:
+    """
+    Parse "python -X importtime" output.
+
+    Args:
+        stderr: Captured stderr of the interpreter
+
+    Returns:
+        One entry per imported module, in the order the lines were written
+        (children before their parent); depth 0 is a module imported directly
+    """
+
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            indent = len(name) - len(name.lstrip())
+            entries.append(ImportEntry(name.strip(), (indent - 1) // 2, int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return entries
+
+
+def import_report(module: str, top: int = 20) -> Dict[str, Any]:
+    """
+    Import a module in a fresh interpreter and summarize where the time goes.
+
+    Args:
+        module: Module to import (run with finai-backend/ as the working directory)
+        top: Number of modules and packages to list
+
+    Returns:
+        Dictionary with the total import time, the slowest modules by self time
+        and the top-level packages by summed self time (all in seconds)
+    """
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    entries = parse_importtime(completed.stderr)
+    packages: Dict[str, int] = {}
+    for entry in entries:
+        package = entry.name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + entry.self_us
+
+    slowest = sorted(entries, key=lambda entry: entry.self_us, reverse=True)[:top]
+    return {
+        "module": module,
+        "python": sys.version.split()[0],
+        "total_seconds": sum(entry.self_us for entry in entries) / 1e6,
+        "module_count": len(entries),
+        "modules": [
+            {"name": entry.name, "self_seconds": entry.self_us / 1e6, "cumulative_seconds": entry.cumulative_us / 1e6}
+            for entry in slowest
+        ],
+        "packages": [
+            {"name": name, "self_seconds": self_us / 1e6}
+            for name, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        "loaded": sorted({entry.name.split(".", 1)[0] for entry in entries}),
+    }
+
+
+def startup_report() -> Dict[str, float]:
+    """Time "import main", the cohort index and the warm-up run in a fresh interpreter."""
+
+    completed = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"startup failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print an import report as tables."""
+
+    print(f"import {report['module']}: {report['total_seconds'] * 1000:.1f}ms "
+          f"across {report['module_count']} modules (Python {report['python']})")
+
+    print(f"\n{'package':<30} {'self ms':>10}")
+    for package in report["packages"]:
+        print(f"{package['name']:<30} {package['self_seconds'] * 1000:>10.1f}")
+
+    print(f"\n{'module':<50} {'self ms':>10} {'cumulative ms':>14}")
+    for module in report["modules"]:
+        print(f"{module['name']:<50} {module['self_seconds'] * 1000:>10.1f} {module['cumulative_seconds'] * 1000:>14.1f}")
+
+    startup = report.get("startup")
+    if startup:
+        print("\nstartup (fresh interpreter):")
+        for name, seconds in startup.items():
+            print(f"  {name:<28} {seconds * 1000:>8.1f}ms")
+
+
+def main():
+    """Print the cold-start report and check it against an optional budget."""
+
+    parser = argparse.ArgumentParser(description="Report import and startup time of the API process")
+    parser.add_argument("--module", default="main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Modules and packages to list")
+    parser.add_argument("--no-startup", action="store_true", help="Skip timing the cohort index and warm-up")
+    parser.add_argument("--budget", type=float, help="Fail when the import takes longer (seconds)")
+    parser.add_argument("--output", help="Also write the report to a JSON file")
+    args = parser.parse_args()
+
+    report = import_report(args.module, args.top)
+    if not args.no_startup and args.module == "main":
+        report["startup"] = startup_report()
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.budget is not None:
+        if report["total_seconds"] > args.budget:
+            print(f"\n❌ import {args.module} took {report['total_seconds']:.3f}s (budget {args.budget:.3f}s)")
+            sys.exit(1)
+        print(f"\n✅ import {args.module} within {args.budget:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,705 @@
+"""
+Benchmark suite for formulas, validation, chains and endpoints.
+
+Every benchmark is timed at one or more sizes (number of profiles processed per run).
+The fastest of several runs (less sensitive to scheduler noise than the median) is
+compared with benchmarks/baseline.json and the suite exits with status 1 when any
+benchmark is slower than baseline * (1 + threshold) or has no baseline entry (a new
+benchmark must be recorded with --update-baseline in the change that adds it).
+The baseline is recorded on the versions pinned in requirements.txt; running on
+other versions of the packages in BASELINE_PACKAGES prints a warning.
+
+Endpoints are called through an in-process ASGI client, so no server is started.
+The llm_two_call and llm_combined benchmarks (and their _compact prompt variants)
+run the LLM chains' async paths against the in-process fake OpenAI server (with a
+small simulated round-trip) and also report calls and prompt/completion tokens per
+profile; LangChain itself is not needed for them.
+The serialize_analyze_* benchmarks encode /analyze response bodies with the
+previous path (model_dump + jsonable_encoder + json), orjson and MessagePack, and
+the report ends with serialization's share of endpoint_analyze latency.
+The per-request chain and endpoint benchmarks are slow at 100k profiles, so they run
+at 1 and 1k by default and at 100k only with --full; the vectorized batch paths
+(retirement_projection_batch, /analyze/batch) cover 100k in every run.
+
+Usage (from finai-backend/):
+    python -m benchmarks.run_benchmarks                    # compare against the baseline
+    python -m benchmarks.run_benchmarks --update-baseline  # record a new baseline
+    python -m benchmarks.run_benchmarks --only analyze --sizes 1,1000 --threshold 0.5
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+import gc
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import httpx
+
+# Make the backend packages importable when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.user_input import UserInput
+from utils.formulas import (
+    retirement_projection, retirement_projection_batch, calculate_risk_score, calculate_risk_score_batch
+)
+from utils.cache import calculation_cache
+from chains.simple_analysis import SimpleRetirementAnalysis
+from chains.simple_strategy import SimpleRetirementStrategy
+
+
+SIZES = (1, 1000, 100000)
+FULL_SIZE = 100000
+DEFAULT_THRESHOLD = float(os.getenv("BENCHMARK_THRESHOLD", "0.5"))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Runs shorter than this are repeated in a loop so timer resolution does not dominate
+MIN_RUN_SECONDS = 0.05
+
+# Slowdowns smaller than this are treated as timer and scheduler noise
+NOISE_FLOOR_SECONDS = 20e-6
+
+# Packages whose versions are stored with the baseline (timings depend on them)
+BASELINE_PACKAGES = ("numpy", "pandas", "pydantic", "fastapi", "starlette", "orjson")
+
+# Simulated network round-trip of the fake LLM server in the llm_* benchmarks
+LLM_ROUND_TRIP_SECONDS = 0.005
+
+# name -> (factory(size) returning the callable to time, sizes, heavy)
+BENCHMARKS: Dict[str, Tuple[Callable[[int], Callable[[], Any]], Tuple[int, ...], bool]] = {}
+
+
+def benchmark(name: str, sizes: Tuple[int, ...] = SIZES, heavy: bool = False):
+    """
+    Register a benchmark.
+
+    The decorated factory receives the size, does all setup, and returns a
+    zero-argument callable that processes `size` profiles once (or None when the
+    benchmark cannot run here). A `metrics` attribute on the callable, returning
+    cumulative counters, adds per-item counter deltas to the results.
+
+    Args:
+        name: Benchmark name used in reports and the baseline
+        sizes: Sizes the benchmark supports
+        heavy: Only run at FULL_SIZE when --full is given
+    """
+
+    def register(factory: Callable[[int], Callable[[], Any]]):
+        BENCHMARKS[name] = (factory, sizes, heavy)
+        return factory
+
+    return register
+
+
+def sample_payloads(size: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Deterministic, valid UserInput payloads with varied profiles.
+
+    Args:
+        size: Number of payloads
+        seed: Random seed
+
+    Returns:
+        List of plain dictionaries ready for UserInput(**payload) or a JSON body
+    """
+
+    rng = np.random.default_rng(seed)
+    age = rng.integers(22, 56, size)
+    retirement_age = np.maximum(age + 5, rng.integers(55, 66, size))
+    annual_income = np.round(rng.lognormal(np.log(1200000), 0.5, size), -3)
+    monthly_expenses = np.round(annual_income * rng.uniform(0.3, 0.6, size) / 12)
+    monthly_savings = np.round(annual_income * rng.uniform(0.05, 0.3, size) / 12)
+    current_savings = np.round(annual_income * rng.uniform(0, 3, size), -3)
+    retirement_goal = np.round(annual_income * rng.uniform(20, 60, size), -3)
+    expected_returns = rng.choice([6.0, 8.0, 10.0, 12.0], size)
+    expected_inflation = rng.choice([4.0, 5.0, 6.0], size)
+
+    return [
+        {
+            "age": int(age[i]),
+            "retirement_age": int(retirement_age[i]),
+            "annual_income": float(annual_income[i]),
+            "monthly_expenses": float(monthly_expenses[i]),
+            "current_savings": float(current_savings[i]),
+            "monthly_savings": float(monthly_savings[i]),
+            "retirement_goal": float(retirement_goal[i]),
+            "expected_returns": float(expected_returns[i]),
+            "expected_inflation": float(expected_inflation[i])
+        }
+        for i in range(size)
+    ]
+
+
+def _projection_data(user_input: UserInput) -> Dict[str, Any]:
+    """projection_data dictionary as passed to the chains by main.py."""
+
+    projection = retirement_projection(user_input)
+    return {
+        "readiness_percentage": projection.readiness_percentage,
+        "projected_corpus": projection.projected_corpus,
+        "retirement_goal": projection.retirement_goal,
+        "shortfall": projection.shortfall,
+        "surplus": projection.surplus,
+        "years_to_retirement": projection.years_to_retirement
+    }
+
+
+@benchmark("user_input_validation")
+def bench_user_input_validation(size: int):
+    payloads = sample_payloads(size)
+    return lambda: [UserInput(**payload) for payload in payloads]
+
+
+@benchmark("retirement_projection")
+def bench_retirement_projection(size: int):
+    inputs = [UserInput(**payload) for payload in sample_payloads(size)]
+    return lambda: [retirement_projection(user_input) for user_input in inputs]
+
+
+@benchmark("retirement_projection_batch")
+def bench_retirement_projection_batch(size: int):
+    payloads = sample_payloads(size)
+    columns = [
+        np.array([payload[name] for payload in payloads])
+        for name in ("age", "retirement_age", "current_savings", "monthly_savings", "expected_returns", "retirement_goal")
+    ]
+    return lambda: retirement_projection_batch(*columns)
+
+
+@benchmark("calculate_risk_score")
+def bench_calculate_risk_score(size: int):
+    inputs = [UserInput(**payload) for payload in sample_payloads(size)]
+    return lambda: [calculate_risk_score(user_input) for user_input in inputs]
+
+
+@benchmark("calculate_risk_score_batch")
+def bench_calculate_risk_score_batch(size: int):
+    payloads = sample_payloads(size)
+    columns = [
+        np.array([payload[name] for payload in payloads])
+        for name in ("age", "retirement_age", "annual_income", "monthly_savings")
+    ]
+    return lambda: calculate_risk_score_batch(*columns)
+
+
+@benchmark("ingest_validation")
+def bench_ingest_validation(size: int):
+    # Vectorized UserInput rules of utils.ingest, to compare with user_input_validation
+    from utils.ingest import REQUIRED_COLUMNS, OPTIONAL_COLUMNS, validate_columns
+
+    payloads = sample_payloads(size)
+    columns = {
+        name: np.array([float(payload.get(name, OPTIONAL_COLUMNS.get(name, 0))) for payload in payloads])
+        for name in (*REQUIRED_COLUMNS, *OPTIONAL_COLUMNS)
+    }
+    return lambda: validate_columns(columns)
+
+
+@benchmark("metrics_per_request", heavy=True)
+def bench_metrics_per_request(size: int):
+    # What one /analyze request records: ten stage samples plus the request counters and histogram
+    from utils.metrics import observe_request, observe_stage
+
+    stages = ("validation", "projection", "risk", "cohort_risk", "analysis", "strategies",
+              "timeline", "retirement_income", "instruments", "serialization")
+
+    def run():
+        for _ in range(size):
+            for stage in stages:
+                observe_stage(stage, 0.0002)
+            observe_request("POST", "/analyze", 200, 0.004)
+
+    return run
+
+
+@benchmark("simple_analysis", heavy=True)
+def bench_simple_analysis(size: int):
+    chain = SimpleRetirementAnalysis()
+    inputs = [UserInput(**payload) for payload in sample_payloads(size)]
+    cases = [(user_input, _projection_data(user_input)) for user_input in inputs]
+    return lambda: [chain.analyze_retirement_plan(user_input, data) for user_input, data in cases]
+
+
+@benchmark("simple_strategy", heavy=True)
+def bench_simple_strategy(size: int):
+    analysis = SimpleRetirementAnalysis()
+    chain = SimpleRetirementStrategy()
+    inputs = [UserInput(**payload) for payload in sample_payloads(size)]
+    cases = []
+    for user_input in inputs:
+        data = _projection_data(user_input)
+        cases.append((user_input, analysis.analyze_retirement_plan(user_input, data), data))
+    return lambda: [chain.generate_strategies(*case) for case in cases]
+
+
+class _ASGIRunner:
+    """Sends requests to the FastAPI app in-process on a private event loop."""
+
+    def __init__(self):
+        import main
+
+        self.main = main
+        self.loop = asyncio.new_event_loop()
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark")
+
+    def post_all(self, path: str, bodies: List[Dict[str, Any]]) -> None:
+        """POST every body in turn, starting from a cold calculation cache."""
+
+        async def send():
+            for body in bodies:
+                response = await self.client.post(path, json=body)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+
+        # Use the rule-based chains so endpoint timings are deterministic and offline
+        pipeline = self.main.pipeline
+        chains = (pipeline.analysis_chain, pipeline.strategy_chain)
+        pipeline.analysis_chain = SimpleRetirementAnalysis()
+        pipeline.strategy_chain = SimpleRetirementStrategy()
+        calculation_cache.clear()
+        try:
+            self.loop.run_until_complete(send())
+        finally:
+            pipeline.analysis_chain, pipeline.strategy_chain = chains
+
+    def close(self) -> None:
+        self.loop.run_until_complete(self.client.aclose())
+        self.loop.close()
+
+
+_runner: Optional[_ASGIRunner] = None
+
+
+def _asgi_runner() -> _ASGIRunner:
+    global _runner
+    if _runner is None:
+        _runner = _ASGIRunner()
+    return _runner
+
+
+@benchmark("endpoint_analyze", heavy=True)
+def bench_endpoint_analyze(size: int):
+    runner = _asgi_runner()
+    bodies = sample_payloads(size)
+    return lambda: runner.post_all("/analyze", bodies)
+
+
+@benchmark("endpoint_suggestions", heavy=True)
+def bench_endpoint_suggestions(size: int):
+    runner = _asgi_runner()
+    bodies = sample_payloads(size)
+    return lambda: runner.post_all("/suggestions", bodies)
+
+
+@benchmark("endpoint_simulate", heavy=True)
+def bench_endpoint_simulate(size: int):
+    runner = _asgi_runner()
+    bodies = [
+        {"user_input": payload, "modified_parameters": {"monthly_savings": payload["monthly_savings"] * 1.5}}
+        for payload in sample_payloads(size)
+    ]
+    return lambda: runner.post_all("/simulate", bodies)
+
+
+@benchmark("endpoint_analyze_batch")
+def bench_endpoint_analyze_batch(size: int):
+    runner = _asgi_runner()
+    payloads = sample_payloads(size)
+    body = {
+        name: [payload[name] for payload in payloads]
+        for name in ("age", "retirement_age", "current_savings", "monthly_savings", "retirement_goal", "expected_returns")
+    }
+    return lambda: runner.post_all("/analyze/batch", [body])
+
+
+def _analyze_bodies(size: int) -> List[Dict[str, Any]]:
+    """/analyze response bodies (rule-based chains, models not yet serialized) for `size` profiles."""
+
+    import main
+    from chains.pipeline import AnalysisPipeline
+    from utils.cache import LRUCache
+
+    pipeline = AnalysisPipeline(
+        SimpleRetirementAnalysis(), SimpleRetirementStrategy(), cache=LRUCache(len(main.ANALYZE_STAGES) * size + 16, 0)
+    )
+    loop = asyncio.new_event_loop()
+    runs = [
+        loop.run_until_complete(pipeline.run(UserInput(**payload)).acompute(main.ANALYZE_STAGES))
+        for payload in sample_payloads(size)
+    ]
+    loop.close()
+    return [main.analyze_response_body(run) for run in runs]
+
+
+@benchmark("serialize_analyze_legacy", sizes=(1, 1000))
+def bench_serialize_analyze_legacy(size: int):
+    # The previous response path: model_dump() dictionaries, FastAPI's jsonable_encoder, then json.dumps
+    from fastapi.encoders import jsonable_encoder
+
+    bodies = _analyze_bodies(size)
+
+    def encode(body):
+        content = jsonable_encoder({
+            **body,
+            "projection": body["projection"].model_dump(),
+            "analysis": body["analysis"].model_dump(),
+            "strategies": [strategy.model_dump() for strategy in body["strategies"]]
+        })
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+    return lambda: [encode(body) for body in bodies]
+
+
+@benchmark("serialize_analyze_orjson", sizes=(1, 1000))
+def bench_serialize_analyze_orjson(size: int):
+    from utils.serialization import dumps_json
+
+    bodies = _analyze_bodies(size)
+    return lambda: [dumps_json(body) for body in bodies]
+
+
+@benchmark("serialize_analyze_msgpack", sizes=(1, 1000))
+def bench_serialize_analyze_msgpack(size: int):
+    from utils.serialization import dumps_msgpack, msgpack_available
+
+    if not msgpack_available():
+        return None
+    bodies = _analyze_bodies(size)
+    return lambda: [dumps_msgpack(body) for body in bodies]
+
+
+def compare_serialization(results: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Share of /analyze latency spent serializing the response, before and after orjson.
+
+    endpoint_analyze is timed with the current (orjson) response path; the "before"
+    latency swaps its serialization time for the legacy path's.
+
+    Returns:
+        One line per size at which endpoint_analyze and both serializers ran
+    """
+
+    lines = []
+    for key, endpoint in results.items():
+        if key.split("[")[0] != "endpoint_analyze":
+            continue
+        size = key[len("endpoint_analyze"):]
+        legacy = results.get("serialize_analyze_legacy" + size)
+        fast = results.get("serialize_analyze_orjson" + size)
+        if legacy is None or fast is None:
+            continue
+        after = endpoint["min_seconds"]
+        before = after - fast["min_seconds"] + legacy["min_seconds"]
+        lines.append(
+            f"serialization share of endpoint_analyze{size}: {legacy['min_seconds'] / before:.1%} before "
+            f"(json + jsonable_encoder), {fast['min_seconds'] / after:.1%} after (orjson); "
+            f"{legacy['min_seconds'] / fast['min_seconds']:.1f}x faster"
+        )
+    return lines
+
+
+def _llm_chain_benchmark(mode: str, size: int, prompt_variant: str = "full"):
+    """Plan `size` profiles with the LLM chains against the fake server, in two_call or combined mode."""
+
+    from chains.analysis_chain import RetirementAnalysisChain
+    from chains.strategy_chain import RetirementStrategyChain
+    from chains.plan_chain import RetirementPlanChain
+    from chains.llm_client import AsyncChatClient, LLMLimiter
+    from utils.llm_cache import LLMResponseCache
+    from fake_openai_server import create_fake_openai_app
+
+    app = create_fake_openai_app(delay=LLM_ROUND_TRIP_SECONDS)
+    client = AsyncChatClient(
+        api_key="benchmark", base_url="http://fake-openai/v1",
+        limiter=LLMLimiter(8, 30.0), transport=httpx.ASGITransport(app=app)
+    )
+    # Nothing is retained, so every profile reaches the (fake) LLM
+    no_cache = LLMResponseCache(":memory:", max_entries=0)
+    if mode == "combined":
+        analysis_chain = strategy_chain = RetirementPlanChain("benchmark", client, no_cache, prompt_variant)
+    else:
+        analysis_chain = RetirementAnalysisChain("benchmark", client, no_cache, prompt_variant)
+        strategy_chain = RetirementStrategyChain("benchmark", client, no_cache, prompt_variant)
+
+    inputs = [UserInput(**payload) for payload in sample_payloads(size)]
+    loop = asyncio.new_event_loop()
+
+    async def plan_all():
+        for user_input in inputs:
+            analysis = await analysis_chain.aanalyze_retirement_plan(user_input)
+            await strategy_chain.agenerate_strategies(user_input, analysis)
+
+    def run():
+        loop.run_until_complete(plan_all())
+
+    run.metrics = lambda: dict(client.usage)
+    return run
+
+
+@benchmark("llm_two_call", sizes=(1, 100))
+def bench_llm_two_call(size: int):
+    return _llm_chain_benchmark("two_call", size)
+
+
+@benchmark("llm_combined", sizes=(1, 100))
+def bench_llm_combined(size: int):
+    return _llm_chain_benchmark("combined", size)
+
+
+@benchmark("llm_two_call_compact", sizes=(1, 100))
+def bench_llm_two_call_compact(size: int):
+    return _llm_chain_benchmark("two_call", size, "compact")
+
+
+@benchmark("llm_combined_compact", sizes=(1, 100))
+def bench_llm_combined_compact(size: int):
+    return _llm_chain_benchmark("combined", size, "compact")
+
+
+def compare_llm_modes(results: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Compare the LLM benchmarks that ran at the same size.
+
+    Returns:
+        One line per pair: combined vs two_call (same prompt variant) and compact
+        vs full (same mode), with latency ratio, calls and tokens per profile
+    """
+
+    pairs = [
+        ("llm_combined", "llm_two_call"), ("llm_combined_compact", "llm_two_call_compact"),
+        ("llm_two_call_compact", "llm_two_call"), ("llm_combined_compact", "llm_combined")
+    ]
+    tokens = lambda timing: timing["prompt_tokens_per_item"] + timing["completion_tokens_per_item"]
+    lines = []
+    for name, reference_name in pairs:
+        for key, timing in results.items():
+            if key.split("[")[0] != name:
+                continue
+            reference = results.get(reference_name + key[len(name):])
+            if reference is None:
+                continue
+            lines.append(
+                f"{key} vs {reference_name}: {timing['min_seconds'] / reference['min_seconds']:.2f}x latency, "
+                f"{timing['calls_per_item']:.1f} vs {reference['calls_per_item']:.1f} calls/profile, "
+                f"{tokens(timing):.0f} vs {tokens(reference):.0f} tokens/profile "
+                f"({tokens(timing) / tokens(reference):.2f}x)"
+            )
+    return lines
+
+
+def time_callable(run: Callable[[], Any], repeats: int = 5) -> Dict[str, float]:
+    """
+    Time a callable.
+
+    Fast callables are looped until one measurement takes at least MIN_RUN_SECONDS.
+    Garbage collection is paused while measuring, as in timeit, so collections
+    triggered by earlier setup do not land inside the timed region.
+
+    Args:
+        run: Zero-argument callable to time
+        repeats: Number of measurements
+
+    Returns:
+        Dictionary with median and min seconds per call, and loops per measurement
+    """
+
+    # Warm up (imports, caches, first-call allocation) and size the loop
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    loops = max(1, int(MIN_RUN_SECONDS / elapsed)) if elapsed > 0 else 1000
+
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(loops):
+                run()
+            samples.append((time.perf_counter() - start) / loops)
+    finally:
+        gc.enable()
+
+    return {"median_seconds": statistics.median(samples), "min_seconds": min(samples), "loops": loops}
+
+
+def run_benchmarks(sizes=SIZES, only: Optional[List[str]] = None, full: bool = False,
+                   repeats: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the registered benchmarks.
+
+    Args:
+        sizes: Sizes to run (each benchmark skips sizes it does not support)
+        only: Run only benchmarks whose name contains one of these substrings
+        full: Also run heavy benchmarks at FULL_SIZE
+        repeats: Measurements per benchmark and size
+
+    Returns:
+        Results keyed "name[size]"
+    """
+
+    results = {}
+    for name, (factory, supported, heavy) in BENCHMARKS.items():
+        if only and not any(part in name for part in only):
+            continue
+        for size in sizes:
+            if size not in supported or (heavy and size >= FULL_SIZE and not full):
+                continue
+            run = factory(size)
+            if run is None:
+                print(f"{name + f'[{size}]':<36} skipped (dependencies not installed)")
+                continue
+            timing = time_callable(run, repeats)
+            timing["per_item_us"] = timing["min_seconds"] / size * 1e6
+            counters = ""
+            if hasattr(run, "metrics"):
+                before = run.metrics()
+                run()
+                after = run.metrics()
+                for counter in after:
+                    timing[f"{counter}_per_item"] = (after[counter] - before[counter]) / size
+                counters = "  " + ", ".join(f"{counter} {timing[f'{counter}_per_item']:.1f}/item" for counter in after)
+            results[f"{name}[{size}]"] = timing
+            print(f"{name + f'[{size}]':<36} {timing['min_seconds'] * 1000:>11.3f} ms  "
+                  f"{timing['per_item_us']:>10.2f} us/item  (median {timing['median_seconds'] * 1000:.3f} ms){counters}")
+
+    for line in compare_llm_modes(results) + compare_serialization(results):
+        print(line)
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                        threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Find benchmarks that got slower than the baseline allows or have no baseline entry.
+
+    Args:
+        results: Output of run_benchmarks
+        baseline: "results" section of a baseline file
+        threshold: Allowed slowdown as a fraction (0.5 = 50% slower)
+
+    Returns:
+        One message per regression or missing baseline entry (empty when everything
+        is within the threshold)
+    """
+
+    regressions = []
+    for key, timing in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            regressions.append(f"{key}: no baseline entry (record it with --update-baseline)")
+            continue
+        ratio = timing["min_seconds"] / reference["min_seconds"]
+        slowdown = timing["min_seconds"] - reference["min_seconds"]
+        if ratio > 1 + threshold and slowdown > NOISE_FLOOR_SECONDS:
+            regressions.append(
+                f"{key}: {timing['min_seconds'] * 1000:.3f} ms vs baseline "
+                f"{reference['min_seconds'] * 1000:.3f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def package_versions() -> Dict[str, Optional[str]]:
+    """Installed versions of BASELINE_PACKAGES (None when not installed)."""
+
+    from importlib import metadata
+
+    versions = {}
+    for name in BASELINE_PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def version_mismatches(path: str = BASELINE_PATH) -> List[str]:
+    """Packages whose installed version differs from the one the baseline was recorded with."""
+
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        recorded = json.load(f).get("packages", {})
+    return [
+        f"{name} {installed} (baseline: {recorded[name]})"
+        for name, installed in package_versions().items()
+        if name in recorded and recorded[name] != installed
+    ]
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict[str, Any]]:
+    """Load the "results" section of a baseline file (empty if missing)."""
+
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: str = BASELINE_PATH) -> None:
+    """Write results as the new baseline, merged over entries that were not re-run."""
+
+    merged = {**load_baseline(path), **results}
+    document = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "packages": package_versions(),
+        "results": dict(sorted(merged.items()))
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    """Run the suite and compare against (or update) the baseline."""
+
+    parser = argparse.ArgumentParser(description="Run the backend benchmark suite")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES), help="Comma-separated sizes")
+    parser.add_argument("--only", default="", help="Comma-separated name filters")
+    parser.add_argument("--full", action="store_true", help="Run chain and endpoint benchmarks at 100k too")
+    parser.add_argument("--repeats", type=int, default=5, help="Measurements per benchmark")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.5 = 50%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON path")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--output", help="Also write these results to a JSON file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    only = [name for name in args.only.split(",") if name]
+    results = run_benchmarks(sizes, only, args.full, args.repeats)
+    if _runner is not None:
+        _runner.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    mismatches = version_mismatches(args.baseline)
+    if mismatches:
+        print(f"\n⚠️ Timings are not comparable with the baseline: {', '.join(mismatches)}")
+
+    regressions = compare_to_baseline(results, load_baseline(args.baseline), args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%} or have no baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,13 @@ Chains package for the AI-Driven Retirement Planner.
 
 from .simple_analysis import SimpleRetirementAnalysis, create_analysis_chain
 from .simple_strategy import SimpleRetirementStrategy, create_strategy_chain
+from .pipeline import AnalysisPipeline, PipelineRun
 
 __all__ = [
     "SimpleRetirementAnalysis",
     "create_analysis_chain",
     "SimpleRetirementStrategy", 
-    "create_strategy_chain"
+    "create_strategy_chain",
+    "AnalysisPipeline",
+    "PipelineRun"
 ]
@@ -0,0 +1,240 @@
+"""
+Admission control for the LLM-backed (AI) path of /analyze, /suggestions and /analyze/stream.
+
+Before a request runs the LLM chains, AdmissionController.admit decides whether
+it may use them or is answered by the rule-based Simple chains instead:
+
+- rate: each client has a token bucket (ADMISSION_RATE_PER_CLIENT requests per
+  second, bursts of ADMISSION_BURST); a client that spends its tokens is degraded
+- queue: at most ADMISSION_MAX_PENDING admitted requests may be waiting for or
+  running LLM calls at once, including chain calls still finishing in the
+  background after a request missed its latency budget; further requests are
+  degraded instead of queueing
+- latency: while the LLM's recent latency (moving average kept by the limiter)
+  is above ADMISSION_MAX_LLM_LATENCY_SECONDS, requests are degraded; after
+  ADMISSION_LATENCY_RECOVERY_SECONDS without a finished call they are admitted
+  again so that the average can recover
+
+Degraded requests never wait for the LLM, so they cost the same as the
+rule-based deployment. Deterministic endpoints (/simulate, /analyze/batch,
+/simulate/grid) do not go through admission at all. A setting of 0 disables the
+corresponding check. Decisions are counted in /metrics.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from chains.llm_client import LLMLimiter, llm_limiter
+from utils.metrics import metrics
+
+
+ADMISSION_RATE_PER_CLIENT = float(os.getenv("ADMISSION_RATE_PER_CLIENT", "2"))
+ADMISSION_BURST = float(os.getenv("ADMISSION_BURST", "10"))
+ADMISSION_MAX_PENDING = int(os.getenv("ADMISSION_MAX_PENDING", "32"))
+ADMISSION_MAX_LLM_LATENCY_SECONDS = float(os.getenv("ADMISSION_MAX_LLM_LATENCY_SECONDS", "10"))
+ADMISSION_LATENCY_RECOVERY_SECONDS = float(os.getenv("ADMISSION_LATENCY_RECOVERY_SECONDS", "30"))
+# Request header identifying the client (e.g. X-Client-Id behind a proxy); the peer address otherwise
+ADMISSION_CLIENT_HEADER = os.getenv("ADMISSION_CLIENT_HEADER", "")
+
+# Decisions
+ADMITTED = "admitted"
+RULE_BASED = "rule_based"
+DEGRADED_RATE = "degraded_rate"
+DEGRADED_QUEUE = "degraded_queue"
+DEGRADED_LATENCY = "degraded_latency"
+DECISIONS = (ADMITTED, RULE_BASED, DEGRADED_RATE, DEGRADED_QUEUE, DEGRADED_LATENCY)
+
+decisions_total = metrics.counter(
+    "finai_admission_decisions_total", "AI-path admission decisions (admitted, rule_based or degraded_*)", ("decision",)
+)
+
+
+def is_degraded(decision: Optional[str]) -> bool:
+    """Whether a decision sends the request to the rule-based chains."""
+
+    return decision is not None and decision.startswith("degraded")
+
+
+class TokenBuckets:
+    """
+    Token bucket per client, for the most recently seen max_clients clients.
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        """
+        Initialize the buckets.
+
+        Args:
+            rate: Tokens added per second (0 disables the limit)
+            burst: Bucket capacity; a new client starts full
+            max_clients: Clients tracked before the least recently seen is forgotten
+        """
+
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client: str, now: Optional[float] = None) -> bool:
+        """Take one token from client's bucket; False when it is empty."""
+
+        if self.rate <= 0:
+            return True
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            self._buckets[client] = (tokens - 1 if allowed else tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            return allowed
+
+
+class Admission:
+    """One request's admission decision; release() (or the with block) frees its queue place."""
+
+    def __init__(self, controller: "AdmissionController", decision: str):
+        self.controller = controller
+        self.decision = decision
+        self._held = decision == ADMITTED
+        self._deferred_to: Optional["asyncio.Task"] = None
+
+    @property
+    def degraded(self) -> bool:
+        return is_degraded(self.decision)
+
+    def release(self) -> None:
+        if self._held and self._deferred_to is None:
+            self._held = False
+            self.controller._release()
+
+    def release_after(self, task: Optional["asyncio.Task"]) -> None:
+        """
+        Keep the queue place until task (a chain call backfilling after a missed
+        latency budget) is done, so max_pending bounds LLM work rather than answered requests.
+        """
+
+        if task is None or task.done() or not self._held:
+            return
+        self._deferred_to = task
+
+        def done(_):
+            self._deferred_to = None
+            self.release()
+
+        task.add_done_callback(done)
+
+    def __enter__(self) -> "Admission":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class AdmissionController:
+    """
+    Decides per request whether the LLM chains may be used (see module docstring).
+    """
+
+    def __init__(self, rate: float = ADMISSION_RATE_PER_CLIENT, burst: float = ADMISSION_BURST,
+                 max_pending: int = ADMISSION_MAX_PENDING,
+                 max_llm_latency: float = ADMISSION_MAX_LLM_LATENCY_SECONDS,
+                 latency_recovery: float = ADMISSION_LATENCY_RECOVERY_SECONDS,
+                 limiter: LLMLimiter = None):
+        """
+        Initialize the controller.
+
+        Args:
+            rate: Per-client AI requests per second (0 disables)
+            burst: Per-client burst size
+            max_pending: Admitted requests allowed in the AI path at once (0 disables)
+            max_llm_latency: Recent LLM latency in seconds above which requests are degraded (0 disables)
+            latency_recovery: Seconds without a finished LLM call after which the latency is ignored
+            limiter: LLMLimiter whose latency is watched (defaults to the shared llm_limiter)
+        """
+
+        self.buckets = TokenBuckets(rate, burst)
+        self.max_pending = max_pending
+        self.max_llm_latency = max_llm_latency
+        self.latency_recovery = latency_recovery
+        self.limiter = limiter or llm_limiter
+        self.pending = 0
+        self._lock = threading.Lock()
+
+    def admit(self, client: str, llm: bool = True) -> Admission:
+        """
+        Decide whether a request may use the LLM chains.
+
+        Args:
+            client: Client identity for the token bucket
+            llm: Whether the pipeline has LLM chains at all (False gives RULE_BASED without accounting)
+
+        Returns:
+            Admission to release once the request's chain stages are done
+        """
+
+        if not llm:
+            decision = RULE_BASED
+        elif not self.buckets.take(client):
+            decision = DEGRADED_RATE
+        elif self._llm_slow():
+            decision = DEGRADED_LATENCY
+        else:
+            with self._lock:
+                if self.max_pending and self.pending >= self.max_pending:
+                    decision = DEGRADED_QUEUE
+                else:
+                    self.pending += 1
+                    decision = ADMITTED
+        decisions_total.inc((decision,))
+        return Admission(self, decision)
+
+    def _llm_slow(self) -> bool:
+        """Whether the LLM's recent latency is over the threshold (and recent enough to trust)."""
+
+        if not self.max_llm_latency or self.limiter.latency_ewma is None:
+            return False
+        if time.monotonic() - self.limiter.last_completed > self.latency_recovery:
+            return False
+        return self.limiter.latency_ewma > self.max_llm_latency
+
+    def _release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Settings, admitted requests in the AI path and the LLM latency being watched."""
+
+        return {
+            "rate_per_client": self.buckets.rate,
+            "burst": self.buckets.burst,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "max_llm_latency_seconds": self.max_llm_latency,
+            "llm_latency_seconds": self.limiter.latency_ewma,
+            "decisions": {labels[0]: count for labels, count in decisions_total.values().items()}
+        }
+
+
+def client_id(host: Optional[str], headers) -> str:
+    """Client identity: the ADMISSION_CLIENT_HEADER value when configured and present, else the peer host."""
+
+    if ADMISSION_CLIENT_HEADER:
+        value = headers.get(ADMISSION_CLIENT_HEADER)
+        if value:
+            return value.split(",", 1)[0].strip()
+    return host or "unknown"
+
+
+# Shared by the app's AI endpoints
+admission_controller = AdmissionController()
+metrics.callback("finai_admission_pending", "Admitted requests in the AI path",
+                 lambda: {(): admission_controller.pending})
+metrics.callback("finai_llm_latency_seconds", "Moving average of LLM call latency watched by admission control",
+                 lambda: {(): llm_limiter.latency_ewma} if llm_limiter.latency_ewma is not None else {})
@@ -4,13 +4,14 @@ LangChain analysis chain for AI-driven retirement planning insights.
 
 import json
 import os
-from typing import Dict, Any, List
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
-from langchain.llms import OpenAI
-from langchain.chat_models import ChatOpenAI
+import asyncio
+import functools
+from typing import Dict, Any, List, AsyncIterator, Tuple
 from models.user_input import UserInput, AnalysisResult, RetirementProjection
-from utils.formulas import retirement_projection, calculate_risk_score
+from utils.cache import cached_retirement_projection, cached_risk_score
+from utils.llm_cache import LLMResponseCache, get_llm_response_cache, profile_bands, prompt_fingerprint
+from chains.prompts import LLM_PROMPT_VARIANT, MAX_TOKENS, prompt_template
+from chains.llm_client import AsyncChatClient, JSONListStream, OPENAI_BASE_URL
 
 
 class RetirementAnalysisChain:
@@ -18,12 +19,16 @@ class RetirementAnalysisChain:
     LangChain-based analysis chain for retirement planning insights.
     """
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, llm_client: AsyncChatClient = None,
+                 response_cache: LLMResponseCache = None, prompt_variant: str = LLM_PROMPT_VARIANT):
         """
         Initialize the analysis chain with OpenAI API key.
         
         Args:
             openai_api_key: OpenAI API key (if not provided, will use environment variable)
+            llm_client: Async client used by aanalyze_retirement_plan (defaults to one for OPENAI_BASE_URL)
+            response_cache: Persistent cache of parsed responses (defaults to the shared one)
+            prompt_variant: "full" or "compact" prompt (defaults to LLM_PROMPT_VARIANT)
         """
         
         # Get API key from parameter or environment
@@ -31,97 +36,62 @@ class RetirementAnalysisChain:
         if not api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it as parameter.")
         
-        # Initialize the LLM
-        self.llm = ChatOpenAI(
-            openai_api_key=api_key,
-            model_name="gpt-3.5-turbo",
-            temperature=0.3,
-            max_tokens=1000
-        )
+        # Prompt variant and its completion token limit
+        template = prompt_template("analysis", prompt_variant)
+        self.max_tokens = MAX_TOKENS["analysis"][prompt_variant]
         
-        # Create the analysis prompt template
-        self.analysis_prompt = PromptTemplate(
-            input_variables=[
-                "age", "retirement_age", "annual_income", "monthly_expenses", 
-                "current_savings", "monthly_savings", "retirement_goal",
-                "projected_corpus", "readiness_percentage", "risk_level",
-                "years_to_retirement", "shortfall", "surplus"
-            ],
-            template="""
-You are a professional financial advisor specializing in retirement planning for Indian salaried professionals. Analyze the following user's financial situation and provide a comprehensive assessment tailored for the Indian context.
-
-User Profile (Indian Salaried Professional):
-- Age: {age} years
-- Target Retirement Age: {retirement_age} years
-- Years to Retirement: {years_to_retirement} years
-- Annual Income: ₹{annual_income:,.2f}
-- Monthly Expenses: ₹{monthly_expenses:,.2f}
-- Current Savings: ₹{current_savings:,.2f}
-- Monthly Savings: ₹{monthly_savings:,.2f}
-- Retirement Goal: ₹{retirement_goal:,.2f}
-
-Projection Results:
-- Projected Corpus: ₹{projected_corpus:,.2f}
-- Readiness Percentage: {readiness_percentage:.1f}%
-- Shortfall: ₹{shortfall:,.2f}
-- Surplus: ₹{surplus:,.2f}
-- Risk Level: {risk_level}
-
-Please provide a JSON response with the following structure:
-{{
-    "summary": "A comprehensive 2-3 sentence summary of their retirement readiness for Indian context",
-    "readiness_score": {readiness_percentage},
-    "corpus": {projected_corpus},
-    "confidence_level": "High/Medium/Low based on data quality and time horizon",
-    "key_insights": [
-        "3-5 specific insights about their financial situation in Indian context",
-        "Consider Indian investment options like EPF, PPF, NPS, mutual funds",
-        "Include inflation impact on Indian economy",
-        "Be specific and actionable for Indian salaried professionals"
-    ],
-    "risk_factors": [
-        "List 2-4 main risk factors affecting their retirement plan in India",
-        "Include Indian market risks, inflation risks, and job security risks",
-        "Consider Indian economic factors and regulatory changes"
-    ]
-}}
-
-Focus on Indian context:
-1. Whether they're on track for their retirement goal considering Indian inflation
-2. Key strengths in their current plan (EPF, PPF, mutual funds, etc.)
-3. Main areas of concern or improvement for Indian salaried professionals
-4. Risk factors specific to Indian economy and job market
-5. Overall confidence in their retirement readiness
-6. Consider Indian tax implications and investment options
-7. Mention Indian retirement schemes like EPF, PPF, NPS, and mutual funds
-
-Be specific, professional, and provide actionable insights for Indian salaried professionals. Use Indian financial terminology and consider local economic factors.
-            """
-        )
+        self.api_key = api_key
+        self.llm_client = llm_client or AsyncChatClient(api_key=api_key)
         
-        # Create the LLM chain
-        self.analysis_chain = LLMChain(
-            llm=self.llm,
-            prompt=self.analysis_prompt,
-            output_key="analysis_result"
+        # Analysis prompt (plain str.format template; LangChain wraps it for the sync path)
+        self.analysis_template = template
+        self.input_variables = [
+            "age", "retirement_age", "annual_income", "monthly_expenses", 
+            "current_savings", "monthly_savings", "retirement_goal",
+            "projected_corpus", "readiness_percentage", "risk_level",
+            "years_to_retirement", "shortfall", "surplus"
+        ]
+        
+        # Parsed responses are cached per profile band and prompt version
+        self.response_cache = response_cache or get_llm_response_cache()
+        self.prompt_id = prompt_fingerprint(template)
+    
+    @functools.cached_property
+    def analysis_chain(self):
+        """
+        LangChain LLMChain for analyze_retirement_plan.
+        
+        Built on first use, so langchain is only imported by processes that take
+        the synchronous path; the async variants call the LLM through llm_client.
+        """
+        
+        from langchain.chains import LLMChain
+        from langchain.prompts import PromptTemplate
+        from langchain.chat_models import ChatOpenAI
+        
+        llm = ChatOpenAI(
+            openai_api_key=self.api_key,
+            model_name="gpt-3.5-turbo",
+            temperature=0.3,
+            max_tokens=self.max_tokens,
+            openai_api_base=OPENAI_BASE_URL
         )
+        prompt = PromptTemplate(input_variables=self.input_variables, template=self.analysis_template)
+        return LLMChain(llm=llm, prompt=prompt, output_key="analysis_result")
     
-    def analyze_retirement_plan(self, user_input: UserInput) -> AnalysisResult:
+    def _prepare_input(self, user_input: UserInput):
         """
-        Analyze user's retirement plan and return AI-driven insights.
+        Build the prompt variables for a user.
         
-        Args:
-            user_input: UserInput model with financial data
-            
         Returns:
-            AnalysisResult with AI analysis
+            Tuple of (chain_input, projection, risk_assessment)
         """
         
         # Calculate retirement projection
-        projection = retirement_projection(user_input)
+        projection = cached_retirement_projection(user_input)
         
         # Calculate risk assessment
-        risk_assessment = calculate_risk_score(user_input)
+        risk_assessment = cached_risk_score(user_input)
         
         # Prepare input for the LLM
         chain_input = {
@@ -140,39 +110,180 @@ Be specific, professional, and provide actionable insights for Indian salaried p
             "surplus": projection.surplus
         }
         
+        return chain_input, projection, risk_assessment
+    
+    def _parse_analysis(self, analysis_text: str, projection: RetirementProjection,
+                        risk_assessment: Dict[str, Any]) -> AnalysisResult:
+        """
+        Parse the LLM reply into an AnalysisResult.
+        
+        Args:
+            analysis_text: Raw LLM output
+            projection: Retirement projection data
+            risk_assessment: Risk assessment data
+            
+        Returns:
+            AnalysisResult
+            
+        Raises:
+            ValueError: The reply contains no valid JSON object
+        """
+        
+        # Extract JSON from the response (handle cases where LLM adds extra text)
+        json_start = analysis_text.find('{')
+        json_end = analysis_text.rfind('}') + 1
+        
+        if json_start == -1 or json_end <= json_start:
+            raise ValueError("No JSON object in analysis response")
+        
+        analysis_data = json.loads(analysis_text[json_start:json_end])
+        
+        # Create and return the analysis result
+        return AnalysisResult(
+            summary=analysis_data.get("summary", "Analysis completed successfully."),
+            readiness_score=analysis_data.get("readiness_score", projection.readiness_percentage),
+            corpus=analysis_data.get("corpus", projection.projected_corpus),
+            confidence_level=analysis_data.get("confidence_level", "Medium"),
+            key_insights=analysis_data.get("key_insights", ["Analysis completed"]),
+            risk_factors=analysis_data.get("risk_factors", ["Standard market risks apply"])
+        )
+    
+    def _cached_analysis(self, bands, projection: RetirementProjection):
+        """Cached analysis for the profile band with this user's own score and corpus, or None."""
+        
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.get("analysis", self.prompt_id, bands)
+        if cached is None:
+            return None
+        return AnalysisResult(**{
+            **cached,
+            "readiness_score": projection.readiness_percentage,
+            "corpus": projection.projected_corpus
+        })
+    
+    def _store_analysis(self, bands, analysis: AnalysisResult) -> None:
+        """Store a successfully parsed analysis for the profile band."""
+        
+        if self.response_cache is not None:
+            self.response_cache.set("analysis", self.prompt_id, bands, analysis.model_dump())
+    
+    def analyze_retirement_plan(self, user_input: UserInput, projection_data: Dict[str, Any] = None) -> AnalysisResult:
+        """
+        Analyze user's retirement plan and return AI-driven insights.
+        
+        Args:
+            user_input: UserInput model with financial data
+            projection_data: Accepted for interface parity with the simple chain; the
+                projection is read from the calculation cache
+            
+        Returns:
+            AnalysisResult with AI analysis
+        """
+        
+        chain_input, projection, risk_assessment = self._prepare_input(user_input)
+        bands = profile_bands(user_input, projection, risk_assessment["risk_level"])
+        cached = self._cached_analysis(bands, projection)
+        if cached is not None:
+            return cached
+        
         try:
             # Run the analysis chain
             result = self.analysis_chain(chain_input)
+            analysis = self._parse_analysis(result["analysis_result"], projection, risk_assessment)
+            self._store_analysis(bands, analysis)
+            return analysis
             
-            # Parse the JSON response
-            analysis_text = result["analysis_result"]
-            
-            # Extract JSON from the response (handle cases where LLM adds extra text)
-            json_start = analysis_text.find('{')
-            json_end = analysis_text.rfind('}') + 1
+        except Exception as e:
+            print(f"Error in analysis chain: {e}")
+            # Return fallback analysis
+            return self._create_fallback_analysis(projection, risk_assessment)
+    
+    async def aanalyze_retirement_plan(self, user_input: UserInput, projection_data: Dict[str, Any] = None,
+                                       timeout: float = None) -> AnalysisResult:
+        """
+        Async variant of analyze_retirement_plan that does not block the event loop.
+        
+        The call goes through the shared LLM limiter (concurrency limit and timeout);
+        cancelling the awaiting task cancels the HTTP request.
+        
+        Args:
+            user_input: UserInput model with financial data
+            projection_data: Accepted for interface parity with the simple chain
+            timeout: Per-call timeout in seconds (defaults to LLM_TIMEOUT_SECONDS)
             
-            if json_start != -1 and json_end > json_start:
-                json_str = analysis_text[json_start:json_end]
-                analysis_data = json.loads(json_str)
-            else:
-                # Fallback if JSON parsing fails
-                analysis_data = self._create_fallback_analysis(projection, risk_assessment)
+        Returns:
+            AnalysisResult with AI analysis
             
-            # Create and return the analysis result
-            return AnalysisResult(
-                summary=analysis_data.get("summary", "Analysis completed successfully."),
-                readiness_score=analysis_data.get("readiness_score", projection.readiness_percentage),
-                corpus=analysis_data.get("corpus", projection.projected_corpus),
-                confidence_level=analysis_data.get("confidence_level", "Medium"),
-                key_insights=analysis_data.get("key_insights", ["Analysis completed"]),
-                risk_factors=analysis_data.get("risk_factors", ["Standard market risks apply"])
-            )
+        Raises:
+            asyncio.TimeoutError: The LLM call timed out (callers choose their own fallback)
+        """
+        
+        chain_input, projection, risk_assessment = self._prepare_input(user_input)
+        bands = profile_bands(user_input, projection, risk_assessment["risk_level"])
+        cached = self._cached_analysis(bands, projection)
+        if cached is not None:
+            return cached
+        prompt = self.analysis_template.format(**chain_input)
+        
+        try:
+            analysis_text = await self.llm_client.complete(prompt, temperature=0.3, max_tokens=self.max_tokens, timeout=timeout)
+            analysis = self._parse_analysis(analysis_text, projection, risk_assessment)
+            self._store_analysis(bands, analysis)
+            return analysis
             
+        except asyncio.TimeoutError:
+            raise
         except Exception as e:
             print(f"Error in analysis chain: {e}")
-            # Return fallback analysis
             return self._create_fallback_analysis(projection, risk_assessment)
     
+    async def astream_analysis(self, user_input: UserInput, projection_data: Dict[str, Any] = None,
+                               timeout: float = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of aanalyze_retirement_plan.
+        
+        The reply is streamed token by token; each key insight is yielded as soon as
+        it is complete, and the parsed AnalysisResult comes last.
+        
+        Args:
+            user_input: UserInput model with financial data
+            projection_data: Accepted for interface parity with the simple chain
+            timeout: Timeout in seconds for the whole stream (defaults to LLM_TIMEOUT_SECONDS)
+            
+        Yields:
+            ("token", text) fragments, ("key_insight", text) items, then ("result", AnalysisResult)
+            
+        Raises:
+            asyncio.TimeoutError: The stream timed out (callers choose their own fallback)
+        """
+        
+        chain_input, projection, risk_assessment = self._prepare_input(user_input)
+        bands = profile_bands(user_input, projection, risk_assessment["risk_level"])
+        cached = self._cached_analysis(bands, projection)
+        if cached is not None:
+            for insight in cached.key_insights:
+                yield "key_insight", insight
+            yield "result", cached
+            return
+        prompt = self.analysis_template.format(**chain_input)
+        
+        insights = JSONListStream("key_insights")
+        try:
+            async for token in self.llm_client.stream(prompt, temperature=0.3, max_tokens=self.max_tokens, timeout=timeout):
+                yield "token", token
+                for insight in insights.feed(token):
+                    yield "key_insight", insight
+            analysis = self._parse_analysis(insights.buffer, projection, risk_assessment)
+            self._store_analysis(bands, analysis)
+            
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error in analysis chain: {e}")
+            analysis = self._create_fallback_analysis(projection, risk_assessment)
+        yield "result", analysis
+    
     def _create_fallback_analysis(self, projection: RetirementProjection, 
                                  risk_assessment: Dict[str, Any]) -> AnalysisResult:
         """
@@ -183,7 +294,7 @@ Be specific, professional, and provide actionable insights for Indian salaried p
             risk_assessment: Risk assessment data
             
         Returns:
-            AnalysisResult with basic analysis
+            AnalysisResult with basic analysis, marked as a fallback so it is not cached
         """
         
         # Determine readiness status
@@ -218,7 +329,7 @@ Be specific, professional, and provide actionable insights for Indian salaried p
         # Add risk factors
         risk_factors = risk_assessment.get("risk_factors", ["Standard market risks apply"])
         
-        return AnalysisResult(
+        analysis = AnalysisResult(
             summary=summary,
             readiness_score=projection.readiness_percentage,
             corpus=projection.projected_corpus,
@@ -226,16 +337,23 @@ Be specific, professional, and provide actionable insights for Indian salaried p
             key_insights=insights,
             risk_factors=risk_factors
         )
+        analysis._fallback = True
+        return analysis
 
 
-def create_analysis_chain(openai_api_key: str = None) -> RetirementAnalysisChain:
+def create_analysis_chain(openai_api_key: str = None, llm_client: AsyncChatClient = None,
+                          response_cache: LLMResponseCache = None,
+                          prompt_variant: str = LLM_PROMPT_VARIANT) -> RetirementAnalysisChain:
     """
     Factory function to create an analysis chain.
     
     Args:
         openai_api_key: OpenAI API key (optional)
+        llm_client: Async client for the async variant (optional)
+        response_cache: Persistent response cache (optional)
+        prompt_variant: "full" or "compact" prompt (optional)
         
     Returns:
         RetirementAnalysisChain instance
     """
-    return RetirementAnalysisChain(openai_api_key)
+    return RetirementAnalysisChain(openai_api_key, llm_client, response_cache, prompt_variant)
@@ -0,0 +1,530 @@
+"""
+Non-blocking client for OpenAI-compatible chat completion APIs.
+
+Calls go through httpx.AsyncClient, so a slow completion never stalls the event
+loop. An LLMLimiter caps the number of concurrent calls per process, applies a
+per-call timeout and propagates cancellation: a cancelled request (for example a
+client disconnect) aborts its in-flight HTTP call and frees its slot.
+
+Every call counts its prompt and completion tokens (server-reported usage, or
+utils.tokens.count_tokens for streamed replies). Counts are summed per client,
+per usage scope (see track_usage; the pipeline opens one per stage) and in a
+TokenBudget that rejects calls once LLM_TOKENS_PER_MINUTE would be exceeded.
+
+AsyncChatClient.stream yields the reply token by token (server-sent events with
+"stream": true), and JSONListStream pulls complete items out of a JSON list while
+the reply is still arriving, so callers can forward them progressively.
+
+Set OPENAI_BASE_URL to point the client at any OpenAI-compatible server, such as
+fake_openai_server.py for local testing.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import threading
+import contextlib
+import contextvars
+from collections import deque
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from utils.tokens import count_tokens
+from utils.metrics import metrics
+
+if TYPE_CHECKING:
+    # Imported on first use (AsyncChatClient._http) so processes without LLM chains never load it
+    import httpx
+
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+
+# Weight of the newest call in the limiter's moving average of LLM latency
+LLM_LATENCY_EWMA_ALPHA = 0.2
+
+
+class LLMLimiter:
+    """
+    Concurrency limit and timeout for LLM calls, shared by every chain in the process.
+    """
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, timeout_seconds: float = LLM_TIMEOUT_SECONDS):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrency: Maximum number of LLM calls in flight at once
+            timeout_seconds: Default per-call timeout, including time spent waiting for a slot
+        """
+
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.in_flight = 0
+        self.waiting = 0
+        self.timeouts = 0
+        # Moving average of the time calls hold a slot, and when the last one finished (monotonic)
+        self.latency_ewma: Optional[float] = None
+        self.last_completed = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _slots(self) -> asyncio.Semaphore:
+        """Semaphore for the running event loop (recreated if the loop changes)."""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, call: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """
+        Run an LLM call once a slot is free.
+
+        Args:
+            call: Zero-argument coroutine function making the call
+            timeout: Seconds before the call is cancelled (defaults to timeout_seconds)
+
+        Returns:
+            The call's result
+
+        Raises:
+            asyncio.TimeoutError: The call (or the wait for a slot) took too long
+        """
+
+        async def limited():
+            async with self.slot():
+                return await call()
+
+        return await self.within(limited(), timeout if timeout is not None else self.timeout_seconds)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None):
+        """
+        Hold one concurrency slot for the duration of the block (e.g. a streamed reply).
+
+        Args:
+            timeout: Seconds to wait for a free slot (None waits indefinitely)
+
+        Raises:
+            asyncio.TimeoutError: No slot became free in time
+        """
+
+        slots = self._slots()
+        self.waiting += 1
+        try:
+            await self.within(slots.acquire(), timeout)
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            slots.release()
+            self._observe_latency(time.monotonic() - started)
+
+    def _observe_latency(self, elapsed: float) -> None:
+        """Fold one call's latency into the moving average."""
+
+        if self.latency_ewma is None:
+            self.latency_ewma = elapsed
+        else:
+            self.latency_ewma += LLM_LATENCY_EWMA_ALPHA * (elapsed - self.latency_ewma)
+        self.last_completed = time.monotonic()
+
+    async def within(self, awaitable: Awaitable[Any], timeout: Optional[float]) -> Any:
+        """Await with a timeout, counting timeouts in the limiter's stats."""
+
+        if timeout is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load and timeout counter."""
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout_seconds,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "timeouts": self.timeouts,
+            "latency_seconds": round(self.latency_ewma, 4) if self.latency_ewma is not None else None
+        }
+
+
+# Shared by all chains in the process
+llm_limiter = LLMLimiter()
+metrics.callback("finai_llm_in_flight", "LLM calls currently in flight", lambda: {(): llm_limiter.in_flight})
+metrics.callback("finai_llm_waiting", "LLM calls waiting for a concurrency slot", lambda: {(): llm_limiter.waiting})
+metrics.callback("finai_llm_timeouts_total", "LLM calls that timed out", lambda: {(): llm_limiter.timeouts}, kind="counter")
+
+
+class TokenBudgetExceeded(RuntimeError):
+    """The call would exceed the per-minute token budget."""
+
+
+class TokenBudget:
+    """
+    Sliding one-minute token budget shared by every LLM call in the process.
+
+    A call reserves its prompt tokens plus max_tokens before it is sent and
+    settles the reservation with the actual usage afterwards.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, tokens_per_minute: int = LLM_TOKENS_PER_MINUTE):
+        """
+        Initialize the budget.
+
+        Args:
+            tokens_per_minute: Tokens allowed in any 60-second window (0 disables the limit)
+        """
+
+        self.tokens_per_minute = tokens_per_minute
+        self.rejected = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._window: "deque[List[float]]" = deque()
+        self._lock = threading.Lock()
+
+    def _used(self, now: float) -> int:
+        while self._window and now - self._window[0][0] > self.WINDOW_SECONDS:
+            self._window.popleft()
+        return int(sum(tokens for _, tokens in self._window))
+
+    def reserve(self, tokens: int) -> List[float]:
+        """
+        Reserve tokens for a call.
+
+        Args:
+            tokens: Prompt tokens plus the completion limit
+
+        Returns:
+            Reservation to pass to settle()
+
+        Raises:
+            TokenBudgetExceeded: The reservation does not fit in the current window
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            if self.tokens_per_minute and self._used(now) + tokens > self.tokens_per_minute:
+                self.rejected += 1
+                raise TokenBudgetExceeded(
+                    f"LLM token budget of {self.tokens_per_minute}/min exhausted ({tokens} tokens requested)"
+                )
+            reservation = [now, tokens]
+            self._window.append(reservation)
+            return reservation
+
+    def settle(self, reservation: List[float], prompt_tokens: int, completion_tokens: int) -> None:
+        """Replace a reservation with the tokens the call actually used."""
+
+        with self._lock:
+            reservation[1] = prompt_tokens + completion_tokens
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """Budget, usage in the current window and totals."""
+
+        with self._lock:
+            return {
+                "tokens_per_minute": self.tokens_per_minute,
+                "used_last_minute": self._used(time.monotonic()),
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "rejected": self.rejected
+            }
+
+
+# Shared by all chains in the process
+llm_token_budget = TokenBudget()
+metrics.callback("finai_llm_tokens_total", "LLM tokens used, by kind (prompt or completion)", lambda: {
+    ("prompt",): llm_token_budget.prompt_tokens, ("completion",): llm_token_budget.completion_tokens
+}, ("kind",), "counter")
+metrics.callback("finai_llm_budget_rejections_total", "LLM calls rejected by the per-minute token budget",
+                 lambda: {(): llm_token_budget.rejected}, kind="counter")
+
+# Usage counters of the innermost track_usage() block, if any
+_usage_scopes: contextvars.ContextVar[Tuple[Dict[str, int], ...]] = contextvars.ContextVar("llm_usage_scopes", default=())
+
+
+@contextlib.contextmanager
+def track_usage():
+    """
+    Count the LLM calls and tokens made inside the block (in this task and tasks it starts).
+
+    Blocks nest: a call is counted in every enclosing block.
+
+    Yields:
+        Dictionary with calls, prompt_tokens and completion_tokens, updated as calls complete
+    """
+
+    usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    token = _usage_scopes.set(_usage_scopes.get() + (usage,))
+    try:
+        yield usage
+    finally:
+        _usage_scopes.reset(token)
+
+
+class AsyncChatClient:
+    """
+    Minimal async client for the /chat/completions endpoint.
+    """
+
+    def __init__(self, api_key: str = None, base_url: str = None, model: str = OPENAI_MODEL,
+                 limiter: LLMLimiter = None, transport: "httpx.AsyncBaseTransport" = None,
+                 token_budget: TokenBudget = None):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: API key (defaults to OPENAI_API_KEY)
+            base_url: API base URL (defaults to OPENAI_BASE_URL)
+            model: Chat model name
+            limiter: Concurrency limiter (defaults to the shared llm_limiter)
+            transport: Optional httpx transport (e.g. httpx.ASGITransport for an in-process fake server)
+            token_budget: Per-minute token budget (defaults to the shared llm_token_budget)
+        """
+
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY", "")
+        self.base_url = (base_url or OPENAI_BASE_URL).rstrip("/")
+        self.model = model
+        self.limiter = limiter or llm_limiter
+        self.transport = transport
+        self.token_budget = token_budget or llm_token_budget
+        # Token usage summed over completed calls
+        self.usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _http(self) -> "httpx.AsyncClient":
+        """Pooled HTTP client for the running event loop."""
+
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                transport=self.transport,
+                timeout=None  # the limiter owns the timeout
+            )
+            self._loop = loop
+        return self._client
+
+    async def complete(self, prompt: str, temperature: float = 0.3, max_tokens: int = 1000,
+                       timeout: Optional[float] = None) -> str:
+        """
+        Send a single-message chat completion and return the reply text.
+
+        Args:
+            prompt: User message
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in the reply
+            timeout: Per-call timeout in seconds (defaults to the limiter's)
+
+        Returns:
+            Content of the first choice
+
+        Raises:
+            asyncio.TimeoutError: The call timed out
+            TokenBudgetExceeded: The call would exceed the per-minute token budget
+            httpx.HTTPError: The server returned an error status or could not be reached
+        """
+
+        prompt_tokens = count_tokens(prompt, self.model)
+        reservation = self.token_budget.reserve(prompt_tokens + max_tokens)
+        completion_tokens = 0
+
+        async def call():
+            nonlocal prompt_tokens, completion_tokens
+            response = await self._http().post("/chat/completions", json={
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            })
+            response.raise_for_status()
+            body = response.json()
+            content = body["choices"][0]["message"]["content"]
+            usage = body.get("usage") or {}
+            prompt_tokens = usage.get("prompt_tokens", prompt_tokens)
+            completion_tokens = usage.get("completion_tokens") or count_tokens(content, self.model)
+            return content
+
+        try:
+            return await self.limiter.run(call, timeout)
+        finally:
+            self._record_usage(reservation, prompt_tokens, completion_tokens)
+
+    def _record_usage(self, reservation: List[float], prompt_tokens: int, completion_tokens: int) -> None:
+        """Add one call's tokens to the client, the current usage scope and the token budget."""
+
+        self.token_budget.settle(reservation, prompt_tokens, completion_tokens)
+        for usage in (self.usage,) + _usage_scopes.get():
+            usage["calls"] += 1
+            usage["prompt_tokens"] += prompt_tokens
+            usage["completion_tokens"] += completion_tokens
+
+    async def stream(self, prompt: str, temperature: float = 0.3, max_tokens: int = 1000,
+                     timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Stream a single-message chat completion, yielding content deltas as they arrive.
+
+        The whole stream shares one deadline and holds one limiter slot until it ends
+        or the consumer stops iterating.
+
+        Args:
+            prompt: User message
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in the reply
+            timeout: Seconds for the whole stream (defaults to the limiter's)
+
+        Yields:
+            Reply text fragments, in order
+
+        Raises:
+            asyncio.TimeoutError: The stream did not finish before the deadline
+            TokenBudgetExceeded: The call would exceed the per-minute token budget
+            httpx.HTTPError: The server returned an error status or could not be reached
+        """
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout if timeout is not None else self.limiter.timeout_seconds)
+
+        def remaining() -> float:
+            return max(deadline - loop.time(), 0.0)
+
+        prompt_tokens = count_tokens(prompt, self.model)
+        reservation = self.token_budget.reserve(prompt_tokens + max_tokens)
+        reply: List[str] = []
+        try:
+            async with contextlib.aclosing(self._stream(prompt, temperature, max_tokens, remaining)) as deltas:
+                async for content in deltas:
+                    reply.append(content)
+                    yield content
+        finally:
+            self._record_usage(reservation, prompt_tokens, count_tokens("".join(reply), self.model) if reply else 0)
+
+    async def _stream(self, prompt: str, temperature: float, max_tokens: int,
+                      remaining: Callable[[], float]) -> AsyncIterator[str]:
+        """Content deltas of a streamed completion; remaining() gives the seconds left."""
+
+        async with self.limiter.slot(remaining()):
+            http = self._http()
+            request = http.build_request("POST", "/chat/completions", json={
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True
+            })
+            response = await self.limiter.within(http.send(request, stream=True), remaining())
+            try:
+                response.raise_for_status()
+                lines = response.aiter_lines()
+                while True:
+                    line = await self.limiter.within(anext(lines, None), remaining())
+                    if line is None:
+                        break
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    content = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                    if content:
+                        yield content
+            finally:
+                await response.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class JSONListStream:
+    """
+    Incrementally extract the items of one JSON list field from streamed text.
+
+    Feed reply fragments as they arrive; each call returns the list items that
+    became complete. Text before the field (and any prose around the JSON) is
+    ignored, so it works on partial model output.
+    """
+
+    _SEPARATORS = " \t\r\n,"
+
+    def __init__(self, field: str):
+        """
+        Initialize the extractor.
+
+        Args:
+            field: Name of the list field, e.g. "key_insights" or "strategies"
+        """
+
+        self.field = field
+        self.buffer = ""
+        self.done = False
+        self._pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(field))
+        self._decoder = json.JSONDecoder()
+        self._pos: Optional[int] = None
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Append a fragment and return the list items completed by it.
+
+        Args:
+            text: Next fragment of the reply
+
+        Returns:
+            Newly completed items (decoded JSON values), in order
+        """
+
+        self.buffer += text
+        items: List[Any] = []
+        if self.done:
+            return items
+
+        if self._pos is None:
+            match = self._pattern.search(self.buffer)
+            if match is None:
+                return items
+            self._pos = match.end()
+
+        buffer = self.buffer
+        while True:
+            start = self._pos
+            while start < len(buffer) and buffer[start] in self._SEPARATORS:
+                start += 1
+            if start >= len(buffer):
+                break
+            if buffer[start] == "]":
+                self.done = True
+                break
+            try:
+                item, end = self._decoder.raw_decode(buffer, start)
+            except ValueError:
+                break  # item still incomplete
+            if end >= len(buffer):
+                break  # a number may still be growing; wait for the delimiter
+            items.append(item)
+            self._pos = end
+        return items
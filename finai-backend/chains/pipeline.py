@@ -0,0 +1,639 @@
+"""
+Single-pass analysis pipeline shared by /analyze, /suggestions and /simulate.
+
+A PipelineRun computes each stage (projection, risk, analysis, strategies, ...) at
+most once per request and looks every stage up in the shared calculation_cache first,
+keyed by the canonical UserInput fingerprint. A /suggestions call that follows an
+/analyze call for the same profile therefore reuses the analysis and strategies
+instead of running the chains again. Every stage is timed on its own.
+
+Async handlers use PipelineRun.acompute: chains with async variants
+(aanalyze_retirement_plan / agenerate_strategies) are awaited without blocking the
+event loop while the deterministic stages run in a worker thread alongside them.
+
+With a latency budget (LLM_LATENCY_BUDGET_SECONDS), acompute waits at most that
+long for LLM-backed chains. On overrun the run is answered with the rule-based
+Simple chains and marked partial, while the LLM call keeps running in the
+background and fills the cache for the next request on the same profile.
+
+A run created with a degraded admission decision (see chains.admission) never
+calls the LLM chains: its chain stages come from the cache when an LLM result is
+already there, and from the rule-based chains otherwise.
+
+PipelineRun.astream yields the same stages as server-sent-event style
+(event, data) pairs: the deterministic projection and risk assessment first, then
+key insights and strategies one by one as the chains produce them.
+"""
+
+import os
+import asyncio
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Sequence, Tuple
+from models.user_input import UserInput, AnalysisResult, StrategyResponse, RetirementProjection
+from utils.formulas import retirement_projection, calculate_risk_score
+from chains.llm_client import track_usage
+from chains.admission import is_degraded
+from utils.cache import LRUCache, calculation_cache, fingerprint
+from utils.metrics import observe_stage
+from utils.profiling import mark_stage
+from utils.cohort import calculate_cohort_risk_score
+from utils.timeline import timeline_chart_data
+from utils.decumulation import decumulation_plan
+from utils.instruments import multi_bucket_projection
+from chains.simple_analysis import SimpleRetirementAnalysis
+from chains.simple_strategy import SimpleRetirementStrategy
+
+
+_MISSING = object()
+
+STAGES = (
+    "projection", "risk", "cohort_risk", "analysis", "strategies",
+    "timeline", "retirement_income", "instruments"
+)
+
+# Stages produced by the chains (possibly via an LLM)
+CHAIN_STAGES = ("analysis", "strategies")
+
+# Seconds an async handler waits for LLM-backed chains before answering rule-based (0 disables)
+LLM_LATENCY_BUDGET_SECONDS = float(os.getenv("LLM_LATENCY_BUDGET_SECONDS", "5"))
+
+
+def fallback_analysis(projection: RetirementProjection) -> AnalysisResult:
+    """Basic analysis used when no analysis chain is available or it fails."""
+
+    return AnalysisResult(
+        summary=f"Your retirement readiness is {projection.readiness_percentage:.1f}%",
+        readiness_score=projection.readiness_percentage,
+        corpus=projection.projected_corpus,
+        confidence_level="Medium",
+        key_insights=["Basic analysis completed"],
+        risk_factors=["Standard market risks apply"]
+    )
+
+
+def fallback_strategies() -> StrategyResponse:
+    """Empty strategy response used when no strategy chain is available or it fails."""
+
+    return StrategyResponse(strategies=[], overall_priority="Medium", implementation_order=[])
+
+
+class PipelineRun:
+    """
+    Request-scoped view of the pipeline for one UserInput.
+
+    Stage results are memoized on the instance (request scope) and in the
+    pipeline's cache (cross-request scope). Results come from shared caches, so
+    treat them as read-only.
+    """
+
+    def __init__(self, pipeline: "AnalysisPipeline", user_input: UserInput, admission: Optional[str] = None):
+        """
+        Initialize the run.
+
+        Args:
+            pipeline: Owning AnalysisPipeline
+            user_input: UserInput model containing all financial parameters
+            admission: Admission decision for the chain stages (a degraded_* one keeps them rule-based)
+        """
+
+        self.pipeline = pipeline
+        self.user_input = user_input
+        self.admission = admission
+        self.key = fingerprint(user_input)
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self.cache_hits: Dict[str, bool] = {}
+        # LLM calls and tokens per chain stage (only stages that called an LLM)
+        self.tokens: Dict[str, Dict[str, int]] = {}
+        # True when the latency budget ran out and chain stages are rule-based
+        self.partial = False
+        # Chain call still finishing in the background after the budget ran out
+        self.backfill_task: Optional[asyncio.Task] = None
+
+    @property
+    def degraded(self) -> bool:
+        """Whether admission control sent the chain stages to the rule-based chains."""
+
+        return is_degraded(self.admission)
+
+    def _stage(self, stage: str, compute: Callable[[], Tuple[Any, bool]], variant: Any = None) -> Any:
+        """
+        Return a stage result, computing it at most once.
+
+        Args:
+            stage: Stage name
+            compute: Returns (value, cacheable); fallbacks are not cached across requests
+            variant: Extra cache-key part (e.g. which chain produced the result)
+        """
+
+        if stage in self.results:
+            return self.results[stage]
+
+        start = time.perf_counter()
+        cache_key = self._cache_key(stage, variant)
+        value = self.pipeline.cache.get(cache_key, _MISSING)
+        hit = value is not _MISSING
+        if not hit:
+            value, cacheable = compute()
+            if cacheable:
+                self.pipeline.cache.set(cache_key, value)
+        return self._finish(stage, value, start, hit)
+
+    async def _astage(self, stage: str, compute: Callable[[], Awaitable[Tuple[Any, bool]]], variant: Any = None) -> Any:
+        """Async counterpart of _stage for stages that await a chain."""
+
+        if stage in self.results:
+            return self.results[stage]
+
+        start = time.perf_counter()
+        cache_key = self._cache_key(stage, variant)
+        value = self.pipeline.cache.get(cache_key, _MISSING)
+        hit = value is not _MISSING
+        with track_usage() as usage:
+            if not hit:
+                value, cacheable = await compute()
+                if cacheable:
+                    self.pipeline.cache.set(cache_key, value)
+        return self._finish(stage, value, start, hit, usage)
+
+    def _cache_key(self, stage: str, variant: Any) -> Tuple:
+        # Variant-free keys match cached_retirement_projection/cached_risk_score
+        return (stage, self.key) if variant is None else (stage, variant, self.key)
+
+    def _finish(self, stage: str, value: Any, start: float, hit: bool, usage: Optional[Dict[str, int]] = None) -> Any:
+        """Record a computed or cached stage result, with the LLM usage of computing it."""
+
+        elapsed = time.perf_counter() - start
+        self.results[stage] = value
+        self.timings[stage] = elapsed
+        self.cache_hits[stage] = hit
+        if usage and usage["calls"]:
+            self.tokens[stage] = usage
+        self.pipeline.record(stage, elapsed, hit, usage)
+        mark_stage(stage, start, elapsed)
+        return value
+
+    @property
+    def projection(self) -> RetirementProjection:
+        return self._stage("projection", lambda: (retirement_projection(self.user_input), True))
+
+    @property
+    def risk(self) -> Dict[str, Any]:
+        return self._stage("risk", lambda: (calculate_risk_score(self.user_input), True))
+
+    @property
+    def cohort_risk(self) -> Dict[str, Any]:
+        return self._stage("cohort_risk", lambda: (
+            calculate_cohort_risk_score(self.user_input, self.projection, self.risk), True
+        ))
+
+    @property
+    def projection_data(self) -> Dict[str, Any]:
+        """Projection summary passed to the chains."""
+
+        projection = self.projection
+        return {
+            "readiness_percentage": projection.readiness_percentage,
+            "projected_corpus": projection.projected_corpus,
+            "instrument_corpus": projection.instrument_corpus,
+            "retirement_goal": projection.retirement_goal,
+            "shortfall": projection.shortfall,
+            "surplus": projection.surplus,
+            "years_to_retirement": projection.years_to_retirement
+        }
+
+    @property
+    def analysis(self) -> AnalysisResult:
+        chain = self.pipeline.analysis_chain
+
+        def compute():
+            if chain is None:
+                return fallback_analysis(self.projection), True
+            try:
+                return _chain_result(chain.analyze_retirement_plan(self.user_input, self.projection_data))
+            except Exception as e:
+                print(f"AI analysis failed: {e}")
+                return fallback_analysis(self.projection), False
+
+        return self._stage("analysis", compute, _chain_name(chain))
+
+    @property
+    def strategies(self) -> StrategyResponse:
+        chain = self.pipeline.strategy_chain
+
+        def compute():
+            if chain is None:
+                return fallback_strategies(), True
+            try:
+                return _chain_result(chain.generate_strategies(self.user_input, self.analysis, self.projection_data))
+            except Exception as e:
+                print(f"Strategy generation failed: {e}")
+                return fallback_strategies(), False
+
+        return self._stage("strategies", compute, (_chain_name(self.pipeline.analysis_chain), _chain_name(chain)))
+
+    async def aanalysis(self) -> AnalysisResult:
+        """Analysis stage, awaiting the chain's async variant when it has one."""
+
+        chain = self.pipeline.analysis_chain
+
+        async def compute():
+            if chain is None:
+                return fallback_analysis(self.projection), True
+            try:
+                if hasattr(chain, "aanalyze_retirement_plan"):
+                    return _chain_result(await chain.aanalyze_retirement_plan(self.user_input, self.projection_data))
+                return _chain_result(chain.analyze_retirement_plan(self.user_input, self.projection_data))
+            except Exception as e:
+                print(f"AI analysis failed: {e!r}")
+                return fallback_analysis(self.projection), False
+
+        return await self._astage("analysis", compute, _chain_name(chain))
+
+    async def astrategies(self) -> StrategyResponse:
+        """Strategies stage (and the analysis it needs), awaiting async chain variants."""
+
+        chain = self.pipeline.strategy_chain
+
+        async def compute():
+            analysis = await self.aanalysis()
+            if chain is None:
+                return fallback_strategies(), True
+            try:
+                if hasattr(chain, "agenerate_strategies"):
+                    return _chain_result(await chain.agenerate_strategies(self.user_input, analysis, self.projection_data))
+                return _chain_result(chain.generate_strategies(self.user_input, analysis, self.projection_data))
+            except Exception as e:
+                print(f"Strategy generation failed: {e!r}")
+                return fallback_strategies(), False
+
+        return await self._astage("strategies", compute, (_chain_name(self.pipeline.analysis_chain), _chain_name(chain)))
+
+    async def acompute(self, stages: Sequence[str]) -> "PipelineRun":
+        """
+        Compute the given stages for an async handler.
+
+        When a chain has async variants, its stages are awaited on the event loop
+        while the deterministic stages run concurrently in a worker thread.
+        Cancelling the caller cancels the pending chain call. If the chains miss
+        the pipeline's latency budget, their stages are answered rule-based and
+        the run is marked partial.
+
+        Args:
+            stages: Stage names from STAGES
+
+        Returns:
+            self, with every requested stage available as an attribute
+        """
+
+        # The chains' prompts need the projection, so compute it first (it is cheap)
+        self.projection
+        deterministic = [stage for stage in stages if stage not in CHAIN_STAGES]
+
+        def compute_deterministic():
+            for stage in deterministic:
+                getattr(self, stage)
+
+        if "strategies" in stages:
+            last_stage = "strategies"
+        elif "analysis" in stages:
+            last_stage = "analysis"
+        else:
+            compute_deterministic()
+            return self
+
+        if self.degraded:
+            self._degrade(last_stage)
+            compute_deterministic()
+            return self
+
+        if not self.pipeline.has_async_chains():
+            # Rule-based chains are CPU-only; a thread hop would only add overhead
+            await (self.astrategies() if last_stage == "strategies" else self.aanalysis())
+            compute_deterministic()
+            return self
+
+        if self.pipeline.latency_budget:
+            chain_stages = self._abudgeted(last_stage)
+        else:
+            chain_stages = self.astrategies() if last_stage == "strategies" else self.aanalysis()
+        await asyncio.gather(chain_stages, asyncio.to_thread(compute_deterministic))
+        return self
+
+    async def _abudgeted(self, last_stage: str) -> None:
+        """
+        Run the chain stages up to last_stage within the pipeline's latency budget.
+
+        The chains run on a separate background run so that, when the budget runs
+        out, they can finish (and populate the shared cache) after this request has
+        been answered with rule-based results. Cancelling the caller still cancels
+        the chain call.
+        """
+
+        background = self.pipeline.run(self.user_input)
+
+        async def run_chains():
+            if last_stage == "strategies":
+                await background.astrategies()
+            # Cached strategies skip the analysis stage, so a missing analysis is computed within the budget too
+            await background.aanalysis()
+
+        task = asyncio.create_task(run_chains())
+        try:
+            await asyncio.wait_for(asyncio.shield(task), self.pipeline.latency_budget)
+        except asyncio.TimeoutError:
+            self.pipeline.backfill(task)
+            self.backfill_task = task
+            self.partial = True
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+        # Adopt whatever the chains finished in time; the rest is rule-based
+        for stage in CHAIN_STAGES[:CHAIN_STAGES.index(last_stage) + 1]:
+            if stage in background.results:
+                self.results[stage] = background.results[stage]
+                self.timings[stage] = background.timings[stage]
+                self.cache_hits[stage] = background.cache_hits[stage]
+                if stage in background.tokens:
+                    self.tokens[stage] = background.tokens[stage]
+            else:
+                self._rule_based(stage)
+
+    def _degrade(self, last_stage: str) -> None:
+        """Answer the chain stages up to last_stage without calling the chains: cached LLM results, else rule-based."""
+
+        for stage, variant in zip(CHAIN_STAGES[:CHAIN_STAGES.index(last_stage) + 1], self._chain_variants()):
+            if stage in self.results:
+                continue
+            start = time.perf_counter()
+            value = self.pipeline.cache.get(self._cache_key(stage, variant), _MISSING)
+            if value is not _MISSING:
+                self._finish(stage, value, start, True)
+            else:
+                self._rule_based(stage)
+
+    def _chain_variants(self) -> Tuple[Any, Any]:
+        """Cache-key variants of the analysis and strategies stages for the pipeline's chains."""
+
+        analysis_name = _chain_name(self.pipeline.analysis_chain)
+        return analysis_name, (analysis_name, _chain_name(self.pipeline.strategy_chain))
+
+    def _rule_based(self, stage: str) -> Any:
+        """Compute a chain stage with the pipeline's rule-based chains."""
+
+        if stage == "analysis":
+            chain = self.pipeline.rule_based_analysis
+            compute = lambda: (chain.analyze_retirement_plan(self.user_input, self.projection_data), True)
+        else:
+            chain = self.pipeline.rule_based_strategy
+            compute = lambda: (chain.generate_strategies(self.user_input, self.results["analysis"], self.projection_data), True)
+        return self._stage(stage, compute, ("rule_based", _chain_name(chain)))
+
+    async def _astream_stage(self, stage: str, variant: Any, stream: Optional[Callable[[], AsyncIterator]],
+                             fallback: Callable[[], Any], compute_stage: Callable[[], Awaitable[Any]],
+                             item_event: str, items: Callable[[Any], Iterable[Any]]) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run a chain stage, yielding its progress events.
+
+        Args:
+            stage: Stage name
+            variant: Cache-key variant (as in aanalysis/astrategies)
+            stream: Opens the chain's streaming variant, or None if it has none
+            fallback: Builds the fallback result if the stream fails (not cached)
+            compute_stage: Non-streaming stage coroutine (aanalysis/astrategies)
+            item_event: Event name for each list item
+            items: Items of a finished result, emitted when they were not streamed
+        """
+
+        streamed = False
+        if stream is not None and stage not in self.results:
+            start = time.perf_counter()
+            cache_key = self._cache_key(stage, variant)
+            value = self.pipeline.cache.get(cache_key, _MISSING)
+            hit = value is not _MISSING
+            usage = None
+            if not hit:
+                with track_usage() as usage:
+                    try:
+                        async for kind, data in stream():
+                            if kind == "result":
+                                value = data
+                                continue
+                            streamed = streamed or kind == item_event
+                            yield ("token", {"stage": stage, "text": data}) if kind == "token" else (kind, data)
+                        value, cacheable = _chain_result(value)
+                    except Exception as e:
+                        print(f"Streaming {stage} failed: {e!r}")
+                        value, cacheable = fallback(), False
+                if cacheable:
+                    self.pipeline.cache.set(cache_key, value)
+            self._finish(stage, value, start, hit, usage)
+
+        value = await compute_stage()
+        if not streamed:
+            for item in items(value):
+                yield item_event, item
+
+    async def astream(self) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Compute every /analyze stage, yielding (event, data) pairs as results become available.
+
+        Events, in order: projection, risk_assessment, token/key_insight..., analysis,
+        token/strategy..., strategies, timeline, retirement_income,
+        instrument_projection, done. Streaming chains (astream_analysis /
+        astream_strategies) produce token and item events live; other chains emit
+        the items once their stage completes. The analysis and strategies events
+        carry the authoritative results.
+        """
+
+        yield "projection", self.projection.model_dump()
+        yield "risk_assessment", self.cohort_risk
+
+        if self.degraded:
+            # Chain stages are already final, so they are emitted as items rather than streamed
+            self._degrade("strategies")
+
+        deterministic = ("timeline", "retirement_income", "instruments")
+
+        def compute_deterministic():
+            for stage in deterministic:
+                getattr(self, stage)
+
+        # Overlap the remaining deterministic stages with LLM calls
+        background = asyncio.create_task(asyncio.to_thread(compute_deterministic)) if self.pipeline.has_async_chains() else None
+        try:
+            analysis_chain = self.pipeline.analysis_chain
+            async for event in self._astream_stage(
+                "analysis", _chain_name(analysis_chain),
+                (lambda: analysis_chain.astream_analysis(self.user_input, self.projection_data))
+                if hasattr(analysis_chain, "astream_analysis") else None,
+                lambda: fallback_analysis(self.projection), self.aanalysis,
+                "key_insight", lambda analysis: analysis.key_insights
+            ):
+                yield event
+            yield "analysis", self.analysis.model_dump()
+
+            strategy_chain = self.pipeline.strategy_chain
+            async for event in self._astream_stage(
+                "strategies", (_chain_name(analysis_chain), _chain_name(strategy_chain)),
+                (lambda: strategy_chain.astream_strategies(self.user_input, self.analysis, self.projection_data))
+                if hasattr(strategy_chain, "astream_strategies") else None,
+                fallback_strategies, self.astrategies,
+                "strategy", lambda response: [strategy.model_dump() for strategy in response.strategies]
+            ):
+                yield event
+            strategies = self.strategies
+            yield "strategies", {
+                "strategies": [strategy.model_dump() for strategy in strategies.strategies],
+                "overall_priority": strategies.overall_priority,
+                "implementation_order": strategies.implementation_order
+            }
+
+            if background is not None:
+                await background
+            else:
+                compute_deterministic()
+        finally:
+            if background is not None and not background.done():
+                background.cancel()
+
+        yield "timeline", self.timeline
+        yield "retirement_income", self.retirement_income
+        yield "instrument_projection", self.instruments
+        yield "done", {
+            "ai_enabled": "degraded" if self.degraded else self.pipeline.analysis_chain is not None,
+            "admission": self.admission,
+            "server_timing": self.server_timing()
+        }
+
+    @property
+    def timeline(self) -> Dict[str, list]:
+        return self._stage("timeline", lambda: (timeline_chart_data(self.user_input), True))
+
+    @property
+    def retirement_income(self) -> Dict[str, Any]:
+        return self._stage("retirement_income", lambda: (decumulation_plan(self.user_input, self.projection), True))
+
+    @property
+    def instruments(self) -> Dict[str, Any]:
+        return self._stage("instruments", lambda: (multi_bucket_projection(self.user_input), True))
+
+    def server_timing(self, prefix: str = "") -> str:
+        """Stage timings formatted for a Server-Timing response header."""
+
+        entries = [
+            f'{prefix}{stage};dur={elapsed * 1000:.3f};desc="{"cache" if self.cache_hits[stage] else "computed"}"'
+            for stage, elapsed in self.timings.items()
+        ]
+        entries.extend(
+            f'{prefix}{stage}_tokens;desc="prompt={usage["prompt_tokens"]} completion={usage["completion_tokens"]}"'
+            for stage, usage in self.tokens.items()
+        )
+        return ", ".join(entries)
+
+
+class AnalysisPipeline:
+    """
+    Owns the chains and the cross-request cache, and aggregates per-stage timings.
+    """
+
+    def __init__(self, analysis_chain=None, strategy_chain=None, cache: LRUCache = calculation_cache,
+                 latency_budget: float = LLM_LATENCY_BUDGET_SECONDS):
+        """
+        Initialize the pipeline.
+
+        Args:
+            analysis_chain: Chain with analyze_retirement_plan(user_input, projection_data), or None
+            strategy_chain: Chain with generate_strategies(user_input, analysis, projection_data), or None
+            cache: Cross-request cache for stage results
+            latency_budget: Seconds acompute waits for async chains before answering rule-based (0 disables)
+        """
+
+        self.analysis_chain = analysis_chain
+        self.strategy_chain = strategy_chain
+        self.cache = cache
+        self.latency_budget = latency_budget
+        self.rule_based_analysis = SimpleRetirementAnalysis()
+        self.rule_based_strategy = SimpleRetirementStrategy()
+        self._lock = threading.Lock()
+        self._stage_stats: Dict[str, Dict[str, float]] = {}
+        self._backfills: set = set()
+        self._backfill_stats = {"started": 0, "completed": 0, "failed": 0}
+
+    def run(self, user_input: UserInput, admission: Optional[str] = None) -> PipelineRun:
+        """Start a request-scoped run for user_input; stages are computed on access."""
+
+        return PipelineRun(self, user_input, admission)
+
+    def has_async_chains(self) -> bool:
+        """Whether either chain has an async (LLM-backed) variant."""
+
+        return hasattr(self.analysis_chain, "aanalyze_retirement_plan") or hasattr(self.strategy_chain, "agenerate_strategies")
+
+    def backfill(self, task: "asyncio.Task") -> None:
+        """Keep an over-budget chain task alive until it finishes and fills the cache."""
+
+        self._backfills.add(task)
+        self._backfill_stats["started"] += 1
+
+        def done(task):
+            self._backfills.discard(task)
+            failed = task.cancelled() or task.exception() is not None
+            self._backfill_stats["failed" if failed else "completed"] += 1
+
+        task.add_done_callback(done)
+
+    def backfill_stats(self) -> Dict[str, int]:
+        """Background LLM calls started after a missed latency budget, and their outcomes."""
+
+        return {**self._backfill_stats, "pending": len(self._backfills)}
+
+    def record(self, stage: str, elapsed: float, hit: bool, usage: Optional[Dict[str, int]] = None) -> None:
+        """Add one stage execution (and its LLM token usage) to the aggregate timings."""
+
+        observe_stage(stage, elapsed, "cache" if hit else "computed")
+        with self._lock:
+            stats = self._stage_stats.setdefault(stage, {
+                "count": 0, "cache_hits": 0, "total_seconds": 0.0,
+                "llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0
+            })
+            stats["count"] += 1
+            stats["cache_hits"] += hit
+            stats["total_seconds"] += elapsed
+            if usage:
+                stats["llm_calls"] += usage["calls"]
+                stats["prompt_tokens"] += usage["prompt_tokens"]
+                stats["completion_tokens"] += usage["completion_tokens"]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage call counts, cache hits and average latency, plus LLM tokens for chain stages."""
+
+        with self._lock:
+            report = {}
+            for stage, stats in self._stage_stats.items():
+                report[stage] = {
+                    "count": stats["count"],
+                    "cache_hits": stats["cache_hits"],
+                    "avg_ms": round(stats["total_seconds"] / stats["count"] * 1000, 4)
+                }
+                if stats["llm_calls"]:
+                    report[stage].update(
+                        llm_calls=stats["llm_calls"],
+                        prompt_tokens=stats["prompt_tokens"],
+                        completion_tokens=stats["completion_tokens"]
+                    )
+            return report
+
+
+def _chain_name(chain: Optional[Any]) -> Optional[str]:
+    """Cache-key part identifying which kind of chain produced a result."""
+
+    return type(chain).__name__ if chain is not None else None
+
+
+def _chain_result(result: Any) -> Tuple[Any, bool]:
+    """A chain's result and whether it may be cached (not a fallback the chain built after a failed LLM call)."""
+
+    return result, not getattr(result, "_fallback", False)
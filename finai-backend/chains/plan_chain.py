@@ -0,0 +1,314 @@
+"""
+Combined LangChain chain that produces the analysis and the strategies in one LLM call.
+
+The two-call path (RetirementAnalysisChain, then RetirementStrategyChain) sends the
+profile twice and waits for two sequential round-trips. RetirementPlanChain asks for
+both JSON sections in a single prompt and validates the reply into an
+AnalysisResult and a StrategyResponse. Only when the combined reply cannot be parsed
+does it fall back to the two-call path.
+
+The chain implements both chain interfaces, so the pipeline uses the same instance
+as its analysis and strategy chain: the analysis call makes the combined request
+and keeps the strategies for the strategy call that follows.
+"""
+
+import json
+import os
+import asyncio
+import functools
+from typing import Dict, Any, AsyncIterator, Optional, Tuple
+from models.user_input import UserInput, AnalysisResult, StrategyResponse, RetirementProjection
+from utils.cache import LRUCache
+from utils.llm_cache import LLMResponseCache, get_llm_response_cache, profile_bands, prompt_fingerprint
+from chains.prompts import LLM_PROMPT_VARIANT, MAX_TOKENS, prompt_template
+from chains.llm_client import AsyncChatClient, JSONListStream, OPENAI_BASE_URL
+from chains.analysis_chain import RetirementAnalysisChain
+from chains.strategy_chain import RetirementStrategyChain
+
+
+class RetirementPlanChain:
+    """
+    Single-call analysis and strategy chain with a two-call fallback.
+    """
+
+    def __init__(self, openai_api_key: str = None, llm_client: AsyncChatClient = None,
+                 response_cache: LLMResponseCache = None, prompt_variant: str = LLM_PROMPT_VARIANT):
+        """
+        Initialize the combined chain and the two-call chains it falls back to.
+
+        Args:
+            openai_api_key: OpenAI API key (if not provided, will use environment variable)
+            llm_client: Async client shared with the fallback chains (defaults to one for OPENAI_BASE_URL)
+            response_cache: Persistent cache of parsed responses (defaults to the shared one)
+            prompt_variant: "full" or "compact" prompt (defaults to LLM_PROMPT_VARIANT)
+        """
+
+        api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it as parameter.")
+
+        # Prompt variant and its completion token limit
+        template = prompt_template("plan", prompt_variant)
+        self.max_tokens = MAX_TOKENS["plan"][prompt_variant]
+
+        self.llm_client = llm_client or AsyncChatClient(api_key=api_key)
+        self.response_cache = response_cache or get_llm_response_cache()
+
+        # Two-call path, used when the combined reply cannot be parsed
+        self.analysis_chain = RetirementAnalysisChain(api_key, self.llm_client, self.response_cache, prompt_variant)
+        self.strategy_chain = RetirementStrategyChain(api_key, self.llm_client, self.response_cache, prompt_variant)
+
+        self.api_key = api_key
+        self.plan_template = template
+
+        # Parsed plans are cached per profile band and prompt version
+        self.prompt_id = prompt_fingerprint(template)
+
+        # Strategies from the latest combined call, picked up by the strategy stage
+        self._plans = LRUCache(max_size=1024, ttl_seconds=300.0)
+
+    @functools.cached_property
+    def plan_chain(self):
+        """LangChain LLMChain for the synchronous combined call, built (and langchain imported) on first use."""
+
+        from langchain.chains import LLMChain
+        from langchain.prompts import PromptTemplate
+        from langchain.chat_models import ChatOpenAI
+
+        llm = ChatOpenAI(
+            openai_api_key=self.api_key,
+            model_name="gpt-3.5-turbo",
+            temperature=0.3,
+            max_tokens=self.max_tokens,
+            openai_api_base=OPENAI_BASE_URL
+        )
+        prompt = PromptTemplate(input_variables=self.analysis_chain.input_variables, template=self.plan_template)
+        return LLMChain(llm=llm, prompt=prompt, output_key="plan_result")
+
+    def _parse_plan(self, plan_text: str, projection: RetirementProjection,
+                    risk_assessment: Dict[str, Any]) -> Tuple[AnalysisResult, StrategyResponse]:
+        """
+        Validate a combined reply into an analysis and a strategy response.
+
+        Raises:
+            ValueError: The reply has no JSON object or lacks either section
+        """
+
+        json_start = plan_text.find('{')
+        json_end = plan_text.rfind('}') + 1
+        if json_start == -1 or json_end <= json_start:
+            raise ValueError("No JSON object in plan response")
+
+        plan_data = json.loads(plan_text[json_start:json_end])
+        if "key_insights" not in plan_data or "strategies" not in plan_data:
+            raise ValueError("Plan response is missing the analysis or strategies section")
+
+        text = plan_text[json_start:json_end]
+        analysis = self.analysis_chain._parse_analysis(text, projection, risk_assessment)
+        strategies = self.strategy_chain._parse_strategies(text)
+        return analysis, strategies
+
+    def _cached_plan(self, bands, projection: RetirementProjection) -> Optional[Tuple[AnalysisResult, StrategyResponse]]:
+        """Cached plan for the profile band with this user's own score and corpus, or None."""
+
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.get("plan", self.prompt_id, bands)
+        if cached is None:
+            return None
+        analysis = AnalysisResult(**{
+            **cached["analysis"],
+            "readiness_score": projection.readiness_percentage,
+            "corpus": projection.projected_corpus
+        })
+        return analysis, StrategyResponse(**cached["strategies"])
+
+    def _store_plan(self, bands, analysis: AnalysisResult, strategies: StrategyResponse) -> None:
+        """Keep the strategies for the strategy stage and persist the parsed plan."""
+
+        self._plans.set(bands, strategies)
+        if self.response_cache is not None:
+            self.response_cache.set("plan", self.prompt_id, bands, {
+                "analysis": analysis.model_dump(),
+                "strategies": strategies.model_dump()
+            })
+
+    def _plan_input(self, user_input: UserInput):
+        """Prompt variables, projection, risk assessment and profile bands for a user."""
+
+        chain_input, projection, risk_assessment = self.analysis_chain._prepare_input(user_input)
+        bands = profile_bands(user_input, projection, risk_assessment["risk_level"])
+        return chain_input, projection, risk_assessment, bands
+
+    def analyze_retirement_plan(self, user_input: UserInput, projection_data: Dict[str, Any] = None) -> AnalysisResult:
+        """
+        Analyze the plan with one combined LLM call, keeping its strategies for generate_strategies.
+
+        Args:
+            user_input: UserInput model with financial data
+            projection_data: Accepted for interface parity with the simple chain
+
+        Returns:
+            AnalysisResult with AI analysis
+        """
+
+        chain_input, projection, risk_assessment, bands = self._plan_input(user_input)
+        cached = self._cached_plan(bands, projection)
+        if cached is not None:
+            self._plans.set(bands, cached[1])
+            return cached[0]
+
+        try:
+            result = self.plan_chain(chain_input)
+            analysis, strategies = self._parse_plan(result["plan_result"], projection, risk_assessment)
+            self._store_plan(bands, analysis, strategies)
+            return analysis
+
+        except ValueError as e:
+            print(f"Combined plan reply could not be parsed, using two-call path: {e}")
+            return self.analysis_chain.analyze_retirement_plan(user_input, projection_data)
+        except Exception as e:
+            print(f"Error in plan chain: {e}")
+            return self.analysis_chain._create_fallback_analysis(projection, risk_assessment)
+
+    async def aanalyze_retirement_plan(self, user_input: UserInput, projection_data: Dict[str, Any] = None,
+                                       timeout: float = None) -> AnalysisResult:
+        """
+        Async variant of analyze_retirement_plan that does not block the event loop.
+
+        Args:
+            user_input: UserInput model with financial data
+            projection_data: Accepted for interface parity with the simple chain
+            timeout: Per-call timeout in seconds (defaults to LLM_TIMEOUT_SECONDS)
+
+        Returns:
+            AnalysisResult with AI analysis
+
+        Raises:
+            asyncio.TimeoutError: The LLM call timed out (callers choose their own fallback)
+        """
+
+        chain_input, projection, risk_assessment, bands = self._plan_input(user_input)
+        cached = self._cached_plan(bands, projection)
+        if cached is not None:
+            self._plans.set(bands, cached[1])
+            return cached[0]
+        prompt = self.plan_template.format(**chain_input)
+
+        try:
+            plan_text = await self.llm_client.complete(prompt, temperature=0.3, max_tokens=self.max_tokens, timeout=timeout)
+            analysis, strategies = self._parse_plan(plan_text, projection, risk_assessment)
+            self._store_plan(bands, analysis, strategies)
+            return analysis
+
+        except asyncio.TimeoutError:
+            raise
+        except ValueError as e:
+            print(f"Combined plan reply could not be parsed, using two-call path: {e}")
+            return await self.analysis_chain.aanalyze_retirement_plan(user_input, projection_data, timeout)
+        except Exception as e:
+            print(f"Error in plan chain: {e}")
+            return self.analysis_chain._create_fallback_analysis(projection, risk_assessment)
+
+    async def astream_analysis(self, user_input: UserInput, projection_data: Dict[str, Any] = None,
+                               timeout: float = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of aanalyze_retirement_plan (see RetirementAnalysisChain.astream_analysis).
+
+        Yields:
+            ("token", text) fragments, ("key_insight", text) items, then ("result", AnalysisResult)
+        """
+
+        chain_input, projection, risk_assessment, bands = self._plan_input(user_input)
+        cached = self._cached_plan(bands, projection)
+        if cached is not None:
+            self._plans.set(bands, cached[1])
+            for insight in cached[0].key_insights:
+                yield "key_insight", insight
+            yield "result", cached[0]
+            return
+        prompt = self.plan_template.format(**chain_input)
+
+        insights = JSONListStream("key_insights")
+        try:
+            async for token in self.llm_client.stream(prompt, temperature=0.3, max_tokens=self.max_tokens, timeout=timeout):
+                yield "token", token
+                for insight in insights.feed(token):
+                    yield "key_insight", insight
+            analysis, strategies = self._parse_plan(insights.buffer, projection, risk_assessment)
+            self._store_plan(bands, analysis, strategies)
+
+        except asyncio.TimeoutError:
+            raise
+        except ValueError as e:
+            print(f"Combined plan reply could not be parsed, using two-call path: {e}")
+            analysis = await self.analysis_chain.aanalyze_retirement_plan(user_input, projection_data, timeout)
+        except Exception as e:
+            print(f"Error in plan chain: {e}")
+            analysis = self.analysis_chain._create_fallback_analysis(projection, risk_assessment)
+        yield "result", analysis
+
+    def _planned_strategies(self, user_input: UserInput) -> Optional[StrategyResponse]:
+        """Strategies from the combined call for this user's band, or None."""
+
+        return self._plans.get(self._plan_input(user_input)[3])
+
+    def generate_strategies(self, user_input: UserInput, analysis_result: AnalysisResult,
+                            projection_data: Dict[str, Any] = None) -> StrategyResponse:
+        """
+        Strategies from the combined call, or a separate strategy call if there were none.
+
+        Args:
+            user_input: UserInput model with financial data
+            analysis_result: AnalysisResult from analyze_retirement_plan
+            projection_data: Accepted for interface parity with the simple chain
+
+        Returns:
+            StrategyResponse with personalized recommendations
+        """
+
+        planned = self._planned_strategies(user_input)
+        if planned is not None:
+            return planned
+        return self.strategy_chain.generate_strategies(user_input, analysis_result, projection_data)
+
+    async def agenerate_strategies(self, user_input: UserInput, analysis_result: AnalysisResult,
+                                   projection_data: Dict[str, Any] = None, timeout: float = None) -> StrategyResponse:
+        """Async variant of generate_strategies."""
+
+        planned = self._planned_strategies(user_input)
+        if planned is not None:
+            return planned
+        return await self.strategy_chain.agenerate_strategies(user_input, analysis_result, projection_data, timeout)
+
+    async def astream_strategies(self, user_input: UserInput, analysis_result: AnalysisResult,
+                                 projection_data: Dict[str, Any] = None,
+                                 timeout: float = None) -> AsyncIterator[Tuple[str, Any]]:
+        """Streaming variant of agenerate_strategies (see RetirementStrategyChain.astream_strategies)."""
+
+        planned = self._planned_strategies(user_input)
+        if planned is None:
+            async for event in self.strategy_chain.astream_strategies(user_input, analysis_result, projection_data, timeout):
+                yield event
+            return
+        for strategy in planned.strategies:
+            yield "strategy", strategy.model_dump()
+        yield "result", planned
+
+
+def create_plan_chain(openai_api_key: str = None, llm_client: AsyncChatClient = None,
+                      response_cache: LLMResponseCache = None,
+                      prompt_variant: str = LLM_PROMPT_VARIANT) -> RetirementPlanChain:
+    """
+    Factory function to create a combined analysis and strategy chain.
+
+    Args:
+        openai_api_key: OpenAI API key (optional)
+        llm_client: Async client for the async variants (optional)
+        response_cache: Persistent response cache (optional)
+        prompt_variant: "full" or "compact" prompt (optional)
+
+    Returns:
+        RetirementPlanChain instance
+    """
+    return RetirementPlanChain(openai_api_key, llm_client, response_cache, prompt_variant)
@@ -0,0 +1,234 @@
+"""
+Prompt templates for the LLM chains, in a full and a compact variant.
+
+The full prompts spell out every instruction; the compact variants carry the same
+profile data and JSON schema with the guidance condensed, for a large reduction in
+prompt tokens (measure with utils.tokens.count_tokens). LLM_PROMPT_VARIANT selects
+the variant for chains that are not given one explicitly.
+"""
+
+import os
+
+
+LLM_PROMPT_VARIANT = os.getenv("LLM_PROMPT_VARIANT", "full")
+
+PROMPT_VARIANTS = ("full", "compact")
+
+ANALYSIS_TEMPLATE = """
+You are a professional financial advisor specializing in retirement planning for Indian salaried professionals. Analyze the following user's financial situation and provide a comprehensive assessment tailored for the Indian context.
+
+User Profile (Indian Salaried Professional):
+- Age: {age} years
+- Target Retirement Age: {retirement_age} years
+- Years to Retirement: {years_to_retirement} years
+- Annual Income: ₹{annual_income:,.2f}
+- Monthly Expenses: ₹{monthly_expenses:,.2f}
+- Current Savings: ₹{current_savings:,.2f}
+- Monthly Savings: ₹{monthly_savings:,.2f}
+- Retirement Goal: ₹{retirement_goal:,.2f}
+
+Projection Results:
+- Projected Corpus: ₹{projected_corpus:,.2f}
+- Readiness Percentage: {readiness_percentage:.1f}%
+- Shortfall: ₹{shortfall:,.2f}
+- Surplus: ₹{surplus:,.2f}
+- Risk Level: {risk_level}
+
+Please provide a JSON response with the following structure:
+{{
+    "summary": "A comprehensive 2-3 sentence summary of their retirement readiness for Indian context",
+    "readiness_score": {readiness_percentage},
+    "corpus": {projected_corpus},
+    "confidence_level": "High/Medium/Low based on data quality and time horizon",
+    "key_insights": [
+        "3-5 specific insights about their financial situation in Indian context",
+        "Consider Indian investment options like EPF, PPF, NPS, mutual funds",
+        "Include inflation impact on Indian economy",
+        "Be specific and actionable for Indian salaried professionals"
+    ],
+    "risk_factors": [
+        "List 2-4 main risk factors affecting their retirement plan in India",
+        "Include Indian market risks, inflation risks, and job security risks",
+        "Consider Indian economic factors and regulatory changes"
+    ]
+}}
+
+Focus on Indian context:
+1. Whether they're on track for their retirement goal considering Indian inflation
+2. Key strengths in their current plan (EPF, PPF, mutual funds, etc.)
+3. Main areas of concern or improvement for Indian salaried professionals
+4. Risk factors specific to Indian economy and job market
+5. Overall confidence in their retirement readiness
+6. Consider Indian tax implications and investment options
+7. Mention Indian retirement schemes like EPF, PPF, NPS, and mutual funds
+
+Be specific, professional, and provide actionable insights for Indian salaried professionals. Use Indian financial terminology and consider local economic factors.
+"""
+
+STRATEGY_TEMPLATE = """
+You are a senior financial advisor with 20+ years of experience in retirement planning for Indian salaried professionals. Based on the user's financial situation and analysis, provide 3 specific, actionable strategies to improve their retirement readiness in the Indian context.
+
+User Profile (Indian Salaried Professional):
+- Age: {age} years
+- Target Retirement Age: {retirement_age} years
+- Years to Retirement: {years_to_retirement} years
+- Annual Income: ₹{annual_income:,.2f}
+- Monthly Expenses: ₹{monthly_expenses:,.2f}
+- Current Savings: ₹{current_savings:,.2f}
+- Monthly Savings: ₹{monthly_savings:,.2f}
+- Retirement Goal: ₹{retirement_goal:,.2f}
+
+Current Analysis:
+- Projected Corpus: ${projected_corpus:,.2f}
+- Readiness Percentage: {readiness_percentage:.1f}%
+- Shortfall: ${shortfall:,.2f}
+- Surplus: ${surplus:,.2f}
+- Risk Level: {risk_level}
+- Confidence Level: {confidence_level}
+
+Key Insights: {key_insights}
+Risk Factors: {risk_factors}
+
+Provide exactly 3 strategies in JSON format:
+{{
+    "strategies": [
+        {{
+            "title": "Strategy 1 Title",
+            "description": "Detailed description of the strategy and how it works",
+            "impact": "Expected impact on retirement readiness (specific percentage or dollar amount)",
+            "timeframe": "When to implement (immediate, 1-6 months, 6-12 months, etc.)",
+            "difficulty": "Implementation difficulty (Easy/Medium/Hard)",
+            "expected_benefit": "Specific expected benefit (e.g., 'Increase corpus by $50,000' or 'Improve readiness by 15%')"
+        }},
+        {{
+            "title": "Strategy 2 Title", 
+            "description": "Detailed description of the strategy and how it works",
+            "impact": "Expected impact on retirement readiness",
+            "timeframe": "When to implement",
+            "difficulty": "Implementation difficulty",
+            "expected_benefit": "Specific expected benefit"
+        }},
+        {{
+            "title": "Strategy 3 Title",
+            "description": "Detailed description of the strategy and how it works", 
+            "impact": "Expected impact on retirement readiness",
+            "timeframe": "When to implement",
+            "difficulty": "Implementation difficulty",
+            "expected_benefit": "Specific expected benefit"
+        }}
+    ],
+    "overall_priority": "High/Medium/Low - overall priority for implementing these strategies",
+    "implementation_order": ["Strategy 1 Title", "Strategy 2 Title", "Strategy 3 Title"]
+}}
+
+Strategy Guidelines for Indian Context:
+1. Make strategies specific and actionable for Indian salaried professionals
+2. Consider the user's age, income level, and time horizon in Indian context
+3. Include Indian investment options: EPF, PPF, NPS, mutual funds, ELSS, FDs
+4. Address the most critical gaps first considering Indian inflation
+5. Provide realistic timeframes and difficulty levels
+6. Include specific expected benefits in Indian Rupees
+7. Consider Indian tax optimization (80C, 80CCD, 80D, etc.)
+8. Include risk management strategies for Indian market
+9. Mention Indian retirement schemes and their benefits
+10. Consider Indian economic factors and job market conditions
+
+Focus on strategies that will have the most impact on their retirement readiness in the Indian context. Include specific Indian investment vehicles and tax-saving options.
+"""
+
+PLAN_TEMPLATE = """
+You are a senior financial advisor specializing in retirement planning for Indian salaried professionals. Analyze the following user's financial situation and recommend 3 specific, actionable strategies to improve their retirement readiness.
+
+User Profile (Indian Salaried Professional):
+- Age: {age} years
+- Target Retirement Age: {retirement_age} years
+- Years to Retirement: {years_to_retirement} years
+- Annual Income: ₹{annual_income:,.2f}
+- Monthly Expenses: ₹{monthly_expenses:,.2f}
+- Current Savings: ₹{current_savings:,.2f}
+- Monthly Savings: ₹{monthly_savings:,.2f}
+- Retirement Goal: ₹{retirement_goal:,.2f}
+
+Projection Results:
+- Projected Corpus: ₹{projected_corpus:,.2f}
+- Readiness Percentage: {readiness_percentage:.1f}%
+- Shortfall: ₹{shortfall:,.2f}
+- Surplus: ₹{surplus:,.2f}
+- Risk Level: {risk_level}
+
+Respond with a single JSON object with the following structure:
+{{
+    "summary": "A 2-3 sentence summary of their retirement readiness for Indian context",
+    "readiness_score": {readiness_percentage},
+    "corpus": {projected_corpus},
+    "confidence_level": "High/Medium/Low based on data quality and time horizon",
+    "key_insights": ["3-5 specific, actionable insights (EPF, PPF, NPS, mutual funds, inflation impact)"],
+    "risk_factors": ["2-4 main risks: Indian market, inflation, job security, regulatory changes"],
+    "strategies": [
+        {{
+            "title": "Strategy title",
+            "description": "How the strategy works",
+            "impact": "Expected impact on retirement readiness",
+            "timeframe": "Immediate, 1-6 months, 6-12 months, ...",
+            "difficulty": "Easy/Medium/Hard",
+            "expected_benefit": "Specific expected benefit in Indian Rupees or readiness %"
+        }}
+    ],
+    "overall_priority": "High/Medium/Low",
+    "implementation_order": ["Strategy titles in the order to implement them"]
+}}
+
+Base the strategies on your own insights and risk factors. Address the most critical gaps first, include Indian investment vehicles (EPF, PPF, NPS, ELSS, mutual funds) and tax-saving options (80C, 80CCD, 80D), and give realistic timeframes.
+"""
+
+COMPACT_ANALYSIS_TEMPLATE = """Retirement advisor for Indian salaried professionals. Reply with JSON only.
+Profile: age {age}, retiring at {retirement_age} (in {years_to_retirement}y), income ₹{annual_income:,.0f}/yr, expenses ₹{monthly_expenses:,.0f}/mo, savings ₹{current_savings:,.0f}, saving ₹{monthly_savings:,.0f}/mo, goal ₹{retirement_goal:,.0f}.
+Projection: corpus ₹{projected_corpus:,.0f}, readiness {readiness_percentage:.1f}%, shortfall ₹{shortfall:,.0f}, surplus ₹{surplus:,.0f}, risk {risk_level}.
+{{"summary": "2-3 sentences", "readiness_score": {readiness_percentage}, "corpus": {projected_corpus}, "confidence_level": "High|Medium|Low", "key_insights": ["3-5 actionable insights: EPF/PPF/NPS/mutual funds, inflation, tax"], "risk_factors": ["2-4 risks: market, inflation, job security"]}}
+"""
+
+COMPACT_STRATEGY_TEMPLATE = """Retirement advisor for Indian salaried professionals. Give exactly 3 actionable strategies. Reply with JSON only.
+Profile: age {age}, retiring at {retirement_age} (in {years_to_retirement}y), income ₹{annual_income:,.0f}/yr, expenses ₹{monthly_expenses:,.0f}/mo, savings ₹{current_savings:,.0f}, saving ₹{monthly_savings:,.0f}/mo, goal ₹{retirement_goal:,.0f}.
+Projection: corpus ₹{projected_corpus:,.0f}, readiness {readiness_percentage:.1f}%, shortfall ₹{shortfall:,.0f}, surplus ₹{surplus:,.0f}, risk {risk_level}, confidence {confidence_level}.
+Insights: {key_insights}. Risks: {risk_factors}.
+Use EPF, PPF, NPS, ELSS, mutual funds and 80C/80CCD/80D; biggest gaps first; benefits in ₹.
+{{"strategies": [{{"title": "", "description": "", "impact": "", "timeframe": "", "difficulty": "Easy|Medium|Hard", "expected_benefit": ""}}], "overall_priority": "High|Medium|Low", "implementation_order": ["titles"]}}
+"""
+
+COMPACT_PLAN_TEMPLATE = """Retirement advisor for Indian salaried professionals. Assess readiness and give exactly 3 actionable strategies based on your insights. Reply with JSON only.
+Profile: age {age}, retiring at {retirement_age} (in {years_to_retirement}y), income ₹{annual_income:,.0f}/yr, expenses ₹{monthly_expenses:,.0f}/mo, savings ₹{current_savings:,.0f}, saving ₹{monthly_savings:,.0f}/mo, goal ₹{retirement_goal:,.0f}.
+Projection: corpus ₹{projected_corpus:,.0f}, readiness {readiness_percentage:.1f}%, shortfall ₹{shortfall:,.0f}, surplus ₹{surplus:,.0f}, risk {risk_level}.
+Use EPF, PPF, NPS, ELSS, mutual funds and 80C/80CCD/80D; biggest gaps first; benefits in ₹.
+{{"summary": "2-3 sentences", "readiness_score": {readiness_percentage}, "corpus": {projected_corpus}, "confidence_level": "High|Medium|Low", "key_insights": ["3-5 insights"], "risk_factors": ["2-4 risks"], "strategies": [{{"title": "", "description": "", "impact": "", "timeframe": "", "difficulty": "Easy|Medium|Hard", "expected_benefit": ""}}], "overall_priority": "High|Medium|Low", "implementation_order": ["titles"]}}
+"""
+
+# kind -> variant -> template
+PROMPTS = {
+    "analysis": {"full": ANALYSIS_TEMPLATE, "compact": COMPACT_ANALYSIS_TEMPLATE},
+    "strategies": {"full": STRATEGY_TEMPLATE, "compact": COMPACT_STRATEGY_TEMPLATE},
+    "plan": {"full": PLAN_TEMPLATE, "compact": COMPACT_PLAN_TEMPLATE}
+}
+
+# kind -> variant -> completion token limit
+MAX_TOKENS = {
+    "analysis": {"full": 1000, "compact": 600},
+    "strategies": {"full": 1200, "compact": 800},
+    "plan": {"full": 1800, "compact": 1200}
+}
+
+
+def prompt_template(kind: str, variant: str = LLM_PROMPT_VARIANT) -> str:
+    """
+    Template text for a chain.
+
+    Args:
+        kind: "analysis", "strategies" or "plan"
+        variant: "full" or "compact"
+
+    Raises:
+        ValueError: Unknown variant
+    """
+
+    if variant not in PROMPT_VARIANTS:
+        raise ValueError(f"Unknown prompt variant {variant!r}; expected one of {PROMPT_VARIANTS}")
+    return PROMPTS[kind][variant]
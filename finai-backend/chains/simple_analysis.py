@@ -4,6 +4,7 @@ Simple analysis without LangChain dependencies for Indian retirement planning.
 
 from typing import Dict, Any
 from models.user_input import UserInput, AnalysisResult
+from utils.solver import required_monthly_savings
 
 
 class SimpleRetirementAnalysis:
@@ -32,6 +33,7 @@ class SimpleRetirementAnalysis:
         if projection_data:
             readiness_percentage = projection_data.get('readiness_percentage', 0)
             projected_corpus = projection_data.get('projected_corpus', 0)
+            instrument_corpus = projection_data.get('instrument_corpus', 0)
             retirement_goal = projection_data.get('retirement_goal', 0)
             shortfall = projection_data.get('shortfall', 0)
             surplus = projection_data.get('surplus', 0)
@@ -41,6 +43,7 @@ class SimpleRetirementAnalysis:
             years_to_retirement = user_input.retirement_age - user_input.age
             readiness_percentage = 0
             projected_corpus = 0
+            instrument_corpus = 0
             retirement_goal = user_input.retirement_goal
             shortfall = retirement_goal
             surplus = 0
@@ -116,7 +119,10 @@ class SimpleRetirementAnalysis:
         
         # Projection-specific insights
         if projected_corpus > 0:
-            monthly_required = (retirement_goal - user_input.current_savings) / (years_to_retirement * 12)
+            # EPF/PPF/NPS buckets cover part of the goal
+            monthly_required = float(required_monthly_savings(
+                retirement_goal - instrument_corpus, user_input.current_savings, years_to_retirement, user_input.expected_returns
+            ))
             if user_input.monthly_savings < monthly_required:
                 insights.append(f"📊 To reach your goal, consider saving ₹{monthly_required:,.0f} monthly")
             else:
@@ -2,8 +2,10 @@
 Simple strategy recommendations without LangChain dependencies for Indian retirement planning.
 """
 
+import math
 from typing import Dict, Any
 from models.user_input import UserInput, StrategyRecommendation, StrategyResponse, AnalysisResult
+from utils.solver import required_monthly_savings, required_retirement_age, required_expected_returns
 
 
 class SimpleRetirementStrategy:
@@ -35,6 +37,7 @@ class SimpleRetirementStrategy:
         if projection_data:
             readiness_percentage = projection_data.get('readiness_percentage', 0)
             projected_corpus = projection_data.get('projected_corpus', 0)
+            instrument_corpus = projection_data.get('instrument_corpus', 0)
             retirement_goal = projection_data.get('retirement_goal', 0)
             shortfall = projection_data.get('shortfall', 0)
             surplus = projection_data.get('surplus', 0)
@@ -44,20 +47,26 @@ class SimpleRetirementStrategy:
             years_to_retirement = user_input.retirement_age - user_input.age
             readiness_percentage = 0
             projected_corpus = 0
+            instrument_corpus = 0
             retirement_goal = user_input.retirement_goal
             shortfall = retirement_goal
             surplus = 0
         
         savings_rate = (user_input.monthly_savings * 12 / user_input.annual_income) * 100 if user_input.annual_income > 0 else 0
         
+        # Exact goal-seek figures from inverting the projection formula; market savings
+        # only have to cover what the EPF/PPF/NPS buckets do not (the solved age keeps
+        # the instrument corpus at the current retirement age, so it is conservative)
+        savings_goal = retirement_goal - instrument_corpus
+        required_monthly = float(required_monthly_savings(
+            savings_goal, user_input.current_savings, years_to_retirement, user_input.expected_returns
+        ))
+        additional_monthly = max(0, required_monthly - user_input.monthly_savings)
+        
         # Generate strategies based on actual readiness percentage and projection data
         
         # Strategy 1: Critical Gap Strategies (for low readiness)
         if readiness_percentage < 50:
-            # Calculate required monthly savings to reach goal
-            required_monthly = (retirement_goal - user_input.current_savings) / (years_to_retirement * 12)
-            additional_monthly = max(0, required_monthly - user_input.monthly_savings)
-            
             if additional_monthly > 0:
                 strategies.append(StrategyRecommendation(
                     title="🚨 URGENT: Increase Monthly Savings",
@@ -68,22 +77,33 @@ class SimpleRetirementStrategy:
                     expected_benefit=f"Bridges ₹{shortfall:,.0f} shortfall gap"
                 ))
             
-            # Extend retirement age strategy
-            if years_to_retirement < 30:
+            # Extend retirement age strategy (only while the later age is still a valid retirement age)
+            if years_to_retirement < 30 and user_input.retirement_age + 5 <= 100:
+                goal_age = required_retirement_age(
+                    user_input.age, savings_goal, user_input.current_savings,
+                    user_input.monthly_savings, user_input.expected_returns
+                )
+                extended_required = float(required_monthly_savings(
+                    savings_goal, user_input.current_savings, years_to_retirement + 5, user_input.expected_returns
+                ))
+                reduction = (1 - extended_required / required_monthly) * 100 if required_monthly > 0 else 0
+                
+                if not math.isnan(goal_age):  # NaN when the goal is out of reach by age 100
+                    age_note = f"At your current savings you would reach your goal at age {int(goal_age)}."
+                else:
+                    age_note = "At your current savings the goal is out of reach without other changes."
+                
                 strategies.append(StrategyRecommendation(
                     title="Consider Extending Retirement Age",
-                    description=f"With only {years_to_retirement} years to retirement, consider extending to age 65-67. This gives you 5-7 more years to build corpus and reduces monthly savings requirement.",
+                    description=f"With only {years_to_retirement} years to retirement, consider retiring 5 years later at age {user_input.retirement_age + 5}. {age_note} Working longer gives your corpus more time to compound and lowers the monthly savings needed to ₹{extended_required:,.0f}.",
                     impact="High impact on reducing savings pressure",
                     timeframe="Immediate decision required",
                     difficulty="Medium",
-                    expected_benefit="Reduces monthly savings requirement by 20-30%"
+                    expected_benefit=f"Reduces monthly savings requirement by {reduction:.0f}%"
                 ))
         
         # Strategy 2: Moderate Gap Strategies (for medium readiness)
         elif readiness_percentage < 80:
-            # Calculate additional savings needed
-            additional_monthly = (shortfall / years_to_retirement) / 12
-            
             strategies.append(StrategyRecommendation(
                 title="📈 Boost Monthly Savings",
                 description=f"You're {readiness_percentage:.1f}% ready with ₹{shortfall:,.0f} shortfall. Increase monthly savings by ₹{additional_monthly:,.0f} to bridge the gap. This can be achieved through expense reduction or income increase.",
@@ -94,13 +114,23 @@ class SimpleRetirementStrategy:
             ))
             
             # Investment optimization
+            needed_returns = float(required_expected_returns(
+                savings_goal, user_input.current_savings, user_input.monthly_savings, years_to_retirement
+            ))
+            if not math.isnan(needed_returns):  # NaN when no realistic return closes the gap
+                returns_note = f"Earning {needed_returns:.1f}% a year instead of {user_input.expected_returns:.1f}% would close the gap without saving more."
+                returns_benefit = f"Closes shortfall at {needed_returns:.1f}% annual returns"
+            else:
+                returns_note = "Better returns alone cannot close the gap, so combine this with higher savings."
+                returns_benefit = "Potential 2-3% higher annual returns"
+            
             strategies.append(StrategyRecommendation(
                 title="Optimize Investment Returns",
-                description=f"With {years_to_retirement} years to retirement, consider increasing equity allocation to 70-80% for higher returns. This can potentially reduce shortfall by 20-30% through better returns.",
+                description=f"With {years_to_retirement} years to retirement, consider increasing equity allocation to 70-80% for higher returns. {returns_note}",
                 impact="Medium impact on corpus growth",
                 timeframe="1-2 months to rebalance",
                 difficulty="Medium",
-                expected_benefit="Potential 2-3% higher annual returns"
+                expected_benefit=returns_benefit
             ))
         
         # Strategy 3: Goal Achievement Strategies (for high readiness)
@@ -176,10 +206,9 @@ class SimpleRetirementStrategy:
         
         # Strategy 7: Expense Optimization (based on shortfall)
         if shortfall > 0:
-            monthly_expense_reduction = (shortfall / years_to_retirement) / 12
             strategies.append(StrategyRecommendation(
                 title="Optimize Monthly Expenses",
-                description=f"To bridge the ₹{shortfall:,.0f} shortfall, consider reducing monthly expenses by ₹{monthly_expense_reduction:,.0f}. This can be achieved through budgeting, cutting discretionary spending, or finding cheaper alternatives.",
+                description=f"To bridge the ₹{shortfall:,.0f} shortfall, consider reducing monthly expenses by ₹{additional_monthly:,.0f} and investing the difference. This can be achieved through budgeting, cutting discretionary spending, or finding cheaper alternatives.",
                 impact="Direct impact on shortfall reduction",
                 timeframe="1-2 months to implement",
                 difficulty="Medium",
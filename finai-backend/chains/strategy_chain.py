@@ -4,13 +4,14 @@ LangChain strategy chain for generating personalized retirement planning recomme
 
 import json
 import os
-from typing import Dict, Any, List
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
-from langchain.llms import OpenAI
-from langchain.chat_models import ChatOpenAI
+import asyncio
+import functools
+from typing import Dict, Any, List, AsyncIterator, Tuple
 from models.user_input import UserInput, StrategyRecommendation, StrategyResponse, AnalysisResult
-from utils.formulas import retirement_projection, calculate_risk_score
+from utils.cache import cached_retirement_projection, cached_risk_score
+from utils.llm_cache import LLMResponseCache, get_llm_response_cache, profile_bands, prompt_fingerprint
+from chains.prompts import LLM_PROMPT_VARIANT, MAX_TOKENS, prompt_template
+from chains.llm_client import AsyncChatClient, JSONListStream, OPENAI_BASE_URL
 
 
 class RetirementStrategyChain:
@@ -18,12 +19,16 @@ class RetirementStrategyChain:
     LangChain-based strategy chain for generating personalized retirement recommendations.
     """
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, llm_client: AsyncChatClient = None,
+                 response_cache: LLMResponseCache = None, prompt_variant: str = LLM_PROMPT_VARIANT):
         """
         Initialize the strategy chain with OpenAI API key.
         
         Args:
             openai_api_key: OpenAI API key (if not provided, will use environment variable)
+            llm_client: Async client used by agenerate_strategies (defaults to one for OPENAI_BASE_URL)
+            response_cache: Persistent cache of parsed responses (defaults to the shared one)
+            prompt_variant: "full" or "compact" prompt (defaults to LLM_PROMPT_VARIANT)
         """
         
         # Get API key from parameter or environment
@@ -31,117 +36,62 @@ class RetirementStrategyChain:
         if not api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it as parameter.")
         
-        # Initialize the LLM
-        self.llm = ChatOpenAI(
-            openai_api_key=api_key,
-            model_name="gpt-3.5-turbo",
-            temperature=0.4,
-            max_tokens=1200
-        )
+        # Prompt variant and its completion token limit
+        template = prompt_template("strategies", prompt_variant)
+        self.max_tokens = MAX_TOKENS["strategies"][prompt_variant]
         
-        # Create the strategy prompt template
-        self.strategy_prompt = PromptTemplate(
-            input_variables=[
-                "age", "retirement_age", "annual_income", "monthly_expenses", 
-                "current_savings", "monthly_savings", "retirement_goal",
-                "projected_corpus", "readiness_percentage", "risk_level",
-                "years_to_retirement", "shortfall", "surplus", "key_insights",
-                "risk_factors", "confidence_level"
-            ],
-            template="""
-You are a senior financial advisor with 20+ years of experience in retirement planning for Indian salaried professionals. Based on the user's financial situation and analysis, provide 3 specific, actionable strategies to improve their retirement readiness in the Indian context.
-
-User Profile (Indian Salaried Professional):
-- Age: {age} years
-- Target Retirement Age: {retirement_age} years
-- Years to Retirement: {years_to_retirement} years
-- Annual Income: ₹{annual_income:,.2f}
-- Monthly Expenses: ₹{monthly_expenses:,.2f}
-- Current Savings: ₹{current_savings:,.2f}
-- Monthly Savings: ₹{monthly_savings:,.2f}
-- Retirement Goal: ₹{retirement_goal:,.2f}
-
-Current Analysis:
-- Projected Corpus: ${projected_corpus:,.2f}
-- Readiness Percentage: {readiness_percentage:.1f}%
-- Shortfall: ${shortfall:,.2f}
-- Surplus: ${surplus:,.2f}
-- Risk Level: {risk_level}
-- Confidence Level: {confidence_level}
-
-Key Insights: {key_insights}
-Risk Factors: {risk_factors}
-
-Provide exactly 3 strategies in JSON format:
-{{
-    "strategies": [
-        {{
-            "title": "Strategy 1 Title",
-            "description": "Detailed description of the strategy and how it works",
-            "impact": "Expected impact on retirement readiness (specific percentage or dollar amount)",
-            "timeframe": "When to implement (immediate, 1-6 months, 6-12 months, etc.)",
-            "difficulty": "Implementation difficulty (Easy/Medium/Hard)",
-            "expected_benefit": "Specific expected benefit (e.g., 'Increase corpus by $50,000' or 'Improve readiness by 15%')"
-        }},
-        {{
-            "title": "Strategy 2 Title", 
-            "description": "Detailed description of the strategy and how it works",
-            "impact": "Expected impact on retirement readiness",
-            "timeframe": "When to implement",
-            "difficulty": "Implementation difficulty",
-            "expected_benefit": "Specific expected benefit"
-        }},
-        {{
-            "title": "Strategy 3 Title",
-            "description": "Detailed description of the strategy and how it works", 
-            "impact": "Expected impact on retirement readiness",
-            "timeframe": "When to implement",
-            "difficulty": "Implementation difficulty",
-            "expected_benefit": "Specific expected benefit"
-        }}
-    ],
-    "overall_priority": "High/Medium/Low - overall priority for implementing these strategies",
-    "implementation_order": ["Strategy 1 Title", "Strategy 2 Title", "Strategy 3 Title"]
-}}
-
-Strategy Guidelines for Indian Context:
-1. Make strategies specific and actionable for Indian salaried professionals
-2. Consider the user's age, income level, and time horizon in Indian context
-3. Include Indian investment options: EPF, PPF, NPS, mutual funds, ELSS, FDs
-4. Address the most critical gaps first considering Indian inflation
-5. Provide realistic timeframes and difficulty levels
-6. Include specific expected benefits in Indian Rupees
-7. Consider Indian tax optimization (80C, 80CCD, 80D, etc.)
-8. Include risk management strategies for Indian market
-9. Mention Indian retirement schemes and their benefits
-10. Consider Indian economic factors and job market conditions
-
-Focus on strategies that will have the most impact on their retirement readiness in the Indian context. Include specific Indian investment vehicles and tax-saving options.
-            """
-        )
+        self.api_key = api_key
+        self.llm_client = llm_client or AsyncChatClient(api_key=api_key)
+        
+        # Strategy prompt (plain str.format template; LangChain wraps it for the sync path)
+        self.strategy_template = template
+        self.input_variables = [
+            "age", "retirement_age", "annual_income", "monthly_expenses", 
+            "current_savings", "monthly_savings", "retirement_goal",
+            "projected_corpus", "readiness_percentage", "risk_level",
+            "years_to_retirement", "shortfall", "surplus", "key_insights",
+            "risk_factors", "confidence_level"
+        ]
+        
+        # Parsed responses are cached per profile band and prompt version
+        self.response_cache = response_cache or get_llm_response_cache()
+        self.prompt_id = prompt_fingerprint(template)
+    
+    @functools.cached_property
+    def strategy_chain(self):
+        """
+        LangChain LLMChain for generate_strategies.
+        
+        Built on first use, so langchain is only imported by processes that take
+        the synchronous path; the async variants call the LLM through llm_client.
+        """
+        
+        from langchain.chains import LLMChain
+        from langchain.prompts import PromptTemplate
+        from langchain.chat_models import ChatOpenAI
         
-        # Create the LLM chain
-        self.strategy_chain = LLMChain(
-            llm=self.llm,
-            prompt=self.strategy_prompt,
-            output_key="strategy_result"
+        llm = ChatOpenAI(
+            openai_api_key=self.api_key,
+            model_name="gpt-3.5-turbo",
+            temperature=0.4,
+            max_tokens=self.max_tokens,
+            openai_api_base=OPENAI_BASE_URL
         )
+        prompt = PromptTemplate(input_variables=self.input_variables, template=self.strategy_template)
+        return LLMChain(llm=llm, prompt=prompt, output_key="strategy_result")
     
-    def generate_strategies(self, user_input: UserInput, analysis_result: AnalysisResult) -> StrategyResponse:
+    def _prepare_input(self, user_input: UserInput, analysis_result: AnalysisResult):
         """
-        Generate personalized retirement strategies based on user input and analysis.
+        Build the prompt variables for a user and their analysis.
         
-        Args:
-            user_input: UserInput model with financial data
-            analysis_result: AnalysisResult from the analysis chain
-            
         Returns:
-            StrategyResponse with personalized recommendations
+            Tuple of (chain_input, projection, profile bands)
         """
         
         # Calculate retirement projection for additional context
-        projection = retirement_projection(user_input)
-        risk_assessment = calculate_risk_score(user_input)
+        projection = cached_retirement_projection(user_input)
+        risk_assessment = cached_risk_score(user_input)
+        bands = profile_bands(user_input, projection, risk_assessment["risk_level"])
         
         # Prepare input for the LLM
         chain_input = {
@@ -163,48 +113,182 @@ Focus on strategies that will have the most impact on their retirement readiness
             "confidence_level": analysis_result.confidence_level
         }
         
+        return chain_input, projection, bands
+    
+    def _parse_strategies(self, strategy_text: str) -> StrategyResponse:
+        """
+        Parse the LLM reply into a StrategyResponse.
+        
+        Args:
+            strategy_text: Raw LLM output
+            
+        Returns:
+            StrategyResponse
+            
+        Raises:
+            ValueError: The reply contains no valid JSON object
+        """
+        
+        # Extract JSON from the response
+        json_start = strategy_text.find('{')
+        json_end = strategy_text.rfind('}') + 1
+        
+        if json_start == -1 or json_end <= json_start:
+            raise ValueError("No JSON object in strategy response")
+        
+        strategy_data = json.loads(strategy_text[json_start:json_end])
+        
+        # Create strategy recommendations
+        strategies = []
+        for strategy_info in strategy_data.get("strategies", []):
+            strategy = StrategyRecommendation(
+                title=strategy_info.get("title", "Strategy"),
+                description=strategy_info.get("description", "Strategy description"),
+                impact=strategy_info.get("impact", "Moderate impact"),
+                timeframe=strategy_info.get("timeframe", "6-12 months"),
+                difficulty=strategy_info.get("difficulty", "Medium"),
+                expected_benefit=strategy_info.get("expected_benefit", "Improved retirement readiness")
+            )
+            strategies.append(strategy)
+        
+        # Create and return the strategy response
+        return StrategyResponse(
+            strategies=strategies,
+            overall_priority=strategy_data.get("overall_priority", "Medium"),
+            implementation_order=strategy_data.get("implementation_order", [s.title for s in strategies])
+        )
+    
+    def _cached_strategies(self, bands):
+        """Cached strategies for the profile band, or None."""
+        
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.get("strategies", self.prompt_id, bands)
+        return StrategyResponse(**cached) if cached is not None else None
+    
+    def _store_strategies(self, bands, strategies: StrategyResponse) -> None:
+        """Store successfully parsed strategies for the profile band."""
+        
+        if self.response_cache is not None:
+            self.response_cache.set("strategies", self.prompt_id, bands, strategies.model_dump())
+    
+    def generate_strategies(self, user_input: UserInput, analysis_result: AnalysisResult,
+                            projection_data: Dict[str, Any] = None) -> StrategyResponse:
+        """
+        Generate personalized retirement strategies based on user input and analysis.
+        
+        Args:
+            user_input: UserInput model with financial data
+            analysis_result: AnalysisResult from the analysis chain
+            projection_data: Accepted for interface parity with the simple chain; the
+                projection is read from the calculation cache
+            
+        Returns:
+            StrategyResponse with personalized recommendations
+        """
+        
+        chain_input, projection, bands = self._prepare_input(user_input, analysis_result)
+        cached = self._cached_strategies(bands)
+        if cached is not None:
+            return cached
+        
         try:
             # Run the strategy chain
             result = self.strategy_chain(chain_input)
+            strategies = self._parse_strategies(result["strategy_result"])
+            self._store_strategies(bands, strategies)
+            return strategies
+            
+        except Exception as e:
+            print(f"Error in strategy chain: {e}")
+            # Return fallback strategies
+            return self._create_fallback_strategies(user_input, analysis_result, projection)
+    
+    async def agenerate_strategies(self, user_input: UserInput, analysis_result: AnalysisResult,
+                                   projection_data: Dict[str, Any] = None, timeout: float = None) -> StrategyResponse:
+        """
+        Async variant of generate_strategies that does not block the event loop.
+        
+        The call goes through the shared LLM limiter (concurrency limit and timeout);
+        cancelling the awaiting task cancels the HTTP request.
+        
+        Args:
+            user_input: UserInput model with financial data
+            analysis_result: AnalysisResult from the analysis chain
+            projection_data: Accepted for interface parity with the simple chain
+            timeout: Per-call timeout in seconds (defaults to LLM_TIMEOUT_SECONDS)
             
-            # Parse the JSON response
-            strategy_text = result["strategy_result"]
+        Returns:
+            StrategyResponse with personalized recommendations
             
-            # Extract JSON from the response
-            json_start = strategy_text.find('{')
-            json_end = strategy_text.rfind('}') + 1
+        Raises:
+            asyncio.TimeoutError: The LLM call timed out (callers choose their own fallback)
+        """
+        
+        chain_input, projection, bands = self._prepare_input(user_input, analysis_result)
+        cached = self._cached_strategies(bands)
+        if cached is not None:
+            return cached
+        prompt = self.strategy_template.format(**chain_input)
+        
+        try:
+            strategy_text = await self.llm_client.complete(prompt, temperature=0.4, max_tokens=self.max_tokens, timeout=timeout)
+            strategies = self._parse_strategies(strategy_text)
+            self._store_strategies(bands, strategies)
+            return strategies
             
-            if json_start != -1 and json_end > json_start:
-                json_str = strategy_text[json_start:json_end]
-                strategy_data = json.loads(json_str)
-            else:
-                # Fallback if JSON parsing fails
-                strategy_data = self._create_fallback_strategies(user_input, analysis_result, projection)
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error in strategy chain: {e}")
+            return self._create_fallback_strategies(user_input, analysis_result, projection)
+    
+    async def astream_strategies(self, user_input: UserInput, analysis_result: AnalysisResult,
+                                 projection_data: Dict[str, Any] = None,
+                                 timeout: float = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of agenerate_strategies.
+        
+        The reply is streamed token by token; each strategy is yielded as soon as its
+        JSON object is complete, and the parsed StrategyResponse comes last.
+        
+        Args:
+            user_input: UserInput model with financial data
+            analysis_result: AnalysisResult from the analysis chain
+            projection_data: Accepted for interface parity with the simple chain
+            timeout: Timeout in seconds for the whole stream (defaults to LLM_TIMEOUT_SECONDS)
             
-            # Create strategy recommendations
-            strategies = []
-            for strategy_info in strategy_data.get("strategies", []):
-                strategy = StrategyRecommendation(
-                    title=strategy_info.get("title", "Strategy"),
-                    description=strategy_info.get("description", "Strategy description"),
-                    impact=strategy_info.get("impact", "Moderate impact"),
-                    timeframe=strategy_info.get("timeframe", "6-12 months"),
-                    difficulty=strategy_info.get("difficulty", "Medium"),
-                    expected_benefit=strategy_info.get("expected_benefit", "Improved retirement readiness")
-                )
-                strategies.append(strategy)
+        Yields:
+            ("token", text) fragments, ("strategy", dict) items, then ("result", StrategyResponse)
             
-            # Create and return the strategy response
-            return StrategyResponse(
-                strategies=strategies,
-                overall_priority=strategy_data.get("overall_priority", "Medium"),
-                implementation_order=strategy_data.get("implementation_order", [s.title for s in strategies])
-            )
+        Raises:
+            asyncio.TimeoutError: The stream timed out (callers choose their own fallback)
+        """
+        
+        chain_input, projection, bands = self._prepare_input(user_input, analysis_result)
+        cached = self._cached_strategies(bands)
+        if cached is not None:
+            for strategy in cached.strategies:
+                yield "strategy", strategy.model_dump()
+            yield "result", cached
+            return
+        prompt = self.strategy_template.format(**chain_input)
+        
+        items = JSONListStream("strategies")
+        try:
+            async for token in self.llm_client.stream(prompt, temperature=0.4, max_tokens=self.max_tokens, timeout=timeout):
+                yield "token", token
+                for strategy in items.feed(token):
+                    yield "strategy", strategy
+            strategies = self._parse_strategies(items.buffer)
+            self._store_strategies(bands, strategies)
             
+        except asyncio.TimeoutError:
+            raise
         except Exception as e:
             print(f"Error in strategy chain: {e}")
-            # Return fallback strategies
-            return self._create_fallback_strategies(user_input, analysis_result, projection)
+            strategies = self._create_fallback_strategies(user_input, analysis_result, projection)
+        yield "result", strategies
     
     def _create_fallback_strategies(self, user_input: UserInput, 
                                    analysis_result: AnalysisResult,
@@ -218,7 +302,7 @@ Focus on strategies that will have the most impact on their retirement readiness
             projection: Retirement projection
             
         Returns:
-            StrategyResponse with basic strategies
+            StrategyResponse with basic strategies, marked as a fallback so it is not cached
         """
         
         strategies = []
@@ -264,21 +348,28 @@ Focus on strategies that will have the most impact on their retirement readiness
                 expected_benefit="Potential 10-20% improvement in after-tax retirement income"
             ))
         
-        return StrategyResponse(
+        response = StrategyResponse(
             strategies=strategies,
             overall_priority="High" if projection.readiness_percentage < 80 else "Medium",
             implementation_order=[s.title for s in strategies]
         )
+        response._fallback = True
+        return response
 
 
-def create_strategy_chain(openai_api_key: str = None) -> RetirementStrategyChain:
+def create_strategy_chain(openai_api_key: str = None, llm_client: AsyncChatClient = None,
+                          response_cache: LLMResponseCache = None,
+                          prompt_variant: str = LLM_PROMPT_VARIANT) -> RetirementStrategyChain:
     """
     Factory function to create a strategy chain.
     
     Args:
         openai_api_key: OpenAI API key (optional)
+        llm_client: Async client for the async variant (optional)
+        response_cache: Persistent response cache (optional)
+        prompt_variant: "full" or "compact" prompt (optional)
         
     Returns:
         RetirementStrategyChain instance
     """
-    return RetirementStrategyChain(openai_api_key)
+    return RetirementStrategyChain(openai_api_key, llm_client, response_cache, prompt_variant)
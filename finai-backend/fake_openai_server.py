@@ -0,0 +1,142 @@
+"""
+Fake OpenAI-compatible chat completion server for local testing.
+
+Answers /v1/chat/completions with canned analysis or strategy JSON after an
+optional delay, and records how many calls were in flight at once. Requests with
+"stream": true get the reply as server-sent event chunks.
+
+Run it and point the backend at it:
+    python fake_openai_server.py --port 8100 --delay 2
+    OPENAI_BASE_URL=http://localhost:8100/v1 OPENAI_API_KEY=fake python main.py
+
+Tests can serve it in-process with httpx.ASGITransport(app=create_fake_openai_app()).
+"""
+
+import json
+import asyncio
+import argparse
+from typing import Any, Callable, Dict, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+FAKE_ANALYSIS = {
+    "summary": "You are on track for a comfortable retirement.",
+    "readiness_score": 85.0,
+    "corpus": 42000000.0,
+    "confidence_level": "Medium",
+    "key_insights": ["Increase your PPF contributions", "Use NPS for the extra 80CCD(1B) deduction"],
+    "risk_factors": ["Inflation above 6%", "Equity market volatility"]
+}
+
+FAKE_STRATEGIES = {
+    "strategies": [
+        {
+            "title": "Step Up Your SIP",
+            "description": "Increase your monthly SIP by 10% every year.",
+            "impact": "High",
+            "timeframe": "Immediate",
+            "difficulty": "Easy",
+            "expected_benefit": "Improve readiness by 15%"
+        }
+    ],
+    "overall_priority": "High",
+    "implementation_order": ["Step Up Your SIP"]
+}
+
+
+# Combined analysis and strategies reply (RetirementPlanChain)
+FAKE_PLAN = {**FAKE_ANALYSIS, **FAKE_STRATEGIES}
+
+
+def default_reply(prompt: str) -> str:
+    """Combined JSON for plan prompts, strategy JSON for strategy prompts, analysis JSON otherwise."""
+
+    if '"strategies"' in prompt:
+        return json.dumps(FAKE_PLAN if '"key_insights"' in prompt else FAKE_STRATEGIES)
+    return json.dumps(FAKE_ANALYSIS)
+
+
+def create_fake_openai_app(reply: Callable[[str], str] = default_reply, delay: float = 0.0,
+                           status_code: int = 200, chunk_size: int = 16, chunk_delay: float = 0.0) -> FastAPI:
+    """
+    Build the fake server.
+
+    Args:
+        reply: Maps the prompt to the reply text
+        delay: Seconds to wait before answering
+        status_code: HTTP status to answer with (e.g. 500 to simulate outages)
+        chunk_size: Characters per chunk for streamed replies
+        chunk_delay: Seconds between streamed chunks
+
+    Returns:
+        FastAPI app; app.state.stats holds requests, in_flight, max_in_flight, cancelled
+    """
+
+    app = FastAPI(title="Fake OpenAI API")
+    app.state.stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "cancelled": 0}
+    app.state.delay = delay
+    app.state.chunk_delay = chunk_delay
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Any:
+        stats = app.state.stats
+        body: Dict[str, Any] = await request.json()
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(app.state.delay)
+        except asyncio.CancelledError:
+            stats["cancelled"] += 1
+            raise
+        finally:
+            stats["in_flight"] -= 1
+
+        if status_code != 200:
+            return JSONResponse({"error": {"message": "Fake server error"}}, status_code=status_code)
+
+        prompt = body["messages"][-1]["content"]
+        text = reply(prompt)
+        if body.get("stream"):
+            return StreamingResponse(_stream_chunks(text), media_type="text/event-stream")
+        # Rough token counts (about four characters per token)
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(text) // 4
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "model": body.get("model", "gpt-3.5-turbo"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens}
+        }
+
+    async def _stream_chunks(text: str):
+        for start in range(0, len(text), chunk_size):
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": text[start:start + chunk_size]}, "finish_reason": None}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(app.state.chunk_delay)
+        yield "data: [DONE]\n\n"
+
+    return app
+
+
+def main(argv: Optional[list] = None):
+    """Serve the fake API with uvicorn."""
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible server")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds before each reply")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    args = parser.parse_args(argv)
+    uvicorn.run(create_fake_openai_app(delay=args.delay, chunk_delay=args.chunk_delay), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
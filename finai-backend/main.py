@@ -4,33 +4,70 @@ Provides endpoints for retirement analysis, strategy recommendations, and simula
 """
 
 import os
-import json
+import functools
+import inspect
+from datetime import datetime, timezone
 from typing import Dict, Any, List
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from fastapi.routing import APIRoute
 from dotenv import load_dotenv
+import numpy as np
 
 # Import our custom modules
 from models.user_input import (
     UserInput, AnalysisResult, StrategyResponse, 
-    SimulationRequest, SimulationResult, RetirementProjection
+    SimulationRequest, SimulationResult, RetirementProjection, BatchAnalysisRequest,
+    SimulationGridRequest
 )
-from utils.formulas import retirement_projection, simulate_scenario, calculate_risk_score
+from utils.formulas import retirement_projection_batch, sensitivity_grid, GRID_PARAMETERS
+from utils.cohort import get_cohort_index
+from utils.cache import calculation_cache
+from utils.llm_cache import llm_response_cache_stats
+from utils.serialization import ModelJSONResponse, dumps_json, negotiated_response
+from utils.metrics import metrics, MetricsMiddleware, observe_validation, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils import profiling
+from utils.responses import analyze_body, suggestions_body, what_if_body, monte_carlo_body
 from chains.simple_analysis import create_analysis_chain
 from chains.simple_strategy import create_strategy_chain
+from chains.pipeline import AnalysisPipeline, STAGES as ANALYZE_STAGES
+from chains.llm_client import llm_limiter, llm_token_budget
+from chains.admission import admission_controller, client_id
 
 # Load environment variables
 load_dotenv()
 
+class MetricsRoute(APIRoute):
+    """APIRoute that records the time from request arrival to the endpoint call (body read and validation)."""
+    
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            original = endpoint
+            
+            @functools.wraps(original)
+            async def endpoint(*args, **kw):
+                if self.body_field is not None:
+                    observe_validation()
+                return await original(*args, **kw)
+        super().__init__(path, endpoint, **kwargs)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI-Driven Retirement Planner API",
     description="A comprehensive retirement planning API powered by LangChain and OpenAI",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ModelJSONResponse
 )
+app.router.route_class = MetricsRoute
+
+# Opt-in per-request profiles (PROFILING_ENABLED), listed by /debug/profiles
+app.add_middleware(profiling.ProfilingMiddleware)
+
+# Request counts, errors and latency per route for /metrics
+app.add_middleware(MetricsMiddleware)
 
 # Configure CORS for React frontend
 app.add_middleware(
@@ -46,14 +83,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global variables for chains (initialized on startup)
-analysis_chain = None
-strategy_chain = None
+# Shared analysis pipeline (chains are attached on startup)
+pipeline = AnalysisPipeline()
+metrics.callback(
+    "finai_llm_backfills", "Background LLM calls after a missed latency budget, by state",
+    lambda: {(state,): count for state, count in pipeline.backfill_stats().items()}, ("state",)
+)
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the LangChain components on startup."""
-    global analysis_chain, strategy_chain
+    # Load (or build) the cohort index before serving traffic
+    get_cohort_index()
     
     try:
         # Check if OpenAI API key is available
@@ -62,9 +103,20 @@ async def startup_event():
             print("Warning: OPENAI_API_KEY not found. AI features will be limited.")
             return
         
-        # Initialize the chains
-        analysis_chain = create_analysis_chain(openai_api_key)
-        strategy_chain = create_strategy_chain(openai_api_key)
+        # Initialize the chains (LangChain/OpenAI chains are opt-in)
+        if os.getenv("USE_LLM_CHAINS", "false").lower() == "true":
+            if os.getenv("LLM_CHAIN_MODE", "combined").lower() == "combined":
+                # One LLM call produces both the analysis and the strategies
+                from chains.plan_chain import create_plan_chain
+                pipeline.analysis_chain = pipeline.strategy_chain = create_plan_chain(openai_api_key)
+            else:
+                from chains.analysis_chain import create_analysis_chain as create_llm_analysis_chain
+                from chains.strategy_chain import create_strategy_chain as create_llm_strategy_chain
+                pipeline.analysis_chain = create_llm_analysis_chain(openai_api_key)
+                pipeline.strategy_chain = create_llm_strategy_chain(openai_api_key)
+        else:
+            pipeline.analysis_chain = create_analysis_chain(openai_api_key)
+            pipeline.strategy_chain = create_strategy_chain(openai_api_key)
         print("LangChain components initialized successfully.")
         
     except Exception as e:
@@ -80,9 +132,13 @@ async def root():
         "status": "active",
         "endpoints": {
             "analyze": "/analyze - Analyze retirement readiness",
+            "analyze_stream": "/analyze/stream - Analyze retirement readiness, streamed as server-sent events",
+            "analyze_batch": "/analyze/batch - Project retirement readiness for many profiles",
             "suggestions": "/suggestions - Get strategy recommendations", 
             "simulate": "/simulate - Run retirement simulations",
-            "health": "/health - Health check"
+            "simulate_grid": "/simulate/grid - Sensitivity grid over two or three parameters",
+            "health": "/health - Health check",
+            "metrics": "/metrics - Prometheus metrics"
         }
     }
 
@@ -91,12 +147,61 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "ai_enabled": analysis_chain is not None and strategy_chain is not None,
-        "timestamp": "2024-01-01T00:00:00Z"
+        "ai_enabled": pipeline.analysis_chain is not None and pipeline.strategy_chain is not None,
+        "calculation_cache": calculation_cache.stats(),
+        "pipeline_stages": pipeline.stats(),
+        "llm": llm_limiter.stats(),
+        "llm_tokens": llm_token_budget.stats(),
+        "llm_backfills": pipeline.backfill_stats(),
+        "admission": admission_controller.stats(),
+        "llm_response_cache": llm_response_cache_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus metrics (text format 0.0.4) of this worker process.
+    
+    Request counts, errors and latency histograms per route; per-stage latency
+    histograms (validation, projection, risk, analysis, strategies, ...,
+    serialization) split by computed/cache; cache hits, misses and hit ratios;
+    in-flight and waiting LLM calls and token totals.
+    """
+    return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/debug/profiles", include_in_schema=False)
+async def list_profiles(request: Request, limit: int = 20):
+    """
+    Recent request profiles, newest first (404 unless PROFILING_ENABLED and the X-Profile-Token matches).
+    
+    Profile a request by sending it with "X-Profile: speedscope" or "X-Profile: pstats"
+    (or ?profile=speedscope); each entry has the request, its duration, the stage
+    markers and the file, downloadable from /debug/profiles/{id}.
+    """
+    if not profiling.authorized(request.headers.get("x-profile-token")):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {"profiles": profiling.list_captures(limit=limit)}
+
+@app.get("/debug/profiles/{capture_id}", include_in_schema=False)
+async def download_profile(capture_id: str, request: Request):
+    """Download one capture's speedscope JSON or pstats file (404 unless authorized as for /debug/profiles)."""
+    path = profiling.capture_path(capture_id) if profiling.authorized(request.headers.get("x-profile-token")) else None
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return FileResponse(path, filename=os.path.basename(path))
+
+def analyze_response_body(run) -> Dict[str, Any]:
+    """Build the /analyze response from a finished pipeline run, keeping the models as-is."""
+    return analyze_body(run, pipeline.analysis_chain is not None)
+
+def admit(request: Request):
+    """Admission decision for a request that needs the chain stages (release it when they are done)."""
+    client = request.client.host if request.client else None
+    return admission_controller.admit(client_id(client, request.headers), pipeline.has_async_chains())
+
 @app.post("/analyze", response_model=Dict[str, Any])
-async def analyze_retirement(user_input: UserInput):
+async def analyze_retirement(user_input: UserInput, request: Request):
     """
     Analyze user's retirement readiness and provide AI-driven insights.
     
@@ -104,127 +209,138 @@ async def analyze_retirement(user_input: UserInput):
     1. Calculates retirement projection using compound interest
     2. Runs AI analysis for insights and recommendations
     3. Returns comprehensive analysis results
+    
+    Every stage goes through the shared pipeline, so repeated profiles are served
+    from cache; per-stage timings are returned in the Server-Timing header. If an
+    LLM chain misses the latency budget, the rule-based result is returned with
+    ai_enabled "partial" and the LLM answer is cached for the next request. When
+    admission control turns the request away from the LLM (client over its rate,
+    LLM queue full or LLM slow), it is answered rule-based with ai_enabled
+    "degraded"; "admission" reports the decision either way.
+    
+    The models are serialized straight to bytes (MessagePack when the client sends
+    Accept: application/x-msgpack).
     """
     try:
-        # Calculate retirement projection
-        projection = retirement_projection(user_input)
+        with admit(request) as admission:
+            run = await pipeline.run(user_input, admission.decision).acompute(ANALYZE_STAGES)
+            admission.release_after(run.backfill_task)
+        return negotiated_response(request, analyze_response_body(run), {"Server-Timing": run.server_timing()})
         
-        # Get AI analysis if available
-        if analysis_chain:
-            try:
-                # Pass projection data to analysis for optimized insights
-                projection_data = {
-                    'readiness_percentage': projection.readiness_percentage,
-                    'projected_corpus': projection.projected_corpus,
-                    'retirement_goal': projection.retirement_goal,
-                    'shortfall': projection.shortfall,
-                    'surplus': projection.surplus,
-                    'years_to_retirement': projection.years_to_retirement
-                }
-                analysis_result = analysis_chain.analyze_retirement_plan(user_input, projection_data)
-            except Exception as e:
-                print(f"AI analysis failed: {e}")
-                # Fallback to basic analysis
-                analysis_result = AnalysisResult(
-                    summary=f"Your retirement readiness is {projection.readiness_percentage:.1f}%",
-                    readiness_score=projection.readiness_percentage,
-                    corpus=projection.projected_corpus,
-                    confidence_level="Medium",
-                    key_insights=["Basic analysis completed"],
-                    risk_factors=["Standard market risks apply"]
-                )
-        else:
-            # Fallback when AI is not available
-            analysis_result = AnalysisResult(
-                summary=f"Your retirement readiness is {projection.readiness_percentage:.1f}%",
-                readiness_score=projection.readiness_percentage,
-                corpus=projection.projected_corpus,
-                confidence_level="Medium",
-                key_insights=["Basic analysis completed"],
-                risk_factors=["Standard market risks apply"]
-            )
-        
-        # Get strategy recommendations
-        if strategy_chain:
-            try:
-                # Pass projection data to strategy generation for optimized recommendations
-                projection_data = {
-                    'readiness_percentage': projection.readiness_percentage,
-                    'projected_corpus': projection.projected_corpus,
-                    'retirement_goal': projection.retirement_goal,
-                    'shortfall': projection.shortfall,
-                    'surplus': projection.surplus,
-                    'years_to_retirement': projection.years_to_retirement
-                }
-                strategy_response = strategy_chain.generate_strategies(user_input, analysis_result, projection_data)
-            except Exception as e:
-                print(f"Strategy generation failed: {e}")
-                # Fallback strategies
-                strategy_response = StrategyResponse(
-                    strategies=[],
-                    overall_priority="Medium",
-                    implementation_order=[]
-                )
-        else:
-            # Fallback strategies
-            strategy_response = StrategyResponse(
-                strategies=[],
-                overall_priority="Medium", 
-                implementation_order=[]
-            )
-        
-        # Calculate additional metrics
-        risk_assessment = calculate_risk_score(user_input)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {dumps_json(data).decode()}\n\n"
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that releases its admission however the response ends.
+    
+    The body generator only runs once Starlette starts iterating it, so a client
+    that disconnects before the first event (or a cancelled send) never reaches the
+    generator's finally; releasing around the whole ASGI call covers those paths.
+    """
+    
+    def __init__(self, content, admission, **kwargs):
+        super().__init__(content, **kwargs)
+        self.admission = admission
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.admission.release()
+
+@app.post("/analyze/stream")
+async def analyze_retirement_stream(user_input: UserInput, request: Request):
+    """
+    Progressive variant of /analyze, streamed as server-sent events.
+    
+    The deterministic projection and risk assessment are sent immediately; key
+    insights and strategies follow one event at a time as the chains produce them
+    (token events carry the raw LLM output when an LLM chain is streaming). The
+    full analysis and strategies events carry the final results, and a done event
+    closes the stream with the per-stage Server-Timing string.
+    
+    Consume it with fetch() and a stream reader (EventSource only supports GET).
+    """
+    admission = admit(request)
+    run = pipeline.run(user_input, admission.decision)
+    
+    async def events():
+        try:
+            async for event, data in run.astream():
+                yield format_sse(event, data)
+        except Exception as e:
+            yield format_sse("error", {"detail": f"Analysis failed: {str(e)}"})
+        finally:
+            admission.release()
+    
+    return AdmittedStreamingResponse(
+        events(),
+        admission,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/analyze/batch", response_model=Dict[str, Any])
+async def analyze_retirement_batch(batch_request: BatchAnalysisRequest, request: Request):
+    """
+    Project retirement readiness for a whole population in one vectorized pass.
+    
+    This endpoint:
+    1. Takes column arrays of profile fields (one entry per profile)
+    2. Validates the same bounds as UserInput for the projection fields
+    3. Returns corpus, readiness, shortfall and surplus arrays in input order
+    
+    The result arrays are serialized directly from numpy, without .tolist() copies.
+    """
+    age = np.asarray(batch_request.age, dtype=np.int64)
+    retirement_age = np.asarray(batch_request.retirement_age, dtype=np.int64)
+    current_savings = np.asarray(batch_request.current_savings, dtype=np.float64)
+    monthly_savings = np.asarray(batch_request.monthly_savings, dtype=np.float64)
+    retirement_goal = np.asarray(batch_request.retirement_goal, dtype=np.float64)
+    expected_returns = np.asarray(batch_request.expected_returns, dtype=np.float64)
+    
+    invalid = (
+        (age < 18) | (age > 100)
+        | (retirement_age < 50) | (retirement_age > 100) | (retirement_age <= age)
+        | (current_savings < 0) | (monthly_savings < 0) | (retirement_goal <= 0)
+        | (expected_returns < 0) | (expected_returns > 20)
+    )
+    if invalid.any():
+        rows = np.flatnonzero(invalid)[:20].tolist()
+        raise HTTPException(status_code=422, detail=f"Invalid profile values at rows: {rows}")
+    
+    try:
+        batch = retirement_projection_batch(
+            age, retirement_age, current_savings, monthly_savings, expected_returns, retirement_goal
+        )
+        readiness = batch["readiness_percentage"]
         
-        # Prepare response
-        response = {
+        return negotiated_response(request, {
             "success": True,
-            "projection": {
-                "current_age": projection.current_age,
-                "retirement_age": projection.retirement_age,
-                "years_to_retirement": projection.years_to_retirement,
-                "current_savings": projection.current_savings,
-                "monthly_savings": projection.monthly_savings,
-                "annual_savings": projection.annual_savings,
-                "expected_returns": projection.expected_returns,
-                "projected_corpus": projection.projected_corpus,
-                "retirement_goal": projection.retirement_goal,
-                "readiness_percentage": projection.readiness_percentage,
-                "shortfall": projection.shortfall,
-                "surplus": projection.surplus
-            },
-            "analysis": {
-                "summary": analysis_result.summary,
-                "readiness_score": analysis_result.readiness_score,
-                "corpus": analysis_result.corpus,
-                "confidence_level": analysis_result.confidence_level,
-                "key_insights": analysis_result.key_insights,
-                "risk_factors": analysis_result.risk_factors
-            },
-            "strategies": [
-                {
-                    "title": strategy.title,
-                    "description": strategy.description,
-                    "impact": strategy.impact,
-                    "timeframe": strategy.timeframe,
-                    "difficulty": strategy.difficulty,
-                    "expected_benefit": strategy.expected_benefit
-                }
-                for strategy in strategy_response.strategies
-            ],
-            "overall_priority": strategy_response.overall_priority,
-            "implementation_order": strategy_response.implementation_order,
-            "risk_assessment": risk_assessment,
-            "ai_enabled": analysis_chain is not None
-        }
-        
-        return response
+            "count": int(age.size),
+            "years_to_retirement": batch["years_to_retirement"],
+            "projected_corpus": batch["projected_corpus"],
+            "readiness_percentage": readiness,
+            "shortfall": batch["shortfall"],
+            "surplus": batch["surplus"],
+            "summary": {
+                "average_readiness": round(float(readiness.mean()), 2),
+                "median_readiness": round(float(np.median(readiness)), 2),
+                "on_track_count": int((readiness >= 100).sum()),
+                "total_shortfall": round(float(batch["shortfall"].sum()), 2)
+            }
+        })
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
 
 @app.post("/suggestions", response_model=Dict[str, Any])
-async def get_strategy_suggestions(user_input: UserInput):
+async def get_strategy_suggestions(user_input: UserInput, request: Request):
     """
     Get personalized strategy recommendations for improving retirement readiness.
     
@@ -232,101 +348,23 @@ async def get_strategy_suggestions(user_input: UserInput):
     1. Runs the analysis chain to understand the user's situation
     2. Generates 3 specific, actionable strategies
     3. Returns prioritized recommendations
+    
+    After an /analyze call for the same profile the analysis and strategies are
+    reused from the pipeline cache instead of being generated again.
     """
     try:
-        # Calculate retirement projection first
-        projection = retirement_projection(user_input)
-        
-        # Get analysis
-        if analysis_chain:
-            try:
-                # Pass projection data to analysis for optimized insights
-                projection_data = {
-                    'readiness_percentage': projection.readiness_percentage,
-                    'projected_corpus': projection.projected_corpus,
-                    'retirement_goal': projection.retirement_goal,
-                    'shortfall': projection.shortfall,
-                    'surplus': projection.surplus,
-                    'years_to_retirement': projection.years_to_retirement
-                }
-                analysis_result = analysis_chain.analyze_retirement_plan(user_input, projection_data)
-            except Exception as e:
-                print(f"Analysis failed: {e}")
-                # Create fallback analysis
-                analysis_result = AnalysisResult(
-                    summary=f"Your retirement readiness is {projection.readiness_percentage:.1f}%",
-                    readiness_score=projection.readiness_percentage,
-                    corpus=projection.projected_corpus,
-                    confidence_level="Medium",
-                    key_insights=["Basic analysis completed"],
-                    risk_factors=["Standard market risks apply"]
-                )
-        else:
-            # Fallback analysis
-            analysis_result = AnalysisResult(
-                summary=f"Your retirement readiness is {projection.readiness_percentage:.1f}%",
-                readiness_score=projection.readiness_percentage,
-                corpus=projection.projected_corpus,
-                confidence_level="Medium",
-                key_insights=["Basic analysis completed"],
-                risk_factors=["Standard market risks apply"]
-            )
-        
-        # Get strategy recommendations
-        if strategy_chain:
-            try:
-                # Pass projection data to strategy generation for optimized recommendations
-                projection_data = {
-                    'readiness_percentage': projection.readiness_percentage,
-                    'projected_corpus': projection.projected_corpus,
-                    'retirement_goal': projection.retirement_goal,
-                    'shortfall': projection.shortfall,
-                    'surplus': projection.surplus,
-                    'years_to_retirement': projection.years_to_retirement
-                }
-                strategy_response = strategy_chain.generate_strategies(user_input, analysis_result, projection_data)
-            except Exception as e:
-                print(f"Strategy generation failed: {e}")
-                # Fallback strategies
-                strategy_response = StrategyResponse(
-                    strategies=[],
-                    overall_priority="Medium",
-                    implementation_order=[]
-                )
-        else:
-            # Fallback strategies
-            strategy_response = StrategyResponse(
-                strategies=[],
-                overall_priority="Medium", 
-                implementation_order=[]
-            )
-        
-        # Prepare response
-        response = {
-            "success": True,
-            "strategies": [
-                {
-                    "title": strategy.title,
-                    "description": strategy.description,
-                    "impact": strategy.impact,
-                    "timeframe": strategy.timeframe,
-                    "difficulty": strategy.difficulty,
-                    "expected_benefit": strategy.expected_benefit
-                }
-                for strategy in strategy_response.strategies
-            ],
-            "overall_priority": strategy_response.overall_priority,
-            "implementation_order": strategy_response.implementation_order,
-            "ai_enabled": strategy_chain is not None
-        }
+        with admit(request) as admission:
+            run = await pipeline.run(user_input, admission.decision).acompute(("strategies",))
+            admission.release_after(run.backfill_task)
+        result = suggestions_body(run, pipeline.strategy_chain is not None)
         
-        return response
+        return negotiated_response(request, result, {"Server-Timing": run.server_timing()})
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Strategy generation failed: {str(e)}")
 
 @app.post("/simulate", response_model=Dict[str, Any])
-async def simulate_retirement(simulation_request: SimulationRequest):
+async def simulate_retirement(simulation_request: SimulationRequest, request: Request):
     """
     Run retirement simulations with modified parameters.
     
@@ -335,71 +373,80 @@ async def simulate_retirement(simulation_request: SimulationRequest):
     2. Calculates new projections with modified parameters
     3. Compares original vs. simulated results
     4. Provides recommendations based on differences
+    
+    With simulation_type "monte_carlo", the modified scenario is instead run over
+    thousands of random return/inflation paths and the probability of reaching the
+    retirement goal is reported with P10/P50/P90 corpus values.
     """
     try:
         # Get original projection
-        original_projection = retirement_projection(simulation_request.user_input)
+        original_run = pipeline.run(simulation_request.user_input)
+        original_projection = original_run.projection
+        
+        if simulation_request.simulation_type == "monte_carlo":
+            return negotiated_response(request, monte_carlo_body(simulation_request, original_projection))
         
         # Create simulation with modified parameters
-        simulated_projection = simulate_scenario(
-            simulation_request.user_input, 
-            simulation_request.modified_parameters
+        simulated_run = pipeline.run(
+            simulation_request.user_input.copy(update=simulation_request.modified_parameters)
         )
+        simulated_projection = simulated_run.projection
         
-        # Calculate differences
-        corpus_difference = simulated_projection.projected_corpus - original_projection.projected_corpus
-        readiness_difference = simulated_projection.readiness_percentage - original_projection.readiness_percentage
-        
-        # Generate recommendations based on simulation results
-        recommendations = []
+        result = what_if_body(simulation_request, original_projection, simulated_projection)
         
-        if corpus_difference > 0:
-            recommendations.append(f"Positive impact: Corpus increases by ${corpus_difference:,.2f}")
-        elif corpus_difference < 0:
-            recommendations.append(f"Negative impact: Corpus decreases by ${abs(corpus_difference):,.2f}")
+        server_timing = ", ".join([original_run.server_timing(), simulated_run.server_timing(prefix="simulated_")])
+        return negotiated_response(request, result, {"Server-Timing": server_timing})
         
-        if readiness_difference > 0:
-            recommendations.append(f"Readiness improves by {readiness_difference:.1f} percentage points")
-        elif readiness_difference < 0:
-            recommendations.append(f"Readiness decreases by {abs(readiness_difference):,.1f} percentage points")
-        
-        if simulated_projection.readiness_percentage >= 100:
-            recommendations.append("This scenario would achieve your retirement goal!")
-        elif simulated_projection.readiness_percentage >= 80:
-            recommendations.append("This scenario gets you close to your retirement goal")
-        else:
-            recommendations.append("This scenario still falls short of your retirement goal")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
+
+@app.post("/simulate/grid", response_model=Dict[str, Any])
+async def simulate_retirement_grid(grid_request: SimulationGridRequest, request: Request):
+    """
+    Compute readiness and corpus for every combination of two or three parameter ranges.
+    
+    This endpoint:
+    1. Expands each range into evenly spaced values
+    2. Broadcasts all combinations against the base user input in one vectorized pass
+    3. Returns nested readiness/corpus tensors indexed in the order the ranges were given
+    """
+    user_input = grid_request.user_input
+    
+    axes = {}
+    for name, grid_range in grid_request.ranges.items():
+        if name not in GRID_PARAMETERS:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unsupported grid parameter '{name}'. Use one of: {', '.join(GRID_PARAMETERS)}"
+            )
+        values = np.linspace(grid_range.start, grid_range.stop, grid_range.steps)
+        if name == "retirement_age":
+            values = np.unique(np.rint(values))
+            if values.min() <= user_input.age or values.max() > 100:
+                raise HTTPException(status_code=422, detail="Retirement ages must be above current age and at most 100")
+        # Same bounds as UserInput and /analyze/batch
+        elif name == "retirement_goal" and values.min() <= 0:
+            raise HTTPException(status_code=422, detail="Grid values for 'retirement_goal' must be greater than 0")
+        elif name == "expected_returns" and (values.min() < 0 or values.max() > 20):
+            raise HTTPException(status_code=422, detail="Grid values for 'expected_returns' must be between 0 and 20")
+        elif values.min() < 0:
+            raise HTTPException(status_code=422, detail=f"Grid values for '{name}' cannot be negative")
+        axes[name] = values.tolist()
+    
+    try:
+        grid = sensitivity_grid(user_input, axes)
         
-        # Prepare response
-        response = {
+        return negotiated_response(request, {
             "success": True,
-            "simulation_type": simulation_request.simulation_type,
-            "original_projection": {
-                "projected_corpus": original_projection.projected_corpus,
-                "readiness_percentage": original_projection.readiness_percentage,
-                "shortfall": original_projection.shortfall,
-                "surplus": original_projection.surplus
-            },
-            "simulated_projection": {
-                "projected_corpus": simulated_projection.projected_corpus,
-                "readiness_percentage": simulated_projection.readiness_percentage,
-                "shortfall": simulated_projection.shortfall,
-                "surplus": simulated_projection.surplus
-            },
-            "differences": {
-                "corpus_difference": corpus_difference,
-                "readiness_difference": readiness_difference,
-                "shortfall_change": simulated_projection.shortfall - original_projection.shortfall,
-                "surplus_change": simulated_projection.surplus - original_projection.surplus
-            },
-            "recommendations": recommendations,
-            "modified_parameters": simulation_request.modified_parameters
-        }
-        
-        return response
+            "parameters": list(axes.keys()),
+            "axes": grid["axes"],
+            "shape": list(grid["readiness_percentage"].shape),
+            "readiness_percentage": grid["readiness_percentage"],
+            "projected_corpus": grid["projected_corpus"]
+        })
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Grid simulation failed: {str(e)}")
 
 @app.get("/sample-inputs")
 async def get_sample_inputs():
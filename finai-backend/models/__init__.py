@@ -9,7 +9,10 @@ from .user_input import (
     StrategyRecommendation,
     StrategyResponse,
     SimulationRequest,
-    SimulationResult
+    SimulationResult,
+    BatchAnalysisRequest,
+    GridRange,
+    SimulationGridRequest
 )
 
 __all__ = [
@@ -19,5 +22,8 @@ __all__ = [
     "StrategyRecommendation",
     "StrategyResponse",
     "SimulationRequest",
-    "SimulationResult"
+    "SimulationResult",
+    "BatchAnalysisRequest",
+    "GridRange",
+    "SimulationGridRequest"
 ]
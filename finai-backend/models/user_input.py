@@ -2,7 +2,7 @@
 Pydantic models for user input validation in the AI-Driven Retirement Planner.
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 from typing import Optional
 from datetime import datetime
 
@@ -27,12 +27,15 @@ class UserInput(BaseModel):
     retirement_goal: float = Field(..., gt=0, description="Target retirement corpus in INR")
     expected_inflation: float = Field(default=3.0, ge=0, le=10, description="Expected annual inflation rate (%)")
     expected_returns: float = Field(default=6.0, ge=0, le=20, description="Expected annual investment returns (%)")
+    sip_step_up: Optional[float] = Field(default=0.0, ge=0, le=50, description="Annual increase in monthly savings (SIP step-up, %)")
     
     # Optional Information (Indian Context)
     employer_pf: Optional[float] = Field(default=0.0, ge=0, le=100, description="Employer PF contribution percentage")
     epf_balance: Optional[float] = Field(default=0.0, ge=0, description="Current EPF balance")
     ppf_balance: Optional[float] = Field(default=0.0, ge=0, description="Current PPF balance")
     nps_balance: Optional[float] = Field(default=0.0, ge=0, description="Current NPS balance")
+    ppf_contribution: Optional[float] = Field(default=0.0, ge=0, description="Annual PPF deposit (capped at ₹1.5L)")
+    nps_contribution: Optional[float] = Field(default=0.0, ge=0, description="Monthly NPS contribution")
     other_income: Optional[float] = Field(default=0.0, ge=0, description="Other expected retirement income (pension, rental, etc.)")
     
     @validator('retirement_age')
@@ -72,6 +75,7 @@ class RetirementProjection(BaseModel):
     annual_savings: float
     expected_returns: float
     projected_corpus: float
+    instrument_corpus: float = 0.0  # EPF + PPF + NPS part of projected_corpus
     retirement_goal: float
     readiness_percentage: float
     shortfall: float
@@ -89,6 +93,9 @@ class AnalysisResult(BaseModel):
     confidence_level: str
     key_insights: list[str]
     risk_factors: list[str]
+    
+    # True when an LLM chain built this as a fallback after a failed call (not cached, not serialized)
+    _fallback: bool = PrivateAttr(default=False)
 
 
 class StrategyRecommendation(BaseModel):
@@ -112,6 +119,9 @@ class StrategyResponse(BaseModel):
     strategies: list[StrategyRecommendation]
     overall_priority: str
     implementation_order: list[str]
+    
+    # True when an LLM chain built this as a fallback after a failed call (not cached, not serialized)
+    _fallback: bool = PrivateAttr(default=False)
 
 
 class SimulationRequest(BaseModel):
@@ -120,8 +130,14 @@ class SimulationRequest(BaseModel):
     """
     
     user_input: UserInput
-    modified_parameters: dict = Field(..., description="Parameters to modify for simulation")
-    simulation_type: str = Field(default="what_if", description="Type of simulation to run")
+    modified_parameters: dict = Field(default_factory=dict, description="Parameters to modify for simulation")
+    simulation_type: str = Field(default="what_if", description="Type of simulation to run (what_if or monte_carlo)")
+    
+    # Monte Carlo settings (used when simulation_type is "monte_carlo")
+    num_simulations: int = Field(default=10000, ge=100, le=100000, description="Number of Monte Carlo paths")
+    return_volatility: float = Field(default=15.0, ge=0, le=50, description="Standard deviation of annual returns (%)")
+    inflation_volatility: float = Field(default=1.0, ge=0, le=10, description="Standard deviation of annual inflation (%)")
+    seed: Optional[int] = Field(default=None, description="Random seed for reproducible Monte Carlo runs")
 
 
 class SimulationResult(BaseModel):
@@ -133,3 +149,48 @@ class SimulationResult(BaseModel):
     simulated_projection: RetirementProjection
     difference: dict
     recommendations: list[str]
+
+
+class BatchAnalysisRequest(BaseModel):
+    """
+    Model for batch projection requests in struct-of-arrays form.
+    Each field holds one value per profile; all lists must have the same length.
+    """
+    
+    age: list[int] = Field(..., min_length=1, description="Current ages")
+    retirement_age: list[int] = Field(..., description="Target retirement ages")
+    current_savings: list[float] = Field(..., description="Current savings/investments in INR")
+    monthly_savings: list[float] = Field(..., description="Monthly savings amounts in INR")
+    retirement_goal: list[float] = Field(..., description="Target retirement corpus amounts in INR")
+    expected_returns: list[float] = Field(..., description="Expected annual investment returns (%)")
+    
+    @validator('retirement_age', 'current_savings', 'monthly_savings', 'retirement_goal', 'expected_returns')
+    def columns_must_have_equal_length(cls, v, values):
+        if 'age' in values and len(v) != len(values['age']):
+            raise ValueError('All batch columns must have the same length as age')
+        return v
+
+
+class GridRange(BaseModel):
+    """
+    Model for one axis of a sensitivity grid: evenly spaced values from start to stop.
+    """
+    
+    start: float
+    stop: float
+    steps: int = Field(..., ge=1, le=200, description="Number of values including both ends")
+
+
+class SimulationGridRequest(BaseModel):
+    """
+    Model for sensitivity grid requests over two or three parameters.
+    """
+    
+    user_input: UserInput
+    ranges: dict[str, GridRange] = Field(..., description="Parameter name to range, in axis order")
+    
+    @validator('ranges')
+    def must_have_two_or_three_axes(cls, v):
+        if not 2 <= len(v) <= 3:
+            raise ValueError('Sensitivity grids take two or three parameter ranges')
+        return v
@@ -0,0 +1,372 @@
+"""
+Prefork launcher for the FastAPI app in production.
+
+The master process binds the listening socket once and forks N uvicorn workers
+that accept from it. Each worker imports the app, warms the calculation, chain
+and serialization paths and runs the app's startup (chains, cohort index) before
+it accepts traffic, then reports its startup time to the master.
+
+- Crashed workers are restarted, with exponential backoff while they keep failing
+  before becoming ready
+- SIGHUP reloads gracefully: a new generation of workers (with freshly imported
+  code) starts, and only once all of them are ready are the old workers asked to
+  finish their in-flight requests and exit
+- SIGINT/SIGTERM stop every worker gracefully (GRACEFUL_TIMEOUT_SECONDS)
+- Dependencies are not installed: run `pip install -r requirements.txt` once
+
+Startup times (import, warm-up, app startup, total) are printed per worker and,
+with --startup-report, appended to a JSON-lines file to track cold-start regressions.
+
+Usage (from finai-backend/):
+    python prefork.py --workers 4 --port 8000
+    kill -HUP <master pid>                      # graceful reload
+"""
+
+import os
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import multiprocessing
+from multiprocessing.connection import wait
+from queue import Empty
+from typing import Any, Callable, Dict, List, Optional
+
+
+WORKERS = int(os.getenv("WORKERS", str(os.cpu_count() or 1)))
+GRACEFUL_TIMEOUT_SECONDS = float(os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30"))
+WORKER_READY_TIMEOUT_SECONDS = float(os.getenv("WORKER_READY_TIMEOUT_SECONDS", "120"))
+STARTUP_REPORT_PATH = os.getenv("STARTUP_REPORT_PATH")
+
+# Restart delay after a worker dies before becoming ready: doubles up to the maximum
+RESTART_BACKOFF_SECONDS = 0.5
+RESTART_BACKOFF_MAX_SECONDS = 30.0
+
+SAMPLE_PROFILE = {
+    "age": 35,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket shared by all workers (inherited across fork)."""
+
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def warm_up() -> None:
+    """
+    Run a sample profile through every stage once, outside the app's shared caches.
+
+    Pays for lazy imports, the cohort index load, numpy first-call setup and
+    serializer initialization before the first real request does.
+    """
+
+    from models.user_input import UserInput
+    from utils.cache import LRUCache
+    from utils.cohort import get_cohort_index
+    from utils.responses import analyze_body
+    from utils.serialization import dumps_json
+    from chains.simple_analysis import SimpleRetirementAnalysis
+    from chains.simple_strategy import SimpleRetirementStrategy
+    from chains.pipeline import AnalysisPipeline, STAGES
+
+    get_cohort_index()
+    pipeline = AnalysisPipeline(SimpleRetirementAnalysis(), SimpleRetirementStrategy(), cache=LRUCache(64, 0))
+    run = asyncio.run(pipeline.run(UserInput(**SAMPLE_PROFILE)).acompute(STAGES))
+    dumps_json(analyze_body(run, False))
+
+
+def serve_worker(sock: socket.socket, ready_queue, generation: int, spawned_at: float) -> None:
+    """
+    Worker process: import and warm the app, then serve it with uvicorn on the shared socket.
+
+    Sends {"pid", "generation", "import_seconds", "warmup_seconds", "app_startup_seconds",
+    "startup_seconds"} to the master once uvicorn is accepting connections.
+    """
+
+    start = time.time()
+    import uvicorn
+    import main
+
+    imported = time.time()
+    warm_up()
+    warmed = time.time()
+
+    # uvicorn runs the app's startup (chains) before it starts accepting
+    server = uvicorn.Server(uvicorn.Config(
+        main.app, timeout_graceful_shutdown=GRACEFUL_TIMEOUT_SECONDS, log_level="warning"
+    ))
+
+    async def serve():
+        task = asyncio.create_task(server.serve(sockets=[sock]))
+        while not server.started and not task.done():
+            await asyncio.sleep(0.01)
+        if server.started:
+            ready = time.time()
+            ready_queue.put({
+                "pid": os.getpid(),
+                "generation": generation,
+                "import_seconds": round(imported - start, 4),
+                "warmup_seconds": round(warmed - imported, 4),
+                "app_startup_seconds": round(ready - warmed, 4),
+                "startup_seconds": round(ready - spawned_at, 4)
+            })
+        await task
+
+    server.config.setup_event_loop()  # uvloop when installed
+    asyncio.run(serve())
+
+
+class Worker:
+    """A worker process and its lifecycle state."""
+
+    def __init__(self, process: multiprocessing.Process, generation: int, spawned_at: float):
+        self.process = process
+        self.generation = generation
+        self.spawned_at = spawned_at
+        self.ready = False
+        self.stopping = False
+        self.stop_deadline = 0.0
+
+
+class Supervisor:
+    """
+    Keeps `workers` worker processes of the current generation running.
+    """
+
+    def __init__(self, sock: socket.socket, workers: int = WORKERS,
+                 target: Callable[..., None] = serve_worker, startup_report: Optional[str] = STARTUP_REPORT_PATH,
+                 graceful_timeout: float = GRACEFUL_TIMEOUT_SECONDS,
+                 ready_timeout: float = WORKER_READY_TIMEOUT_SECONDS):
+        """
+        Initialize the supervisor.
+
+        Args:
+            sock: Listening socket passed to every worker
+            workers: Number of workers per generation
+            target: Worker entry point, called as target(sock, ready_queue, generation, spawned_at)
+            startup_report: JSON-lines file for per-worker startup times (None to only print them)
+            graceful_timeout: Seconds a stopping worker gets before it is killed
+            ready_timeout: Seconds a reload waits for the new generation before giving up
+        """
+
+        self.sock = sock
+        self.workers = workers
+        self.target = target
+        self.startup_report = startup_report
+        self.graceful_timeout = graceful_timeout
+        self.ready_timeout = ready_timeout
+        self.context = multiprocessing.get_context("fork")
+        self.ready_queue = self.context.Queue()
+        self.generation = 0
+        self.pool: List[Worker] = []
+        self.restarts = 0
+        self.startup_times: List[Dict[str, Any]] = []
+        self._backoff = RESTART_BACKOFF_SECONDS
+        self._next_spawn_at = 0.0
+        self._reload_started: Optional[float] = None
+        self._reload_requested = False
+        self._stop_requested = False
+
+    def spawn(self) -> Worker:
+        """Start one worker of the current generation."""
+
+        spawned_at = time.time()
+        process = self.context.Process(
+            target=self.target, args=(self.sock, self.ready_queue, self.generation, spawned_at), daemon=True
+        )
+        process.start()
+        worker = Worker(process, self.generation, spawned_at)
+        self.pool.append(worker)
+        return worker
+
+    def start(self) -> None:
+        """Start the first generation of workers."""
+
+        for _ in range(self.workers):
+            self.spawn()
+
+    def current(self) -> List[Worker]:
+        """Running workers of the current generation."""
+
+        return [worker for worker in self.pool if worker.generation == self.generation and not worker.stopping]
+
+    def _stop_worker(self, worker: Worker) -> None:
+        """Ask a worker to finish in-flight requests and exit (uvicorn handles SIGTERM gracefully)."""
+
+        if not worker.stopping and worker.process.pid is not None:
+            worker.stopping = True
+            worker.stop_deadline = time.time() + self.graceful_timeout
+            try:
+                os.kill(worker.process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _record_ready(self, report: Dict[str, Any]) -> None:
+        """Mark a worker ready and report its startup time."""
+
+        for worker in self.pool:
+            if worker.process.pid == report["pid"]:
+                worker.ready = True
+        self._backoff = RESTART_BACKOFF_SECONDS
+        self.startup_times.append(report)
+        print(
+            f"✅ Worker {report['pid']} (generation {report['generation']}) ready in {report['startup_seconds']:.2f}s "
+            f"(import {report.get('import_seconds', 0):.2f}s, warm-up {report.get('warmup_seconds', 0):.2f}s, "
+            f"app startup {report.get('app_startup_seconds', 0):.2f}s)"
+        )
+        if self.startup_report:
+            with open(self.startup_report, "a") as f:
+                f.write(json.dumps({"timestamp": time.time(), **report}) + "\n")
+
+    def request_reload(self) -> None:
+        """Start a graceful reload on the next poll."""
+
+        self._reload_requested = True
+
+    def request_stop(self) -> None:
+        """Stop on the next poll."""
+
+        self._stop_requested = True
+
+    def _begin_reload(self) -> None:
+        """Start a new generation; the old one keeps serving until it is ready."""
+
+        self._reload_requested = False
+        if self._reload_started is not None:
+            return
+        print(f"🔄 Reloading: starting generation {self.generation + 1}")
+        self.generation += 1
+        self._reload_started = time.time()
+        for _ in range(self.workers):
+            self.spawn()
+
+    def _check_reload(self) -> None:
+        """Retire the old generation once the new one is ready, or abandon a reload that does not come up."""
+
+        if self._reload_started is None:
+            return
+        new = self.current()
+        if len(new) == self.workers and all(worker.ready for worker in new):
+            for worker in self.pool:
+                if worker.generation < self.generation:
+                    self._stop_worker(worker)
+            self._reload_started = None
+            print(f"✅ Reload complete: generation {self.generation} serving")
+        elif time.time() - self._reload_started > self.ready_timeout:
+            print(f"❌ Generation {self.generation} did not become ready; keeping generation {self.generation - 1}")
+            for worker in new:
+                self._stop_worker(worker)
+            self.generation -= 1
+            self._reload_started = None
+
+    def poll(self, timeout: float = 0.2) -> None:
+        """
+        Handle ready reports, exited workers, restarts and reloads.
+
+        Args:
+            timeout: Longest time to wait for a worker to exit
+        """
+
+        if self._reload_requested:
+            self._begin_reload()
+
+        wait([worker.process.sentinel for worker in self.pool], timeout)
+
+        while True:
+            try:
+                self._record_ready(self.ready_queue.get_nowait())
+            except Empty:
+                break
+
+        now = time.time()
+        for worker in list(self.pool):
+            if worker.process.is_alive():
+                if worker.stopping and now > worker.stop_deadline:
+                    worker.process.kill()
+                continue
+            worker.process.join()
+            self.pool.remove(worker)
+            if worker.stopping or worker.generation != self.generation or self._stop_requested:
+                continue
+            print(f"⚠️  Worker {worker.process.pid} exited with code {worker.process.exitcode}; restarting")
+            self.restarts += 1
+            if not worker.ready:
+                # Back off while workers keep dying before they become ready
+                self._next_spawn_at = now + self._backoff
+                self._backoff = min(self._backoff * 2, RESTART_BACKOFF_MAX_SECONDS)
+
+        if not self._stop_requested and now >= self._next_spawn_at:
+            for _ in range(self.workers - len(self.current())):
+                self.spawn()
+
+        self._check_reload()
+
+    def shutdown(self) -> None:
+        """Stop every worker gracefully, killing those that outlive the graceful timeout."""
+
+        for worker in self.pool:
+            self._stop_worker(worker)
+        deadline = time.time() + self.graceful_timeout
+        for worker in self.pool:
+            worker.process.join(max(0.0, deadline - time.time()))
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+        self.pool.clear()
+
+    def run(self) -> None:
+        """Supervise until SIGINT/SIGTERM; SIGHUP reloads."""
+
+        signal.signal(signal.SIGINT, lambda *_: self.request_stop())
+        signal.signal(signal.SIGTERM, lambda *_: self.request_stop())
+        signal.signal(signal.SIGHUP, lambda *_: self.request_reload())
+        self.start()
+        try:
+            while not self._stop_requested:
+                self.poll()
+        finally:
+            print("\n👋 Stopping workers...")
+            self.shutdown()
+
+
+def main():
+    """Parse arguments and run the supervisor."""
+
+    parser = argparse.ArgumentParser(description="Prefork launcher for the retirement planner API")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"), help="Interface to bind")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")), help="Port to bind")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Worker processes (default: CPU count)")
+    parser.add_argument("--startup-report", default=STARTUP_REPORT_PATH,
+                        help="Append per-worker startup times to this JSON-lines file")
+    args = parser.parse_args()
+
+    if not hasattr(signal, "SIGHUP") or "fork" not in multiprocessing.get_all_start_methods():
+        # Windows: no fork or SIGHUP, so run a single uvicorn process
+        import uvicorn
+        print("⚠️  Prefork needs fork(); starting a single worker")
+        uvicorn.run("main:app", host=args.host, port=args.port)
+        return
+
+    sock = bind_socket(args.host, args.port)
+    print(f"🚀 Master {os.getpid()} listening on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    print(f"🔄 Graceful reload: kill -HUP {os.getpid()}")
+    Supervisor(sock, max(1, args.workers), startup_report=args.startup_report).run()
+
+
+if __name__ == "__main__":
+    main()
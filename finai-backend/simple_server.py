@@ -1,190 +1,413 @@
 """
-Ultra-simple HTTP server for retirement analysis
-No FastAPI dependencies - just pure Python
+Minimal-footprint asyncio HTTP server for retirement analysis.
+
+No web framework: a stdlib asyncio HTTP/1.1 server serving /analyze, /suggestions,
+/simulate and /health through the same pipeline and formulas as main.py (with the
+rule-based chains), so responses match the FastAPI app.
+
+- Keep-alive: HTTP/1.1 connections stay open (HTTP/1.0 with "Connection: keep-alive")
+  until the client closes them or they are idle for SIMPLE_SERVER_KEEPALIVE_SECONDS
+- Pipelining: requests sent back-to-back on one connection are answered in order
+- Bounded requests: headers over SIMPLE_SERVER_MAX_HEADER_BYTES get 431, bodies over
+  SIMPLE_SERVER_MAX_BODY_BYTES get 413 without being read
+- Multiple cores: --workers N starts N processes that share the port via SO_REUSEPORT
+
+Usage (from finai-backend/):
+    python simple_server.py                   # one process on HOST:PORT (default 0.0.0.0:8000)
+    python simple_server.py --workers 4       # four processes sharing the port
 """
-import json
-import http.server
-import socketserver
-from urllib.parse import urlparse, parse_qs
-import math
-
-class RetirementHandler(http.server.BaseHTTPRequestHandler):
-    def do_OPTIONS(self):
-        """Handle CORS preflight requests"""
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-
-    def do_GET(self):
-        """Handle GET requests"""
-        if self.path == '/':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            response = {
-                "message": "AI Retirement Planner API",
-                "status": "active",
-                "version": "1.0.0"
-            }
-            self.wfile.write(json.dumps(response).encode())
-            
-        elif self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            response = {
-                "status": "healthy",
-                "ai_enabled": True,
-                "timestamp": "2024-01-01T00:00:00Z"
-            }
-            self.wfile.write(json.dumps(response).encode())
-        else:
-            self.send_response(404)
-            self.end_headers()
-
-    def do_POST(self):
-        """Handle POST requests"""
-        if self.path == '/analyze':
-            # Read request body
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            
+
+import os
+import time
+import socket
+import asyncio
+import argparse
+import multiprocessing
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+import orjson
+from pydantic import ValidationError
+
+from models.user_input import UserInput, SimulationRequest
+from utils.cache import calculation_cache
+from utils.cohort import get_cohort_index
+from utils.serialization import dumps_json
+from utils.metrics import metrics, observe_request, observe_stage, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils.responses import analyze_body, suggestions_body, what_if_body, monte_carlo_body
+from chains.simple_analysis import SimpleRetirementAnalysis
+from chains.simple_strategy import SimpleRetirementStrategy
+from chains.pipeline import AnalysisPipeline, STAGES as ANALYZE_STAGES
+
+
+MAX_HEADER_BYTES = int(os.getenv("SIMPLE_SERVER_MAX_HEADER_BYTES", str(16 * 1024)))
+MAX_BODY_BYTES = int(os.getenv("SIMPLE_SERVER_MAX_BODY_BYTES", str(64 * 1024)))
+KEEPALIVE_SECONDS = float(os.getenv("SIMPLE_SERVER_KEEPALIVE_SECONDS", "5"))
+
+CORS_HEADERS = (
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, POST, OPTIONS"),
+    ("Access-Control-Allow-Headers", "Content-Type")
+)
+
+# Rule-based chains: no API key or network access needed
+pipeline = AnalysisPipeline(SimpleRetirementAnalysis(), SimpleRetirementStrategy())
+
+# Per-process connection and request counters, reported by /health
+server_stats = {"connections": 0, "open_connections": 0, "requests": 0, "errors": 0}
+
+
+class HTTPRequest(NamedTuple):
+    """One parsed request."""
+
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+
+class HTTPError(Exception):
+    """Error answered with a JSON {"detail": ...} body."""
+
+    def __init__(self, status: int, detail: Any):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+Handler = Callable[[HTTPRequest], Awaitable[Tuple[Any, Dict[str, str]]]]
+
+
+def parse_json(request: HTTPRequest, model):
+    """Validate a JSON request body against a pydantic model (422 on invalid input, as in FastAPI)."""
+
+    start = time.perf_counter()
+    try:
+        validated = model(**orjson.loads(request.body))
+        observe_stage("validation", time.perf_counter() - start)
+        return validated
+    except orjson.JSONDecodeError as e:
+        raise HTTPError(422, f"Invalid JSON body: {e}")
+    except TypeError:
+        raise HTTPError(422, "Request body must be a JSON object")
+    except ValidationError as e:
+        raise HTTPError(422, orjson.loads(e.json(include_url=False)))
+
+
+async def root(request: HTTPRequest):
+    """API information."""
+
+    return {
+        "message": "AI Retirement Planner API",
+        "status": "active",
+        "version": "1.0.0",
+        "endpoints": {
+            "analyze": "/analyze - Analyze retirement readiness",
+            "suggestions": "/suggestions - Get strategy recommendations",
+            "simulate": "/simulate - Run retirement simulations",
+            "health": "/health - Health check",
+            "metrics": "/metrics - Prometheus metrics"
+        }
+    }, {}
+
+
+async def health(request: HTTPRequest):
+    """Health check with this worker's cache, pipeline and connection counters."""
+
+    return {
+        "status": "healthy",
+        "ai_enabled": False,
+        "worker_pid": os.getpid(),
+        "server": server_stats,
+        "calculation_cache": calculation_cache.stats(),
+        "pipeline_stages": pipeline.stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }, {}
+
+
+async def prometheus_metrics(request: HTTPRequest):
+    """This worker's metrics in the Prometheus text format, as served by the FastAPI app."""
+
+    return metrics.render().encode(), {"Content-Type": METRICS_CONTENT_TYPE}
+
+
+async def analyze(request: HTTPRequest):
+    """Same response as the FastAPI /analyze endpoint."""
+
+    user_input = parse_json(request, UserInput)
+    try:
+        run = await pipeline.run(user_input).acompute(ANALYZE_STAGES)
+        return analyze_body(run, False), {"Server-Timing": run.server_timing()}
+    except Exception as e:
+        raise HTTPError(500, f"Analysis failed: {str(e)}")
+
+
+async def suggestions(request: HTTPRequest):
+    """Same response as the FastAPI /suggestions endpoint."""
+
+    user_input = parse_json(request, UserInput)
+    try:
+        run = await pipeline.run(user_input).acompute(("strategies",))
+        return suggestions_body(run, False), {"Server-Timing": run.server_timing()}
+    except Exception as e:
+        raise HTTPError(500, f"Strategy generation failed: {str(e)}")
+
+
+async def simulate(request: HTTPRequest):
+    """Same response as the FastAPI /simulate endpoint."""
+
+    simulation_request = parse_json(request, SimulationRequest)
+    try:
+        original_run = pipeline.run(simulation_request.user_input)
+        original_projection = original_run.projection
+
+        if simulation_request.simulation_type == "monte_carlo":
+            # Thousands of paths: keep the event loop free for other connections
+            return await asyncio.to_thread(monte_carlo_body, simulation_request, original_projection), {}
+
+        simulated_run = pipeline.run(
+            simulation_request.user_input.copy(update=simulation_request.modified_parameters)
+        )
+        server_timing = ", ".join([original_run.server_timing(), simulated_run.server_timing(prefix="simulated_")])
+        return what_if_body(simulation_request, original_projection, simulated_run.projection), {"Server-Timing": server_timing}
+    except Exception as e:
+        raise HTTPError(500, f"Simulation failed: {str(e)}")
+
+
+ROUTES: Dict[Tuple[str, str], Handler] = {
+    ("GET", "/"): root,
+    ("GET", "/health"): health,
+    ("GET", "/metrics"): prometheus_metrics,
+    ("POST", "/analyze"): analyze,
+    ("POST", "/suggestions"): suggestions,
+    ("POST", "/simulate"): simulate
+}
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[HTTPRequest]:
+    """
+    Read one request from the connection.
+
+    Args:
+        reader: Connection reader (created with limit=MAX_HEADER_BYTES)
+
+    Returns:
+        The parsed request, or None when the client closed the connection between requests
+
+    Raises:
+        HTTPError: Malformed request line, oversized headers or body (answered, then the connection is closed)
+        asyncio.TimeoutError: The connection was idle for KEEPALIVE_SECONDS
+    """
+
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_SECONDS)
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise HTTPError(400, "Incomplete request")
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request headers too large")
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    if "transfer-encoding" in headers:
+        raise HTTPError(501, "Chunked request bodies are not supported; send Content-Length")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+    try:
+        body = await asyncio.wait_for(reader.readexactly(length), KEEPALIVE_SECONDS) if length else b""
+    except asyncio.IncompleteReadError:
+        raise HTTPError(400, "Incomplete request body")
+
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.1":
+        keep_alive = connection != "close"
+    else:
+        keep_alive = connection == "keep-alive"
+
+    return HTTPRequest(method, target.split("?", 1)[0], headers, body, keep_alive)
+
+
+def encode_response(status: int, body: bytes, keep_alive: bool, headers: Dict[str, str] = None) -> bytes:
+    """Status line, headers and body of a response (JSON unless headers set a Content-Type)."""
+
+    headers = headers or {}
+    lines = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        f"Content-Type: {headers.get('Content-Type', 'application/json')}",
+        f"Content-Length: {len(body)}",
+        "Connection: keep-alive" if keep_alive else "Connection: close"
+    ]
+    lines.extend(f"{name}: {value}" for name, value in CORS_HEADERS)
+    lines.extend(f"{name}: {value}" for name, value in headers.items() if name != "Content-Type")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def respond(request: HTTPRequest) -> Tuple[int, bytes, Dict[str, str]]:
+    """Dispatch a request to its route and serialize the result."""
+
+    if request.method == "OPTIONS":
+        return 200, b"", {}
+
+    handler = ROUTES.get((request.method, request.path))
+    if handler is None:
+        if any(path == request.path for _, path in ROUTES):
+            raise HTTPError(405, "Method Not Allowed")
+        raise HTTPError(404, "Not Found")
+
+    content, headers = await handler(request)
+    if isinstance(content, bytes):
+        return 200, content, headers
+    start = time.perf_counter()
+    body = dumps_json(content)
+    observe_stage("serialization", time.perf_counter() - start)
+    return 200, body, headers
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve requests on one connection, in order, until it closes or goes idle."""
+
+    server_stats["connections"] += 1
+    server_stats["open_connections"] += 1
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except HTTPError as e:
+                server_stats["errors"] += 1
+                writer.write(encode_response(e.status, dumps_json({"detail": e.detail}), False))
+                await writer.drain()
+                break
+            except asyncio.TimeoutError:
+                break
+            if request is None:
+                break
+
+            server_stats["requests"] += 1
+            start = time.perf_counter()
             try:
-                # Parse JSON data
-                user_data = json.loads(post_data.decode('utf-8'))
-                
-                # Calculate retirement analysis
-                result = self.calculate_retirement(user_data)
-                
-                # Send response
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                error_response = {"success": False, "error": str(e)}
-                self.wfile.write(json.dumps(error_response).encode())
-        else:
-            self.send_response(404)
-            self.end_headers()
-
-    def calculate_retirement(self, user_input):
-        """Calculate retirement analysis"""
-        try:
-            # Extract data
-            age = user_input.get('age', 30)
-            retirement_age = user_input.get('retirement_age', 65)
-            annual_income = user_input.get('annual_income', 0)
-            monthly_expenses = user_input.get('monthly_expenses', 0)
-            current_savings = user_input.get('current_savings', 0)
-            monthly_savings = user_input.get('monthly_savings', 0)
-            retirement_goal = user_input.get('retirement_goal', 1000000)
-            expected_returns = user_input.get('expected_returns', 6.0)
-            
-            # Calculate years to retirement
-            years_to_retirement = retirement_age - age
-            
-            # Calculate annual savings
-            annual_savings = monthly_savings * 12
-            
-            # Simple compound interest calculation
-            projected_corpus = current_savings
-            for year in range(years_to_retirement):
-                projected_corpus = projected_corpus * (1 + expected_returns/100) + annual_savings
-            
-            # Calculate readiness
-            readiness_percentage = (projected_corpus / retirement_goal) * 100
-            shortfall = max(0, retirement_goal - projected_corpus)
-            surplus = max(0, projected_corpus - retirement_goal)
-            
-            return {
-                "success": True,
-                "projection": {
-                    "current_age": age,
-                    "retirement_age": retirement_age,
-                    "years_to_retirement": years_to_retirement,
-                    "current_savings": current_savings,
-                    "monthly_savings": monthly_savings,
-                    "annual_savings": annual_savings,
-                    "expected_returns": expected_returns,
-                    "projected_corpus": projected_corpus,
-                    "retirement_goal": retirement_goal,
-                    "readiness_percentage": readiness_percentage,
-                    "shortfall": shortfall,
-                    "surplus": surplus
-                },
-                "analysis": {
-                    "summary": f"Your retirement readiness is {readiness_percentage:.1f}%",
-                    "readiness_score": readiness_percentage,
-                    "corpus": projected_corpus,
-                    "confidence_level": "High",
-                    "key_insights": [
-                        f"You need to save ₹{annual_savings:,.0f} annually",
-                        f"Expected corpus: ₹{projected_corpus:,.0f}",
-                        f"Goal: ₹{retirement_goal:,.0f}"
-                    ],
-                    "risk_factors": [
-                        "Market volatility",
-                        "Inflation risk", 
-                        "Longevity risk"
-                    ]
-                },
-                "strategies": [
-                    {
-                        "title": "Increase Monthly Savings",
-                        "description": f"Consider increasing monthly savings to ₹{monthly_savings * 1.2:,.0f}",
-                        "impact": "High",
-                        "timeframe": "Immediate",
-                        "difficulty": "Medium",
-                        "expected_benefit": "20% increase in retirement corpus"
-                    },
-                    {
-                        "title": "Optimize Investment Returns",
-                        "description": "Consider equity mutual funds for higher returns",
-                        "impact": "High",
-                        "timeframe": "Long-term",
-                        "difficulty": "Low",
-                        "expected_benefit": "2-3% higher annual returns"
-                    }
-                ],
-                "overall_priority": "High" if readiness_percentage < 80 else "Medium",
-                "implementation_order": ["Increase Monthly Savings", "Optimize Investment Returns"],
-                "risk_assessment": "Moderate",
-                "ai_enabled": False
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Calculation failed: {str(e)}"
-            }
+                status, body, headers = await respond(request)
+            except HTTPError as e:
+                server_stats["errors"] += 1
+                status, body, headers = e.status, dumps_json({"detail": e.detail}), {}
+            route = request.path if (request.method, request.path) in ROUTES else "unmatched"
+            observe_request(request.method, route, status, time.perf_counter() - start)
+
+            writer.write(encode_response(status, body, request.keep_alive, headers))
+            await writer.drain()
+            if not request.keep_alive:
+                break
+    except (ConnectionError, asyncio.CancelledError):
+        # Client went away, or the server is shutting down; the handler task is top-level
+        pass
+    finally:
+        server_stats["open_connections"] -= 1
+        writer.close()
+
+
+async def start(host: str, port: int, reuse_port: bool = False) -> asyncio.AbstractServer:
+    """
+    Start serving on host:port in the running event loop.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        reuse_port: Set SO_REUSEPORT so several processes can bind the same port
+
+    Returns:
+        The listening asyncio server
+    """
+
+    return await asyncio.start_server(
+        handle_connection, host, port, limit=MAX_HEADER_BYTES, reuse_port=reuse_port or None, backlog=1024
+    )
+
+
+def serve_forever(host: str, port: int, reuse_port: bool = False) -> None:
+    """Run one worker process until interrupted."""
+
+    async def main():
+        server = await start(host, port, reuse_port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(host: str, port: int, workers: int) -> None:
+    """
+    Serve with `workers` processes sharing the port through SO_REUSEPORT.
+
+    The kernel spreads incoming connections across the processes. Where
+    SO_REUSEPORT is unavailable (e.g. Windows) a single process is used.
+    """
+
+    if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        print("⚠️  SO_REUSEPORT is not available on this platform; starting one worker")
+        workers = 1
+
+    # Load the cohort index before forking so the workers share its pages
+    get_cohort_index()
+
+    if workers == 1:
+        serve_forever(host, port)
+        return
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    processes = [
+        context.Process(target=serve_forever, args=(host, port, True), daemon=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
 
 def start_server():
     """Start the HTTP server"""
-    PORT = 8000
-    
-    with socketserver.TCPServer(("", PORT), RetirementHandler) as httpd:
-        print(f"🚀 Server running at http://localhost:{PORT}")
-        print(f"📊 Retirement analysis endpoint: http://localhost:{PORT}/analyze")
-        print(f"❤️  Health check: http://localhost:{PORT}/health")
-        print("Press Ctrl+C to stop")
-        
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n👋 Server stopped")
+
+    parser = argparse.ArgumentParser(description="Minimal-footprint asyncio server for the retirement API")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"), help="Interface to bind")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")), help="Port to bind")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SIMPLE_SERVER_WORKERS", "1")),
+                        help="Processes sharing the port (SO_REUSEPORT)")
+    args = parser.parse_args()
+
+    print(f"🚀 Server running at http://localhost:{args.port} ({args.workers} worker(s))")
+    print(f"📊 Retirement analysis endpoint: http://localhost:{args.port}/analyze")
+    print(f"❤️  Health check: http://localhost:{args.port}/health")
+    print("Press Ctrl+C to stop")
+
+    run_workers(args.host, args.port, max(1, args.workers))
+    print("\n👋 Server stopped")
+
 
 if __name__ == "__main__":
     start_server()
@@ -0,0 +1,258 @@
+"""
+Test script to verify admission control and load shedding on the AI path.
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+import main
+from models.user_input import UserInput, AnalysisResult
+from utils.cache import LRUCache
+from utils.metrics import metrics
+from chains.llm_client import AsyncChatClient, LLMLimiter
+from chains.pipeline import AnalysisPipeline, STAGES
+from chains.admission import (
+    AdmissionController, TokenBuckets, ADMITTED, RULE_BASED, DEGRADED_QUEUE, DEGRADED_LATENCY, DEGRADED_RATE
+)
+from fake_openai_server import create_fake_openai_app, FAKE_ANALYSIS
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+class FakeLLMAnalysis:
+    """Analysis chain with an async variant backed by a slow fake server."""
+
+    def __init__(self, delay):
+        app = create_fake_openai_app(delay=delay)
+        self.stats = app.state.stats
+        self.llm_client = AsyncChatClient(
+            api_key="fake", base_url="http://fake-openai/v1",
+            limiter=LLMLimiter(8, 5.0), transport=httpx.ASGITransport(app=app)
+        )
+
+    async def aanalyze_retirement_plan(self, user_input, projection_data=None):
+        return AnalysisResult(**json.loads(await self.llm_client.complete("Analyze this profile")))
+
+
+def test_token_buckets():
+    """A client may burst, is then limited to the refill rate, and does not affect others."""
+
+    buckets = TokenBuckets(rate=1.0, burst=2)
+    assert [buckets.take("a", now=0.0) for _ in range(3)] == [True, True, False]
+    assert buckets.take("b", now=0.0)
+    assert not buckets.take("a", now=0.5)
+    assert buckets.take("a", now=1.6)
+    assert TokenBuckets(rate=0, burst=0).take("a")
+
+
+def test_queue_and_latency_decisions():
+    """Requests beyond the pending bound or while the LLM is slow are degraded."""
+
+    print("\n🚦 Testing admission decisions")
+    limiter = LLMLimiter()
+    controller = AdmissionController(rate=0, max_pending=2, max_llm_latency=1.0, latency_recovery=30, limiter=limiter)
+
+    first, second = controller.admit("a"), controller.admit("b")
+    third = controller.admit("c")
+    assert (first.decision, second.decision, third.decision) == (ADMITTED, ADMITTED, DEGRADED_QUEUE)
+    first.release()
+    first.release()  # idempotent
+    with controller.admit("c") as admission:
+        assert admission.decision == ADMITTED and controller.pending == 2
+    assert controller.pending == 1
+    second.release()
+    assert controller.admit("d", llm=False).decision == RULE_BASED and controller.pending == 0
+
+    limiter._observe_latency(3.0)
+    assert controller.admit("e").decision == DEGRADED_LATENCY
+    limiter.last_completed -= 60  # no finished call for a minute: try the LLM again
+    admission = controller.admit("e")
+    assert admission.decision == ADMITTED
+    admission.release()
+
+    limited = AdmissionController(rate=1.0, burst=1, max_pending=0, limiter=LLMLimiter())
+    assert [limited.admit("a").decision for _ in range(2)] == [ADMITTED, DEGRADED_RATE]
+    print("✅ Admission decisions working")
+
+
+def test_degraded_run_skips_llm():
+    """A degraded run answers rule-based without calling the LLM, but uses cached LLM results."""
+
+    chain = FakeLLMAnalysis(delay=0.0)
+    pipeline = AnalysisPipeline(analysis_chain=chain, cache=LRUCache(100, 0), latency_budget=0)
+    user_input = UserInput(**PROFILE)
+
+    async def run():
+        degraded = await pipeline.run(user_input, DEGRADED_QUEUE).acompute(STAGES)
+        admitted = await pipeline.run(user_input, ADMITTED).acompute(STAGES)
+        cached = await pipeline.run(user_input, DEGRADED_LATENCY).acompute(STAGES)
+        await chain.llm_client.aclose()
+        return degraded, admitted, cached
+
+    degraded, admitted, cached = asyncio.run(run())
+    assert degraded.degraded and degraded.analysis.summary != FAKE_ANALYSIS["summary"]
+    assert admitted.analysis.summary == FAKE_ANALYSIS["summary"]
+    assert cached.analysis.summary == FAKE_ANALYSIS["summary"] and cached.cache_hits["analysis"]
+    assert chain.stats["requests"] == 1
+
+
+def test_saturated_ai_path_degrades_and_deterministic_endpoints_stay_fast():
+    """With the LLM queue full, extra /analyze calls are answered rule-based at once and /simulate is unaffected."""
+
+    chain = FakeLLMAnalysis(delay=0.5)
+    controller = AdmissionController(rate=0, max_pending=2, max_llm_latency=0, limiter=chain.llm_client.limiter)
+    saved = main.pipeline.analysis_chain, main.pipeline.latency_budget, main.pipeline.cache, main.admission_controller
+    main.pipeline.analysis_chain, main.pipeline.latency_budget, main.pipeline.cache = chain, 0, LRUCache(100, 0)
+    main.admission_controller = controller
+
+    def decisions():
+        counter = metrics.get("finai_admission_decisions_total").values()
+        return {labels[0]: value for labels, value in counter.items()}
+
+    before = decisions()
+
+    async def timed(client, path, body):
+        start = time.perf_counter()
+        response = await client.post(path, json=body)
+        return response.json(), time.perf_counter() - start
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            profiles = [{**PROFILE, "age": 30 + i} for i in range(6)]
+            analyses = [asyncio.create_task(timed(client, "/analyze", profile)) for profile in profiles]
+            await asyncio.sleep(0.05)
+            simulation = await timed(client, "/simulate", {
+                "user_input": PROFILE, "simulation_type": "what_if", "modified_parameters": {"monthly_savings": 30000}
+            })
+            results = await asyncio.gather(*analyses)
+        await chain.llm_client.aclose()
+        return results, simulation
+
+    try:
+        results, simulation = asyncio.run(run())
+    finally:
+        main.pipeline.analysis_chain, main.pipeline.latency_budget, main.pipeline.cache, main.admission_controller = saved
+
+    admitted = [(body, elapsed) for body, elapsed in results if body["admission"] == ADMITTED]
+    degraded = [(body, elapsed) for body, elapsed in results if body["admission"] == DEGRADED_QUEUE]
+    assert len(admitted) == 2 and len(degraded) == 4
+    assert all(body["ai_enabled"] == "degraded" for body, _ in degraded)
+    assert all(body["analysis"]["summary"] == FAKE_ANALYSIS["summary"] for body, _ in admitted)
+    assert max(elapsed for _, elapsed in degraded) < 0.3
+    assert simulation[0]["success"] and simulation[1] < 0.3
+    assert controller.pending == 0
+
+    after = decisions()
+    assert after.get(DEGRADED_QUEUE, 0) - before.get(DEGRADED_QUEUE, 0) == 4
+
+
+def test_backfills_keep_their_queue_place():
+    """Requests that miss the latency budget hold their place until the background LLM call finishes."""
+
+    chain = FakeLLMAnalysis(delay=0.5)
+    controller = AdmissionController(rate=0, max_pending=3, max_llm_latency=0, limiter=chain.llm_client.limiter)
+    saved = main.pipeline.analysis_chain, main.pipeline.latency_budget, main.pipeline.cache, main.admission_controller
+    main.pipeline.analysis_chain, main.pipeline.latency_budget, main.pipeline.cache = chain, 0.05, LRUCache(100, 0)
+    main.admission_controller = controller
+
+    async def burst(client, first_age, size):
+        responses = await asyncio.gather(*[
+            client.post("/analyze", json={**PROFILE, "age": first_age + i}) for i in range(size)
+        ])
+        return [response.json() for response in responses]
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            first = await burst(client, 20, 10)
+            # Every request is answered, but three LLM calls are still running in the background
+            second = await burst(client, 35, 10)
+            backfills = main.pipeline.backfill_stats()["pending"]
+            waiting = chain.llm_client.limiter.waiting
+            while main.pipeline.backfill_stats()["pending"]:
+                await asyncio.sleep(0.01)
+            third = await client.post("/analyze", json={**PROFILE, "age": 50})
+        await chain.llm_client.aclose()
+        return first, second, backfills, waiting, third.json()
+
+    try:
+        first, second, backfills, waiting, third = asyncio.run(run())
+    finally:
+        main.pipeline.analysis_chain, main.pipeline.latency_budget, main.pipeline.cache, main.admission_controller = saved
+
+    assert [body["admission"] for body in first].count(ADMITTED) == 3
+    assert all(body["ai_enabled"] == "partial" for body in first if body["admission"] == ADMITTED)
+    assert all(body["admission"] == DEGRADED_QUEUE for body in second)
+    assert backfills <= 3 and waiting == 0
+    assert chain.stats["max_in_flight"] <= 3
+    assert third["admission"] == ADMITTED and controller.pending == 0
+
+
+def test_stream_disconnect_before_first_event_frees_admission():
+    """A client that goes away before /analyze/stream sends anything does not keep its queue place."""
+
+    chain = FakeLLMAnalysis(delay=0.0)
+    controller = AdmissionController(rate=0, max_pending=1, max_llm_latency=0, limiter=chain.llm_client.limiter)
+    saved = main.pipeline.analysis_chain, main.admission_controller
+    main.pipeline.analysis_chain, main.admission_controller = chain, controller
+
+    body = json.dumps(PROFILE).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/analyze/stream", "raw_path": b"/analyze/stream",
+        "query_string": b"", "root_path": "", "client": ("10.0.0.1", 5000), "server": ("test", 80),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    }
+    sent = []
+    messages = [{"type": "http.request", "body": body, "more_body": False}, {"type": "http.disconnect"}]
+
+    async def receive():
+        return messages.pop(0) if len(messages) > 1 else messages[0]
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            raise OSError("client disconnected")  # the connection is gone before the first event
+        sent.append(message)
+
+    async def run():
+        try:
+            await main.app(scope, receive, send)
+        except Exception:
+            pass
+        await chain.llm_client.aclose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        main.pipeline.analysis_chain, main.admission_controller = saved
+
+    assert sent == [] and chain.stats["requests"] == 0
+    assert controller.pending == 0
+    assert controller.admit("b").decision == ADMITTED
+
+
+if __name__ == "__main__":
+    test_token_buckets()
+    test_queue_and_latency_decisions()
+    test_degraded_run_skips_llm()
+    test_saturated_ai_path_degrades_and_deterministic_endpoints_stay_fast()
+    test_backfills_keep_their_queue_place()
+    test_stream_disconnect_before_first_event_frees_admission()
+    print("\n🎉 All admission tests passed!")
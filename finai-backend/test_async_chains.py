@@ -0,0 +1,191 @@
+"""
+Test script to verify non-blocking LLM calls against a local fake OpenAI-compatible server.
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import pytest
+
+from models.user_input import UserInput, AnalysisResult
+from utils.cache import LRUCache
+from utils.llm_cache import LLMResponseCache
+from chains.llm_client import AsyncChatClient, LLMLimiter
+from chains.pipeline import AnalysisPipeline, STAGES
+from fake_openai_server import create_fake_openai_app, FAKE_ANALYSIS
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def fake_client(delay=0.0, max_concurrency=8, timeout=5.0, status_code=200):
+    """AsyncChatClient wired to an in-process fake server."""
+
+    app = create_fake_openai_app(delay=delay, status_code=status_code)
+    client = AsyncChatClient(
+        api_key="fake", base_url="http://fake-openai/v1",
+        limiter=LLMLimiter(max_concurrency, timeout), transport=httpx.ASGITransport(app=app)
+    )
+    return client, app.state.stats
+
+
+class FakeLLMAnalysis:
+    """Analysis chain with an async variant backed by the fake server."""
+
+    def __init__(self, client):
+        self.llm_client = client
+
+    async def aanalyze_retirement_plan(self, user_input, projection_data=None):
+        return AnalysisResult(**json.loads(await self.llm_client.complete("Analyze this profile")))
+
+
+def test_concurrency_limit():
+    """No more than max_concurrency calls reach the server at once."""
+
+    print("\n🤖 Testing LLM concurrency limit")
+    client, stats = fake_client(delay=0.05, max_concurrency=2)
+
+    async def main():
+        replies = await asyncio.gather(*[client.complete("Analyze this profile") for _ in range(6)])
+        await client.aclose()
+        return replies
+
+    replies = asyncio.run(main())
+    assert json.loads(replies[0]) == FAKE_ANALYSIS
+    assert stats["requests"] == 6 and stats["max_in_flight"] == 2
+    print("✅ Concurrency limit working")
+
+
+def test_timeout_and_cancellation():
+    """Timed-out and cancelled calls free their slot and abort the HTTP request."""
+
+    client, stats = fake_client(delay=1.0, timeout=0.05)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await client.complete("Analyze this profile")
+
+        task = asyncio.create_task(client.complete("Analyze this profile", timeout=10))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await client.aclose()
+
+    asyncio.run(main())
+    assert client.limiter.stats()["timeouts"] == 1
+    assert client.limiter.in_flight == 0 and client.limiter.waiting == 0
+    assert stats["cancelled"] == 2 and stats["in_flight"] == 0
+
+
+def test_pipeline_overlaps_llm_with_deterministic_stages():
+    """Concurrent requests share the event loop while their LLM calls are pending."""
+
+    client, stats = fake_client(delay=0.2)
+    pipeline = AnalysisPipeline(FakeLLMAnalysis(client), None, cache=LRUCache(100, 0))
+
+    async def main():
+        start = time.perf_counter()
+        runs = await asyncio.gather(*[
+            pipeline.run(UserInput(**dict(PROFILE, current_savings=500000 + i))).acompute(STAGES) for i in range(4)
+        ])
+        elapsed = time.perf_counter() - start
+        await client.aclose()
+        return runs, elapsed
+
+    runs, elapsed = asyncio.run(main())
+    assert elapsed < 0.6  # four 0.2s calls overlapped rather than serialized
+    assert stats["max_in_flight"] == 4
+    for run in runs:
+        assert run.analysis.summary == FAKE_ANALYSIS["summary"]
+        assert set(STAGES) <= run.results.keys()
+
+
+def test_timeout_falls_back_without_caching():
+    """A timed-out LLM call yields the fallback analysis and is retried next time."""
+
+    client, stats = fake_client(delay=1.0, timeout=0.05)
+    pipeline = AnalysisPipeline(FakeLLMAnalysis(client), None, cache=LRUCache(100, 0))
+
+    async def main():
+        first = await pipeline.run(UserInput(**PROFILE)).aanalysis()
+        await pipeline.run(UserInput(**PROFILE)).aanalysis()
+        await client.aclose()
+        return first
+
+    assert asyncio.run(main()).key_insights == ["Basic analysis completed"]
+    assert stats["requests"] == 2
+
+
+def test_langchain_chains_async_variants():
+    """The LangChain chains' async variants parse replies from the fake server."""
+
+    from chains.analysis_chain import RetirementAnalysisChain
+    from chains.strategy_chain import RetirementStrategyChain
+
+    client, stats = fake_client()
+    response_cache = LLMResponseCache(":memory:")
+    analysis_chain = RetirementAnalysisChain("fake", llm_client=client, response_cache=response_cache)
+    strategy_chain = RetirementStrategyChain("fake", llm_client=client, response_cache=response_cache)
+    user_input = UserInput(**PROFILE)
+
+    async def main():
+        analysis = await analysis_chain.aanalyze_retirement_plan(user_input)
+        strategies = await strategy_chain.agenerate_strategies(user_input, analysis)
+        await client.aclose()
+        return analysis, strategies
+
+    analysis, strategies = asyncio.run(main())
+    assert analysis.summary == FAKE_ANALYSIS["summary"]
+    assert strategies.implementation_order == ["Step Up Your SIP"]
+
+
+def test_chain_fallbacks_after_http_errors_are_not_cached():
+    """When the LLM answers with an error, the chains' fallbacks are served but the next request retries the LLM."""
+
+    from chains.analysis_chain import RetirementAnalysisChain
+    from chains.strategy_chain import RetirementStrategyChain
+
+    client, stats = fake_client(status_code=500)
+    response_cache = LLMResponseCache(":memory:")
+    pipeline = AnalysisPipeline(
+        RetirementAnalysisChain("fake", llm_client=client, response_cache=response_cache),
+        RetirementStrategyChain("fake", llm_client=client, response_cache=response_cache),
+        cache=LRUCache(100, 0), latency_budget=0
+    )
+
+    async def main():
+        first = await pipeline.run(UserInput(**PROFILE)).acompute(("strategies",))
+        second = await pipeline.run(UserInput(**PROFILE)).acompute(("strategies",))
+        await client.aclose()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first.analysis._fallback and first.strategies._fallback
+    assert not second.cache_hits["analysis"] and not second.cache_hits["strategies"]
+    assert stats["requests"] == 4
+
+
+if __name__ == "__main__":
+    test_concurrency_limit()
+    test_timeout_and_cancellation()
+    test_pipeline_overlaps_llm_with_deterministic_stages()
+    test_timeout_falls_back_without_caching()
+    test_chain_fallbacks_after_http_errors_are_not_cached()
+    print("\n🎉 All async chain tests passed!")
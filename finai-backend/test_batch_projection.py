@@ -0,0 +1,172 @@
+"""
+Test script to verify the vectorized batch projection engine.
+Checks that retirement_projection_batch agrees exactly with the scalar projection.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from models.user_input import UserInput
+from utils.formulas import (
+    retirement_projection, retirement_projection_batch, simulate_scenario,
+    calculate_risk_score, calculate_risk_score_batch
+)
+from main import app
+
+
+def _random_population(size: int, seed: int = 7):
+    """Build a random but valid struct-of-arrays population."""
+    rng = np.random.default_rng(seed)
+    age = rng.integers(18, 60, size)
+    return {
+        "age": age,
+        "retirement_age": np.maximum(age + 1, rng.integers(50, 75, size)),
+        "current_savings": rng.uniform(0, 5_000_000, size).round(0),
+        "monthly_savings": rng.uniform(0, 50_000, size).round(0),
+        "expected_returns": rng.choice([0.0, 4.0, 6.0, 7.5, 8.0, 12.0], size),
+        "retirement_goal": rng.uniform(100_000, 80_000_000, size).round(-3),
+    }
+
+
+def test_batch_matches_scalar():
+    """Every batch element must equal the scalar RetirementProjection."""
+
+    print("\n📊 Testing batch projection against scalar projection")
+    population = _random_population(2000)
+    batch = retirement_projection_batch(**population)
+
+    for i in range(len(population["age"])):
+        user_input = UserInput(
+            age=int(population["age"][i]),
+            retirement_age=int(population["retirement_age"][i]),
+            annual_income=10_000_000,
+            monthly_expenses=10_000,
+            current_savings=float(population["current_savings"][i]),
+            monthly_savings=float(population["monthly_savings"][i]),
+            retirement_goal=float(population["retirement_goal"][i]),
+            expected_returns=float(population["expected_returns"][i])
+        )
+        projection = retirement_projection(user_input)
+
+        assert batch["years_to_retirement"][i] == projection.years_to_retirement
+        assert batch["projected_corpus"][i] == projection.projected_corpus
+        assert batch["readiness_percentage"][i] == projection.readiness_percentage
+        assert batch["shortfall"][i] == projection.shortfall
+        assert batch["surplus"][i] == projection.surplus
+
+    print("✅ Batch projection matches scalar projection")
+
+
+def test_batch_endpoint():
+    """The /analyze/batch endpoint returns one entry per profile and rejects bad rows."""
+
+    print("\n🌐 Testing /analyze/batch endpoint")
+    client = TestClient(app)
+    population = {key: values.tolist() for key, values in _random_population(100).items()}
+
+    response = client.post("/analyze/batch", json=population)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 100
+    assert len(body["readiness_percentage"]) == 100
+
+    population["retirement_age"][3] = population["age"][3]
+    response = client.post("/analyze/batch", json=population)
+    assert response.status_code == 422
+
+    print("✅ Batch endpoint working")
+
+
+def test_risk_score_batch_matches_scalar():
+    """Every batch risk score and level must equal calculate_risk_score."""
+
+    population = _random_population(2000, seed=11)
+    rng = np.random.default_rng(11)
+    annual_income = rng.choice([40_000, 50_000, 80_000, 100_000, 150_000, 1_200_000], 2000).astype(float)
+    monthly_savings = (annual_income * rng.choice([0.05, 0.1, 0.12, 0.15, 0.2, 0.3], 2000) / 12).round(2)
+    batch = calculate_risk_score_batch(population["age"], population["retirement_age"], annual_income, monthly_savings)
+
+    for i in range(2000):
+        user_input = UserInput.model_construct(
+            age=int(population["age"][i]),
+            retirement_age=int(population["retirement_age"][i]),
+            annual_income=float(annual_income[i]),
+            monthly_savings=float(monthly_savings[i])
+        )
+        risk = calculate_risk_score(user_input)
+        assert batch["risk_score"][i] == risk["risk_score"]
+        assert batch["risk_level"][i] == risk["risk_level"]
+
+
+def test_sensitivity_grid_matches_simulate_scenario():
+    """Each grid cell must equal the matching simulate_scenario projection."""
+
+    print("\n🧮 Testing /simulate/grid endpoint")
+    client = TestClient(app)
+    base = {
+        "age": 35,
+        "retirement_age": 60,
+        "annual_income": 1500000,
+        "monthly_expenses": 80000,
+        "current_savings": 1000000,
+        "monthly_savings": 30000,
+        "retirement_goal": 50000000,
+        "expected_returns": 8.0
+    }
+    response = client.post("/simulate/grid", json={
+        "user_input": base,
+        "ranges": {
+            "monthly_savings": {"start": 10000, "stop": 40000, "steps": 4},
+            "expected_returns": {"start": 6, "stop": 12, "steps": 3},
+            "retirement_age": {"start": 55, "stop": 65, "steps": 3}
+        }
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["shape"] == [4, 3, 3]
+
+    user_input = UserInput(**base)
+    for i, monthly_savings in enumerate(body["axes"]["monthly_savings"]):
+        for j, expected_returns in enumerate(body["axes"]["expected_returns"]):
+            for k, retirement_age in enumerate(body["axes"]["retirement_age"]):
+                projection = simulate_scenario(user_input, {
+                    "monthly_savings": monthly_savings,
+                    "expected_returns": expected_returns,
+                    "retirement_age": int(retirement_age)
+                })
+                assert body["projected_corpus"][i][j][k] == projection.projected_corpus
+                assert body["readiness_percentage"][i][j][k] == projection.readiness_percentage
+
+    response = client.post("/simulate/grid", json={
+        "user_input": base,
+        "ranges": {"monthly_savings": {"start": 0, "stop": 1, "steps": 2}}
+    })
+    assert response.status_code == 422
+
+    # Axes outside the UserInput bounds are rejected with the offending axis named
+    for name, grid_range in [
+        ("retirement_goal", {"start": 0, "stop": 50000000, "steps": 3}),
+        ("expected_returns", {"start": 6, "stop": 90, "steps": 3}),
+        ("current_savings", {"start": -1, "stop": 100000, "steps": 2}),
+    ]:
+        response = client.post("/simulate/grid", json={
+            "user_input": base,
+            "ranges": {"monthly_savings": {"start": 10000, "stop": 40000, "steps": 2}, name: grid_range}
+        })
+        assert response.status_code == 422 and name in response.json()["detail"]
+
+    print("✅ Sensitivity grid matches simulate_scenario")
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    test_batch_endpoint()
+    test_risk_score_batch_matches_scalar()
+    test_sensitivity_grid_matches_simulate_scenario()
+    print("\n🎉 All batch projection tests passed!")
@@ -0,0 +1,48 @@
+"""
+Test script to verify the benchmark harness (not the timings themselves).
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.user_input import UserInput
+from benchmarks.run_benchmarks import sample_payloads, run_benchmarks, compare_to_baseline
+
+
+def test_sample_payloads_are_valid():
+    """Generated profiles pass UserInput validation and are deterministic."""
+
+    payloads = sample_payloads(500)
+    for payload in payloads:
+        UserInput(**payload)
+    assert payloads == sample_payloads(500)
+
+
+def test_run_and_compare():
+    """A small run produces timings and only large slowdowns count as regressions."""
+
+    print("\n⏱️ Testing benchmark harness")
+    results = run_benchmarks([1], only=["retirement_projection", "endpoint_simulate"], repeats=1)
+    assert {"retirement_projection[1]", "retirement_projection_batch[1]", "endpoint_simulate[1]"} <= results.keys()
+
+    baseline = {key: dict(timing) for key, timing in results.items()}
+    assert compare_to_baseline(results, baseline, threshold=0.5) == []
+
+    slow = {"endpoint_simulate[1]": {"min_seconds": baseline["endpoint_simulate[1]"]["min_seconds"] * 3 + 0.001}}
+    regressions = compare_to_baseline(slow, baseline, threshold=0.5)
+    assert len(regressions) == 1 and regressions[0].startswith("endpoint_simulate[1]")
+
+    # A benchmark without a baseline entry is reported, not skipped
+    del baseline["retirement_projection[1]"]
+    missing = compare_to_baseline(results, baseline)
+    assert missing == ["retirement_projection[1]: no baseline entry (record it with --update-baseline)"]
+    print("✅ Benchmark harness working")
+
+
+if __name__ == "__main__":
+    test_sample_payloads_are_valid()
+    test_run_and_compare()
+    print("\n🎉 All benchmark harness tests passed!")
@@ -0,0 +1,86 @@
+"""
+Test script to verify the calculation cache.
+Checks LRU/TTL eviction, counters and sharing across endpoints.
+"""
+
+import sys
+import os
+import time
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+from models.user_input import UserInput
+from utils.cache import LRUCache, fingerprint, calculation_cache, cached_retirement_projection
+from utils.formulas import retirement_projection
+from main import app
+
+
+SAMPLE_INPUT = {
+    "age": 35,
+    "retirement_age": 65,
+    "annual_income": 75000,
+    "monthly_expenses": 4000,
+    "current_savings": 50000,
+    "monthly_savings": 1000,
+    "retirement_goal": 1000000
+}
+
+
+def test_lru_and_ttl_eviction():
+    """Oldest entries are evicted by size, stale entries by TTL."""
+
+    print("\n🗄️ Testing LRU cache eviction")
+    cache = LRUCache(max_size=2, ttl_seconds=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1          # "a" becomes most recently used
+    cache.set("c", 3)                   # evicts "b"
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    print("✅ LRU and TTL eviction working")
+
+
+def test_fingerprint_and_memoization():
+    """Equal numeric inputs share one cached projection."""
+
+    print("\n🔑 Testing fingerprint memoization")
+    first = UserInput(**SAMPLE_INPUT)
+    second = UserInput(**{**SAMPLE_INPUT, "retirement_goal": 1000000.0})
+    assert fingerprint(first) == fingerprint(second)
+
+    calculation_cache.clear()
+    projection = cached_retirement_projection(first)
+    assert cached_retirement_projection(second) is projection
+    assert projection == retirement_projection(first)
+    assert calculation_cache.stats()["hits"] == 1
+    print("✅ Fingerprint memoization working")
+
+
+def test_suggestions_reuse_analyze_calculations():
+    """/suggestions after /analyze for the same payload hits the cache."""
+
+    print("\n🌐 Testing cache sharing across endpoints")
+    client = TestClient(app)
+    calculation_cache.clear()
+    client.post("/analyze", json=SAMPLE_INPUT)
+    misses = calculation_cache.stats()["misses"]
+    client.post("/suggestions", json=SAMPLE_INPUT)
+    assert calculation_cache.stats()["misses"] == misses
+    assert client.get("/health").json()["calculation_cache"]["hits"] >= 1
+    print("✅ Endpoints share cached calculations")
+
+
+if __name__ == "__main__":
+    test_lru_and_ttl_eviction()
+    test_fingerprint_and_memoization()
+    test_suggestions_reuse_analyze_calculations()
+    print("\n🎉 All cache tests passed!")
@@ -0,0 +1,90 @@
+"""
+Test script to verify cohort-relative risk scoring.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from models.user_input import UserInput
+from utils.formulas import retirement_projection, calculate_risk_score
+from utils.cohort import CohortIndex, synthetic_profiles, calculate_cohort_risk_score
+
+
+PROFILE = {
+    "age": 35,
+    "retirement_age": 60,
+    "annual_income": 1500000,
+    "monthly_expenses": 80000,
+    "current_savings": 1000000,
+    "monthly_savings": 30000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def test_index_round_trip_and_percentiles():
+    """Saved indexes load back unchanged and percentiles rise with readiness."""
+
+    print("\n👥 Testing cohort index")
+    index = CohortIndex.build(**synthetic_profiles(20000, seed=7))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cohort_index.npz")
+        index.save(path)
+        loaded = CohortIndex.load(path)
+
+    assert loaded.readiness.keys() == index.readiness.keys()
+    for band, values in index.readiness.items():
+        np.testing.assert_array_equal(loaded.readiness[band], values)
+        np.testing.assert_array_equal(loaded.savings_rate[band], index.savings_rate[band])
+
+    ranks = [index.percentiles(35, 1500000, readiness, 20)["readiness_percentile"] for readiness in (10, 50, 90, 100)]
+    assert ranks == sorted(ranks)
+    assert ranks[-1] == 100.0
+    assert index.percentiles(35, 1500000, 50, 20)["income_band"] == "10-20L"
+    print("✅ Cohort index working")
+
+
+def test_cohort_risk_score():
+    """Cohort percentiles are added on top of the absolute risk assessment."""
+
+    print("\n📊 Testing cohort risk score")
+    user_input = UserInput(**PROFILE)
+    risk = calculate_risk_score(user_input)
+    result = calculate_cohort_risk_score(
+        user_input, retirement_projection(user_input), risk, CohortIndex.build(**synthetic_profiles(20000))
+    )
+
+    assert result["risk_level"] == risk["risk_level"]
+    assert "cohort" not in risk
+    assert result["cohort"]["age_band"] == "30-39"
+    assert 0 <= result["cohort"]["readiness_percentile"] <= 100
+    assert isinstance(result["cohort"]["recommendations"], list)
+    print("✅ Cohort risk score working")
+
+
+def test_analyze_includes_cohort():
+    """/analyze reports the cohort percentiles in the risk assessment."""
+
+    from main import app
+
+    client = TestClient(app)
+    response = client.post("/analyze", json=PROFILE)
+    assert response.status_code == 200
+    cohort = response.json()["risk_assessment"]["cohort"]
+    assert cohort["income_band"] == "10-20L"
+    assert "savings_rate_percentile" in cohort
+
+
+if __name__ == "__main__":
+    test_index_round_trip_and_percentiles()
+    test_cohort_risk_score()
+    test_analyze_includes_cohort()
+    print("\n🎉 All cohort tests passed!")
@@ -0,0 +1,87 @@
+"""
+Test script to verify the decumulation engine.
+Compares the vectorized withdrawal phase with a year-by-year loop.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from models.user_input import UserInput
+from utils.decumulation import simulate_withdrawals, sustainable_withdrawal
+from utils.formulas import retirement_projection, calculate_monthly_retirement_income
+
+
+def _loop_years_funded(corpus, spending, returns, inflation, other_income, years):
+    """Reference year-by-year withdrawal loop."""
+    balance = corpus
+    for year in range(years):
+        withdrawal = max(0.0, spending * (1 + inflation / 100) ** year - other_income * 12)
+        if balance < withdrawal:
+            return year, balance
+        balance = (balance - withdrawal) * (1 + returns / 100)
+    return years, balance
+
+
+def test_withdrawals_match_loop():
+    """Years funded and balances must match the loop for a batch of retirees."""
+
+    print("\n🏖️ Testing withdrawal simulation")
+    corpus = np.array([1_000_000.0, 5_000_000.0, 20_000_000.0])
+    spending = np.array([60_000.0, 400_000.0, 600_000.0])
+    returns = np.array([5.0, 7.0, 0.0])
+    other_income = np.array([1000.0, 0.0, 5000.0])
+
+    result = simulate_withdrawals(corpus, spending, returns, 6.0, other_income, 30)
+
+    for i in range(len(corpus)):
+        years, balance = _loop_years_funded(corpus[i], spending[i], returns[i], 6.0, other_income[i], 30)
+        assert result["years_funded"][i] == years
+        if years == 30:
+            assert abs(result["balances"][i, -1] - balance) < 1e-6 * max(1.0, balance)
+    print("✅ Withdrawal simulation matches the yearly loop")
+
+
+def test_sustainable_withdrawal_batch():
+    """The solved spending lasts exactly the horizon for every retiree in one solve."""
+
+    print("\n💸 Testing sustainable withdrawal solve")
+    corpus = np.array([1_000_000.0, 5_000_000.0, 20_000_000.0, 0.0])
+    other_income = np.array([1000.0, 0.0, 5000.0, 2000.0])
+
+    spending = sustainable_withdrawal(corpus, 6.0, 5.0, other_income, 25)
+    lasts = simulate_withdrawals(corpus, spending, 6.0, 5.0, other_income, 25)["years_funded"]
+    fails = simulate_withdrawals(corpus, spending + 1, 6.0, 5.0, other_income, 25)["years_funded"]
+
+    assert np.all(lasts == 25)
+    assert np.all(fails < 25)
+    print("✅ Sustainable withdrawal solve working")
+
+
+def test_monthly_retirement_income_fields():
+    """Income is solved at the projection's returns and the inflation-adjusted fields are future amounts."""
+
+    projection = retirement_projection(UserInput(
+        age=30, retirement_age=60, annual_income=1200000, monthly_expenses=50000,
+        current_savings=500000, monthly_savings=20000, retirement_goal=50000000, expected_returns=8.0
+    ))
+    income = calculate_monthly_retirement_income(projection, inflation_rate=3.0)
+
+    annual = float(sustainable_withdrawal(projection.projected_corpus, 8.0, 3.0, 0.0, 30))
+    assert income == calculate_monthly_retirement_income(projection, 3.0, retirement_returns=8.0)
+    assert income["annual_income"] == round(annual, 2)
+    assert income["monthly_income"] == round(annual / 12, 2)
+    assert income["inflation_adjusted_annual"] == round(annual * 1.03 ** 30, 2)
+    assert income["inflation_adjusted_monthly"] == round(annual * 1.03 ** 30 / 12, 2)
+    assert income["inflation_adjusted_annual"] > income["annual_income"]
+
+
+if __name__ == "__main__":
+    test_withdrawals_match_loop()
+    test_sustainable_withdrawal_batch()
+    test_monthly_retirement_income_fields()
+    print("\n🎉 All decumulation tests passed!")
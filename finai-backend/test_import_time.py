@@ -0,0 +1,65 @@
+"""
+Test script to verify the API process imports lazily and the import-time report parses.
+"""
+
+import sys
+import os
+import subprocess
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.import_time import parse_importtime
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_main_import_skips_optional_clients():
+    """Importing the app does not load LangChain, httpx or pandas."""
+
+    print("\n🤖 Testing lazy imports of main")
+    code = (
+        "import sys, main\n"
+        "print('loaded:' + ','.join(m for m in ('langchain', 'openai', 'httpx', 'pandas') if m in sys.modules))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().splitlines()[-1] == "loaded:"
+    print("✅ main imports without the optional clients")
+
+
+def test_chains_construct_without_langchain():
+    """The LLM chains build without touching LangChain until the sync path is used."""
+
+    from chains.analysis_chain import RetirementAnalysisChain
+    from chains.plan_chain import RetirementPlanChain
+    from utils.llm_cache import LLMResponseCache
+
+    modules_before = set(sys.modules)
+    chain = RetirementPlanChain("fake", response_cache=LLMResponseCache(":memory:"))
+    assert isinstance(chain.analysis_chain, RetirementAnalysisChain)
+    assert "plan_chain" not in vars(chain)
+    assert not any(name.startswith("langchain") for name in set(sys.modules) - modules_before)
+
+
+def test_parse_importtime():
+    """-X importtime lines become entries with depth, self and cumulative time."""
+
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     numpy.version\n"
+        "import time:       300 |        420 |   numpy\n"
+        "import time:        50 |        470 | main\n"
+        "something else\n"
+    )
+    entries = parse_importtime(stderr)
+    assert [(e.name, e.depth, e.self_us, e.cumulative_us) for e in entries] == [
+        ("numpy.version", 2, 120, 120), ("numpy", 1, 300, 420), ("main", 0, 50, 470)
+    ]
+
+
+if __name__ == "__main__":
+    test_main_import_skips_optional_clients()
+    test_chains_construct_without_langchain()
+    test_parse_importtime()
+    print("\n🎉 All import tests passed!")
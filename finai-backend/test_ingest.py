@@ -0,0 +1,180 @@
+"""
+Test script to verify the bulk CSV/Parquet ingestion CLI (utils.ingest).
+"""
+
+import sys
+import os
+import json
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from models.user_input import UserInput
+from utils.cache import LRUCache
+from utils.ingest import ingest, score_chunk, validate_columns, _numeric_columns
+from chains.pipeline import AnalysisPipeline
+from chains.simple_analysis import SimpleRetirementAnalysis
+from chains.simple_strategy import SimpleRetirementStrategy
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def employees(size: int, seed: int = 3) -> pd.DataFrame:
+    """Employee file with mostly valid profiles and a few broken rows."""
+
+    rng = np.random.default_rng(seed)
+    age = rng.integers(20, 58, size)
+    income = rng.uniform(300_000, 4_000_000, size).round(-3)
+    frame = pd.DataFrame({
+        "employee_id": [f"E{i:05d}" for i in range(size)],
+        "age": age,
+        "retirement_age": np.maximum(age + 1, rng.integers(55, 66, size)),
+        "annual_income": income,
+        "monthly_expenses": (income * rng.uniform(0.2, 0.6, size) / 12).round(),
+        "current_savings": rng.uniform(0, 5_000_000, size).round(),
+        "monthly_savings": (income * rng.uniform(0.02, 0.3, size) / 12).round(),
+        "retirement_goal": rng.uniform(1_000_000, 80_000_000, size).round(-3),
+        "expected_returns": rng.choice([6.0, 8.0, 10.0], size),
+        "employer_pf": rng.choice([0.0, 12.0], size),
+        "epf_balance": rng.uniform(0, 1_000_000, size).round()
+    })
+    frame.loc[::37, "age"] = 15
+    frame.loc[5::41, "monthly_expenses"] = np.nan
+    return frame
+
+
+def test_vectorized_validation_matches_user_input():
+    """A row is valid exactly when UserInput accepts it, and the message names the broken rule."""
+
+    rows = [
+        PROFILE,
+        {**PROFILE, "age": 17},
+        {**PROFILE, "age": 30.5},
+        {**PROFILE, "retirement_age": 30},
+        {**PROFILE, "retirement_age": 55, "age": 58},
+        {**PROFILE, "annual_income": 0},
+        {**PROFILE, "monthly_expenses": 95000},
+        {**PROFILE, "monthly_savings": 60000},
+        {**PROFILE, "current_savings": -1},
+        {**PROFILE, "retirement_goal": 0},
+        {**PROFILE, "expected_returns": 25},
+        {**PROFILE, "expected_inflation": 11},
+        {**PROFILE, "monthly_savings": None},
+        {**PROFILE, "employer_pf": 120},
+        {**PROFILE, "nps_balance": -1},
+    ]
+    errors = validate_columns(_numeric_columns(pd.DataFrame(rows)))
+
+    for row, error in zip(rows, errors):
+        try:
+            UserInput(**row)
+            accepted = True
+        except ValidationError:
+            accepted = False
+        assert accepted == (error is None), (row, error)
+    assert errors[4] == "Retirement age must be greater than current age"
+    assert errors[6] == "Monthly expenses seem too high relative to income"
+    assert errors[12] == "monthly_savings is missing or not a number"
+
+
+def test_scores_match_pipeline():
+    """Chunk scores equal the rule-based pipeline's projection, risk and strategies."""
+
+    print("\n📥 Testing bulk scoring")
+    frame = employees(60)
+    result = score_chunk(frame, first_row=100, id_column="employee_id")
+    pipeline = AnalysisPipeline(SimpleRetirementAnalysis(), SimpleRetirementStrategy(), cache=LRUCache(1000, 0))
+
+    assert result["row"].tolist() == list(range(100, 160))
+    assert result["employee_id"].tolist() == frame["employee_id"].tolist()
+    for i, row in result.iterrows():
+        if not pd.isna(row["error"]):
+            assert pd.isna(row["projected_corpus"]) and pd.isna(row["risk_level"])
+            continue
+        run = pipeline.run(UserInput(**frame.drop(columns="employee_id").iloc[i].to_dict()))
+        assert row["projected_corpus"] == run.projection.projected_corpus
+        assert row["readiness_percentage"] == run.projection.readiness_percentage
+        assert row["years_to_retirement"] == run.projection.years_to_retirement
+        assert row["risk_score"] == run.risk["risk_score"] and row["risk_level"] == run.risk["risk_level"]
+        assert row["confidence_level"] == run.analysis.confidence_level
+        assert row["overall_priority"] == run.strategies.overall_priority
+        assert json.loads(row["strategies"]) == run.strategies.implementation_order
+    print("✅ Bulk scores match the pipeline")
+
+
+@pytest.mark.parametrize("extension,workers", [("csv", 0), ("parquet", 2)])
+def test_ingest_writes_every_row_in_order(tmp_path, extension, workers):
+    """The output has one row per input row, in input order, and the parts are cleaned up."""
+
+    frame = employees(2500)
+    source = tmp_path / f"employees.{extension}"
+    output = tmp_path / f"scores.{extension}"
+    if extension == "csv":
+        frame.to_csv(source, index=False)
+    else:
+        frame.to_parquet(source, index=False)
+
+    summary = ingest(str(source), str(output), chunk_size=300, workers=workers, id_column="employee_id")
+    result = pd.read_csv(output) if extension == "csv" else pd.read_parquet(output)
+
+    assert summary["rows"] == len(result) == 2500 and summary["chunks"] == 9
+    assert summary["invalid_rows"] == result["error"].notna().sum() > 0
+    assert summary["rows_per_second"] > 0
+    assert result["row"].tolist() == list(range(2500))
+    assert result["employee_id"].tolist() == frame["employee_id"].tolist()
+    assert sorted(os.listdir(tmp_path)) == sorted([source.name, output.name])
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path):
+    """A run that crashes after some chunks resumes from them and produces the same output."""
+
+    source = tmp_path / "employees.csv"
+    employees(1000).to_csv(source, index=False)
+    output = tmp_path / "scores.csv"
+
+    def crash_after_three(status):
+        if status["chunks"] == 3:
+            raise RuntimeError("worker killed")
+
+    with pytest.raises(RuntimeError):
+        ingest(str(source), str(output), chunk_size=100, progress=crash_after_three)
+    assert not output.exists()
+    with open(f"{output}.checkpoint.json") as f:
+        assert sorted(json.load(f)["chunks"]) == ["0", "1", "2"]
+
+    with pytest.raises(ValueError):
+        ingest(str(source), str(output), chunk_size=50)
+
+    summary = ingest(str(source), str(output), chunk_size=100)
+    assert summary["resumed_chunks"] == 3 and summary["rows"] == 1000
+    resumed = pd.read_csv(output)
+
+    fresh = tmp_path / "fresh.csv"
+    ingest(str(source), str(fresh), chunk_size=100)
+    pd.testing.assert_frame_equal(resumed, pd.read_csv(fresh))
+
+
+def test_missing_columns_are_rejected(tmp_path):
+    source = tmp_path / "employees.csv"
+    pd.DataFrame([PROFILE]).drop(columns="retirement_goal").to_csv(source, index=False)
+    with pytest.raises(ValueError, match="retirement_goal"):
+        ingest(str(source), str(tmp_path / "scores.csv"))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,114 @@
+"""
+Test script to verify the multi-bucket EPF/PPF/NPS projection.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from models.user_input import UserInput
+from utils.formulas import retirement_projection, retirement_projection_batch
+from utils.instruments import BUCKETS, PPF_ANNUAL_CAP, multi_bucket_projection, multi_bucket_projection_batch
+from utils.solver import required_monthly_savings
+from chains.simple_analysis import SimpleRetirementAnalysis
+from chains.simple_strategy import SimpleRetirementStrategy
+from chains.pipeline import AnalysisPipeline
+from utils.cache import LRUCache
+
+
+MID_CAREER = {
+    "age": 35,
+    "retirement_age": 55,
+    "annual_income": 1500000,
+    "monthly_expenses": 80000,
+    "current_savings": 1000000,
+    "monthly_savings": 30000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0,
+    "employer_pf": 12,
+    "epf_balance": 300000,
+    "ppf_balance": 200000,
+    "nps_balance": 100000,
+    "ppf_contribution": 250000,
+    "nps_contribution": 5000
+}
+
+
+def test_buckets_match_closed_forms():
+    """All buckets add up to retirement_projection; each bucket follows its own rules."""
+
+    print("\n🏦 Testing multi-bucket projection")
+    user_input = UserInput(**MID_CAREER)
+    result = multi_bucket_projection(user_input)
+    projection = retirement_projection(user_input)
+
+    assert abs(result["total_corpus"] - projection.projected_corpus) < 0.05
+    assert abs(result["total_corpus"] - result["buckets"]["savings"] - projection.instrument_corpus) < 0.05
+    assert result["readiness_percentage"] == projection.readiness_percentage
+
+    # PPF deposits are capped at ₹1.5L a year
+    expected_ppf = 200000 * 1.071 ** 20 + PPF_ANNUAL_CAP * (1.071 ** 20 - 1) / 0.071
+    assert abs(result["buckets"]["ppf"] - expected_ppf) < 0.05
+
+    # Retiring at 55 locks EPF (58) and NPS (60)
+    assert result["locked_until_unlock_age"] == ["epf", "nps"]
+    assert result["accessible_corpus"] < result["total_corpus"]
+    print("✅ Multi-bucket projection working")
+
+
+def test_batch_matrix_shape_and_consistency():
+    """The buckets x years matrix ends at the per-bucket corpus for every user."""
+
+    print("\n🧮 Testing buckets x years matrix")
+    result = multi_bucket_projection_batch(
+        [25, 40], [60, 45], 1000000, 100000, 10000, [8.0, 0.0], 12, 100000, 100000, 100000, 100000, 1000
+    )
+    assert result["balances"].shape == (2, len(BUCKETS), 36)
+    assert np.isnan(result["balances"][1, :, 6]).all()
+    np.testing.assert_allclose(result["balances"][0, :, 35], result["corpus_by_bucket"][0])
+    np.testing.assert_allclose(result["balances"][1, :, 5], result["corpus_by_bucket"][1])
+    print("✅ Buckets x years matrix consistent")
+
+
+def test_instruments_count_towards_readiness():
+    """EPF/PPF/NPS balances raise readiness, cut the shortfall and lower the required savings."""
+
+    print("\n📈 Testing readiness with instruments")
+    profile = {**MID_CAREER, "retirement_goal": 100000000}
+    savings_only = {name: value for name, value in profile.items() if name not in (
+        "employer_pf", "epf_balance", "ppf_balance", "nps_balance", "ppf_contribution", "nps_contribution"
+    )}
+    pipeline = AnalysisPipeline(SimpleRetirementAnalysis(), SimpleRetirementStrategy(), cache=LRUCache(100, 0))
+    with_instruments = pipeline.run(UserInput(**profile))
+    without = pipeline.run(UserInput(**savings_only))
+
+    assert without.projection.instrument_corpus == 0
+    assert with_instruments.projection.readiness_percentage > without.projection.readiness_percentage
+    assert with_instruments.projection.shortfall == round(
+        without.projection.shortfall - with_instruments.projection.instrument_corpus, 2
+    )
+
+    required = float(required_monthly_savings(
+        100000000 - with_instruments.projection.instrument_corpus, 1000000, 20, 8.0
+    ))
+    urgent = next(s for s in with_instruments.strategies.strategies if s.title.endswith("Increase Monthly Savings"))
+    assert f"₹{required:,.0f}" in urgent.description
+
+    # The vectorized projection takes the same instrument columns
+    batch = retirement_projection_batch(
+        35, 55, 1000000, 30000, 8.0, 100000000, 1500000, 12, 300000, 200000, 100000, 250000, 5000
+    )
+    assert float(batch["projected_corpus"]) == with_instruments.projection.projected_corpus
+    assert float(batch["readiness_percentage"]) == with_instruments.projection.readiness_percentage
+    print("✅ Instruments count towards readiness")
+
+
+if __name__ == "__main__":
+    test_buckets_match_closed_forms()
+    test_batch_matrix_shape_and_consistency()
+    test_instruments_count_towards_readiness()
+    print("\n🎉 All instrument tests passed!")
@@ -0,0 +1,160 @@
+"""
+Test script to verify the LLM latency budget, rule-based fallback and background backfill.
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+import main
+from models.user_input import UserInput, AnalysisResult
+from utils.cache import LRUCache
+from chains.llm_client import AsyncChatClient, LLMLimiter
+from chains.pipeline import AnalysisPipeline, STAGES, fallback_strategies
+from chains.simple_analysis import SimpleRetirementAnalysis
+from chains.simple_strategy import SimpleRetirementStrategy
+from fake_openai_server import create_fake_openai_app, FAKE_ANALYSIS
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+class FakeLLMAnalysis:
+    """Analysis chain with an async variant backed by a slow fake server."""
+
+    def __init__(self, delay):
+        app = create_fake_openai_app(delay=delay)
+        self.stats = app.state.stats
+        self.llm_client = AsyncChatClient(
+            api_key="fake", base_url="http://fake-openai/v1",
+            limiter=LLMLimiter(8, 5.0), transport=httpx.ASGITransport(app=app)
+        )
+
+    async def aanalyze_retirement_plan(self, user_input, projection_data=None):
+        return AnalysisResult(**json.loads(await self.llm_client.complete("Analyze this profile")))
+
+
+async def wait_for_backfills(pipeline):
+    while pipeline.backfill_stats()["pending"]:
+        await asyncio.sleep(0.01)
+
+
+def test_over_budget_returns_rule_based_then_backfills():
+    """A slow LLM is answered rule-based within the budget and cached for the next request."""
+
+    print("\n🤖 Testing LLM latency budget")
+    chain = FakeLLMAnalysis(delay=0.5)
+    pipeline = AnalysisPipeline(chain, None, cache=LRUCache(100, 0), latency_budget=0.1)
+    user_input = UserInput(**PROFILE)
+
+    async def run():
+        start = time.perf_counter()
+        first = await pipeline.run(user_input).acompute(STAGES)
+        elapsed = time.perf_counter() - start
+        await wait_for_backfills(pipeline)
+        second = await pipeline.run(user_input).acompute(STAGES)
+        await chain.llm_client.aclose()
+        return first, elapsed, second
+
+    first, elapsed, second = asyncio.run(run())
+    assert elapsed < 0.45  # bounded by the budget, not the 0.5s LLM call
+    assert first.partial
+    assert first.analysis == SimpleRetirementAnalysis().analyze_retirement_plan(user_input, first.projection_data)
+    assert set(STAGES) <= first.results.keys()
+
+    assert pipeline.backfill_stats() == {"started": 1, "completed": 1, "failed": 0, "pending": 0}
+    assert not second.partial
+    assert second.cache_hits["analysis"]
+    assert second.analysis.summary == FAKE_ANALYSIS["summary"]
+    assert chain.stats["requests"] == 1
+    print("✅ Latency budget working")
+
+
+def test_within_budget_uses_llm():
+    """An LLM answering within the budget is used directly."""
+
+    chain = FakeLLMAnalysis(delay=0.0)
+    pipeline = AnalysisPipeline(chain, None, cache=LRUCache(100, 0), latency_budget=1.0)
+
+    async def run():
+        result = await pipeline.run(UserInput(**PROFILE)).acompute(("analysis",))
+        await chain.llm_client.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert not result.partial
+    assert result.analysis.summary == FAKE_ANALYSIS["summary"]
+    assert pipeline.backfill_stats()["started"] == 0
+
+
+def test_cached_strategies_without_analysis_stay_within_budget():
+    """When strategies are cached but the analysis is not, the analysis LLM call is budgeted too."""
+
+    chain = FakeLLMAnalysis(delay=0.5)
+    pipeline = AnalysisPipeline(chain, SimpleRetirementStrategy(), cache=LRUCache(100, 0), latency_budget=0.1)
+    user_input = UserInput(**PROFILE)
+    seed = pipeline.run(user_input)
+    pipeline.cache.set(seed._cache_key("strategies", seed._chain_variants()[1]), fallback_strategies())
+
+    async def run():
+        start = time.perf_counter()
+        result = await pipeline.run(user_input).acompute(("strategies",))
+        elapsed = time.perf_counter() - start
+        await wait_for_backfills(pipeline)
+        await chain.llm_client.aclose()
+        return result, elapsed
+
+    result, elapsed = asyncio.run(run())
+    assert elapsed < 0.45
+    assert result.partial and result.cache_hits["strategies"]
+    assert result.analysis == SimpleRetirementAnalysis().analyze_retirement_plan(user_input, result.projection_data)
+    assert pipeline.backfill_stats()["completed"] == 1
+
+
+def test_analyze_reports_partial():
+    """/analyze marks over-budget responses with ai_enabled "partial"."""
+
+    chain = FakeLLMAnalysis(delay=0.5)
+    saved = main.pipeline.analysis_chain, main.pipeline.latency_budget, main.pipeline.cache
+    main.pipeline.analysis_chain, main.pipeline.latency_budget, main.pipeline.cache = chain, 0.1, LRUCache(100, 0)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            first = (await client.post("/analyze", json=PROFILE)).json()
+            await wait_for_backfills(main.pipeline)
+            second = (await client.post("/analyze", json=PROFILE)).json()
+        await chain.llm_client.aclose()
+        return first, second
+
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        main.pipeline.analysis_chain, main.pipeline.latency_budget, main.pipeline.cache = saved
+
+    assert first["ai_enabled"] == "partial"
+    assert second["ai_enabled"] is True
+    assert second["analysis"]["summary"] == FAKE_ANALYSIS["summary"]
+
+
+if __name__ == "__main__":
+    test_over_budget_returns_rule_based_then_backfills()
+    test_within_budget_uses_llm()
+    test_cached_strategies_without_analysis_stay_within_budget()
+    test_analyze_reports_partial()
+    print("\n🎉 All latency budget tests passed!")
@@ -0,0 +1,94 @@
+"""
+Test script to verify the persistent LLM response cache.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.user_input import UserInput
+from utils.formulas import retirement_projection
+from utils.llm_cache import LLMResponseCache, profile_bands, prompt_fingerprint
+
+
+PROFILE = {
+    "age": 31,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+ANALYSIS = {"summary": "On track", "key_insights": ["Use PPF"]}
+
+
+def bands_for(**changes):
+    user_input = UserInput(**{**PROFILE, **changes})
+    return profile_bands(user_input, retirement_projection(user_input), "Medium")
+
+
+def test_near_identical_profiles_share_a_band():
+    """Small differences stay in one band; a different income bracket does not."""
+
+    print("\n🗄️ Testing LLM cache bands")
+    assert bands_for() == bands_for(age=32, current_savings=510000, monthly_savings=20500)
+    assert bands_for() != bands_for(annual_income=2500000)
+    assert prompt_fingerprint("a {x}") != prompt_fingerprint("b {x}")
+    print("✅ Profile bands working")
+
+
+def test_persistence_ttl_and_eviction():
+    """Entries survive reopening, expire after the TTL and are evicted LRU-first."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "llm_cache.sqlite3")
+        cache = LLMResponseCache(path, ttl_seconds=0, max_entries=2)
+        cache.set("analysis", "p1", (30, "Low"), ANALYSIS)
+        assert cache.get("analysis", "p1", (30, "Low")) == ANALYSIS
+        assert cache.get("analysis", "p2", (30, "Low")) is None
+
+        reopened = LLMResponseCache(path, ttl_seconds=0, max_entries=2)
+        assert reopened.get("analysis", "p1", (30, "Low")) == ANALYSIS
+
+        reopened.set("analysis", "p1", (35, "Low"), ANALYSIS)
+        reopened.get("analysis", "p1", (30, "Low"))
+        reopened.set("analysis", "p1", (40, "Low"), ANALYSIS)
+        assert reopened.get("analysis", "p1", (35, "Low")) is None  # least recently used
+        assert reopened.get("analysis", "p1", (30, "Low")) == ANALYSIS
+
+        stats = reopened.stats()
+        assert stats["size"] == 2 and stats["evictions"] == 1
+        assert stats["hits"] == 3 and stats["misses"] == 1
+
+        expiring = LLMResponseCache(path, ttl_seconds=1e-9)
+        assert expiring.get("analysis", "p1", (30, "Low")) is None
+        assert expiring.stats()["expirations"] == 1
+
+
+def test_workers_sharing_a_file_respect_max_entries():
+    """Caches opened by several workers on one file keep the table at max_entries and report its real size."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "llm_cache.sqlite3")
+        workers = [LLMResponseCache(path, ttl_seconds=0, max_entries=3) for _ in range(2)]
+        for age in range(30, 60, 5):
+            for worker in workers:
+                worker.set("analysis", "p1", (age, id(worker)), ANALYSIS)
+
+        assert [worker.stats()["size"] for worker in workers] == [3, 3]
+        assert sum(worker.stats()["evictions"] for worker in workers) == 9
+        assert workers[0].get("analysis", "p1", (55, id(workers[1]))) == ANALYSIS
+        assert workers[1].get("analysis", "p1", (30, id(workers[0]))) is None
+
+
+if __name__ == "__main__":
+    test_near_identical_profiles_share_a_band()
+    test_persistence_ttl_and_eviction()
+    test_workers_sharing_a_file_respect_max_entries()
+    print("\n🎉 All LLM cache tests passed!")
@@ -0,0 +1,132 @@
+"""
+Test script to verify the Prometheus /metrics endpoint and its sharded counters.
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.metrics import MetricsRegistry, observe_request, observe_stage
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def samples(text):
+    """Metric lines of a Prometheus text page as {name{labels}: value}."""
+
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+
+def test_counters_and_histograms_across_threads():
+    """Samples recorded from several threads add up exactly and render cumulatively."""
+
+    print("\n📈 Testing sharded metrics")
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+
+    def record():
+        for _ in range(10000):
+            requests.inc(("/a",))
+            latency.observe(("/a",), 0.5)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latency.observe(("/a",), 0.05)
+    latency.observe(("/a",), 5.0)
+
+    values = samples(registry.render())
+    assert values['requests_total{route="/a"}'] == 40000
+    assert values['latency_seconds_bucket{route="/a",le="0.1"}'] == 1
+    assert values['latency_seconds_bucket{route="/a",le="1"}'] == 40001
+    assert values['latency_seconds_bucket{route="/a",le="+Inf"}'] == 40002
+    assert values['latency_seconds_count{route="/a"}'] == 40002
+    assert abs(values['latency_seconds_sum{route="/a"}'] - 20005.05) < 1e-6
+    print("✅ Sharded metrics working")
+
+
+def test_metrics_endpoint():
+    """/metrics reports requests, errors, route and stage latency, caches and LLM gauges."""
+
+    with TestClient(app) as client:
+        before = samples(client.get("/metrics").text)
+        assert client.post("/analyze", json=PROFILE).status_code == 200
+        assert client.post("/analyze", json=PROFILE).status_code == 200
+        assert client.post("/analyze", json={**PROFILE, "age": 5}).status_code == 422
+        response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = samples(response.text)
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert delta('finai_http_requests_total{method="POST",route="/analyze",status="200"}') == 2
+    assert delta('finai_http_request_errors_total{method="POST",route="/analyze",kind="client"}') == 1
+    assert delta('finai_http_request_duration_seconds_count{route="/analyze"}') == 3
+    assert delta('finai_stage_duration_seconds_count{stage="validation",source="computed"}') == 2
+    assert delta('finai_stage_duration_seconds_count{stage="serialization",source="computed"}') >= 2
+    assert delta('finai_stage_duration_seconds_count{stage="projection",source="cache"}') >= 1
+    assert 'finai_stage_duration_seconds_bucket{stage="strategies",source="cache",le="+Inf"}' in after
+    assert 0 < after['finai_cache_hit_ratio{cache="calculation"}'] <= 1
+    assert after["finai_llm_in_flight"] == 0
+
+
+def test_instrumentation_overhead():
+    """Recording one request's samples takes microseconds."""
+
+    iterations = 2000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for stage in ("validation", "projection", "risk", "analysis", "strategies", "serialization"):
+            observe_stage(stage, 0.0002)
+        observe_request("POST", "/analyze", 200, 0.004)
+    per_request = (time.perf_counter() - start) / iterations
+    assert per_request < 100e-6, f"{per_request * 1e6:.1f}us per request"
+
+
+def test_simple_server_metrics():
+    """The asyncio server serves the same metrics page."""
+
+    import simple_server
+
+    request = simple_server.HTTPRequest("GET", "/metrics", {}, b"", True)
+    status, body, headers = asyncio.run(simple_server.respond(request))
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/plain")
+    assert b"# TYPE finai_http_requests_total counter" in body
+    assert b"Content-Type: text/plain" in simple_server.encode_response(status, body, True, headers)
+
+
+if __name__ == "__main__":
+    test_counters_and_histograms_across_threads()
+    test_metrics_endpoint()
+    test_instrumentation_overhead()
+    test_simple_server_metrics()
+    print("\n🎉 All metrics tests passed!")
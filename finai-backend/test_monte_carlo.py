@@ -0,0 +1,86 @@
+"""
+Test script to verify the Monte Carlo simulation mode.
+Run this to check path compounding and the /simulate monte_carlo response.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from models.user_input import UserInput
+from utils.formulas import retirement_projection
+from utils.monte_carlo import monte_carlo_projection, compound_paths
+from main import app
+
+
+SAMPLE_INPUT = {
+    "age": 25,
+    "retirement_age": 60,
+    "annual_income": 800000,
+    "monthly_expenses": 40000,
+    "current_savings": 200000,
+    "monthly_savings": 15000,
+    "retirement_goal": 30000000,
+    "expected_inflation": 6.0,
+    "expected_returns": 8.0
+}
+
+
+def test_zero_volatility_matches_projection():
+    """With no volatility every path must equal the deterministic projection."""
+
+    print("\n🎲 Testing zero-volatility Monte Carlo")
+    user_input = UserInput(**SAMPLE_INPUT)
+    result = monte_carlo_projection(user_input, num_simulations=100, return_volatility=0, inflation_volatility=0)
+    projection = retirement_projection(user_input)
+
+    assert abs(result["corpus_percentiles"]["p50"] - projection.projected_corpus) < 0.05
+    assert result["corpus_percentiles"]["p10"] == result["corpus_percentiles"]["p90"]
+    print("✅ Zero-volatility paths match the deterministic projection")
+
+
+def test_compound_paths_varying_returns():
+    """Path compounding must match a year-by-year loop for uneven returns."""
+
+    print("\n📈 Testing path compounding")
+    returns = np.array([[0.10, -0.05, 0.07], [0.0, 0.0, 0.0]])
+    corpus = compound_paths(1000.0, 100.0, returns)
+
+    for path, path_returns in enumerate(returns):
+        expected = 1000.0
+        for annual_return in path_returns:
+            expected = expected * (1 + annual_return) + 100.0
+        assert abs(corpus[path] - expected) < 1e-9
+    print("✅ Path compounding matches the yearly loop")
+
+
+def test_monte_carlo_endpoint():
+    """The /simulate endpoint reports probability and percentiles in monte_carlo mode."""
+
+    print("\n🌐 Testing /simulate monte_carlo mode")
+    client = TestClient(app)
+    response = client.post("/simulate", json={
+        "user_input": SAMPLE_INPUT,
+        "modified_parameters": {"monthly_savings": 20000},
+        "simulation_type": "monte_carlo",
+        "num_simulations": 2000,
+        "seed": 42
+    })
+    assert response.status_code == 200
+    monte_carlo = response.json()["monte_carlo"]
+    assert 0 <= monte_carlo["probability_of_success"] <= 100
+    percentiles = monte_carlo["corpus_percentiles"]
+    assert percentiles["p10"] <= percentiles["p50"] <= percentiles["p90"]
+    print("✅ Monte Carlo endpoint working")
+
+
+if __name__ == "__main__":
+    test_zero_volatility_matches_projection()
+    test_compound_paths_varying_returns()
+    test_monte_carlo_endpoint()
+    print("\n🎉 All Monte Carlo tests passed!")
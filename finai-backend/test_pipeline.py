@@ -0,0 +1,107 @@
+"""
+Test script to verify the shared analysis pipeline.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+from models.user_input import UserInput
+from utils.cache import LRUCache
+from chains.simple_analysis import SimpleRetirementAnalysis
+from chains.simple_strategy import SimpleRetirementStrategy
+from chains.pipeline import AnalysisPipeline
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+class CountingAnalysis(SimpleRetirementAnalysis):
+    """Rule-based analysis that counts its calls and can be told to fail."""
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.calls = 0
+        self.fail = fail
+
+    def analyze_retirement_plan(self, user_input, projection_data=None):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        return super().analyze_retirement_plan(user_input, projection_data)
+
+
+def test_stages_run_once_and_are_shared():
+    """Each stage runs once per profile; later runs are served from the cache."""
+
+    print("\n🔁 Testing analysis pipeline")
+    analysis = CountingAnalysis()
+    pipeline = AnalysisPipeline(analysis, SimpleRetirementStrategy(), cache=LRUCache(100, 0))
+    user_input = UserInput(**PROFILE)
+
+    run = pipeline.run(user_input)
+    assert run.strategies.strategies
+    assert run.analysis is run.results["analysis"]
+    assert analysis.calls == 1
+    assert not run.cache_hits["analysis"]
+
+    second = pipeline.run(UserInput(**PROFILE))
+    assert second.strategies is run.strategies
+    assert second.cache_hits["strategies"] and analysis.calls == 1
+    stats = pipeline.stats()["strategies"]
+    assert stats["count"] == 2 and stats["cache_hits"] == 1
+    print("✅ Pipeline stages shared")
+
+
+def test_failed_chain_falls_back_without_caching():
+    """A chain failure yields the fallback analysis, and the next request retries the chain."""
+
+    analysis = CountingAnalysis(fail=True)
+    pipeline = AnalysisPipeline(analysis, None, cache=LRUCache(100, 0))
+
+    result = pipeline.run(UserInput(**PROFILE)).analysis
+    assert result.key_insights == ["Basic analysis completed"]
+    pipeline.run(UserInput(**PROFILE)).analysis
+    assert analysis.calls == 2
+
+
+def test_suggestions_after_analyze_reuse_pipeline():
+    """/suggestions after /analyze for the same profile reuses the analysis and strategies."""
+
+    import main
+
+    analysis = CountingAnalysis()
+    main.pipeline.analysis_chain, main.pipeline.strategy_chain = analysis, SimpleRetirementStrategy()
+    try:
+        client = TestClient(main.app)
+        profile = dict(PROFILE, current_savings=512345)
+        analyzed = client.post("/analyze", json=profile)
+        suggested = client.post("/suggestions", json=profile)
+    finally:
+        main.pipeline.analysis_chain = main.pipeline.strategy_chain = None
+
+    assert analyzed.status_code == suggested.status_code == 200
+    assert analysis.calls == 1
+    assert suggested.json()["strategies"] == analyzed.json()["strategies"]
+    assert 'strategies;dur=' in suggested.headers["server-timing"]
+    assert 'desc="cache"' in suggested.headers["server-timing"]
+
+
+if __name__ == "__main__":
+    test_stages_run_once_and_are_shared()
+    test_failed_chain_falls_back_without_caching()
+    test_suggestions_after_analyze_reuse_pipeline()
+    print("\n🎉 All pipeline tests passed!")
@@ -0,0 +1,92 @@
+"""
+Test script to verify the combined single-call analysis and strategy chain.
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from models.user_input import UserInput
+from utils.cache import LRUCache
+from utils.llm_cache import LLMResponseCache
+from chains.llm_client import AsyncChatClient, LLMLimiter
+from chains.pipeline import AnalysisPipeline, STAGES
+from fake_openai_server import create_fake_openai_app, default_reply, FAKE_ANALYSIS, FAKE_STRATEGIES
+
+from chains.plan_chain import RetirementPlanChain
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def plan_chain(reply=default_reply):
+    """RetirementPlanChain wired to an in-process fake server with a private response cache."""
+
+    app = create_fake_openai_app(reply=reply)
+    client = AsyncChatClient(
+        api_key="fake", base_url="http://fake-openai/v1",
+        limiter=LLMLimiter(8, 5.0), transport=httpx.ASGITransport(app=app)
+    )
+    return RetirementPlanChain("fake", llm_client=client, response_cache=LLMResponseCache(":memory:")), app.state.stats
+
+
+def test_one_call_for_analysis_and_strategies():
+    """The pipeline gets both stages from a single LLM call."""
+
+    print("\n🤖 Testing combined plan chain")
+    chain, stats = plan_chain()
+    pipeline = AnalysisPipeline(chain, chain, cache=LRUCache(100, 0))
+
+    async def main():
+        run = await pipeline.run(UserInput(**PROFILE)).acompute(STAGES)
+        await chain.llm_client.aclose()
+        return run
+
+    run = asyncio.run(main())
+    assert stats["requests"] == 1
+    assert run.analysis.summary == FAKE_ANALYSIS["summary"]
+    assert run.strategies.implementation_order == FAKE_STRATEGIES["implementation_order"]
+    print("✅ Combined plan chain working")
+
+
+def test_falls_back_to_two_calls_on_parse_failure():
+    """An unparseable combined reply is retried with the separate analysis and strategy prompts."""
+
+    def reply(prompt):
+        if '"strategies"' in prompt and '"key_insights"' in prompt:
+            return "Sorry, I cannot help with that."
+        return default_reply(prompt)
+
+    chain, stats = plan_chain(reply)
+    user_input = UserInput(**PROFILE)
+
+    async def main():
+        analysis = await chain.aanalyze_retirement_plan(user_input)
+        strategies = await chain.agenerate_strategies(user_input, analysis)
+        await chain.llm_client.aclose()
+        return analysis, strategies
+
+    analysis, strategies = asyncio.run(main())
+    assert stats["requests"] == 3
+    assert analysis.summary == FAKE_ANALYSIS["summary"]
+    assert strategies.implementation_order == FAKE_STRATEGIES["implementation_order"]
+
+
+if __name__ == "__main__":
+    test_one_call_for_analysis_and_strategies()
+    test_falls_back_to_two_calls_on_parse_failure()
+    print("\n🎉 All plan chain tests passed!")
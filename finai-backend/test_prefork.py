@@ -0,0 +1,98 @@
+"""
+Test script to verify the prefork supervisor: startup reports, restarts and graceful reload.
+"""
+
+import sys
+import os
+import json
+import time
+import signal
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import pytest
+
+from prefork import Supervisor, bind_socket
+
+
+def fake_worker(sock, ready_queue, generation, spawned_at):
+    """Reports ready immediately and serves nothing."""
+
+    ready_queue.put({"pid": os.getpid(), "generation": generation, "startup_seconds": time.time() - spawned_at})
+    while True:
+        time.sleep(1)
+
+
+def poll_until(supervisor, condition, timeout=10.0):
+    """Poll the supervisor until condition() holds."""
+
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out waiting for the supervisor"
+        supervisor.poll(0.05)
+
+
+def ready_pids(supervisor):
+    return sorted(worker.process.pid for worker in supervisor.current() if worker.ready)
+
+
+def test_restart_and_graceful_reload(tmp_path):
+    """Crashed workers are replaced; a reload swaps generations only once the new one is ready."""
+
+    print("\n🤖 Testing prefork supervisor")
+    report = tmp_path / "startup.jsonl"
+    sock = bind_socket("127.0.0.1", 0)
+    supervisor = Supervisor(sock, workers=2, target=fake_worker, startup_report=str(report), graceful_timeout=2.0)
+    supervisor.start()
+    try:
+        poll_until(supervisor, lambda: len(ready_pids(supervisor)) == 2)
+        first = ready_pids(supervisor)
+
+        # Crash one worker: it is restarted
+        os.kill(first[0], signal.SIGKILL)
+        poll_until(supervisor, lambda: len(ready_pids(supervisor)) == 2 and first[0] not in ready_pids(supervisor))
+        assert supervisor.restarts == 1
+        before_reload = ready_pids(supervisor)
+
+        # Reload: new generation first, then the old workers are stopped
+        supervisor.request_reload()
+        poll_until(supervisor, lambda: supervisor.generation == 1 and len(ready_pids(supervisor)) == 2)
+        poll_until(supervisor, lambda: len(supervisor.pool) == 2)
+        assert not set(before_reload) & set(ready_pids(supervisor))
+        assert supervisor.restarts == 1  # retired workers are not restarted
+    finally:
+        supervisor.shutdown()
+        sock.close()
+
+    lines = [json.loads(line) for line in report.read_text().splitlines()]
+    assert len(lines) == 5  # two initial workers, one restart, two reloaded workers
+    assert all(line["startup_seconds"] >= 0 for line in lines)
+    assert [line["generation"] for line in lines] == [0, 0, 0, 1, 1]
+    print("✅ Prefork supervisor working")
+
+
+def test_uvicorn_workers_serve_app():
+    """Real workers warm up, run the app startup and serve from the shared socket."""
+
+    pytest.importorskip("uvicorn")
+    sock = bind_socket("127.0.0.1", 0)
+    port = sock.getsockname()[1]
+    supervisor = Supervisor(sock, workers=2, startup_report=None, graceful_timeout=5.0)
+    supervisor.start()
+    try:
+        poll_until(supervisor, lambda: len(ready_pids(supervisor)) == 2, timeout=60.0)
+        assert all("warmup_seconds" in report for report in supervisor.startup_times)
+        assert httpx.get(f"http://127.0.0.1:{port}/health").json()["status"] == "healthy"
+    finally:
+        supervisor.shutdown()
+        sock.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_restart_and_graceful_reload(pathlib.Path(tempfile.mkdtemp()))
+    test_uvicorn_workers_serve_app()
+    print("\n🎉 All prefork tests passed!")
@@ -0,0 +1,157 @@
+"""
+Test script to verify opt-in request profiling and the /debug/profiles index.
+"""
+
+import sys
+import os
+import json
+import time
+import pstats
+import threading
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+from main import app
+from utils import profiling
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def enable_profiling(monkeypatch, tmp_path, token=""):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", token)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+
+
+def test_disabled_by_default(monkeypatch, tmp_path):
+    """Without PROFILING_ENABLED the header is ignored and the index is hidden."""
+
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", False)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    with TestClient(app) as client:
+        response = client.post("/analyze", json=PROFILE, headers={"X-Profile": "pstats"})
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert client.get("/debug/profiles").status_code == 404
+    assert os.listdir(tmp_path) == []
+
+
+def test_pstats_capture_with_stage_markers(monkeypatch, tmp_path):
+    """A profiled /analyze writes a pstats file and a summary with the stage markers."""
+
+    print("\n🔬 Testing request profiling")
+    enable_profiling(monkeypatch, tmp_path)
+    with TestClient(app) as client:
+        response = client.post("/analyze", json={**PROFILE, "age": 41}, headers={"X-Profile": "pstats"})
+        assert response.status_code == 200
+        capture_id = response.headers["x-profile-id"]
+
+        index = client.get("/debug/profiles").json()["profiles"]
+        download = client.get(f"/debug/profiles/{capture_id}")
+
+    assert [capture["id"] for capture in index] == [capture_id]
+    summary = index[0]
+    assert summary["format"] == "pstats" and summary["status"] == 200 and summary["path"] == "/analyze"
+    stages = [marker["stage"] for marker in summary["stages"]]
+    for stage in ("projection", "analysis", "strategies", "serialization"):
+        assert stage in stages
+    assert all(0 <= marker["start_ms"] <= summary["duration_ms"] for marker in summary["stages"])
+
+    assert download.status_code == 200
+    stats = pstats.Stats(str(tmp_path / summary["file"]))
+    assert any(name == "retirement_projection" for _, _, name in stats.stats)
+    print("✅ Request profiling working")
+
+
+def test_query_flag_token_and_busy(monkeypatch, tmp_path):
+    """?profile= works, a configured token is required, and concurrent captures are refused."""
+
+    enable_profiling(monkeypatch, tmp_path, token="secret")
+    with TestClient(app) as client:
+        assert "x-profile-id" not in client.post("/analyze?profile=1", json=PROFILE).headers
+        response = client.post("/analyze?profile=1", json=PROFILE, headers={"X-Profile-Token": "secret"})
+        assert response.headers["x-profile-id"]
+
+        profiling._capture_lock.acquire()
+        try:
+            busy = client.post("/analyze", json=PROFILE, headers={"X-Profile": "pstats", "X-Profile-Token": "secret"})
+        finally:
+            profiling._capture_lock.release()
+        assert busy.status_code == 200 and busy.headers["x-profile"] == "busy"
+
+    assert [capture["format"] for capture in profiling.list_captures(str(tmp_path))] == ["speedscope"]
+
+
+def test_index_and_download_require_token(monkeypatch, tmp_path):
+    """With PROFILING_TOKEN set, /debug/profiles and downloads answer 404 without the matching token."""
+
+    enable_profiling(monkeypatch, tmp_path, token="secret")
+    with TestClient(app) as client:
+        profiled = client.post("/analyze", json=PROFILE, headers={"X-Profile": "pstats", "X-Profile-Token": "secret"})
+        capture_id = profiled.headers["x-profile-id"]
+
+        for headers in ({}, {"X-Profile-Token": "wrong"}):
+            assert client.get("/debug/profiles", headers=headers).status_code == 404
+            assert client.get(f"/debug/profiles/{capture_id}", headers=headers).status_code == 404
+
+        index = client.get("/debug/profiles", headers={"X-Profile-Token": "secret"})
+        download = client.get(f"/debug/profiles/{capture_id}", headers={"X-Profile-Token": "secret"})
+
+    assert index.status_code == 200 and [capture["id"] for capture in index.json()["profiles"]] == [capture_id]
+    assert "directory" not in index.json()
+    assert download.status_code == 200 and download.content
+
+
+def test_speedscope_samples_under_stage_frames(tmp_path):
+    """Sampled stacks taken inside a marked stage are rooted at a stage frame."""
+
+    capture = profiling.Capture("speedscope", "POST", "/analyze", directory=str(tmp_path))
+    token = profiling._active.set(capture)
+    capture.start()
+    try:
+        start = time.perf_counter()
+        while time.perf_counter() - start < 0.05:
+            pass
+        profiling.mark_stage("projection", start, time.perf_counter() - start)
+    finally:
+        capture.stop()
+        profiling._active.reset(token)
+    summary = capture.save()
+
+    with open(tmp_path / summary["file"]) as f:
+        speedscope = json.load(f)
+    frames = [frame["name"] for frame in speedscope["shared"]["frames"]]
+    profile = next(p for p in speedscope["profiles"] if p["name"] == f"thread {threading.get_ident()}")
+    in_stage = [frames[sample[0]] == "stage:projection" for sample in profile["samples"]]
+    # Only the samples taken while stopping the capture fall outside the stage
+    assert sum(in_stage) >= 5 and sum(in_stage) >= len(in_stage) - 3
+    assert "test_speedscope_samples_under_stage_frames" in frames
+
+
+def test_prune_keeps_newest(tmp_path):
+    """Only the newest captures are kept."""
+
+    for i in range(3):
+        with open(tmp_path / f"c{i}.json", "w") as f:
+            json.dump({"id": f"c{i}", "created": i, "file": f"c{i}.prof"}, f)
+        (tmp_path / f"c{i}.prof").write_bytes(b"")
+    profiling.prune(str(tmp_path), keep=2)
+    assert sorted(os.listdir(tmp_path)) == ["c1.json", "c1.prof", "c2.json", "c2.prof"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
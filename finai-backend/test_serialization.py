@@ -0,0 +1,74 @@
+"""
+Test script to verify orjson response serialization and MessagePack negotiation.
+"""
+
+import sys
+import os
+import json
+import asyncio
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from main import app, pipeline, analyze_response_body, ANALYZE_STAGES
+from models.user_input import UserInput
+from utils.serialization import dumps_json, dumps_msgpack, msgpack_available
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def test_models_serialize_like_jsonable_encoder():
+    """orjson output of the model-holding body matches the previous encoding."""
+
+    print("\n🤖 Testing model serialization")
+    run = asyncio.run(pipeline.run(UserInput(**PROFILE)).acompute(ANALYZE_STAGES))
+    body = analyze_response_body(run)
+    assert json.loads(dumps_json(body)) == jsonable_encoder(body)
+
+    arrays = {"values": np.array([1.5, 2.5]), "count": np.int64(2), "grid": np.zeros((2, 2))}
+    assert json.loads(dumps_json(arrays)) == {"values": [1.5, 2.5], "count": 2, "grid": [[0.0, 0.0], [0.0, 0.0]]}
+    print("✅ Model serialization working")
+
+
+def test_analyze_negotiates_format():
+    """JSON by default; MessagePack only when asked for and available."""
+
+    with TestClient(app) as client:
+        response = client.post("/analyze", json=PROFILE)
+        assert response.headers["content-type"] == "application/json"
+        assert "Accept" in response.headers["vary"]
+        assert "Server-Timing" in response.headers
+        assert response.json()["projection"]["current_age"] == 30
+
+        packed = client.post("/analyze", json=PROFILE, headers={"Accept": "application/x-msgpack"})
+
+    if not msgpack_available():
+        assert packed.headers["content-type"] == "application/json"
+        with pytest.raises(RuntimeError):
+            dumps_msgpack({})
+        return
+
+    import msgpack
+    assert packed.headers["content-type"] == "application/x-msgpack"
+    assert msgpack.unpackb(packed.content) == response.json()
+
+
+if __name__ == "__main__":
+    test_models_serialize_like_jsonable_encoder()
+    test_analyze_negotiates_format()
+    print("\n🎉 All serialization tests passed!")
@@ -0,0 +1,138 @@
+"""
+Test script to verify the asyncio simple server: keep-alive, pipelining, limits and API parity.
+"""
+
+import sys
+import os
+import json
+import socket
+import asyncio
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import simple_server
+from main import app
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def post(path, body, version="HTTP/1.1"):
+    """Raw POST request bytes with a JSON body."""
+
+    data = json.dumps(body).encode()
+    return f"POST {path} {version}\r\nHost: test\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+
+
+async def read_response(reader):
+    """Read one response: (status, headers, parsed JSON body), or None at EOF."""
+
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:] if line)
+    body = await reader.readexactly(int(headers["Content-Length"]))
+    return int(lines[0].split(" ")[1]), headers, json.loads(body) if body else None
+
+
+def exchange(raw, responses, servers=1):
+    """Send raw bytes on one connection and read `responses` responses plus whether it was closed."""
+
+    async def main():
+        started = [await simple_server.start("127.0.0.1", 0, reuse_port=servers > 1)]
+        port = started[0].sockets[0].getsockname()[1]
+        for _ in range(servers - 1):
+            started.append(await simple_server.start("127.0.0.1", port, reuse_port=True))
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        results = [await read_response(reader) for _ in range(responses)]
+        closed = await read_response(reader) is None if results[-1][1]["Connection"] == "close" else False
+        writer.close()
+        for server in started:
+            server.close()
+        return results, closed
+
+    return asyncio.run(main())
+
+
+def test_pipelined_requests_on_one_connection():
+    """Back-to-back requests are answered in order on a kept-alive connection."""
+
+    print("\n🤖 Testing pipelined keep-alive requests")
+    raw = (
+        post("/analyze", PROFILE)
+        + post("/suggestions", PROFILE)
+        + post("/simulate", {"user_input": PROFILE, "modified_parameters": {"monthly_savings": 30000}})
+        + b"GET /health HTTP/1.1\r\nHost: test\r\n\r\n"
+    )
+    (analyze, suggestions, simulate, health), _ = exchange(raw, 4)
+
+    assert [response[0] for response in (analyze, suggestions, simulate, health)] == [200] * 4
+    assert all(response[1]["Connection"] == "keep-alive" for response in (analyze, suggestions, simulate, health))
+    assert "projection" in analyze[1]["Server-Timing"]
+    assert suggestions[2]["strategies"]
+    assert simulate[2]["differences"]["corpus_difference"] > 0
+    assert health[2]["server"]["requests"] >= 4
+
+    # Same engine and response bodies as the FastAPI app
+    with TestClient(app) as client:
+        expected = client.post("/analyze", json=PROFILE).json()
+    for field in ("projection", "risk_assessment", "timeline", "retirement_income", "instrument_projection"):
+        assert analyze[2][field] == expected[field]
+    print("✅ Pipelining working")
+
+
+def test_oversized_body_is_rejected_and_connection_closed():
+    """A Content-Length above the limit gets 413 without reading the body."""
+
+    raw = f"POST /analyze HTTP/1.1\r\nContent-Length: {simple_server.MAX_BODY_BYTES + 1}\r\n\r\n".encode()
+    (response,), closed = exchange(raw, 1)
+    assert response[0] == 413 and closed
+
+
+def test_errors_and_http10():
+    """Invalid input gets 422, unknown paths 404, and HTTP/1.0 closes after the response."""
+
+    raw = (
+        post("/analyze", dict(PROFILE, age=10))
+        + b"GET /missing HTTP/1.1\r\n\r\n"
+        + post("/suggestions", PROFILE, version="HTTP/1.0")
+    )
+    (invalid, missing, suggestions), closed = exchange(raw, 3)
+    assert invalid[0] == 422 and invalid[2]["detail"][0]["loc"] == ["age"]
+    assert missing[0] == 404
+    assert suggestions[0] == 200 and closed
+
+
+def test_workers_share_port_with_reuseport():
+    """Several listeners bind the same port when SO_REUSEPORT is available."""
+
+    if not hasattr(socket, "SO_REUSEPORT"):
+        pytest.skip("SO_REUSEPORT not available")
+    (response,), _ = exchange(b"GET /health HTTP/1.1\r\n\r\n", 1, servers=3)
+    assert response[0] == 200
+
+
+if __name__ == "__main__":
+    test_pipelined_requests_on_one_connection()
+    test_oversized_body_is_rejected_and_connection_closed()
+    test_errors_and_http10()
+    test_workers_share_port_with_reuseport()
+    print("\n🎉 All simple server tests passed!")
@@ -0,0 +1,126 @@
+"""
+Test script to verify the goal-seek solvers.
+Each solver is checked by feeding its answer back through the batch projection.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from models.user_input import UserInput
+from utils.formulas import retirement_projection_batch, calculate_required_monthly_savings
+from utils.solver import (
+    required_monthly_savings,
+    required_current_savings,
+    required_retirement_age,
+    required_expected_returns
+)
+from chains.simple_strategy import SimpleRetirementStrategy
+from chains.simple_analysis import SimpleRetirementAnalysis
+
+
+AGE = np.array([25, 35, 45, 30])
+RETIREMENT_AGE = np.array([60, 60, 60, 65])
+CURRENT_SAVINGS = np.array([200000.0, 1000000.0, 3000000.0, 0.0])
+MONTHLY_SAVINGS = np.array([15000.0, 30000.0, 50000.0, 5000.0])
+EXPECTED_RETURNS = np.array([8.0, 8.0, 0.0, 10.0])
+RETIREMENT_GOAL = np.array([30000000.0, 50000000.0, 80000000.0, 20000000.0])
+
+
+def test_required_monthly_and_current_savings():
+    """Closed-form savings solvers must land exactly on the goal."""
+
+    print("\n🎯 Testing savings solvers")
+    years = RETIREMENT_AGE - AGE
+
+    monthly = required_monthly_savings(RETIREMENT_GOAL, CURRENT_SAVINGS, years, EXPECTED_RETURNS)
+    corpus = retirement_projection_batch(AGE, RETIREMENT_AGE, CURRENT_SAVINGS, monthly, EXPECTED_RETURNS, RETIREMENT_GOAL)
+    np.testing.assert_allclose(corpus["projected_corpus"], RETIREMENT_GOAL, rtol=1e-9)
+    for i in range(len(AGE)):
+        # The scalar formula takes returns as a decimal but must give the same answer
+        assert calculate_required_monthly_savings(
+            RETIREMENT_GOAL[i], CURRENT_SAVINGS[i], years[i], EXPECTED_RETURNS[i] / 100
+        ) == round(float(monthly[i]), 2)
+
+    starting = required_current_savings(RETIREMENT_GOAL, MONTHLY_SAVINGS, years, EXPECTED_RETURNS)
+    corpus = retirement_projection_batch(AGE, RETIREMENT_AGE, starting, MONTHLY_SAVINGS, EXPECTED_RETURNS, RETIREMENT_GOAL)
+    assert np.all(corpus["projected_corpus"] >= RETIREMENT_GOAL - 0.01)
+    print("✅ Savings solvers working")
+
+
+def test_required_retirement_age():
+    """The solved age reaches the goal and one year earlier does not."""
+
+    print("\n⏰ Testing retirement age solver")
+    ages = required_retirement_age(AGE, RETIREMENT_GOAL, CURRENT_SAVINGS, MONTHLY_SAVINGS, EXPECTED_RETURNS)
+    reachable = ~np.isnan(ages)
+    assert reachable.any()
+
+    solved = ages[reachable].astype(int)
+    args = (AGE[reachable], CURRENT_SAVINGS[reachable], MONTHLY_SAVINGS[reachable],
+            EXPECTED_RETURNS[reachable], RETIREMENT_GOAL[reachable])
+    at_age = retirement_projection_batch(args[0], solved, *args[1:])
+    before = retirement_projection_batch(args[0], solved - 1, *args[1:])
+    assert np.all(at_age["projected_corpus"] >= RETIREMENT_GOAL[reachable])
+    assert np.all((before["projected_corpus"] < RETIREMENT_GOAL[reachable]) | (solved - 1 == AGE[reachable]))
+    print("✅ Retirement age solver working")
+
+
+def test_required_expected_returns():
+    """Bisection finds the return that reaches the goal for the whole batch."""
+
+    print("\n📈 Testing expected returns solver")
+    years = RETIREMENT_AGE - AGE
+    rates = required_expected_returns(RETIREMENT_GOAL, CURRENT_SAVINGS, MONTHLY_SAVINGS, years)
+    assert not np.isnan(rates).any()
+
+    corpus = retirement_projection_batch(AGE, RETIREMENT_AGE, CURRENT_SAVINGS, MONTHLY_SAVINGS, rates, RETIREMENT_GOAL)
+    np.testing.assert_allclose(corpus["projected_corpus"], RETIREMENT_GOAL, rtol=1e-5)
+    print("✅ Expected returns solver working")
+
+
+def test_strategies_quote_solver_numbers():
+    """Rule-based strategies quote the exact required monthly savings."""
+
+    print("\n🧭 Testing strategy figures")
+    user_input = UserInput(
+        age=35, retirement_age=55, annual_income=1200000, monthly_expenses=50000,
+        current_savings=100000, monthly_savings=5000, retirement_goal=50000000, expected_returns=8.0
+    )
+    analysis = SimpleRetirementAnalysis().analyze_retirement_plan(user_input)
+    response = SimpleRetirementStrategy().generate_strategies(user_input, analysis)
+
+    required = float(required_monthly_savings(50000000, 100000, 20, 8.0))
+    urgent = next(s for s in response.strategies if s.title.endswith("Increase Monthly Savings"))
+    assert f"₹{required:,.0f}" in urgent.description
+    print("✅ Strategies quote solver figures")
+
+
+def test_extended_retirement_age_stays_valid():
+    """Retiring 5 years later is only suggested when that age is at most 100."""
+
+    analysis_chain, strategy_chain = SimpleRetirementAnalysis(), SimpleRetirementStrategy()
+    titles = {}
+    for retirement_age in (95, 97):
+        user_input = UserInput(
+            age=70, retirement_age=retirement_age, annual_income=1200000, monthly_expenses=50000,
+            current_savings=100000, monthly_savings=5000, retirement_goal=50000000, expected_returns=8.0
+        )
+        response = strategy_chain.generate_strategies(user_input, analysis_chain.analyze_retirement_plan(user_input))
+        titles[retirement_age] = [s.title for s in response.strategies]
+
+    assert "Consider Extending Retirement Age" in titles[95]
+    assert "Consider Extending Retirement Age" not in titles[97]
+
+
+if __name__ == "__main__":
+    test_required_monthly_and_current_savings()
+    test_required_retirement_age()
+    test_required_expected_returns()
+    test_strategies_quote_solver_numbers()
+    test_extended_retirement_age_stays_valid()
+    print("\n🎉 All solver tests passed!")
@@ -0,0 +1,196 @@
+"""
+Test script to verify the progressive /analyze/stream endpoint and LLM token streaming.
+"""
+
+import sys
+import os
+import json
+import asyncio
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi.testclient import TestClient
+
+from main import app
+from models.user_input import UserInput, AnalysisResult
+from utils.cache import LRUCache
+from utils.llm_cache import LLMResponseCache
+from chains.llm_client import AsyncChatClient, LLMLimiter, JSONListStream
+from chains.pipeline import AnalysisPipeline
+from fake_openai_server import create_fake_openai_app, FAKE_ANALYSIS, FAKE_STRATEGIES
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def fake_client(chunk_size=16, timeout=5.0):
+    """AsyncChatClient wired to an in-process fake server."""
+
+    app = create_fake_openai_app(chunk_size=chunk_size)
+    client = AsyncChatClient(
+        api_key="fake", base_url="http://fake-openai/v1",
+        limiter=LLMLimiter(8, timeout), transport=httpx.ASGITransport(app=app)
+    )
+    return client, app.state.stats
+
+
+def parse_sse(body):
+    """Split a text/event-stream body into (event, data) pairs."""
+
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class FakeStreamingAnalysis:
+    """Analysis chain with a streaming variant backed by the fake server."""
+
+    def __init__(self, client):
+        self.llm_client = client
+
+    async def aanalyze_retirement_plan(self, user_input, projection_data=None):
+        return AnalysisResult(**json.loads(await self.llm_client.complete("Analyze this profile")))
+
+    async def astream_analysis(self, user_input, projection_data=None):
+        insights = JSONListStream("key_insights")
+        async for token in self.llm_client.stream("Analyze this profile"):
+            yield "token", token
+            for insight in insights.feed(token):
+                yield "key_insight", insight
+        yield "result", AnalysisResult(**json.loads(insights.buffer))
+
+
+def test_json_list_stream():
+    """List items are extracted as soon as they are complete, even one character at a time."""
+
+    print("\n🤖 Testing incremental JSON list extraction")
+    text = "Here you go:\n" + json.dumps(FAKE_STRATEGIES, indent=2)
+    extractor = JSONListStream("strategies")
+    items = []
+    for char in text:
+        items.extend(extractor.feed(char))
+    assert items == FAKE_STRATEGIES["strategies"]
+    assert extractor.done
+
+    numbers = JSONListStream("values")
+    assert numbers.feed('{"values": [12') == []
+    assert numbers.feed('3, 4') == [123]
+    assert numbers.feed(']}') == [4]
+    print("✅ JSON list extraction working")
+
+
+def test_client_stream_reassembles_reply():
+    """Streamed deltas join into the same reply and the limiter slot is released."""
+
+    client, stats = fake_client(chunk_size=7)
+
+    async def main():
+        tokens = [token async for token in client.stream("Analyze this profile")]
+        await client.aclose()
+        return tokens
+
+    tokens = asyncio.run(main())
+    assert len(tokens) > 1
+    assert json.loads("".join(tokens)) == FAKE_ANALYSIS
+    assert client.limiter.in_flight == 0 and stats["requests"] == 1
+
+
+def test_pipeline_streams_insights_before_analysis():
+    """Key insights are forwarded while the chain is still streaming."""
+
+    client, _ = fake_client(chunk_size=5)
+    pipeline = AnalysisPipeline(FakeStreamingAnalysis(client), None, cache=LRUCache(100, 0))
+
+    async def main():
+        events = [event async for event in pipeline.run(UserInput(**PROFILE)).astream()]
+        await client.aclose()
+        return events
+
+    events = asyncio.run(main())
+    names = [name for name, _ in events]
+    assert names[:2] == ["projection", "risk_assessment"]
+    assert names[-1] == "done"
+
+    analysis_at = names.index("analysis")
+    insights = [data for name, data in events[:analysis_at] if name == "key_insight"]
+    assert insights == FAKE_ANALYSIS["key_insights"]
+    assert "token" in names[:names.index("key_insight")]
+    assert events[analysis_at][1]["summary"] == FAKE_ANALYSIS["summary"]
+
+    # Second run is served from the calculation cache: no tokens, same insights
+    async def again():
+        return [event async for event in pipeline.run(UserInput(**PROFILE)).astream()]
+
+    cached = asyncio.run(again())
+    assert "token" not in [name for name, _ in cached]
+    assert [data for name, data in cached if name == "key_insight"] == FAKE_ANALYSIS["key_insights"]
+
+
+def test_analyze_stream_endpoint():
+    """The endpoint emits deterministic results first and matches /analyze."""
+
+    print("\n🤖 Testing /analyze/stream")
+    with TestClient(app) as client:
+        response = client.post("/analyze/stream", json=PROFILE)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse(response.text)
+        full = client.post("/analyze", json=PROFILE).json()
+
+    names = [name for name, _ in events]
+    assert names[:2] == ["projection", "risk_assessment"]
+    assert names.index("analysis") < names.index("strategies") < names.index("done")
+    data = dict(events)
+    assert data["projection"] == full["projection"]
+    assert data["risk_assessment"] == full["risk_assessment"]
+    assert data["analysis"] == full["analysis"]
+    assert data["strategies"]["strategies"] == full["strategies"]
+    assert [d for name, d in events if name == "key_insight"] == full["analysis"]["key_insights"]
+    assert data["done"]["server_timing"]
+    print("✅ Streaming endpoint working")
+
+
+def test_langchain_chains_stream():
+    """The LangChain chains stream insights and strategies from the fake server."""
+
+    from chains.analysis_chain import RetirementAnalysisChain
+    from chains.strategy_chain import RetirementStrategyChain
+
+    client, _ = fake_client()
+    response_cache = LLMResponseCache(":memory:")
+    analysis_chain = RetirementAnalysisChain("fake", llm_client=client, response_cache=response_cache)
+    strategy_chain = RetirementStrategyChain("fake", llm_client=client, response_cache=response_cache)
+    user_input = UserInput(**PROFILE)
+
+    async def main():
+        analysis_events = [event async for event in analysis_chain.astream_analysis(user_input)]
+        analysis = analysis_events[-1][1]
+        strategy_events = [event async for event in strategy_chain.astream_strategies(user_input, analysis)]
+        await client.aclose()
+        return analysis_events, strategy_events
+
+    analysis_events, strategy_events = asyncio.run(main())
+    assert [d for name, d in analysis_events if name == "key_insight"] == FAKE_ANALYSIS["key_insights"]
+    assert [d for name, d in strategy_events if name == "strategy"] == FAKE_STRATEGIES["strategies"]
+    assert strategy_events[-1][1].implementation_order == ["Step Up Your SIP"]
+
+
+if __name__ == "__main__":
+    test_json_list_stream()
+    test_client_stream_reassembles_reply()
+    test_pipeline_streams_insights_before_analysis()
+    test_analyze_stream_endpoint()
+    print("\n🎉 All streaming tests passed!")
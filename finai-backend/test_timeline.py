@@ -0,0 +1,83 @@
+"""
+Test script to verify the cash-flow timeline engine.
+Checks the closed-form compounding against a year-by-year loop and the headline projection.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from models.user_input import UserInput
+from utils.formulas import retirement_projection
+from utils.timeline import cash_flow_timeline, user_timeline, iter_timeline_rows, iter_timeline_chunks
+
+
+def _loop_balance(current_savings, monthly_savings, expected_returns, step_up, years):
+    """Reference year-by-year balance with the year's savings invested at the year end."""
+    balance = current_savings
+    for year in range(years):
+        balance = balance * (1 + expected_returns / 100) + monthly_savings * 12 * (1 + step_up / 100) ** year
+    return balance
+
+
+def test_timeline_matches_loop():
+    """Yearly and monthly timelines must end at the loop balance."""
+
+    print("\n📅 Testing timeline against a yearly loop")
+    expected = _loop_balance(200000, 15000, 8.0, 10.0, 35)
+
+    yearly = cash_flow_timeline(25, 60, 200000, 15000, 8.0, 6.0, 10.0)
+    monthly = cash_flow_timeline(25, 60, 200000, 15000, 8.0, 6.0, 10.0, monthly=True)
+
+    assert len(yearly["balance"]) == 35
+    assert len(monthly["balance"]) == 420
+    assert abs(yearly["balance"][-1] - expected) / expected < 1e-9
+    assert abs(monthly["balance"][-1] - yearly["balance"][-1]) < 1e-6
+
+    # Opening balance + contributions + growth must add up to the closing balance
+    opening = np.concatenate([[200000], yearly["balance"][:-1]])
+    np.testing.assert_allclose(opening + yearly["contribution"] + yearly["growth"], yearly["balance"])
+    assert np.all(yearly["real_balance"] < yearly["balance"])
+    print("✅ Timeline matches the yearly loop")
+
+
+def test_timeline_ends_at_projected_corpus():
+    """The last timeline balance is the headline projected corpus."""
+
+    for age, retirement_age, returns in [(30, 60, 8.0), (25, 58, 12.0), (45, 50, 0.0)]:
+        user_input = UserInput(
+            age=age, retirement_age=retirement_age, annual_income=1200000, monthly_expenses=50000,
+            current_savings=500000, monthly_savings=20000, retirement_goal=50000000, expected_returns=returns
+        )
+        projection = retirement_projection(user_input)
+        for monthly in (False, True):
+            balance = user_timeline(user_input, monthly=monthly)["balance"][-1]
+            assert round(float(balance), 2) == projection.projected_corpus
+
+
+def test_streaming_interfaces():
+    """Rows stop at retirement and chunks cover every profile once."""
+
+    print("\n🌊 Testing streaming interfaces")
+    timeline = cash_flow_timeline([30, 40], [35, 60], 100000, 10000, 8.0, 6.0)
+    assert np.isnan(timeline["balance"][0, 5])
+
+    single = cash_flow_timeline(30, 35, 100000, 10000, 8.0, 6.0)
+    rows = list(iter_timeline_rows(single))
+    assert len(rows) == 5 and rows[-1]["age"] == 35
+
+    ages = np.arange(20, 45)
+    offsets = [chunk["offset"] for chunk in iter_timeline_chunks(ages, 60, 0, 5000, 8.0, 6.0, chunk_size=10)]
+    assert offsets == [0, 10, 20]
+    print("✅ Streaming interfaces working")
+
+
+if __name__ == "__main__":
+    test_timeline_matches_loop()
+    test_timeline_ends_at_projected_corpus()
+    test_streaming_interfaces()
+    print("\n🎉 All timeline tests passed!")
@@ -0,0 +1,178 @@
+"""
+Test script to verify LLM token accounting, the token budget and the compact prompts.
+"""
+
+import sys
+import os
+import json
+import types
+import asyncio
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import pytest
+
+from models.user_input import UserInput, AnalysisResult
+from utils.cache import LRUCache, cached_retirement_projection, cached_risk_score
+from utils import tokens
+from utils.tokens import count_tokens
+from chains.llm_client import AsyncChatClient, LLMLimiter, TokenBudget, TokenBudgetExceeded, track_usage
+from chains.pipeline import AnalysisPipeline
+from chains.prompts import PROMPTS, MAX_TOKENS, prompt_template
+from fake_openai_server import create_fake_openai_app
+
+
+PROFILE = {
+    "age": 30,
+    "retirement_age": 60,
+    "annual_income": 1200000,
+    "monthly_expenses": 50000,
+    "current_savings": 500000,
+    "monthly_savings": 20000,
+    "retirement_goal": 50000000,
+    "expected_returns": 8.0
+}
+
+
+def fake_client(token_budget):
+    """AsyncChatClient wired to an in-process fake server."""
+
+    app = create_fake_openai_app()
+    return AsyncChatClient(
+        api_key="fake", base_url="http://fake-openai/v1", limiter=LLMLimiter(8, 5.0),
+        transport=httpx.ASGITransport(app=app), token_budget=token_budget
+    )
+
+
+class FakeLLMAnalysis:
+    """Analysis chain with an async variant backed by the fake server."""
+
+    def __init__(self, client):
+        self.llm_client = client
+
+    async def aanalyze_retirement_plan(self, user_input, projection_data=None):
+        return AnalysisResult(**json.loads(await self.llm_client.complete("Analyze this profile", max_tokens=500)))
+
+
+def prompt_variables():
+    """Prompt variables for PROFILE, as the chains build them."""
+
+    user_input = UserInput(**PROFILE)
+    projection = cached_retirement_projection(user_input)
+    return {
+        **PROFILE,
+        "projected_corpus": projection.projected_corpus,
+        "readiness_percentage": projection.readiness_percentage,
+        "risk_level": cached_risk_score(user_input)["risk_level"],
+        "years_to_retirement": projection.years_to_retirement,
+        "shortfall": projection.shortfall,
+        "surplus": projection.surplus,
+        "key_insights": "Increase your PPF contributions, Use NPS for the extra deduction",
+        "risk_factors": "Inflation above 6%, Equity market volatility",
+        "confidence_level": "Medium"
+    }
+
+
+def test_compact_prompts_use_fewer_tokens():
+    """The compact prompts cut prompt tokens by at least half and keep the JSON keys."""
+
+    print("\n🤖 Testing compact prompt token reduction")
+    variables = prompt_variables()
+    for kind in PROMPTS:
+        full = count_tokens(prompt_template(kind, "full").format(**variables))
+        compact = count_tokens(prompt_template(kind, "compact").format(**variables))
+        print(f"   {kind}: {full} -> {compact} tokens ({1 - compact / full:.0%} fewer)")
+        assert compact < full * 0.5
+        assert MAX_TOKENS[kind]["compact"] < MAX_TOKENS[kind]["full"]
+
+    assert '"key_insights"' in prompt_template("analysis", "compact").format(**variables)
+    assert '"strategies"' in prompt_template("strategies", "compact").format(**variables)
+    with pytest.raises(ValueError):
+        prompt_template("analysis", "tiny")
+    print("✅ Compact prompts working")
+
+
+def test_token_budget_window():
+    """Reservations beyond the per-minute budget are rejected until the window slides."""
+
+    budget = TokenBudget(tokens_per_minute=1000)
+    reservation = budget.reserve(800)
+    with pytest.raises(TokenBudgetExceeded):
+        budget.reserve(300)
+    budget.settle(reservation, 100, 50)  # actual usage frees the unused part
+    budget.reserve(300)
+    assert budget.stats()["used_last_minute"] == 450 and budget.stats()["rejected"] == 1
+
+    budget.WINDOW_SECONDS = 0.0
+    budget.reserve(1000)
+    assert TokenBudget(0).reserve(10 ** 9)  # 0 disables the limit
+
+
+def test_usage_recorded_per_stage_and_budget_enforced():
+    """Pipeline stages record LLM tokens; an exhausted budget falls back without caching."""
+
+    budget = TokenBudget(tokens_per_minute=1000)
+    client = fake_client(budget)
+    pipeline = AnalysisPipeline(FakeLLMAnalysis(client), None, cache=LRUCache(100, 0))
+
+    async def main():
+        with track_usage() as usage:
+            first = await pipeline.run(UserInput(**PROFILE)).acompute(("analysis",))
+        # Each call reserves its 500 max_tokens up front; leave less than that
+        budget.reserve(600)
+        second = await pipeline.run(UserInput(**dict(PROFILE, age=31))).acompute(("analysis",))
+        await client.aclose()
+        return usage, first, second
+
+    usage, first, second = asyncio.run(main())
+    assert usage["calls"] == 1 and usage["prompt_tokens"] > 0
+    assert first.tokens["analysis"] == usage
+    assert 'analysis_tokens;desc="prompt=' in first.server_timing()
+    assert pipeline.stats()["analysis"]["completion_tokens"] == usage["completion_tokens"]
+
+    assert budget.stats()["rejected"] == 1
+    assert second.analysis.key_insights == ["Basic analysis completed"]
+    assert client.usage["calls"] == 1
+
+
+def test_count_tokens():
+    """Token counts grow with the text (tiktoken or the four-characters estimate)."""
+
+    assert count_tokens("") == 0
+    assert 0 < count_tokens("Retirement planning") < count_tokens("Retirement planning " * 10)
+
+
+def test_unknown_model_offline_falls_back_to_estimate():
+    """An unknown model whose fallback encoding cannot be downloaded uses the estimate instead of failing."""
+
+    def unknown_model(model):
+        raise KeyError(model)
+
+    def offline(name):
+        raise OSError("no network")
+
+    fake = types.ModuleType("tiktoken")
+    fake.encoding_for_model, fake.get_encoding = unknown_model, offline
+    saved = sys.modules.get("tiktoken")
+    sys.modules["tiktoken"] = fake
+    tokens._encoding.cache_clear()
+    try:
+        assert count_tokens("Retirement planning", model="custom-model") == 5
+        assert tokens.tokenizer_name("custom-model") is None
+    finally:
+        if saved is None:
+            del sys.modules["tiktoken"]
+        else:
+            sys.modules["tiktoken"] = saved
+        tokens._encoding.cache_clear()
+
+
+if __name__ == "__main__":
+    test_compact_prompts_use_fewer_tokens()
+    test_token_budget_window()
+    test_usage_recorded_per_stage_and_budget_enforced()
+    test_count_tokens()
+    test_unknown_model_offline_falls_back_to_estimate()
+    print("\n🎉 All token accounting tests passed!")
@@ -4,16 +4,84 @@ Utilities package for the AI-Driven Retirement Planner.
 
 from .formulas import (
     retirement_projection,
+    retirement_projection_batch,
     calculate_monthly_retirement_income,
     calculate_required_monthly_savings,
     calculate_risk_score,
-    simulate_scenario
+    simulate_scenario,
+    sensitivity_grid
+)
+from .monte_carlo import monte_carlo_projection
+from .timeline import (
+    cash_flow_timeline,
+    user_timeline,
+    iter_timeline_rows,
+    iter_timeline_chunks,
+    timeline_chart_data
+)
+from .decumulation import (
+    simulate_withdrawals,
+    sustainable_withdrawal,
+    decumulation_plan
+)
+from .instruments import (
+    BUCKETS,
+    multi_bucket_projection_batch,
+    multi_bucket_projection,
+    instrument_corpus_batch,
+    instrument_corpus
+)
+from .cache import (
+    LRUCache,
+    calculation_cache,
+    fingerprint,
+    cached_retirement_projection,
+    cached_risk_score
+)
+from .cohort import (
+    CohortIndex,
+    get_cohort_index,
+    calculate_cohort_risk_score
+)
+from .solver import (
+    required_monthly_savings,
+    required_current_savings,
+    required_retirement_age,
+    required_expected_returns
 )
 
 __all__ = [
     "retirement_projection",
+    "retirement_projection_batch",
     "calculate_monthly_retirement_income",
     "calculate_required_monthly_savings", 
     "calculate_risk_score",
-    "simulate_scenario"
+    "simulate_scenario",
+    "sensitivity_grid",
+    "monte_carlo_projection",
+    "required_monthly_savings",
+    "required_current_savings",
+    "required_retirement_age",
+    "required_expected_returns",
+    "cash_flow_timeline",
+    "user_timeline",
+    "iter_timeline_rows",
+    "iter_timeline_chunks",
+    "timeline_chart_data",
+    "LRUCache",
+    "calculation_cache",
+    "fingerprint",
+    "cached_retirement_projection",
+    "cached_risk_score",
+    "simulate_withdrawals",
+    "sustainable_withdrawal",
+    "decumulation_plan",
+    "BUCKETS",
+    "multi_bucket_projection_batch",
+    "multi_bucket_projection",
+    "instrument_corpus_batch",
+    "instrument_corpus",
+    "CohortIndex",
+    "get_cohort_index",
+    "calculate_cohort_risk_score"
 ]
@@ -0,0 +1,165 @@
+"""
+Bounded LRU memoization for retirement calculations.
+Projections and risk scores are keyed by a canonical fingerprint of the numeric
+UserInput fields, so repeated payloads (dashboard reloads, /analyze followed by
+/suggestions, chains recomputing context) reuse the first result.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+from models.user_input import UserInput, RetirementProjection
+from utils.formulas import retirement_projection, calculate_risk_score
+from utils.metrics import register_cache
+
+
+_MISSING = object()
+
+
+def fingerprint(user_input: UserInput) -> Tuple[float, ...]:
+    """
+    Canonical cache key for a UserInput.
+
+    Every field is numeric, so the key is the field values in declaration order,
+    normalised to floats (None becomes 0.0) so that 65 and 65.0 hash the same.
+
+    Args:
+        user_input: UserInput model
+
+    Returns:
+        Hashable tuple of field values
+    """
+
+    return tuple(
+        float(getattr(user_input, name) or 0.0) for name in type(user_input).model_fields
+    )
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with size- and TTL-based eviction and usage counters.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted
+            ttl_seconds: Entry lifetime in seconds (0 disables expiry)
+        """
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            stored_at, value = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry when full."""
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss."""
+
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss/eviction counters."""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Shared by main.py and the chains
+calculation_cache = LRUCache(
+    max_size=int(os.getenv("CALCULATION_CACHE_SIZE", "4096")),
+    ttl_seconds=float(os.getenv("CALCULATION_CACHE_TTL", "600"))
+)
+register_cache("calculation", calculation_cache.stats)
+
+
+def cached_retirement_projection(user_input: UserInput) -> RetirementProjection:
+    """
+    Memoized retirement_projection.
+
+    Args:
+        user_input: UserInput model containing all financial parameters
+
+    Returns:
+        RetirementProjection (shared instance - do not mutate)
+    """
+
+    return calculation_cache.get_or_compute(
+        ("projection", fingerprint(user_input)),
+        lambda: retirement_projection(user_input)
+    )
+
+
+def cached_risk_score(user_input: UserInput) -> Dict[str, Any]:
+    """
+    Memoized calculate_risk_score.
+
+    Args:
+        user_input: UserInput model
+
+    Returns:
+        Risk assessment dictionary (shared instance - do not mutate)
+    """
+
+    return calculation_cache.get_or_compute(
+        ("risk", fingerprint(user_input)),
+        lambda: calculate_risk_score(user_input)
+    )
@@ -0,0 +1,276 @@
+"""
+Population-relative risk scoring for retirement planning.
+Ranks a user's readiness and savings rate against a precomputed cohort distribution
+keyed by age band and income band.
+
+The cohort index is built offline (from synthetic or ingested profiles) and stored as
+one sorted array per band, so each lookup is a binary search (O(log n)).
+
+Build and save an index:
+    python -m utils.cohort --output data/cohort_index.npz --size 200000
+"""
+
+import os
+import argparse
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+from models.user_input import UserInput, RetirementProjection
+from utils.formulas import retirement_projection_batch
+
+
+# Band edges: a value falls in band i when edges[i] <= value < edges[i + 1]
+AGE_BAND_EDGES = np.array([18, 30, 40, 50, 101])
+AGE_BAND_LABELS = ("18-29", "30-39", "40-49", "50+")
+INCOME_BAND_EDGES = np.array([0, 500000, 1000000, 2000000, np.inf])
+INCOME_BAND_LABELS = ("<5L", "5-10L", "10-20L", "20L+")
+
+DEFAULT_INDEX_PATH = os.getenv(
+    "COHORT_INDEX_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cohort_index.npz")
+)
+
+
+def _band(values, edges) -> np.ndarray:
+    """Band index for each value."""
+    return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+
+
+class CohortIndex:
+    """
+    Sorted readiness and savings-rate distributions per (age band, income band).
+    """
+
+    def __init__(self, readiness: Dict[Tuple[int, int], np.ndarray], savings_rate: Dict[Tuple[int, int], np.ndarray]):
+        """
+        Initialize the index.
+
+        Args:
+            readiness: Sorted readiness percentages per (age band, income band)
+            savings_rate: Sorted savings rates (%) per (age band, income band)
+        """
+
+        self.readiness = readiness
+        self.savings_rate = savings_rate
+
+    @classmethod
+    def build(cls, age, annual_income, readiness_percentage, savings_rate) -> "CohortIndex":
+        """
+        Build the index from population columns.
+
+        Args:
+            age: Ages
+            annual_income: Annual incomes
+            readiness_percentage: Readiness percentages
+            savings_rate: Savings rates (%)
+
+        Returns:
+            CohortIndex with one sorted float32 array per populated band
+        """
+
+        age_band = _band(np.asarray(age), AGE_BAND_EDGES)
+        income_band = _band(np.asarray(annual_income), INCOME_BAND_EDGES)
+        readiness_percentage = np.asarray(readiness_percentage, dtype=np.float32)
+        savings_rate = np.asarray(savings_rate, dtype=np.float32)
+
+        readiness, rates = {}, {}
+        for a in range(len(AGE_BAND_LABELS)):
+            for i in range(len(INCOME_BAND_LABELS)):
+                members = (age_band == a) & (income_band == i)
+                if members.any():
+                    readiness[(a, i)] = np.sort(readiness_percentage[members])
+                    rates[(a, i)] = np.sort(savings_rate[members])
+
+        return cls(readiness, rates)
+
+    def save(self, path: str) -> None:
+        """Store the index as a compressed .npz file."""
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {}
+        for (a, i), values in self.readiness.items():
+            arrays[f"readiness_{a}_{i}"] = values
+            arrays[f"savings_rate_{a}_{i}"] = self.savings_rate[(a, i)]
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "CohortIndex":
+        """Load an index written by save()."""
+
+        readiness, rates = {}, {}
+        with np.load(path) as data:
+            for name in data.files:
+                kind, a, i = name.rsplit("_", 2)
+                target = readiness if kind == "readiness" else rates
+                target[(int(a), int(i))] = data[name]
+        return cls(readiness, rates)
+
+    def percentiles(self, age: float, annual_income: float,
+                    readiness_percentage: float, savings_rate: float) -> Optional[Dict[str, Any]]:
+        """
+        Percentile of a user's readiness and savings rate within their band.
+
+        Args:
+            age: User's age
+            annual_income: User's annual income
+            readiness_percentage: User's readiness percentage
+            savings_rate: User's savings rate (%)
+
+        Returns:
+            Dictionary with band labels, percentiles and cohort size, or None if the band is empty
+        """
+
+        a = int(_band(age, AGE_BAND_EDGES))
+        i = int(_band(annual_income, INCOME_BAND_EDGES))
+        readiness = self.readiness.get((a, i))
+        if readiness is None:
+            return None
+        rates = self.savings_rate[(a, i)]
+
+        # Share of the cohort at or below the user's value
+        readiness_rank = np.searchsorted(readiness, readiness_percentage, side="right")
+        rate_rank = np.searchsorted(rates, savings_rate, side="right")
+
+        # Arrays are sorted, so the middle element is the median
+        return {
+            "age_band": AGE_BAND_LABELS[a],
+            "income_band": INCOME_BAND_LABELS[i],
+            "cohort_size": len(readiness),
+            "readiness_percentile": round(100 * int(readiness_rank) / len(readiness), 1),
+            "savings_rate_percentile": round(100 * int(rate_rank) / len(rates), 1),
+            "cohort_median_readiness": round(float(readiness[len(readiness) // 2]), 2),
+            "cohort_median_savings_rate": round(float(rates[len(rates) // 2]), 2)
+        }
+
+
+def synthetic_profiles(size: int = 200000, seed: int = 2024) -> Dict[str, np.ndarray]:
+    """
+    Generate a synthetic population of Indian salaried professionals.
+
+    Args:
+        size: Number of profiles
+        seed: Random seed
+
+    Returns:
+        Dictionary of columns: age, annual_income, readiness_percentage, savings_rate
+    """
+
+    rng = np.random.default_rng(seed)
+    age = rng.integers(22, 58, size)
+    annual_income = np.round(rng.lognormal(np.log(900000), 0.6, size), -3)
+    savings_rate = np.clip(rng.beta(2.5, 12, size) * 100, 1, 60)
+    monthly_savings = annual_income * savings_rate / 100 / 12
+
+    # Savings accumulated so far grow with years worked
+    current_savings = annual_income * (age - 22) * rng.uniform(0.05, 0.3, size)
+    retirement_age = np.full(size, 60)
+    expected_returns = rng.choice([6.0, 8.0, 10.0, 12.0], size, p=[0.2, 0.4, 0.3, 0.1])
+
+    # Goals of 35-70x today's income
+    retirement_goal = annual_income * rng.uniform(35, 70, size)
+
+    projection = retirement_projection_batch(
+        age, retirement_age, current_savings, monthly_savings, expected_returns, retirement_goal
+    )
+
+    return {
+        "age": age,
+        "annual_income": annual_income,
+        "readiness_percentage": projection["readiness_percentage"],
+        "savings_rate": savings_rate
+    }
+
+
+_default_index: Optional[CohortIndex] = None
+
+
+def get_cohort_index() -> CohortIndex:
+    """
+    Shared cohort index: loaded from DEFAULT_INDEX_PATH if present, otherwise
+    built once from the synthetic population and saved there, so later process
+    starts load it instead of rebuilding it.
+    """
+
+    global _default_index
+    if _default_index is None:
+        if os.path.exists(DEFAULT_INDEX_PATH):
+            _default_index = CohortIndex.load(DEFAULT_INDEX_PATH)
+        else:
+            _default_index = CohortIndex.build(**synthetic_profiles())
+            _save_quietly(_default_index, DEFAULT_INDEX_PATH)
+    return _default_index
+
+
+def _save_quietly(index: CohortIndex, path: str) -> None:
+    """Save the index atomically (concurrent workers may race); a read-only tree just skips the cache."""
+
+    temp_path = f"{path}.{os.getpid()}.tmp.npz"
+    try:
+        index.save(temp_path)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def calculate_cohort_risk_score(user_input: UserInput,
+                                projection: RetirementProjection,
+                                risk_assessment: Dict[str, Any],
+                                cohort_index: Optional[CohortIndex] = None) -> Dict[str, Any]:
+    """
+    Add cohort percentiles to a calculate_risk_score result.
+
+    Args:
+        user_input: UserInput model
+        projection: RetirementProjection for the same input
+        risk_assessment: Output of calculate_risk_score (not modified)
+        cohort_index: Index to rank against (defaults to get_cohort_index())
+
+    Returns:
+        Copy of risk_assessment with a "cohort" entry holding percentiles and
+        peer-relative recommendations
+    """
+
+    cohort_index = cohort_index or get_cohort_index()
+    savings_rate = (user_input.monthly_savings * 12) / user_input.annual_income * 100
+
+    cohort = cohort_index.percentiles(
+        user_input.age, user_input.annual_income, projection.readiness_percentage, savings_rate
+    )
+
+    if cohort is not None:
+        recommendations = []
+        if cohort["readiness_percentile"] < 25:
+            recommendations.append(
+                f"Your readiness is in the bottom quarter of {cohort['age_band']} year olds earning {cohort['income_band']}"
+            )
+        elif cohort["readiness_percentile"] >= 75:
+            recommendations.append(
+                f"Your readiness is in the top quarter of {cohort['age_band']} year olds earning {cohort['income_band']}"
+            )
+        if cohort["savings_rate_percentile"] < 50:
+            recommendations.append(
+                f"Peers in your band save a median {cohort['cohort_median_savings_rate']:.1f}% of income - "
+                f"you save {savings_rate:.1f}%"
+            )
+        cohort["recommendations"] = recommendations
+
+    return {**risk_assessment, "cohort": cohort}
+
+
+def main():
+    """Build a cohort index from the synthetic population and save it."""
+
+    parser = argparse.ArgumentParser(description="Build the cohort risk index")
+    parser.add_argument("--output", default=DEFAULT_INDEX_PATH, help="Path of the .npz index to write")
+    parser.add_argument("--size", type=int, default=200000, help="Number of synthetic profiles")
+    parser.add_argument("--seed", type=int, default=2024, help="Random seed")
+    args = parser.parse_args()
+
+    index = CohortIndex.build(**synthetic_profiles(args.size, args.seed))
+    index.save(args.output)
+    print(f"Cohort index with {args.size:,} profiles written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Post-retirement (decumulation) engine for retirement planning.
+Simulates inflation-growing withdrawals against a corpus that keeps earning returns,
+offset by other retirement income, and reports when the money runs out.
+
+Inputs broadcast like NumPy arrays, so one call handles a single profile or a whole batch.
+Withdrawals are taken at the start of each retirement year and the remainder grows
+for the year. Other income is a fixed (not inflation-indexed) monthly amount.
+"""
+
+from typing import Dict, Any, Optional
+import numpy as np
+from models.user_input import UserInput, RetirementProjection
+
+
+def _withdrawal_schedule(first_year_spending, inflation, other_income, retirement_years):
+    """
+    Net annual portfolio withdrawals, shaped (..., retirement_years).
+
+    Spending grows with inflation every year; other income (monthly) covers part of it.
+    """
+
+    years = np.arange(retirement_years, dtype=np.float64)
+    spending = first_year_spending[..., None] * (1 + inflation[..., None]) ** years
+    return np.maximum(0.0, spending - other_income[..., None] * 12)
+
+
+def _funded_value(corpus, withdrawals, retirement_returns):
+    """
+    Corpus left after each withdrawal, in retirement-day money, shaped like withdrawals.
+
+    funded[k] = C - sum_(j <= k) w_j / (1 + r)^j; withdrawal k is fully paid while funded[k] >= 0
+    and the nominal balance after it is funded[k] * (1 + r)^(k + 1).
+    """
+
+    years = np.arange(withdrawals.shape[-1], dtype=np.float64)
+    discount = (1 + retirement_returns[..., None]) ** -years
+    return corpus[..., None] - np.cumsum(withdrawals * discount, axis=-1)
+
+
+def simulate_withdrawals(corpus, annual_spending, retirement_returns, inflation,
+                         other_income=0.0, retirement_years: int = 30) -> Dict[str, np.ndarray]:
+    """
+    Run the withdrawal phase for one or many retirees.
+
+    Args:
+        corpus: Corpus at retirement
+        annual_spending: First-year annual spending need (nominal, at retirement)
+        retirement_returns: Annual returns during retirement (%)
+        inflation: Annual inflation during retirement (%)
+        other_income: Monthly pension/rental/other income during retirement
+        retirement_years: Number of retirement years to simulate
+
+    Returns:
+        Dictionary with years_funded, withdrawals (..., years) and
+        balances (..., years + 1) with depleted years clipped to 0
+    """
+
+    corpus, annual_spending, rates, inflation, other_income = np.broadcast_arrays(
+        np.asarray(corpus, dtype=np.float64),
+        np.asarray(annual_spending, dtype=np.float64),
+        np.asarray(retirement_returns, dtype=np.float64) / 100,
+        np.asarray(inflation, dtype=np.float64) / 100,
+        np.asarray(other_income, dtype=np.float64)
+    )
+
+    withdrawals = _withdrawal_schedule(annual_spending, inflation, other_income, retirement_years)
+    funded = _funded_value(corpus, withdrawals, rates)
+
+    # funded is non-increasing, so the count of non-negative entries is the years paid in full
+    years_funded = np.sum(funded >= 0, axis=-1)
+
+    growth = (1 + rates[..., None]) ** np.arange(1, retirement_years + 1, dtype=np.float64)
+    balances = np.concatenate([corpus[..., None], np.maximum(0.0, funded * growth)], axis=-1)
+
+    return {
+        "years_funded": years_funded,
+        "withdrawals": withdrawals,
+        "balances": balances
+    }
+
+
+def sustainable_withdrawal(corpus, retirement_returns, inflation, other_income=0.0,
+                           retirement_years: int = 30, tolerance: float = 0.01) -> np.ndarray:
+    """
+    Largest first-year annual spending the corpus can sustain for retirement_years.
+
+    Because other income is not indexed the net withdrawals are piecewise, so the
+    spending level is found by bisection - run once for the whole batch as array
+    operations rather than a Python loop per retiree.
+
+    Args:
+        corpus: Corpus at retirement
+        retirement_returns: Annual returns during retirement (%)
+        inflation: Annual inflation during retirement (%)
+        other_income: Monthly pension/rental/other income during retirement
+        retirement_years: Number of years the spending must last
+        tolerance: Stop when the bracket is narrower than this amount
+
+    Returns:
+        Array of sustainable first-year annual spending (including other income)
+    """
+
+    corpus, rates, inflation, other_income = np.broadcast_arrays(
+        np.asarray(corpus, dtype=np.float64),
+        np.asarray(retirement_returns, dtype=np.float64) / 100,
+        np.asarray(inflation, dtype=np.float64) / 100,
+        np.asarray(other_income, dtype=np.float64)
+    )
+
+    # Spending above corpus + first-year other income cannot even fund year one
+    low = np.zeros(corpus.shape)
+    high = corpus + other_income * 12
+
+    # Everything except the spending level is fixed, so precompute it once
+    years = np.arange(retirement_years, dtype=np.float64)
+    spending_growth = (1 + inflation[..., None]) ** years
+    discount = (1 + rates[..., None]) ** -years
+    annual_other_income = other_income[..., None] * 12
+
+    span = float(np.max(high - low, initial=0.0))
+    iterations = int(np.ceil(np.log2(span / tolerance))) if span > tolerance else 0
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        withdrawals = np.maximum(0.0, middle[..., None] * spending_growth - annual_other_income)
+        lasts = np.sum(withdrawals * discount, axis=-1) <= corpus
+        low = np.where(lasts, middle, low)
+        high = np.where(lasts, high, middle)
+
+    return low
+
+
+def decumulation_plan(user_input: UserInput,
+                      projection: RetirementProjection,
+                      retirement_years: int = 30,
+                      retirement_returns: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Retirement income plan for a single user.
+
+    Spending need is today's monthly expenses inflated to the retirement date.
+
+    Args:
+        user_input: UserInput model containing all financial parameters
+        projection: RetirementProjection for the same input
+        retirement_years: Expected retirement duration
+        retirement_returns: Annual returns during retirement (%), defaults to expected_returns
+
+    Returns:
+        Dictionary with depletion age and sustainable withdrawal figures
+    """
+
+    if retirement_returns is None:
+        retirement_returns = user_input.expected_returns
+
+    inflation = user_input.expected_inflation
+    other_income = user_input.other_income or 0.0
+    price_level = (1 + inflation / 100) ** projection.years_to_retirement
+    annual_spending = user_input.monthly_expenses * 12 * price_level
+
+    result = simulate_withdrawals(
+        projection.projected_corpus, annual_spending, retirement_returns, inflation,
+        other_income, retirement_years
+    )
+    sustainable_annual = float(sustainable_withdrawal(
+        projection.projected_corpus, retirement_returns, inflation, other_income, retirement_years
+    ))
+
+    years_funded = int(result["years_funded"])
+    depletion_age = projection.retirement_age + years_funded if years_funded < retirement_years else None
+
+    return {
+        "retirement_years": retirement_years,
+        "retirement_returns": retirement_returns,
+        "annual_spending_at_retirement": round(annual_spending, 2),
+        "years_funded": years_funded,
+        "depletion_age": depletion_age,
+        "sustainable_monthly_income": round(sustainable_annual / 12, 2),
+        "sustainable_monthly_income_today": round(sustainable_annual / 12 / price_level, 2),
+        "balance_at_end": round(float(result["balances"][-1]), 2)
+    }
@@ -4,8 +4,12 @@ Implements compound interest calculations and retirement readiness assessments.
 """
 
 import math
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
+import numpy as np
 from models.user_input import UserInput, RetirementProjection
+from utils.decumulation import sustainable_withdrawal
+from utils.instruments import instrument_corpus, instrument_corpus_batch
+from utils.solver import required_monthly_savings
 
 
 def retirement_projection(user_input: UserInput) -> RetirementProjection:
@@ -14,12 +18,16 @@ def retirement_projection(user_input: UserInput) -> RetirementProjection:
     
     Formula: A = P(1 + r)^t + PMT * [((1 + r)^t - 1) / r]
     Where:
-    - A = Final amount (projected corpus)
+    - A = Final amount (market savings corpus)
     - P = Principal (current savings)
     - r = Annual interest rate (as decimal)
     - t = Time in years
     - PMT = Annual savings amount
     
+    The projected corpus adds the EPF, PPF and NPS buckets at retirement
+    (utils.instruments.instrument_corpus), so readiness, shortfall and surplus
+    count the user's instrument balances and contributions too.
+    
     Args:
         user_input: UserInput model containing all financial parameters
         
@@ -49,8 +57,9 @@ def retirement_projection(user_input: UserInput) -> RetirementProjection:
         # If no returns, just multiply by years
         future_value_annuity = annual_savings * years_to_retirement
     
-    # Total projected corpus
-    projected_corpus = future_value_current_savings + future_value_annuity
+    # Total projected corpus, including the EPF/PPF/NPS buckets
+    instruments = instrument_corpus(user_input)
+    projected_corpus = future_value_current_savings + future_value_annuity + instruments
     
     # Calculate readiness percentage (capped at 100%)
     readiness_percentage = min(100, (projected_corpus / retirement_goal) * 100) if retirement_goal > 0 else 0
@@ -68,6 +77,7 @@ def retirement_projection(user_input: UserInput) -> RetirementProjection:
         annual_savings=annual_savings,
         expected_returns=expected_returns * 100,  # Convert back to percentage
         projected_corpus=round(projected_corpus, 2),
+        instrument_corpus=round(instruments, 2),
         retirement_goal=retirement_goal,
         readiness_percentage=round(readiness_percentage, 2),
         shortfall=round(shortfall, 2),
@@ -75,27 +85,176 @@ def retirement_projection(user_input: UserInput) -> RetirementProjection:
     )
 
 
+def _growth_factors(rates: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    Compute (1 + r) ** t element-wise with the same float semantics as the scalar path.
+    
+    NumPy's vectorized power can differ from Python's float power in the last ulp,
+    which would break exact agreement with retirement_projection. Populations share
+    a small number of (rate, years) pairs, so each distinct pair is evaluated once
+    with Python's power and scattered back.
+    
+    Args:
+        rates: Annual returns as decimals
+        years: Whole years to compound
+        
+    Returns:
+        Array of growth factors with the same shape as the inputs
+    """
+    
+    rate_values, rate_index = np.unique(rates, return_inverse=True)
+    year_values, year_index = np.unique(years, return_inverse=True)
+    pair_keys, pair_index = np.unique(
+        rate_index.ravel() * len(year_values) + year_index.ravel(), return_inverse=True
+    )
+    
+    factors = np.array([
+        (1 + float(rate_values[key // len(year_values)])) ** int(year_values[key % len(year_values)])
+        for key in pair_keys.tolist()
+    ], dtype=np.float64)
+    
+    return factors[pair_index].reshape(np.shape(rates))
+
+
+def _round_cents(values: np.ndarray) -> np.ndarray:
+    """
+    Round to 2 decimals with the same result as Python's round(value, 2).
+    
+    np.round scales by 100 before rounding, which can tip values that sit on a
+    half-cent boundary the other way. Only those near-tie elements are re-rounded
+    with Python's correctly rounded round().
+    
+    Args:
+        values: Array of amounts
+        
+    Returns:
+        Array rounded to cents
+    """
+    
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 4 * np.spacing(scaled)
+    
+    if near_tie.any():
+        rounded[near_tie] = [round(value, 2) for value in values[near_tie].tolist()]
+    
+    return rounded
+
+
+def retirement_projection_batch(age, retirement_age, current_savings, monthly_savings,
+                                expected_returns, retirement_goal, annual_income=0.0, employer_pf=0.0,
+                                epf_balance=0.0, ppf_balance=0.0, nps_balance=0.0,
+                                ppf_contribution=0.0, nps_contribution=0.0) -> Dict[str, np.ndarray]:
+    """
+    Vectorized retirement_projection over a struct-of-arrays batch of profiles.
+    
+    Every argument is an array-like of equal length (scalars broadcast). The math
+    mirrors retirement_projection operation for operation, so each element matches
+    the scalar RetirementProjection exactly, including the 2-decimal rounding.
+    
+    Args:
+        age: Current ages
+        retirement_age: Target retirement ages
+        current_savings: Current savings amounts
+        monthly_savings: Monthly savings amounts
+        expected_returns: Expected annual returns (%)
+        retirement_goal: Target retirement corpus amounts
+        annual_income, employer_pf, epf_balance, ppf_balance, nps_balance,
+        ppf_contribution, nps_contribution: Optional instrument columns as in
+            UserInput (default 0, i.e. no EPF/PPF/NPS buckets)
+        
+    Returns:
+        Dictionary of NumPy arrays: years_to_retirement, annual_savings,
+        projected_corpus, instrument_corpus, readiness_percentage, shortfall and surplus
+    """
+    
+    age, retirement_age, current_savings, monthly_savings, expected_returns, retirement_goal = np.broadcast_arrays(
+        np.asarray(age, dtype=np.int64),
+        np.asarray(retirement_age, dtype=np.int64),
+        np.asarray(current_savings, dtype=np.float64),
+        np.asarray(monthly_savings, dtype=np.float64),
+        np.asarray(expected_returns, dtype=np.float64),
+        np.asarray(retirement_goal, dtype=np.float64),
+    )
+    
+    years_to_retirement = retirement_age - age
+    annual_savings = monthly_savings * 12
+    rates = expected_returns / 100
+    
+    growth = _growth_factors(rates, years_to_retirement)
+    future_value_current_savings = current_savings * growth
+    
+    # Same zero-return special case as the scalar annuity formula
+    with np.errstate(divide="ignore", invalid="ignore"):
+        future_value_annuity = np.where(
+            rates > 0,
+            annual_savings * ((growth - 1) / rates),
+            annual_savings * years_to_retirement
+        )
+    
+    # EPF/PPF/NPS buckets; batches without instrument columns skip the closed form
+    instrument_columns = (employer_pf, epf_balance, ppf_balance, nps_balance, ppf_contribution, nps_contribution)
+    if any(np.any(np.asarray(column) != 0) for column in instrument_columns):
+        instruments = instrument_corpus_batch(age, retirement_age, annual_income, *instrument_columns)
+    else:
+        instruments = np.zeros(age.shape)
+    
+    projected_corpus = future_value_current_savings + future_value_annuity + instruments
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        readiness_percentage = np.where(
+            retirement_goal > 0,
+            np.minimum(100, (projected_corpus / retirement_goal) * 100),
+            0.0
+        )
+    
+    shortfall = np.maximum(0, retirement_goal - projected_corpus)
+    surplus = np.maximum(0, projected_corpus - retirement_goal)
+    
+    return {
+        "years_to_retirement": years_to_retirement,
+        "annual_savings": annual_savings,
+        "projected_corpus": _round_cents(projected_corpus),
+        "instrument_corpus": _round_cents(instruments),
+        "readiness_percentage": _round_cents(readiness_percentage),
+        "shortfall": _round_cents(shortfall),
+        "surplus": _round_cents(surplus)
+    }
+
+
 def calculate_monthly_retirement_income(projection: RetirementProjection, 
                                            inflation_rate: float = 3.0,
-                                           retirement_years: int = 30) -> Dict[str, float]:
+                                           retirement_years: int = 30,
+                                           retirement_returns: Optional[float] = None,
+                                           other_income: float = 0.0) -> Dict[str, float]:
     """
     Calculate monthly retirement income based on projected corpus.
     
+    Instead of a flat 4% withdrawal, the income is the largest inflation-growing
+    withdrawal the corpus sustains for retirement_years while earning
+    retirement_returns (see utils.decumulation).
+    
     Args:
         projection: RetirementProjection object
         inflation_rate: Expected inflation rate (default 3%)
         retirement_years: Expected retirement duration (default 30 years)
+        retirement_returns: Annual returns during retirement (defaults to the projection's expected returns)
+        other_income: Monthly pension/rental/other income during retirement
         
     Returns:
-        Dictionary with monthly income calculations
+        Dictionary with monthly income calculations; the inflation-adjusted
+        figures are the income grown by inflation over the years to retirement
     """
     
     corpus = projection.projected_corpus
     annual_inflation = inflation_rate / 100
+    if retirement_returns is None:
+        retirement_returns = projection.expected_returns
     
-    # Calculate monthly income using 4% rule (conservative withdrawal rate)
-    annual_withdrawal_rate = 0.04
-    annual_income = corpus * annual_withdrawal_rate
+    # First-year income (nominal, at retirement) that lasts the whole retirement
+    annual_income = float(sustainable_withdrawal(
+        corpus, retirement_returns, inflation_rate, other_income, retirement_years
+    ))
     monthly_income = annual_income / 12
     
     # Calculate inflation-adjusted income
@@ -127,25 +286,10 @@ def calculate_required_monthly_savings(target_corpus: float,
         Required monthly savings amount
     """
     
-    if years_to_retirement <= 0:
-        return 0
-    
-    # Future value of current savings
-    future_value_current = current_savings * (1 + expected_returns) ** years_to_retirement
-    
-    # Remaining amount needed from savings
-    remaining_needed = target_corpus - future_value_current
-    
-    if remaining_needed <= 0:
-        return 0
-    
-    # Calculate required annual savings
-    if expected_returns > 0:
-        required_annual = remaining_needed * (expected_returns / ((1 + expected_returns) ** years_to_retirement - 1))
-    else:
-        required_annual = remaining_needed / years_to_retirement
-    
-    return round(required_annual / 12, 2)
+    # Same closed form as the goal-seek solver, which takes returns as a percentage
+    return round(float(required_monthly_savings(
+        target_corpus, current_savings, years_to_retirement, expected_returns * 100
+    )), 2)
 
 
 def calculate_risk_score(user_input: UserInput) -> Dict[str, Any]:
@@ -213,6 +357,50 @@ def calculate_risk_score(user_input: UserInput) -> Dict[str, Any]:
     }
 
 
+RISK_LEVELS = np.array(["Low", "Medium", "High"])
+
+
+def calculate_risk_score_batch(age, retirement_age, annual_income, monthly_savings) -> Dict[str, np.ndarray]:
+    """
+    Vectorized calculate_risk_score over a struct-of-arrays batch of profiles.
+
+    Applies the same thresholds in the same order as the scalar function, so
+    each element's score and level match calculate_risk_score exactly (the
+    factor and recommendation lists are not built).
+
+    Args:
+        age: Current ages
+        retirement_age: Target retirement ages
+        annual_income: Annual incomes (must be > 0)
+        monthly_savings: Monthly savings amounts
+
+    Returns:
+        Dictionary with risk_score (int array) and risk_level (string array)
+    """
+
+    age, retirement_age, annual_income, monthly_savings = np.broadcast_arrays(
+        np.asarray(age, dtype=np.int64),
+        np.asarray(retirement_age, dtype=np.int64),
+        np.asarray(annual_income, dtype=np.float64),
+        np.asarray(monthly_savings, dtype=np.float64),
+    )
+
+    savings_rate = (monthly_savings * 12) / annual_income
+    years_to_retirement = retirement_age - age
+
+    risk_score = (
+        np.select([age < 30, age > 50], [1, 3], 0)
+        + np.select([savings_rate < 0.1, savings_rate < 0.15, savings_rate >= 0.2], [3, 2, -1], 0)
+        + np.select([annual_income < 50000, annual_income > 100000], [2, -1], 0)
+        + np.select([years_to_retirement < 10, years_to_retirement > 30], [3, -1], 0)
+    )
+
+    return {
+        "risk_score": risk_score,
+        "risk_level": RISK_LEVELS[(risk_score > 2).astype(np.int64) + (risk_score > 5)]
+    }
+
+
 def _get_risk_recommendations(risk_level: str, risk_factors: list) -> list:
     """Get recommendations based on risk assessment."""
     
@@ -258,3 +446,64 @@ def simulate_scenario(user_input: UserInput,
     
     # Calculate new projection
     return retirement_projection(modified_input)
+
+
+GRID_PARAMETERS = ("monthly_savings", "expected_returns", "retirement_age", "current_savings", "retirement_goal")
+
+
+def sensitivity_grid(user_input: UserInput,
+                     axes: Dict[str, Sequence[float]]) -> Dict[str, Any]:
+    """
+    Project every combination of the given parameter values in one vectorized pass.
+    
+    Each axis is reshaped so that it varies along its own dimension and broadcast
+    against the base UserInput, so a 50x50x20 grid is a single batch projection
+    instead of 50,000 simulate_scenario calls.
+    
+    Args:
+        user_input: Base user input; parameters not on an axis keep its values
+        axes: Ordered mapping of parameter name to the values to try
+              (names from GRID_PARAMETERS)
+        
+    Returns:
+        Dictionary with the axis values and projected_corpus / readiness_percentage
+        tensors shaped (len(axis_1), len(axis_2), ...)
+    """
+    
+    columns = {
+        "monthly_savings": user_input.monthly_savings,
+        "expected_returns": user_input.expected_returns,
+        "retirement_age": user_input.retirement_age,
+        "current_savings": user_input.current_savings,
+        "retirement_goal": user_input.retirement_goal
+    }
+    
+    for position, (name, values) in enumerate(axes.items()):
+        if name not in GRID_PARAMETERS:
+            raise ValueError(f"Unsupported grid parameter: {name}")
+        
+        shape = [1] * len(axes)
+        shape[position] = -1
+        columns[name] = np.asarray(values, dtype=np.float64).reshape(shape)
+    
+    batch = retirement_projection_batch(
+        user_input.age,
+        np.rint(columns["retirement_age"]).astype(np.int64),
+        columns["current_savings"],
+        columns["monthly_savings"],
+        columns["expected_returns"],
+        columns["retirement_goal"],
+        user_input.annual_income,
+        user_input.employer_pf or 0.0,
+        user_input.epf_balance or 0.0,
+        user_input.ppf_balance or 0.0,
+        user_input.nps_balance or 0.0,
+        user_input.ppf_contribution or 0.0,
+        user_input.nps_contribution or 0.0
+    )
+    
+    return {
+        "axes": {name: list(values) for name, values in axes.items()},
+        "projected_corpus": batch["projected_corpus"],
+        "readiness_percentage": batch["readiness_percentage"]
+    }
@@ -0,0 +1,467 @@
+"""
+Bulk scoring of employer files (CSV or Parquet) without going through the API.
+
+The input is streamed in chunks of --chunk-size rows. For each chunk:
+
+- rows are validated with vectorized versions of the UserInput rules; invalid
+  rows stay in the output with their error message and empty results
+- projection (retirement_projection_batch) and risk (calculate_risk_score_batch)
+  are computed for all valid rows in one vectorized pass
+- the rule-based analysis and strategy chains run row by row (--no-strategies
+  skips them)
+
+Chunks are scored on a process pool, with at most two chunks per worker read
+ahead, so memory is bounded by the chunk size rather than the file size. Every
+scored chunk is written to <output>.parts/ and recorded in
+<output>.checkpoint.json; running the same command again after a crash skips the
+chunks already done. Once all chunks are done the parts are merged into the
+output in input order. Progress and rows/sec are printed to stderr.
+
+pandas (and pyarrow for Parquet) are imported only when the tool runs, so the
+API never loads them.
+
+Usage (from finai-backend/):
+    python -m utils.ingest employees.csv scores.parquet --workers 8
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from models.user_input import UserInput
+from utils.formulas import retirement_projection_batch, calculate_risk_score_batch
+
+
+REQUIRED_COLUMNS = (
+    "age", "retirement_age", "annual_income", "monthly_expenses",
+    "current_savings", "monthly_savings", "retirement_goal"
+)
+# Optional columns and the UserInput defaults used when they are absent or empty
+OPTIONAL_COLUMNS = {
+    "expected_inflation": 3.0, "expected_returns": 6.0,
+    "employer_pf": 0.0, "epf_balance": 0.0, "ppf_balance": 0.0, "nps_balance": 0.0,
+    "ppf_contribution": 0.0, "nps_contribution": 0.0
+}
+# EPF/PPF/NPS columns, in retirement_projection_batch argument order
+INSTRUMENT_COLUMNS = ("employer_pf", "epf_balance", "ppf_balance", "nps_balance", "ppf_contribution", "nps_contribution")
+
+# Projection fields passed to the chains (as in AnalysisPipeline.projection_data)
+PROJECTION_DATA_FIELDS = (
+    "readiness_percentage", "projected_corpus", "instrument_corpus", "shortfall", "surplus", "years_to_retirement"
+)
+
+DEFAULT_CHUNK_SIZE = 5000
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+# Rule-based chains, created once per worker process
+_chains = None
+
+
+def file_format(path: str) -> str:
+    """'parquet' for .parquet/.pq paths, 'csv' otherwise."""
+
+    return "parquet" if path.lower().endswith(PARQUET_EXTENSIONS) else "csv"
+
+
+def validate_columns(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Vectorized UserInput validation of a struct-of-arrays batch.
+
+    Applies the field bounds and the model validators in the order UserInput
+    checks them; each row gets the message of the first rule it breaks.
+
+    Args:
+        columns: Float arrays for REQUIRED_COLUMNS and OPTIONAL_COLUMNS (NaN = missing)
+
+    Returns:
+        Object array of error messages, None for valid rows
+    """
+
+    def outside(name, low, high=None, low_inclusive=True):
+        values = columns[name]
+        below = values < low if low_inclusive else values <= low
+        return below | (values > high) if high is not None else below
+
+    def not_integer(name):
+        return columns[name] != np.floor(columns[name])
+
+    age, retirement_age = columns["age"], columns["retirement_age"]
+    annual_income = columns["annual_income"]
+    annual_expenses = columns["monthly_expenses"] * 12
+
+    rules: List[Tuple[np.ndarray, str]] = [
+        (~np.isfinite(columns[name]), f"{name} is missing or not a number")
+        for name in (*REQUIRED_COLUMNS, *OPTIONAL_COLUMNS)
+    ] + [
+        (not_integer("age") | outside("age", 18, 100), "age must be an integer between 18 and 100"),
+        (not_integer("retirement_age") | outside("retirement_age", 50, 100),
+         "retirement_age must be an integer between 50 and 100"),
+        (outside("annual_income", 0, low_inclusive=False), "annual_income must be greater than 0"),
+        (outside("monthly_expenses", 0, low_inclusive=False), "monthly_expenses must be greater than 0"),
+        (outside("current_savings", 0), "current_savings must be at least 0"),
+        (outside("monthly_savings", 0), "monthly_savings must be at least 0"),
+        (outside("retirement_goal", 0, low_inclusive=False), "retirement_goal must be greater than 0"),
+        (outside("expected_inflation", 0, 10), "expected_inflation must be between 0 and 10"),
+        (outside("expected_returns", 0, 20), "expected_returns must be between 0 and 20"),
+        (outside("employer_pf", 0, 100), "employer_pf must be between 0 and 100"),
+    ] + [
+        (outside(name, 0), f"{name} must be at least 0") for name in INSTRUMENT_COLUMNS[1:]
+    ] + [
+        (retirement_age <= age, "Retirement age must be greater than current age"),
+        (annual_expenses > annual_income * 0.9, "Monthly expenses seem too high relative to income"),
+        (columns["monthly_savings"] * 12 + annual_expenses > annual_income,
+         "Monthly savings plus expenses cannot exceed annual income"),
+    ]
+
+    errors = np.full(len(age), None, dtype=object)
+    for broken, message in reversed(rules):
+        errors[broken] = message
+    return errors
+
+
+def _numeric_columns(frame) -> Dict[str, np.ndarray]:
+    """Float arrays of the validated columns; non-numeric cells become NaN, absent optional columns their default."""
+
+    import pandas as pd
+
+    columns = {}
+    for name in (*REQUIRED_COLUMNS, *OPTIONAL_COLUMNS):
+        if name in frame:
+            values = pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = np.full(len(frame), np.nan)
+        if name in OPTIONAL_COLUMNS:
+            values = np.where(np.isnan(values), OPTIONAL_COLUMNS[name], values)
+        columns[name] = values
+    return columns
+
+
+def _get_chains():
+    """Rule-based analysis and strategy chains of this process."""
+
+    global _chains
+    if _chains is None:
+        from chains.simple_analysis import SimpleRetirementAnalysis
+        from chains.simple_strategy import SimpleRetirementStrategy
+        _chains = SimpleRetirementAnalysis(), SimpleRetirementStrategy()
+    return _chains
+
+
+def score_chunk(frame, first_row: int = 0, id_column: Optional[str] = None, strategies: bool = True):
+    """
+    Validate and score one chunk of profiles.
+
+    Args:
+        frame: pandas DataFrame with UserInput columns
+        first_row: Input row number of the chunk's first row
+        id_column: Column copied to the output (as a string) to identify rows
+        strategies: Whether to run the rule-based analysis and strategy chains
+
+    Returns:
+        pandas DataFrame with one row per input row: row, the id column, error,
+        projection and risk columns and, with strategies, confidence_level,
+        overall_priority and strategies (JSON list of titles in implementation order)
+    """
+
+    import pandas as pd
+
+    size = len(frame)
+    columns = _numeric_columns(frame)
+    errors = validate_columns(columns)
+    valid = np.flatnonzero(np.equal(errors, None))
+    profiles = {name: values[valid] for name, values in columns.items()}
+    age, retirement_age = profiles["age"].astype(np.int64), profiles["retirement_age"].astype(np.int64)
+
+    projection = retirement_projection_batch(
+        age, retirement_age, profiles["current_savings"], profiles["monthly_savings"],
+        profiles["expected_returns"], profiles["retirement_goal"], profiles["annual_income"],
+        *[profiles[name] for name in INSTRUMENT_COLUMNS]
+    )
+    risk = calculate_risk_score_batch(age, retirement_age, profiles["annual_income"], profiles["monthly_savings"])
+    scores: Dict[str, Any] = {
+        "years_to_retirement": projection["years_to_retirement"],
+        "projected_corpus": projection["projected_corpus"],
+        "readiness_percentage": projection["readiness_percentage"],
+        "shortfall": projection["shortfall"],
+        "surplus": projection["surplus"],
+        "risk_score": risk["risk_score"],
+        "risk_level": risk["risk_level"]
+    }
+
+    if strategies:
+        analysis_chain, strategy_chain = _get_chains()
+        confidence, priority, titles = [], [], []
+        fields = {name: values.tolist() for name, values in profiles.items()}
+        fields["age"], fields["retirement_age"] = age.tolist(), retirement_age.tolist()
+        summary = {name: projection[name].tolist() for name in PROJECTION_DATA_FIELDS}
+        summary["retirement_goal"] = fields["retirement_goal"]
+        for i in range(len(valid)):
+            # Already validated above, so skip pydantic's per-row validation
+            user_input = UserInput.model_construct(**{name: values[i] for name, values in fields.items()})
+            projection_data = {name: values[i] for name, values in summary.items()}
+            analysis = analysis_chain.analyze_retirement_plan(user_input, projection_data)
+            response = strategy_chain.generate_strategies(user_input, analysis, projection_data)
+            confidence.append(analysis.confidence_level)
+            priority.append(response.overall_priority)
+            titles.append(orjson.dumps(response.implementation_order).decode())
+        scores.update(confidence_level=confidence, overall_priority=priority, strategies=titles)
+
+    result = pd.DataFrame({"row": np.arange(first_row, first_row + size, dtype=np.int64)})
+    if id_column:
+        result[id_column] = frame[id_column].astype("string").to_numpy()
+    result["error"] = pd.array(errors, dtype="string")
+    for name, values in scores.items():
+        column = pd.Series(values, index=valid, dtype=None if len(valid) else object).reindex(range(size))
+        if name in ("years_to_retirement", "risk_score"):
+            column = column.astype("Int64")
+        elif name in ("risk_level", "confidence_level", "overall_priority", "strategies"):
+            column = column.astype("string")
+        else:
+            column = column.astype(np.float64)
+        result[name] = column.to_numpy() if column.dtype == np.float64 else column.array
+    return result
+
+
+def read_chunks(path: str, chunk_size: int, columns) -> Iterator[Any]:
+    """
+    Stream an input file as pandas DataFrames of at most chunk_size rows.
+
+    Only the given columns are read; required columns missing from the file raise ValueError.
+    """
+
+    import pandas as pd
+
+    if file_format(path) == "parquet":
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(path)
+        available = parquet.schema_arrow.names
+    else:
+        available = list(pd.read_csv(path, nrows=0).columns)
+
+    missing = [name for name in columns if name not in OPTIONAL_COLUMNS and name not in available]
+    if missing:
+        raise ValueError(f"{path} is missing columns: {', '.join(missing)}")
+    selected = [name for name in columns if name in available]
+
+    if file_format(path) == "parquet":
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=selected):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=selected)
+
+
+def _write_atomically(path: str, write) -> None:
+    temp_path = f"{path}.tmp"
+    write(temp_path)
+    os.replace(temp_path, path)
+
+
+def _part_path(parts_dir: str, index: int, output_format: str) -> str:
+    return os.path.join(parts_dir, f"part-{index:06d}.{output_format}")
+
+
+def _score_part(frame, first_row: int, index: int, parts_dir: str, output_format: str,
+                id_column: Optional[str], strategies: bool) -> Tuple[int, int, int]:
+    """Score a chunk and write it as a part file (runs in a pool worker). Returns (index, rows, invalid rows)."""
+
+    result = score_chunk(frame, first_row, id_column, strategies)
+    if output_format == "parquet":
+        _write_atomically(_part_path(parts_dir, index, output_format),
+                          lambda path: result.to_parquet(path, index=False))
+    else:
+        _write_atomically(_part_path(parts_dir, index, output_format),
+                          lambda path: result.to_csv(path, index=False))
+    return index, len(result), int(result["error"].notna().sum())
+
+
+def _merge_parts(parts_dir: str, indexes: List[int], output: str, output_format: str) -> None:
+    """Concatenate the part files into output in chunk order, one part in memory at a time."""
+
+    def write(path):
+        if output_format == "parquet":
+            import pyarrow.parquet as pq
+            writer = None
+            try:
+                for index in indexes:
+                    table = pq.read_table(_part_path(parts_dir, index, output_format))
+                    if writer is None:
+                        writer = pq.ParquetWriter(path, table.schema)
+                    writer.write_table(table.cast(writer.schema))
+            finally:
+                if writer is not None:
+                    writer.close()
+        else:
+            with open(path, "wb") as out:
+                for position, index in enumerate(indexes):
+                    with open(_part_path(parts_dir, index, output_format), "rb") as part:
+                        if position:
+                            part.readline()  # header
+                        shutil.copyfileobj(part, out)
+
+    _write_atomically(output, write)
+
+
+def _load_checkpoint(path: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Checkpoint of an earlier run with the same settings, or a fresh one."""
+
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return {"settings": settings, "chunks": {}, "elapsed_seconds": 0.0}
+    if checkpoint.get("settings") != settings:
+        raise ValueError(f"{path} belongs to a run with a different input or settings; pass --restart to start over")
+    return checkpoint
+
+
+def ingest(input_path: str, output_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 0,
+           id_column: Optional[str] = None, strategies: bool = True, restart: bool = False,
+           progress=None) -> Dict[str, Any]:
+    """
+    Score every row of input_path into output_path, resuming an interrupted run.
+
+    Args:
+        input_path: CSV or Parquet file of profiles
+        output_path: CSV or Parquet file to write (format from the extension)
+        chunk_size: Rows per chunk
+        workers: Pool processes (0 scores chunks in this process)
+        id_column: Input column copied to the output to identify rows
+        strategies: Whether to run the rule-based analysis and strategy chains
+        restart: Ignore (and replace) an existing checkpoint
+        progress: Called with a summary dict after each chunk
+
+    Returns:
+        Summary: rows, invalid_rows, chunks, resumed_chunks, elapsed_seconds and rows_per_second
+    """
+
+    output_format = file_format(output_path)
+    parts_dir = f"{output_path}.parts"
+    checkpoint_path = f"{output_path}.checkpoint.json"
+    stat = os.stat(input_path)
+    settings = {
+        "input": os.path.abspath(input_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+        "chunk_size": chunk_size, "id_column": id_column, "strategies": strategies
+    }
+
+    if restart:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+    checkpoint = _load_checkpoint(checkpoint_path, settings)
+    chunks: Dict[str, List[int]] = checkpoint["chunks"]
+    resumed_chunks = len(chunks)
+    os.makedirs(parts_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    rows_this_run = 0
+
+    def summary() -> Dict[str, Any]:
+        elapsed = time.perf_counter() - start
+        return {
+            "rows": sum(rows for rows, _ in chunks.values()),
+            "invalid_rows": sum(invalid for _, invalid in chunks.values()),
+            "chunks": len(chunks),
+            "resumed_chunks": resumed_chunks,
+            "elapsed_seconds": round(checkpoint["elapsed_seconds"] + elapsed, 3),
+            "rows_per_second": round(rows_this_run / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+    def record(done: Tuple[int, int, int]) -> None:
+        nonlocal rows_this_run
+        index, rows, invalid = done
+        chunks[str(index)] = [rows, invalid]
+        rows_this_run += rows
+        _write_atomically(checkpoint_path, lambda path: _dump_json(
+            {**checkpoint, "elapsed_seconds": checkpoint["elapsed_seconds"] + time.perf_counter() - start}, path
+        ))
+        if progress is not None:
+            progress(summary())
+
+    def pending_chunks():
+        columns = [*REQUIRED_COLUMNS, *OPTIONAL_COLUMNS] + ([id_column] if id_column else [])
+        first_row = 0
+        for index, frame in enumerate(read_chunks(input_path, chunk_size, columns)):
+            # Chunks already done are still read to keep the row numbering
+            if str(index) not in chunks:
+                yield frame, first_row, index
+            first_row += len(frame)
+        if first_row == 0 and not chunks:
+            # Empty input: one empty part so the output still gets its header
+            import pandas as pd
+            yield pd.DataFrame(columns=columns), 0, 0
+
+    arguments = (parts_dir, output_format, id_column, strategies)
+    if workers <= 0:
+        for frame, first_row, index in pending_chunks():
+            record(_score_part(frame, first_row, index, *arguments))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            in_flight = set()
+            for frame, first_row, index in pending_chunks():
+                in_flight.add(pool.submit(_score_part, frame, first_row, index, *arguments))
+                # Bounded read-ahead: wait for a chunk to finish before reading more
+                while len(in_flight) >= 2 * workers:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record(future.result())
+            while in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record(future.result())
+
+    _merge_parts(parts_dir, sorted(int(index) for index in chunks), output_path, output_format)
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    os.remove(checkpoint_path)
+    return summary()
+
+
+def _dump_json(data: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def main():
+    """Parse arguments and score the input file."""
+
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of employee profiles")
+    parser.add_argument("input", help="CSV or Parquet file with UserInput columns")
+    parser.add_argument("output", help="CSV or Parquet file to write (format from the extension)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count; 0 scores in this process)")
+    parser.add_argument("--id-column", help="Input column copied to the output, e.g. employee_id")
+    parser.add_argument("--no-strategies", action="store_true",
+                        help="Only validate and compute projection and risk (skip the rule-based chains)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of an interrupted run")
+    args = parser.parse_args()
+
+    last_report = 0.0
+
+    def progress(status):
+        nonlocal last_report
+        if time.perf_counter() - last_report >= 1:
+            last_report = time.perf_counter()
+            print(f"  {status['chunks']} chunks, {status['rows']:,} rows, {status['rows_per_second']:,.0f} rows/s",
+                  file=sys.stderr)
+
+    try:
+        result = ingest(args.input, args.output, args.chunk_size, args.workers, args.id_column,
+                        not args.no_strategies, args.restart, progress)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    resumed = f" ({result['resumed_chunks']} chunks resumed from checkpoint)" if result["resumed_chunks"] else ""
+    print(f"✅ Scored {result['rows']:,} rows ({result['invalid_rows']:,} invalid) into {args.output} "
+          f"in {result['elapsed_seconds']:.1f}s, {result['rows_per_second']:,.0f} rows/s{resumed}")
+
+
+if __name__ == "__main__":
+    main()
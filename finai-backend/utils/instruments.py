@@ -0,0 +1,248 @@
+"""
+Multi-bucket accumulation for Indian retirement instruments.
+Projects market savings, EPF, PPF and NPS side by side, each with its own rate,
+contribution rule and lock-in, as a buckets x years matrix per user.
+
+Inputs broadcast like NumPy arrays, so one call handles a single profile or a whole batch.
+All buckets use the same end-of-year contribution convention as retirement_projection,
+which adds the EPF, PPF and NPS corpus (instrument_corpus_batch) to the market savings
+corpus, so readiness and shortfall count every bucket.
+"""
+
+from typing import Dict, Any
+import numpy as np
+from models.user_input import UserInput
+
+
+BUCKETS = ("savings", "epf", "ppf", "nps")
+
+# Default annual rates (%) for the government-backed instruments
+INSTRUMENT_RATES = {"epf": 8.25, "ppf": 7.1, "nps": 10.0}
+
+# EPF contributions are a percentage of basic pay, assumed to be this share of annual income
+EPF_BASIC_SALARY_SHARE = 0.4
+
+# PPF deposits are capped per financial year
+PPF_ANNUAL_CAP = 150000.0
+
+# NPS: withdrawals open at 60 and 40% of the corpus must buy an annuity
+NPS_ANNUITY_SHARE = 0.4
+
+# Age from which each bucket can be withdrawn. PPF really locks each account for 15
+# years from opening (extendable in 5-year blocks, partial withdrawals from year 7),
+# but UserInput has no account opening date, so PPF is treated as open at retirement
+# and never reported as locked.
+UNLOCK_AGE = {"savings": 0, "epf": 58, "ppf": 0, "nps": 60}
+
+
+def _instrument_columns(shape, annual_income, employer_pf, epf_balance, ppf_balance, nps_balance,
+                        ppf_contribution, nps_contribution, instrument_rates):
+    """(..., 3) opening balances, rates (as decimals) and annual contributions of the EPF, PPF and NPS buckets."""
+
+    opening = np.stack([epf_balance, ppf_balance, nps_balance], axis=-1)
+    bucket_rates = np.stack([
+        np.full(shape, instrument_rates["epf"]),
+        np.full(shape, instrument_rates["ppf"]),
+        np.full(shape, instrument_rates["nps"])
+    ], axis=-1) / 100
+    contributions = np.stack([
+        annual_income * EPF_BASIC_SALARY_SHARE * employer_pf / 100 * 2,
+        np.minimum(ppf_contribution, PPF_ANNUAL_CAP),
+        nps_contribution * 12
+    ], axis=-1)
+    return opening, bucket_rates, contributions
+
+
+def _corpus_at_retirement(opening, bucket_rates, contributions, years_to_retirement):
+    """Closed form P(1 + r)^t + PMT * [((1 + r)^t - 1) / r] per bucket at each user's retirement year."""
+
+    retirement_growth = (1 + bucket_rates) ** years_to_retirement[..., None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        retirement_annuity = np.where(
+            bucket_rates > 0, (retirement_growth - 1) / bucket_rates, years_to_retirement[..., None]
+        )
+    return opening * retirement_growth + contributions * retirement_annuity
+
+
+def multi_bucket_projection_batch(age, retirement_age, annual_income, current_savings, monthly_savings,
+                                  expected_returns, employer_pf=0.0, epf_balance=0.0, ppf_balance=0.0,
+                                  nps_balance=0.0, ppf_contribution=0.0, nps_contribution=0.0,
+                                  rates: Dict[str, float] = None) -> Dict[str, np.ndarray]:
+    """
+    Project every instrument bucket from today until retirement.
+
+    Contribution rules:
+    - savings: monthly_savings * 12 at expected_returns
+    - epf: employee + matching employer share, employer_pf% of basic pay each
+    - ppf: ppf_contribution per year, capped at PPF_ANNUAL_CAP
+    - nps: nps_contribution per month
+
+    Args:
+        age, retirement_age, annual_income, current_savings, monthly_savings, expected_returns:
+            Profile columns as in UserInput (expected_returns in %)
+        employer_pf: Employer PF contribution (% of basic pay)
+        epf_balance, ppf_balance, nps_balance: Current instrument balances
+        ppf_contribution: Annual PPF deposit
+        nps_contribution: Monthly NPS contribution
+        rates: Optional overrides for INSTRUMENT_RATES (%)
+
+    Returns:
+        Dictionary with:
+        - balances: (..., buckets, years + 1) year-end balances, NaN after retirement
+        - corpus_by_bucket: (..., buckets) balances at retirement
+        - total_corpus: (...) sum over buckets
+        - accessible_corpus: (...) part that can be withdrawn at retirement
+    """
+
+    instrument_rates = {**INSTRUMENT_RATES, **(rates or {})}
+
+    (age, retirement_age, annual_income, current_savings, monthly_savings, expected_returns,
+     employer_pf, epf_balance, ppf_balance, nps_balance, ppf_contribution, nps_contribution) = np.broadcast_arrays(
+        *[np.asarray(column, dtype=np.float64) for column in (
+            age, retirement_age, annual_income, current_savings, monthly_savings, expected_returns,
+            employer_pf, epf_balance, ppf_balance, nps_balance, ppf_contribution, nps_contribution
+        )]
+    )
+
+    # (..., buckets) starting balances, rates and annual contributions
+    instrument_opening, instrument_bucket_rates, instrument_contributions = _instrument_columns(
+        age.shape, annual_income, employer_pf, epf_balance, ppf_balance, nps_balance,
+        ppf_contribution, nps_contribution, instrument_rates
+    )
+    opening = np.concatenate([current_savings[..., None], instrument_opening], axis=-1)
+    bucket_rates = np.concatenate([expected_returns[..., None] / 100, instrument_bucket_rates], axis=-1)
+    contributions = np.concatenate([monthly_savings[..., None] * 12, instrument_contributions], axis=-1)
+
+    years_to_retirement = retirement_age - age
+    years = np.arange(int(years_to_retirement.max(initial=0)) + 1, dtype=np.float64)
+
+    # buckets x years matrix for every user, built from running products and sums
+    # (growth[y] = (1 + r)^y, annuity[y] = sum(growth[:y])) rather than pow and division
+    yearly_growth = np.empty(bucket_rates.shape + years.shape)
+    yearly_growth[..., 0] = 1.0
+    yearly_growth[..., 1:] = (1 + bucket_rates)[..., None]
+    growth = np.cumprod(yearly_growth, axis=-1)
+
+    annuity_factor = np.zeros_like(growth)
+    np.cumsum(growth[..., :-1], axis=-1, out=annuity_factor[..., 1:])
+
+    balances = growth
+    balances *= opening[..., None]
+    annuity_factor *= contributions[..., None]
+    balances += annuity_factor
+    np.copyto(balances, np.nan, where=years > years_to_retirement[..., None, None])
+
+    # Closed form at each user's own retirement year
+    corpus_by_bucket = _corpus_at_retirement(opening, bucket_rates, contributions, years_to_retirement)
+
+    unlock_age = np.array([UNLOCK_AGE[bucket] for bucket in BUCKETS], dtype=np.float64)
+    withdrawable_share = np.array([1.0, 1.0, 1.0, 1 - NPS_ANNUITY_SHARE])
+    unlocked = unlock_age <= retirement_age[..., None]
+    accessible_corpus = np.sum(corpus_by_bucket * withdrawable_share * unlocked, axis=-1)
+
+    return {
+        "balances": balances,
+        "corpus_by_bucket": corpus_by_bucket,
+        "total_corpus": corpus_by_bucket.sum(axis=-1),
+        "accessible_corpus": accessible_corpus
+    }
+
+
+def instrument_corpus_batch(age, retirement_age, annual_income, employer_pf=0.0, epf_balance=0.0,
+                            ppf_balance=0.0, nps_balance=0.0, ppf_contribution=0.0, nps_contribution=0.0,
+                            rates: Dict[str, float] = None) -> np.ndarray:
+    """
+    EPF + PPF + NPS corpus at retirement, as added to projected_corpus by retirement_projection.
+
+    Only the closed form at retirement is evaluated, without the buckets x years
+    matrix, so this stays cheap for large batches.
+
+    Args:
+        age, retirement_age, annual_income: Profile columns as in UserInput
+        employer_pf, epf_balance, ppf_balance, nps_balance, ppf_contribution, nps_contribution:
+            Instrument columns as in multi_bucket_projection_batch
+        rates: Optional overrides for INSTRUMENT_RATES (%)
+
+    Returns:
+        Array of instrument corpus values (0 for profiles without instruments)
+    """
+
+    (age, retirement_age, annual_income, employer_pf, epf_balance, ppf_balance, nps_balance,
+     ppf_contribution, nps_contribution) = np.broadcast_arrays(
+        *[np.asarray(column, dtype=np.float64) for column in (
+            age, retirement_age, annual_income, employer_pf, epf_balance, ppf_balance, nps_balance,
+            ppf_contribution, nps_contribution
+        )]
+    )
+
+    opening, bucket_rates, contributions = _instrument_columns(
+        age.shape, annual_income, employer_pf, epf_balance, ppf_balance, nps_balance,
+        ppf_contribution, nps_contribution, {**INSTRUMENT_RATES, **(rates or {})}
+    )
+    return _corpus_at_retirement(opening, bucket_rates, contributions, retirement_age - age).sum(axis=-1)
+
+
+def instrument_corpus(user_input: UserInput) -> float:
+    """EPF + PPF + NPS corpus at retirement for a single user."""
+
+    instrument_fields = (
+        user_input.employer_pf or 0.0,
+        user_input.epf_balance or 0.0,
+        user_input.ppf_balance or 0.0,
+        user_input.nps_balance or 0.0,
+        user_input.ppf_contribution or 0.0,
+        user_input.nps_contribution or 0.0
+    )
+    # Most profiles have no instruments; skip the NumPy call on the scalar hot path
+    if not any(instrument_fields):
+        return 0.0
+    return float(instrument_corpus_batch(
+        user_input.age, user_input.retirement_age, user_input.annual_income, *instrument_fields
+    ))
+
+
+def multi_bucket_projection(user_input: UserInput) -> Dict[str, Any]:
+    """
+    Multi-bucket projection for a single user.
+
+    Args:
+        user_input: UserInput model containing all financial parameters
+
+    Returns:
+        Dictionary with per-bucket corpus, totals, lock-in notes and readiness
+        against the retirement goal
+    """
+
+    result = multi_bucket_projection_batch(
+        user_input.age,
+        user_input.retirement_age,
+        user_input.annual_income,
+        user_input.current_savings,
+        user_input.monthly_savings,
+        user_input.expected_returns,
+        user_input.employer_pf or 0.0,
+        user_input.epf_balance or 0.0,
+        user_input.ppf_balance or 0.0,
+        user_input.nps_balance or 0.0,
+        user_input.ppf_contribution or 0.0,
+        user_input.nps_contribution or 0.0
+    )
+
+    total_corpus = float(result["total_corpus"])
+    readiness_percentage = min(100, (total_corpus / user_input.retirement_goal) * 100) if user_input.retirement_goal > 0 else 0
+
+    locked = [
+        bucket for bucket in BUCKETS
+        if UNLOCK_AGE[bucket] > user_input.retirement_age and result["corpus_by_bucket"][BUCKETS.index(bucket)] > 0
+    ]
+
+    return {
+        "buckets": {
+            bucket: round(float(value), 2) for bucket, value in zip(BUCKETS, result["corpus_by_bucket"])
+        },
+        "rates": {"savings": user_input.expected_returns, **INSTRUMENT_RATES},
+        "total_corpus": round(total_corpus, 2),
+        "accessible_corpus": round(float(result["accessible_corpus"]), 2),
+        "readiness_percentage": round(readiness_percentage, 2),
+        "locked_until_unlock_age": locked
+    }
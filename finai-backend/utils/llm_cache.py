@@ -0,0 +1,216 @@
+"""
+Persistent cache of parsed LLM responses for the analysis and strategy chains.
+
+Responses are keyed on the prompt variables quantized into bands (age, retirement
+horizon, income bracket, readiness %, savings rate, risk level), so near-identical
+profiles share one LLM answer. Entries live in SQLite, survive restarts, expire
+after a TTL and are evicted least-recently-used beyond a maximum entry count.
+Several worker processes may share one file, so the size is always read from the
+table rather than counted per process.
+
+On a hit the chains overwrite the numeric fields (readiness score, corpus) with
+the user's own values; the cached text is shared across the band.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from models.user_input import UserInput, RetirementProjection
+from utils.metrics import register_cache
+
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "llm_cache.sqlite3")
+)
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+# Band edges (lower bounds); a value falls in the last edge <= value
+INCOME_BRACKETS = np.array([0, 500000, 1000000, 1500000, 2000000, 3000000, 5000000])
+AGE_BAND_YEARS = 5
+HORIZON_BAND_YEARS = 5
+READINESS_BAND_PERCENT = 10
+SAVINGS_RATE_BAND_PERCENT = 5
+
+
+def profile_bands(user_input: UserInput, projection: RetirementProjection, risk_level: str) -> Tuple:
+    """
+    Quantize the prompt variables into a hashable band tuple.
+
+    Args:
+        user_input: UserInput model
+        projection: RetirementProjection for the same input
+        risk_level: Risk level from calculate_risk_score
+
+    Returns:
+        (age band, horizon band, income bracket, readiness band, savings-rate band, risk level)
+    """
+
+    savings_rate = user_input.monthly_savings * 12 / user_input.annual_income * 100
+    readiness = min(projection.readiness_percentage, 100)
+    return (
+        user_input.age // AGE_BAND_YEARS * AGE_BAND_YEARS,
+        projection.years_to_retirement // HORIZON_BAND_YEARS * HORIZON_BAND_YEARS,
+        int(INCOME_BRACKETS[np.searchsorted(INCOME_BRACKETS, user_input.annual_income, side="right") - 1]),
+        int(readiness // READINESS_BAND_PERCENT * READINESS_BAND_PERCENT),
+        int(min(savings_rate, 50) // SAVINGS_RATE_BAND_PERCENT * SAVINGS_RATE_BAND_PERCENT),
+        risk_level
+    )
+
+
+def prompt_fingerprint(template: str) -> str:
+    """Short hash of a prompt template, so editing a prompt invalidates its cached answers."""
+
+    return hashlib.sha1(template.encode("utf-8")).hexdigest()[:12]
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed response cache with TTL, LRU size eviction and hit counters.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl_seconds: float = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            path: SQLite file path (":memory:" for a process-local cache)
+            ttl_seconds: Entry lifetime in seconds (0 disables expiry)
+            max_entries: Maximum number of entries before the least recently used are evicted
+        """
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, kind TEXT NOT NULL, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(kind: str, prompt_id: str, bands: Tuple) -> str:
+        """Stable text key for a response kind, prompt version and band tuple."""
+
+        return json.dumps([kind, prompt_id, list(bands)], separators=(",", ":"))
+
+    def get(self, kind: str, prompt_id: str, bands: Tuple) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            kind: Response kind ("analysis" or "strategies")
+            prompt_id: prompt_fingerprint of the template that produced it
+            bands: profile_bands tuple
+
+        Returns:
+            The stored response dictionary, or None on a miss or expired entry
+        """
+
+        key = self.make_key(kind, prompt_id, bands)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, kind: str, prompt_id: str, bands: Tuple, value: Dict[str, Any]) -> None:
+        """Store a response, evicting the least recently used entries when over max_entries."""
+
+        key = self.make_key(kind, prompt_id, bands)
+        now = time.time()
+        with self._lock:
+            # Insert and evict in one write transaction, so other processes on the
+            # same file never see (or count) the table above max_entries
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, kind, value, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, kind, json.dumps(value), now, now)
+                )
+                excess = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    self._db.execute(
+                        "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                        (excess,)
+                    )
+                    self.evictions += excess
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss/eviction counters."""
+
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "size": size,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Shared response cache at LLM_CACHE_PATH, or None when LLM_CACHE_ENABLED is false."""
+
+    global _llm_response_cache
+    if LLM_CACHE_ENABLED and _llm_response_cache is None:
+        _llm_response_cache = LLMResponseCache()
+    return _llm_response_cache
+
+
+def llm_response_cache_stats() -> Optional[Dict[str, Any]]:
+    """Stats of the shared response cache, or None if it has not been opened."""
+
+    return _llm_response_cache.stats() if _llm_response_cache is not None else None
+
+
+register_cache("llm_response", llm_response_cache_stats)
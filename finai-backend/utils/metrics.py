@@ -0,0 +1,308 @@
+"""
+Prometheus metrics for the API process, served as text by /metrics.
+
+Counters and histograms are sharded per thread: a thread increments plain ints
+and floats in its own shard without taking a lock (the event loop thread and the
+to_thread workers never share one), and a scrape sums the shards. Recording a
+sample is a dictionary lookup and a bisect, so instrumenting a request costs a
+few microseconds. Gauges such as cache sizes and in-flight LLM calls are read
+from their owners by callbacks when the metrics are rendered.
+
+Metrics are per process: with several workers, each worker reports its own.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Request latency buckets (seconds), the Prometheus client defaults
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Stage latency buckets (seconds); deterministic stages and cache hits take microseconds
+STAGE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Sharded:
+    """Per-thread dictionaries of samples keyed by label values."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[Labels, list]] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[Labels, list]:
+        """This thread's shard (created, under the lock, on its first sample)."""
+
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def _merged(self, size: int) -> Dict[Labels, list]:
+        """Element-wise sum of every shard's samples."""
+
+        with self._lock:
+            shards = list(self._shards)
+        merged: Dict[Labels, list] = {}
+        for shard in shards:
+            # dict.copy() and list() run without releasing the GIL, so each copy is consistent
+            for labels, values in shard.copy().items():
+                total = merged.setdefault(labels, [0] * size)
+                for i, value in enumerate(list(values)):
+                    total[i] += value
+        return merged
+
+
+class Counter(_Sharded):
+    """Monotonic counter with labels."""
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            entry = shard[labels] = [0]
+        entry[0] += amount
+
+    def values(self) -> Dict[Labels, float]:
+        return {labels: values[0] for labels, values in self._merged(1).items()}
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(_Sharded):
+    """Histogram with fixed upper bounds; each sample lands in one bucket, rendered cumulatively."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # One slot per bucket, one for +Inf, then the sum
+        self._size = len(self.buckets) + 2
+
+    def observe(self, labels: Labels, value: float) -> None:
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            entry = shard[labels] = [0] * (self._size - 1) + [0.0]
+        entry[bisect.bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def snapshot(self) -> Dict[Labels, Dict[str, object]]:
+        """Cumulative bucket counts, count and sum per label set."""
+
+        report = {}
+        for labels, values in self._merged(self._size).items():
+            cumulative, running = [], 0
+            for count in values[:-1]:
+                running += count
+                cumulative.append(running)
+            report[labels] = {"buckets": cumulative, "count": running, "sum": values[-1]}
+        return report
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, sample in sorted(self.snapshot().items()):
+            for bound, count in zip(self.buckets + (float("inf"),), sample["buckets"]):
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(sample['sum'])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {sample['count']}"
+
+
+class CallbackMetric:
+    """Gauge or counter whose values are read from a callback at render time."""
+
+    def __init__(self, name: str, documentation: str, kind: str, labelnames: Sequence[str],
+                 callback: Callable[[], Dict[Labels, float]]):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def render(self) -> Iterable[str]:
+        try:
+            values = self.callback()
+        except Exception as e:
+            print(f"Metric {self.name} unavailable: {e!r}")
+            return
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        # Re-registering a name (e.g. a module reloaded in tests) replaces the old metric
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = REQUEST_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, callback: Callable[[], Dict[Labels, float]],
+                 labelnames: Sequence[str] = (), kind: str = "gauge") -> CallbackMetric:
+        """Register a gauge (or counter) read from callback(), which returns {label values: value}."""
+
+        return self._register(CallbackMetric(name, documentation, kind, labelnames, callback))
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Caches reported under the "cache" label: name -> stats() returning hits, misses, hit_ratio, size (or None)
+_caches: Dict[str, Callable[[], Optional[Dict[str, float]]]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Optional[Dict[str, float]]]) -> None:
+    """Report a cache's hits, misses, hit ratio and size (read from its stats() at scrape time)."""
+
+    _caches[name] = stats
+
+
+def _cache_values(key: str) -> Callable[[], Dict[Labels, float]]:
+    def callback():
+        values = {}
+        for name, stats in list(_caches.items()):
+            current = stats()
+            if current:
+                values[(name,)] = current[key]
+        return values
+    return callback
+
+
+# Shared by the whole process
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter(
+    "finai_http_requests_total", "HTTP requests by route, method and status", ("method", "route", "status")
+)
+http_errors = metrics.counter(
+    "finai_http_request_errors_total", "HTTP requests answered with a 4xx (client) or 5xx (server) status",
+    ("method", "route", "kind")
+)
+http_latency = metrics.histogram(
+    "finai_http_request_duration_seconds", "HTTP request latency by route", ("route",), REQUEST_BUCKETS
+)
+stage_latency = metrics.histogram(
+    "finai_stage_duration_seconds",
+    "Latency of request stages (validation, pipeline stages, serialization) by source (computed or cache)",
+    ("stage", "source"), STAGE_BUCKETS
+)
+
+metrics.callback("finai_cache_hits_total", "Lookups served from cache", _cache_values("hits"), ("cache",), "counter")
+metrics.callback("finai_cache_misses_total", "Lookups not found in cache", _cache_values("misses"), ("cache",), "counter")
+metrics.callback("finai_cache_hit_ratio", "Hits divided by lookups since start", _cache_values("hit_ratio"), ("cache",))
+metrics.callback("finai_cache_entries", "Entries currently cached", _cache_values("size"), ("cache",))
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    """Record one finished HTTP request."""
+
+    http_requests.inc((method, route, str(status)))
+    if status >= 400:
+        http_errors.inc((method, route, "server" if status >= 500 else "client"))
+    http_latency.observe((route,), seconds)
+
+
+def observe_stage(stage: str, seconds: float, source: str = "computed") -> None:
+    """Record one stage execution."""
+
+    stage_latency.observe((stage, source), seconds)
+
+
+# perf_counter() when the current request arrived (set by MetricsMiddleware)
+request_started: ContextVar[Optional[float]] = ContextVar("request_started", default=None)
+
+
+def observe_validation() -> None:
+    """Record the time from request arrival to now (body read and validation) as the validation stage."""
+
+    started = request_started.get()
+    if started is not None:
+        observe_stage("validation", time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording count, status and latency of every HTTP request.
+
+    Requests are labelled with the matched route's path template (so /analyze and
+    not the raw URL), or "unmatched" for 404s, which keeps label cardinality fixed.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        token = request_started.set(start)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_started.reset(token)
+            route = scope.get("route")
+            observe_request(scope["method"], getattr(route, "path", "unmatched"), status, time.perf_counter() - start)
@@ -0,0 +1,327 @@
+"""
+Opt-in profiling of single requests.
+
+With PROFILING_ENABLED=true, a request sent with "X-Profile: speedscope" (or
+"pstats", or the query flag ?profile=...) runs under a profiler and its capture is
+written to PROFILE_DIR:
+
+- speedscope: a sampling profiler reads the stacks of the event loop thread and of
+  worker threads running backend code every PROFILE_SAMPLE_INTERVAL_MS and writes
+  a speedscope JSON file (open it at https://www.speedscope.app). Samples taken
+  inside a pipeline stage or serialization sit under a "stage:<name>" root frame.
+- pstats: cProfile traces every call on the event loop thread (stages moved to a
+  worker thread are not traced) and writes a .prof file for pstats/snakeviz.
+
+Every capture also gets a <id>.json summary with the request, its duration and
+the stage markers (start and duration of projection, risk, analysis, strategies,
+serialization, ...), listed newest first by /debug/profiles. One request is
+profiled at a time; while a capture is running other profile requests are served
+normally with "X-Profile: busy". When PROFILING_TOKEN is set, profiled requests
+and /debug/profiles must also send it in X-Profile-Token.
+"""
+
+import os
+import sys
+import hmac
+import json
+import time
+import uuid
+import cProfile
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "profiles")
+)
+PROFILE_MAX_CAPTURES = int(os.getenv("PROFILE_MAX_CAPTURES", "50"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+
+PROFILE_FORMATS = ("speedscope", "pstats")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Capture of the request being handled in this context, if it is profiled
+_active: ContextVar[Optional["Capture"]] = ContextVar("profile_capture", default=None)
+
+# Only one capture runs at a time (cProfile and the sampler are process-wide)
+_capture_lock = threading.Lock()
+
+
+def mark_stage(stage: str, start: float, elapsed: float) -> None:
+    """Record a stage marker (perf_counter start, seconds) on the current request's capture, if any."""
+
+    capture = _active.get()
+    if capture is not None:
+        capture.markers.append((stage, threading.get_ident(), start, elapsed))
+
+
+class _Sampler(threading.Thread):
+    """Background thread sampling Python stacks of the profiled threads."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: List[tuple] = []
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            now = time.perf_counter()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                # Idle pool threads and other libraries' threads are not part of the request
+                if thread_id == self.thread_id or any(filename.startswith(BACKEND_DIR) for _, filename, _ in stack):
+                    self.samples.append((thread_id, now, stack))
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class Capture:
+    """One profiled request: the profiler, its stage markers and the files it writes."""
+
+    def __init__(self, profile_format: str, method: str, path: str, directory: str = None):
+        self.id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.format = profile_format
+        self.method = method
+        self.path = path
+        self.directory = directory or PROFILE_DIR
+        self.markers: List[tuple] = []
+        self.status: Optional[int] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_Sampler] = None
+
+    def start(self) -> None:
+        self.created = time.time()
+        self.started = time.perf_counter()
+        if self.format == "pstats":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            interval = PROFILE_SAMPLE_INTERVAL_MS / 1000
+            # The sampler needs the GIL to take a sample, so let threads switch at least that often
+            self._switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(self._switch_interval, interval))
+            self._sampler = _Sampler(threading.get_ident(), interval)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        self.duration = time.perf_counter() - self.started
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+            sys.setswitchinterval(self._switch_interval)
+
+    def _speedscope(self) -> Dict[str, Any]:
+        """Sampled speedscope profiles, one per thread, with stage frames at the root."""
+
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[tuple, int] = {}
+
+        def index(key):
+            if key not in frame_index:
+                frame_index[key] = len(frames)
+                name, filename, line = key
+                frames.append({"name": name, "file": filename, "line": line} if filename else {"name": name})
+            return frame_index[key]
+
+        profiles: Dict[int, Dict[str, Any]] = {}
+        last_sample: Dict[int, float] = {}
+        for thread_id, at, stack in self._sampler.samples:
+            markers = [
+                (start, stage) for stage, marker_thread, start, elapsed in self.markers
+                if marker_thread == thread_id and start <= at < start + elapsed
+            ]
+            if markers:
+                stack = [(f"stage:{max(markers)[1]}", "", 0)] + stack
+            profile = profiles.setdefault(thread_id, {
+                "type": "sampled", "name": f"thread {thread_id}", "unit": "seconds",
+                "startValue": 0, "endValue": self.duration, "samples": [], "weights": []
+            })
+            profile["samples"].append([index(key) for key in stack])
+            profile["weights"].append(at - last_sample.get(thread_id, self.started))
+            last_sample[thread_id] = at
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path} ({self.id})",
+            "exporter": "finai-backend",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values())
+        }
+
+    def summary(self, filename: str) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "created": self.created,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "format": self.format,
+            "file": filename,
+            "duration_ms": round(self.duration * 1000, 3),
+            "stages": [
+                {
+                    "stage": stage,
+                    "thread": thread_id,
+                    "start_ms": round((start - self.started) * 1000, 3),
+                    "duration_ms": round(elapsed * 1000, 3)
+                }
+                for stage, thread_id, start, elapsed in sorted(self.markers, key=lambda marker: marker[2])
+            ]
+        }
+
+    def save(self) -> Dict[str, Any]:
+        """Write the profile and its summary, then drop the oldest captures beyond PROFILE_MAX_CAPTURES."""
+
+        os.makedirs(self.directory, exist_ok=True)
+        if self.format == "pstats":
+            filename = f"{self.id}.prof"
+            self._profiler.dump_stats(os.path.join(self.directory, filename))
+        else:
+            filename = f"{self.id}.speedscope.json"
+            with open(os.path.join(self.directory, filename), "w") as f:
+                json.dump(self._speedscope(), f)
+
+        summary = self.summary(filename)
+        with open(os.path.join(self.directory, f"{self.id}.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        prune(self.directory, PROFILE_MAX_CAPTURES)
+        return summary
+
+
+def list_captures(directory: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """Summaries of the captures in directory, newest first."""
+
+    directory = directory or PROFILE_DIR
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(".json") and not name.endswith(".speedscope.json")]
+    except FileNotFoundError:
+        return []
+
+    captures = []
+    for name in names:
+        try:
+            with open(os.path.join(directory, name)) as f:
+                captures.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    captures.sort(key=lambda capture: capture["created"], reverse=True)
+    return captures[:limit]
+
+
+def capture_path(capture_id: str, directory: str = None) -> Optional[str]:
+    """Path of a capture's profile file, or None if there is no such capture."""
+
+    directory = directory or PROFILE_DIR
+    for capture in list_captures(directory, limit=sys.maxsize):
+        if capture["id"] == capture_id:
+            return os.path.join(directory, capture["file"])
+    return None
+
+
+def prune(directory: str, keep: int) -> None:
+    """Delete all but the newest `keep` captures."""
+
+    for capture in list_captures(directory, limit=sys.maxsize)[keep:]:
+        for name in (capture["file"], f"{capture['id']}.json"):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def authorized(token: Optional[str]) -> bool:
+    """Whether profiling is enabled and token matches PROFILING_TOKEN (when one is set)."""
+
+    if not PROFILING_ENABLED:
+        return False
+    return not PROFILING_TOKEN or hmac.compare_digest((token or "").encode(), PROFILING_TOKEN.encode())
+
+
+def requested_format(scope: Dict[str, Any]) -> Optional[str]:
+    """
+    Profile format asked for by an ASGI request, if profiling is allowed for it.
+
+    Returns:
+        "speedscope" or "pstats" ("1"/"true" mean speedscope), or None when the
+        request does not ask, profiling is disabled or the token does not match
+    """
+
+    headers = dict(scope.get("headers") or ())
+    value = headers.get(b"x-profile", b"").decode("latin-1").lower()
+    if not value and scope.get("query_string"):
+        value = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [""])[0].lower()
+    if not value or not authorized(headers.get(b"x-profile-token", b"").decode("latin-1")):
+        return None
+    if value in ("1", "true"):
+        return "speedscope"
+    return value if value in PROFILE_FORMATS else None
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that ask for it (see requested_format).
+
+    The capture id is returned in the X-Profile-Id response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        profile_format = requested_format(scope) if scope["type"] == "http" else None
+        if profile_format is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not _capture_lock.acquire(blocking=False):
+            await self.app(scope, receive, _with_header(send, b"x-profile", b"busy"))
+            return
+
+        capture = Capture(profile_format, scope["method"], scope["path"])
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                capture.status = message["status"]
+            await _with_header(send, b"x-profile-id", capture.id.encode())(message)
+
+        token = _active.set(capture)
+        capture.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            capture.stop()
+            _active.reset(token)
+            try:
+                capture.save()
+            except OSError as e:
+                print(f"Could not save profile {capture.id}: {e!r}")
+            finally:
+                _capture_lock.release()
+
+
+def _with_header(send, name: bytes, value: bytes):
+    """Wrap an ASGI send to add a header to the response start message."""
+
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": list(message.get("headers", [])) + [(name, value)]}
+        await send(message)
+
+    return wrapped
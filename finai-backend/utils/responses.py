@@ -0,0 +1,166 @@
+"""
+Response bodies shared by the FastAPI app (main.py) and the asyncio server (simple_server.py).
+
+Both servers run profiles through an AnalysisPipeline and build the same bodies
+from the finished runs here, so the two API surfaces cannot drift apart. Models
+and numpy arrays are left in place for utils.serialization to encode.
+"""
+
+from typing import Any, Dict
+
+from models.user_input import RetirementProjection, SimulationRequest
+from utils.monte_carlo import monte_carlo_projection
+
+
+def _ai_enabled(run, ai_enabled: Any) -> Any:
+    """ai_enabled, or "degraded"/"partial" when admission control or the latency budget kept the chains rule-based."""
+
+    if run.degraded:
+        return "degraded"
+    return "partial" if run.partial else ai_enabled
+
+
+def analyze_body(run, ai_enabled: Any) -> Dict[str, Any]:
+    """
+    Build the /analyze response from a pipeline run computed through all stages.
+
+    Args:
+        run: Finished PipelineRun
+        ai_enabled: Whether LLM/AI chains produced the analysis (overridden by "degraded" or "partial")
+
+    Returns:
+        Response dictionary
+    """
+
+    strategy_response = run.strategies
+    return {
+        "success": True,
+        "projection": run.projection,
+        "analysis": run.analysis,
+        "strategies": strategy_response.strategies,
+        "overall_priority": strategy_response.overall_priority,
+        "implementation_order": strategy_response.implementation_order,
+        "risk_assessment": run.cohort_risk,
+        "timeline": run.timeline,
+        "retirement_income": run.retirement_income,
+        "instrument_projection": run.instruments,
+        "ai_enabled": _ai_enabled(run, ai_enabled),
+        "admission": run.admission
+    }
+
+
+def suggestions_body(run, ai_enabled: Any) -> Dict[str, Any]:
+    """Build the /suggestions response from a pipeline run computed through the strategies stage."""
+
+    strategy_response = run.strategies
+    return {
+        "success": True,
+        "strategies": strategy_response.strategies,
+        "overall_priority": strategy_response.overall_priority,
+        "implementation_order": strategy_response.implementation_order,
+        "ai_enabled": _ai_enabled(run, ai_enabled),
+        "admission": run.admission
+    }
+
+
+def _projection_summary(projection: RetirementProjection) -> Dict[str, float]:
+    """Corpus, readiness, shortfall and surplus of a projection."""
+
+    return {
+        "projected_corpus": projection.projected_corpus,
+        "readiness_percentage": projection.readiness_percentage,
+        "shortfall": projection.shortfall,
+        "surplus": projection.surplus
+    }
+
+
+def what_if_body(simulation_request: SimulationRequest, original_projection: RetirementProjection,
+                 simulated_projection: RetirementProjection) -> Dict[str, Any]:
+    """
+    Build the /simulate response comparing the original and modified scenarios.
+
+    Args:
+        simulation_request: SimulationRequest being answered
+        original_projection: Projection of the unmodified user input
+        simulated_projection: Projection with the modified parameters applied
+
+    Returns:
+        Response dictionary with differences and recommendations
+    """
+
+    # Calculate differences
+    corpus_difference = simulated_projection.projected_corpus - original_projection.projected_corpus
+    readiness_difference = simulated_projection.readiness_percentage - original_projection.readiness_percentage
+
+    # Generate recommendations based on simulation results
+    recommendations = []
+
+    if corpus_difference > 0:
+        recommendations.append(f"Positive impact: Corpus increases by ${corpus_difference:,.2f}")
+    elif corpus_difference < 0:
+        recommendations.append(f"Negative impact: Corpus decreases by ${abs(corpus_difference):,.2f}")
+
+    if readiness_difference > 0:
+        recommendations.append(f"Readiness improves by {readiness_difference:.1f} percentage points")
+    elif readiness_difference < 0:
+        recommendations.append(f"Readiness decreases by {abs(readiness_difference):,.1f} percentage points")
+
+    if simulated_projection.readiness_percentage >= 100:
+        recommendations.append("This scenario would achieve your retirement goal!")
+    elif simulated_projection.readiness_percentage >= 80:
+        recommendations.append("This scenario gets you close to your retirement goal")
+    else:
+        recommendations.append("This scenario still falls short of your retirement goal")
+
+    return {
+        "success": True,
+        "simulation_type": simulation_request.simulation_type,
+        "original_projection": _projection_summary(original_projection),
+        "simulated_projection": _projection_summary(simulated_projection),
+        "differences": {
+            "corpus_difference": corpus_difference,
+            "readiness_difference": readiness_difference,
+            "shortfall_change": simulated_projection.shortfall - original_projection.shortfall,
+            "surplus_change": simulated_projection.surplus - original_projection.surplus
+        },
+        "recommendations": recommendations,
+        "modified_parameters": simulation_request.modified_parameters
+    }
+
+
+def monte_carlo_body(simulation_request: SimulationRequest,
+                     original_projection: RetirementProjection) -> Dict[str, Any]:
+    """Run the Monte Carlo simulation for a /simulate request and build its response."""
+
+    scenario_input = simulation_request.user_input.copy(update=simulation_request.modified_parameters)
+
+    monte_carlo = monte_carlo_projection(
+        scenario_input,
+        num_simulations=simulation_request.num_simulations,
+        return_volatility=simulation_request.return_volatility,
+        inflation_volatility=simulation_request.inflation_volatility,
+        seed=simulation_request.seed
+    )
+
+    probability = monte_carlo["probability_of_success"]
+    recommendations = [f"{probability:.1f}% of simulated market paths reach your retirement goal"]
+
+    if probability >= 80:
+        recommendations.append("Your plan is resilient to most market conditions")
+    elif probability >= 50:
+        recommendations.append("Your plan works in typical markets but is exposed to weak return years")
+    else:
+        recommendations.append("Most market paths fall short - consider saving more or retiring later")
+
+    recommendations.append(
+        f"In a poor market (P10) your corpus would be ${monte_carlo['corpus_percentiles']['p10']:,.2f}"
+    )
+
+    return {
+        "success": True,
+        "simulation_type": simulation_request.simulation_type,
+        "original_projection": _projection_summary(original_projection),
+        "monte_carlo": monte_carlo,
+        "recommendations": recommendations,
+        "modified_parameters": simulation_request.modified_parameters
+    }
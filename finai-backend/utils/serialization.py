@@ -0,0 +1,131 @@
+"""
+Response serialization straight from pydantic models and numpy arrays to bytes.
+
+Handlers return dictionaries that hold RetirementProjection, AnalysisResult,
+StrategyResponse etc. as-is; orjson encodes each model from its field storage
+(model.__dict__) and numpy arrays natively, so no intermediate model_dump()
+dictionaries, jsonable_encoder pass or .tolist() copies are built.
+
+Internal clients can ask for MessagePack with "Accept: application/x-msgpack".
+msgpack is optional: without it every response is JSON.
+"""
+
+import functools
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+import orjson
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+from utils.metrics import observe_stage
+from utils.profiling import mark_stage
+
+
+MSGPACK_MEDIA_TYPES = ("application/x-msgpack", "application/msgpack")
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Encode types orjson and msgpack do not handle natively."""
+
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize content (with nested models and numpy arrays) to JSON bytes."""
+
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+@functools.lru_cache(maxsize=1)
+def _msgpack():
+    """The msgpack module, or None if it is not installed."""
+
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+
+def msgpack_available() -> bool:
+    """Whether MessagePack responses can be produced."""
+
+    return _msgpack() is not None
+
+
+def dumps_msgpack(content: Any) -> bytes:
+    """
+    Serialize content (with nested models and numpy arrays) to MessagePack bytes.
+
+    Raises:
+        RuntimeError: msgpack is not installed
+    """
+
+    msgpack = _msgpack()
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(content, default=_default)
+
+
+class ModelJSONResponse(Response):
+    """JSON response rendered with dumps_json."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = dumps_json(content)
+        elapsed = time.perf_counter() - start
+        observe_stage("serialization", elapsed)
+        mark_stage("serialization", start, elapsed)
+        return body
+
+
+class MsgPackResponse(Response):
+    """MessagePack response rendered with dumps_msgpack."""
+
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = dumps_msgpack(content)
+        elapsed = time.perf_counter() - start
+        observe_stage("serialization", elapsed)
+        mark_stage("serialization", start, elapsed)
+        return body
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Whether the client accepts MessagePack and it is available."""
+
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES) and msgpack_available()
+
+
+def negotiated_response(request: Request, content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serialize content as MessagePack when the client asks for it, otherwise as JSON.
+
+    Args:
+        request: Incoming request (its Accept header selects the format)
+        content: Response body, may contain pydantic models and numpy arrays
+        headers: Extra response headers
+
+    Returns:
+        A ModelJSONResponse or MsgPackResponse with "Vary: Accept"
+    """
+
+    response_class = MsgPackResponse if wants_msgpack(request) else ModelJSONResponse
+    return response_class(content, headers={**(headers or {}), "Vary": "Accept"})
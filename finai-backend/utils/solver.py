@@ -0,0 +1,178 @@
+"""
+Goal-seek solvers for retirement planning.
+Inverts the retirement_projection formula for one unknown at a time:
+monthly savings, retirement age, expected return or starting corpus.
+
+All functions accept scalars or NumPy arrays (broadcast together), so a whole
+batch of profiles is solved in one call. Expected returns are percentages, as in UserInput.
+"""
+
+import numpy as np
+
+
+def _future_value(current_savings, annual_savings, rates, years):
+    """
+    Vectorized retirement_projection corpus: P(1 + r)^t + PMT * [((1 + r)^t - 1) / r].
+
+    Args:
+        current_savings: Starting corpus
+        annual_savings: Contribution added at the end of each year
+        rates: Annual returns (as decimals)
+        years: Years to compound
+
+    Returns:
+        Array of projected corpus values
+    """
+
+    growth = (1 + rates) ** years
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity_factor = np.where(rates > 0, (growth - 1) / rates, years)
+    return current_savings * growth + annual_savings * annuity_factor
+
+
+def required_monthly_savings(retirement_goal, current_savings, years_to_retirement, expected_returns):
+    """
+    Monthly savings needed to reach the retirement goal (closed form).
+
+    Args:
+        retirement_goal: Target retirement corpus
+        current_savings: Current savings amount
+        years_to_retirement: Years until retirement
+        expected_returns: Expected annual returns (%)
+
+    Returns:
+        Array of required monthly savings (0 where current savings already suffice)
+    """
+
+    retirement_goal, current_savings, years, rates = np.broadcast_arrays(
+        np.asarray(retirement_goal, dtype=np.float64),
+        np.asarray(current_savings, dtype=np.float64),
+        np.asarray(years_to_retirement, dtype=np.float64),
+        np.asarray(expected_returns, dtype=np.float64) / 100
+    )
+
+    growth = (1 + rates) ** years
+    remaining_needed = np.maximum(0, retirement_goal - current_savings * growth)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity_factor = np.where(rates > 0, (growth - 1) / rates, years)
+        required_annual = np.where(years > 0, remaining_needed / annuity_factor, 0.0)
+
+    return required_annual / 12
+
+
+def required_current_savings(retirement_goal, monthly_savings, years_to_retirement, expected_returns):
+    """
+    Starting corpus needed today to reach the retirement goal (closed form).
+
+    Args:
+        retirement_goal: Target retirement corpus
+        monthly_savings: Monthly savings amount
+        years_to_retirement: Years until retirement
+        expected_returns: Expected annual returns (%)
+
+    Returns:
+        Array of required current savings (0 where monthly savings alone suffice)
+    """
+
+    retirement_goal, monthly_savings, years, rates = np.broadcast_arrays(
+        np.asarray(retirement_goal, dtype=np.float64),
+        np.asarray(monthly_savings, dtype=np.float64),
+        np.asarray(years_to_retirement, dtype=np.float64),
+        np.asarray(expected_returns, dtype=np.float64) / 100
+    )
+
+    growth = (1 + rates) ** years
+    annuity_value = _future_value(0.0, monthly_savings * 12, rates, years)
+
+    return np.maximum(0, retirement_goal - annuity_value) / growth
+
+
+def required_retirement_age(age, retirement_goal, current_savings, monthly_savings, expected_returns,
+                            max_age: int = 100):
+    """
+    Earliest whole retirement age at which the projected corpus reaches the goal.
+
+    Solves P(1 + r)^t + PMT * ((1 + r)^t - 1) / r = goal for t in closed form
+    (logarithms for r > 0, linear for r = 0) and rounds up to whole years, since
+    retirement_projection compounds annually.
+
+    Args:
+        age: Current age
+        retirement_goal: Target retirement corpus
+        current_savings: Current savings amount
+        monthly_savings: Monthly savings amount
+        expected_returns: Expected annual returns (%)
+        max_age: Ages beyond this are treated as unreachable
+
+    Returns:
+        Array of required retirement ages (NaN where the goal is unreachable by max_age)
+    """
+
+    age, retirement_goal, current_savings, annual_savings, rates = np.broadcast_arrays(
+        np.asarray(age, dtype=np.float64),
+        np.asarray(retirement_goal, dtype=np.float64),
+        np.asarray(current_savings, dtype=np.float64),
+        np.asarray(monthly_savings, dtype=np.float64) * 12,
+        np.asarray(expected_returns, dtype=np.float64) / 100
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # g^t * (P + PMT/r) = goal + PMT/r
+        annuity_offset = annual_savings / rates
+        years_compound = np.log((retirement_goal + annuity_offset) / (current_savings + annuity_offset)) / np.log1p(rates)
+        years_linear = (retirement_goal - current_savings) / annual_savings
+        years = np.where(rates > 0, years_compound, years_linear)
+
+    years = np.where(current_savings >= retirement_goal, 1.0, years)
+    # Guard against ceil() overshooting by one year on floating-point noise
+    years = np.maximum(1.0, np.ceil(years - 1e-9))
+
+    retirement_age = age + years
+    return np.where(np.isfinite(retirement_age) & (retirement_age <= max_age), retirement_age, np.nan)
+
+
+def required_expected_returns(retirement_goal, current_savings, monthly_savings, years_to_retirement,
+                              max_return: float = 50.0, tolerance: float = 1e-6):
+    """
+    Annual return needed to reach the retirement goal.
+
+    There is no closed form for the rate, so every element is solved at once by
+    vectorized bisection on [0, max_return]; the projected corpus is increasing in
+    the rate, which keeps the bracket valid for the whole batch.
+
+    Args:
+        retirement_goal: Target retirement corpus
+        current_savings: Current savings amount
+        monthly_savings: Monthly savings amount
+        years_to_retirement: Years until retirement
+        max_return: Upper end of the search bracket (%)
+        tolerance: Bracket width (%) at which bisection stops
+
+    Returns:
+        Array of required expected returns in % (0 where no growth is needed,
+        NaN where even max_return is not enough)
+    """
+
+    retirement_goal, current_savings, annual_savings, years = np.broadcast_arrays(
+        np.asarray(retirement_goal, dtype=np.float64),
+        np.asarray(current_savings, dtype=np.float64),
+        np.asarray(monthly_savings, dtype=np.float64) * 12,
+        np.asarray(years_to_retirement, dtype=np.float64)
+    )
+
+    low = np.zeros(retirement_goal.shape)
+    high = np.full(retirement_goal.shape, max_return / 100)
+
+    reachable = _future_value(current_savings, annual_savings, high, years) >= retirement_goal
+    needs_growth = _future_value(current_savings, annual_savings, low, years) < retirement_goal
+
+    iterations = int(np.ceil(np.log2(max_return / tolerance)))
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        enough = _future_value(current_savings, annual_savings, middle, years) >= retirement_goal
+        high = np.where(enough, middle, high)
+        low = np.where(enough, low, middle)
+
+    required = np.where(needs_growth, high * 100, 0.0)
+    return np.where(reachable, required, np.nan)
@@ -0,0 +1,205 @@
+"""
+Cash-flow timeline engine for retirement planning.
+Produces per-year (or per-month) balances, contributions, growth and inflation-adjusted
+values, compounded like retirement_projection, with optional annual SIP step-ups.
+The timeline follows the market savings only; the EPF/PPF/NPS buckets that
+projected_corpus also counts are projected year by year in utils.instruments.
+
+Inputs broadcast like NumPy arrays: scalars give one timeline of shape (periods,),
+arrays of n profiles give (n, periods). Periods past a profile's retirement are NaN.
+"""
+
+from typing import Dict, Any, Iterator
+import numpy as np
+from models.user_input import UserInput
+
+
+TIMELINE_FIELDS = ("period", "age", "contribution", "total_contributions", "growth", "balance", "real_balance")
+
+
+def cash_flow_timeline(age, retirement_age, current_savings, monthly_savings,
+                       expected_returns, expected_inflation, sip_step_up=0.0,
+                       monthly: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Build a cash-flow timeline from today until retirement.
+
+    Balances compound once a year at expected_returns and each year's contributions
+    are invested at the year end, exactly like retirement_projection, so the final
+    balance equals projected_corpus when there is no step-up. Within a year the opening
+    balance grows at the equivalent monthly rate and the months' contributions are
+    added as they are saved. The monthly contribution steps up by sip_step_up once a
+    year. The yearly recursion B_y = B_(y-1)(1 + r) + C_y is evaluated in closed form
+    as (1 + r)^y (B_0 + sum(C_k / (1 + r)^k)), so no Python loop runs over the years.
+
+    Args:
+        age: Current age
+        retirement_age: Target retirement age
+        current_savings: Current savings amount
+        monthly_savings: Monthly savings amount in the first year
+        expected_returns: Expected annual returns (%)
+        expected_inflation: Expected annual inflation (%)
+        sip_step_up: Annual increase of the monthly contribution (%)
+        monthly: Return one row per month instead of one per year
+
+    Returns:
+        Dictionary of arrays keyed by TIMELINE_FIELDS
+    """
+
+    age, retirement_age, current_savings, monthly_savings, rates, inflation, step_up = np.broadcast_arrays(
+        np.asarray(age, dtype=np.float64),
+        np.asarray(retirement_age, dtype=np.float64),
+        np.asarray(current_savings, dtype=np.float64),
+        np.asarray(monthly_savings, dtype=np.float64),
+        np.asarray(expected_returns, dtype=np.float64) / 100,
+        np.asarray(expected_inflation, dtype=np.float64) / 100,
+        np.asarray(sip_step_up, dtype=np.float64) / 100
+    )
+
+    # Trailing axis is time; everything else is the profile batch
+    horizon_months = ((retirement_age - age) * 12)[..., None]
+    total_months = int(horizon_months.max())
+    month = np.arange(1, total_months + 1, dtype=np.float64)
+    year_index = np.floor((month - 1) / 12)
+    active = month <= horizon_months
+
+    contributions = np.where(active, monthly_savings[..., None] * (1 + step_up[..., None]) ** year_index, 0.0)
+
+    year_contributions = contributions.reshape(contributions.shape[:-1] + (-1, 12))
+    growth_to_year = (1 + rates[..., None]) ** np.arange(1, total_months // 12 + 1, dtype=np.float64)
+    year_end_balance = growth_to_year * (
+        current_savings[..., None] + np.cumsum(year_contributions.sum(axis=-1) / growth_to_year, axis=-1)
+    )
+    opening_of_year = np.concatenate([current_savings[..., None], year_end_balance[..., :-1]], axis=-1)
+    growth_in_year = (1 + rates[..., None, None]) ** (np.arange(1, 13, dtype=np.float64) / 12)
+    balance = (opening_of_year[..., None] * growth_in_year + np.cumsum(year_contributions, axis=-1)).reshape(
+        contributions.shape
+    )
+    total_contributions = np.cumsum(contributions, axis=-1)
+    price_level = (1 + inflation[..., None]) ** (month / 12)
+
+    if monthly:
+        opening_balance = np.concatenate([current_savings[..., None], balance[..., :-1]], axis=-1)
+        period = month
+        contribution = contributions
+        growth = balance - opening_balance - contributions
+    else:
+        year_end = np.arange(11, total_months, 12)
+        opening_balance = np.concatenate([current_savings[..., None], balance[..., year_end[:-1]]], axis=-1)
+        contribution = contributions.reshape(contributions.shape[:-1] + (-1, 12)).sum(axis=-1)
+        period = month[year_end] / 12
+        balance = balance[..., year_end]
+        growth = balance - opening_balance - contribution
+        total_contributions = total_contributions[..., year_end]
+        price_level = price_level[..., year_end]
+        active = active[..., year_end]
+        month = month[year_end]
+
+    timeline = {
+        "period": np.broadcast_to(period, balance.shape),
+        "age": age[..., None] + month / 12,
+        "contribution": contribution,
+        "total_contributions": total_contributions,
+        "growth": growth,
+        "balance": balance,
+        "real_balance": balance / price_level
+    }
+
+    # Blank out periods after each profile's retirement
+    return {name: np.where(active, values, np.nan) for name, values in timeline.items()}
+
+
+def user_timeline(user_input: UserInput, monthly: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Build the cash-flow timeline for a single UserInput.
+
+    Args:
+        user_input: UserInput model containing all financial parameters
+        monthly: Return one row per month instead of one per year
+
+    Returns:
+        Dictionary of 1-D arrays keyed by TIMELINE_FIELDS
+    """
+
+    return cash_flow_timeline(
+        user_input.age,
+        user_input.retirement_age,
+        user_input.current_savings,
+        user_input.monthly_savings,
+        user_input.expected_returns,
+        user_input.expected_inflation,
+        user_input.sip_step_up or 0.0,
+        monthly=monthly
+    )
+
+
+def iter_timeline_rows(timeline: Dict[str, np.ndarray]) -> Iterator[Dict[str, float]]:
+    """
+    Stream a single-profile timeline one period at a time.
+
+    Args:
+        timeline: Output of cash_flow_timeline or user_timeline for one profile
+
+    Yields:
+        One dictionary per period, rounded to 2 decimals
+    """
+
+    columns = [timeline[name] for name in TIMELINE_FIELDS]
+    for values in zip(*columns):
+        if np.isnan(values[-1]):
+            return
+        yield {name: round(float(value), 2) for name, value in zip(TIMELINE_FIELDS, values)}
+
+
+def iter_timeline_chunks(age, retirement_age, current_savings, monthly_savings,
+                         expected_returns, expected_inflation, sip_step_up=0.0,
+                         monthly: bool = False, chunk_size: int = 2000) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Stream timelines for a large batch of profiles in fixed-size chunks.
+
+    Only one chunk of (chunk_size, periods) arrays is alive at a time, so batch
+    exports over long horizons keep memory bounded.
+
+    Args:
+        age, retirement_age, current_savings, monthly_savings, expected_returns,
+        expected_inflation, sip_step_up: Equal-length 1-D column arrays (scalars broadcast)
+        monthly: Return one row per month instead of one per year
+        chunk_size: Number of profiles per yielded chunk
+
+    Yields:
+        cash_flow_timeline dictionaries with an extra "offset" entry giving the
+        index of the chunk's first profile
+    """
+
+    columns = np.broadcast_arrays(
+        np.atleast_1d(age), np.atleast_1d(retirement_age), np.atleast_1d(current_savings),
+        np.atleast_1d(monthly_savings), np.atleast_1d(expected_returns),
+        np.atleast_1d(expected_inflation), np.atleast_1d(sip_step_up)
+    )
+
+    for offset in range(0, len(columns[0]), chunk_size):
+        chunk = [column[offset:offset + chunk_size] for column in columns]
+        timeline: Dict[str, Any] = cash_flow_timeline(*chunk, monthly=monthly)
+        timeline["offset"] = offset
+        yield timeline
+
+
+def timeline_chart_data(user_input: UserInput) -> Dict[str, list]:
+    """
+    Compact per-year chart series for the Dashboard/Results pages.
+
+    Args:
+        user_input: UserInput model containing all financial parameters
+
+    Returns:
+        Dictionary of per-year lists (rounded to whole rupees)
+    """
+
+    timeline = user_timeline(user_input)
+    return {
+        "year": timeline["period"].astype(int).tolist(),
+        "age": np.rint(timeline["age"]).astype(int).tolist(),
+        "balance": np.round(timeline["balance"]).tolist(),
+        "real_balance": np.round(timeline["real_balance"]).tolist(),
+        "total_contributions": np.round(timeline["total_contributions"]).tolist(),
+        "growth": np.round(timeline["growth"]).tolist()
+    }
@@ -0,0 +1,59 @@
+"""
+Token counting for LLM prompts and replies.
+
+Counts use tiktoken's encoding for the model. When tiktoken (or its encoding
+files) is unavailable, counts fall back to an estimate of four characters per
+token, which is close for English text and JSON.
+"""
+
+import functools
+from typing import Optional
+
+
+CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding(model: str):
+    """tiktoken encoding for a model, or None if tiktoken cannot provide one."""
+
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    # Encoding files are downloaded on first use; offline hosts fall back to the estimate
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """
+    Number of tokens in text for the given model.
+
+    Args:
+        text: Prompt or reply text
+        model: Chat model name
+
+    Returns:
+        Token count (estimated when tiktoken is unavailable)
+    """
+
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text))
+
+
+def tokenizer_name(model: str = "gpt-3.5-turbo") -> Optional[str]:
+    """Name of the tiktoken encoding in use for model, or None when counts are estimated."""
+
+    encoding = _encoding(model)
+    return encoding.name if encoding is not None else None
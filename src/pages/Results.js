@@ -422,11 +422,15 @@ const Results = () => {
                                 </div>
                                 <div className="card-body">
                                     <div className="space-y-4">
-                                        {[5, 10, 15, 20, 25, 30].map((year) => (
+                                        {/* Balances come from the backend timeline engine */}
+                                        {(analysisData?.timeline?.year || [])
+                                            .map((year, index) => ({ year, balance: analysisData.timeline.balance[index] }))
+                                            .filter(({ year }) => year % 5 === 0)
+                                            .map(({ year, balance }) => (
                                             <div key={year} className="flex justify-between items-center py-2 border-b border-gray-100">
                                                 <span className="text-gray-600">Year {year}</span>
                                                 <span className="font-semibold text-gray-900">
-                                                    ₹{((year * 12 * 25000) * Math.pow(1.12, year)).toLocaleString()}
+                                                    ₹{Math.round(balance).toLocaleString()}
                                                 </span>
                                             </div>
                                         ))}
@@ -1,6 +1,33 @@
 // API service to connect React frontend to Python backend
 const API_BASE_URL = 'http://localhost:8000';
 
+// Ensure all required fields have default values and handle NaN values
+const buildAnalysisRequest = (userData) => {
+  const requestData = {
+    age: userData.age || 30,
+    retirement_age: userData.retirementAge || 65,
+    annual_income: (userData.monthlyIncome || 0) * 12,
+    monthly_expenses: userData.monthlyExpenses || 0,
+    current_savings: userData.currentSavings || 0,
+    monthly_savings: userData.monthlySavings || 0,
+    retirement_goal: userData.retirementGoal || 1000000,
+    expected_inflation: userData.expectedInflation || 3.0,
+    expected_returns: userData.expectedReturns || 6.0,
+    employer_match: userData.employerMatch || 0,
+    social_security_estimate: userData.socialSecurity || 0,
+    other_income: userData.otherIncome || 0
+  };
+
+  // Convert any NaN values to 0
+  Object.keys(requestData).forEach(key => {
+    if (isNaN(requestData[key])) {
+      requestData[key] = 0;
+    }
+  });
+
+  return requestData;
+};
+
 class RetirementAPI {
   // Health check
   async checkHealth() {
@@ -16,28 +43,7 @@ class RetirementAPI {
   // Analyze retirement readiness
   async analyzeRetirement(userData) {
     try {
-      // Ensure all required fields have default values and handle NaN values
-      const requestData = {
-        age: userData.age || 30,
-        retirement_age: userData.retirementAge || 65,
-        annual_income: (userData.monthlyIncome || 0) * 12,
-        monthly_expenses: userData.monthlyExpenses || 0,
-        current_savings: userData.currentSavings || 0,
-        monthly_savings: userData.monthlySavings || 0,
-        retirement_goal: userData.retirementGoal || 1000000,
-        expected_inflation: userData.expectedInflation || 3.0,
-        expected_returns: userData.expectedReturns || 6.0,
-        employer_match: userData.employerMatch || 0,
-        social_security_estimate: userData.socialSecurity || 0,
-        other_income: userData.otherIncome || 0
-      };
-
-      // Convert any NaN values to 0
-      Object.keys(requestData).forEach(key => {
-        if (isNaN(requestData[key])) {
-          requestData[key] = 0;
-        }
-      });
+      const requestData = buildAnalysisRequest(userData);
 
       console.log('Sending data to backend:', requestData);
 
@@ -63,6 +69,47 @@ class RetirementAPI {
     }
   }
 
+  // Analyze retirement readiness progressively (server-sent events).
+  // onEvent(event, data) is called for projection, risk_assessment, key_insight,
+  // analysis, strategy, strategies, ... and done, as each arrives.
+  async analyzeRetirementStream(userData, onEvent) {
+    const response = await fetch(`${API_BASE_URL}/analyze/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Accept': 'text/event-stream',
+      },
+      body: JSON.stringify(buildAnalysisRequest(userData))
+    });
+
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}: ${await response.text()}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const message = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        let event = 'message';
+        let data = '';
+        message.split('\n').forEach(line => {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) data += line.slice(5).trim();
+        });
+        if (event === 'error') throw new Error(JSON.parse(data).detail);
+        onEvent(event, data ? JSON.parse(data) : null);
+      }
+    }
+  }
+
   // Get strategy suggestions
   async getSuggestions(userData) {
     try {
@@ -1,6 +1,13 @@
 #!/usr/bin/env python3
 """
-Quick startup script for the finai-backend
+Production startup script for the finai-backend
+
+Runs the prefork launcher (finai-backend/prefork.py): N uvicorn workers that are
+warmed up before accepting traffic, restarted if they crash and reloaded
+gracefully on SIGHUP. Dependencies are not installed on start; run
+`pip install -r finai-backend/requirements.txt` once beforehand.
+
+Extra arguments are passed through, e.g. `python start-backend.py --workers 4`.
 """
 import subprocess
 import sys
@@ -13,18 +20,18 @@ def start_backend():
     # Change to backend directory
     os.chdir('finai-backend')
     
-    # Install requirements if needed
-    print("📦 Installing Python dependencies...")
-    subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'], check=True)
-    
     # Start the server
     print("🌐 Starting FastAPI server on http://localhost:8000")
     print("📚 API docs available at http://localhost:8000/docs")
     
     try:
-        subprocess.run([sys.executable, 'main.py'], check=True)
-    except KeyboardInterrupt:
-        print("\n👋 Backend server stopped")
+        server = subprocess.Popen([sys.executable, 'prefork.py', *sys.argv[1:]])
+        try:
+            server.wait()
+        except KeyboardInterrupt:
+            # prefork.py got Ctrl+C too; wait while it stops the workers gracefully
+            server.wait()
+            print("\n👋 Backend server stopped")
     except Exception as e:
         print(f"❌ Error starting backend: {e}")
 
@@ -18,7 +18,8 @@ def start_simple_server():
     print("📊 Analysis endpoint: http://localhost:8000/analyze")
     
     try:
-        subprocess.run([sys.executable, 'simple_server.py'], check=True)
+        # Extra arguments (e.g. --workers 4) are passed through to the server
+        subprocess.run([sys.executable, 'simple_server.py', *sys.argv[1:]], check=True)
     except KeyboardInterrupt:
         print("\n👋 Server stopped")
     except Exception as e: